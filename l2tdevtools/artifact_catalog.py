@@ -0,0 +1,566 @@
+# -*- coding: utf-8 -*-
+"""Catalog of the files in build directories."""
+
+from __future__ import unicode_literals
+
+import contextlib
+import glob
+import hashlib
+import io
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import time
+
+
+class Artifact(object):
+  """File in a build directory.
+
+  Attributes:
+    architecture (str): architecture of the build that produced the file or
+        None if not known.
+    build_target (str): build target that produced the file or None if not
+        known.
+    digest (str): SHA-256 digest of the file in hexadecimal representation
+        or None if not known.
+    directory (str): absolute path of the directory that contains the file.
+    distribution (str): distribution of the build that produced the file or
+        None if not known.
+    filename (str): name of the file.
+    modification_time (float): POSIX timestamp of the last modification of
+        the file.
+    project_name (str): name of the project that produced the file or None
+        if not known.
+    project_version (str): version of the project that produced the file or
+        None if not known.
+    size (int): size of the file in bytes.
+  """
+
+  def __init__(self, directory, filename):
+    """Initializes an artifact.
+
+    Args:
+      directory (str): absolute path of the directory that contains the file.
+      filename (str): name of the file.
+    """
+    super(Artifact, self).__init__()
+    self.architecture = None
+    self.build_target = None
+    self.digest = None
+    self.directory = directory
+    self.distribution = None
+    self.filename = filename
+    self.modification_time = None
+    self.project_name = None
+    self.project_version = None
+    self.size = None
+
+
+class ArtifactCatalog(object):
+  """Catalog of the files in build directories.
+
+  The catalog is stored in a SQLite database and contains the entries of
+  every directory that was queried. A directory is only listed again if its
+  modification time changed, which happens when entries are added, removed
+  or renamed, so that repeated queries do not scan the directory. Files that
+  are produced or downloaded by a build are recorded with the project,
+  version, build target, distribution, architecture and digest.
+  """
+
+  # Characters that have a special meaning in glob patterns.
+  _GLOB_MAGIC_RE = re.compile(r'[*?[]')
+
+  _READ_BUFFER_SIZE = 64 * 1024
+
+  # A directory is listed again if it was modified less than this number of
+  # seconds before it was listed, since a change within the resolution of
+  # the modification time would otherwise go unnoticed.
+  _RACY_MODIFICATION_TIME = 2.0
+
+  _SCHEMA = [
+      ('CREATE TABLE IF NOT EXISTS directories ('
+       'path TEXT PRIMARY KEY, modification_time REAL, list_time REAL)'),
+      ('CREATE TABLE IF NOT EXISTS files ('
+       'directory TEXT, filename TEXT, is_directory INTEGER, size INTEGER, '
+       'modification_time REAL, project_name TEXT, project_version TEXT, '
+       'build_target TEXT, distribution TEXT, architecture TEXT, '
+       'digest TEXT, PRIMARY KEY (directory, filename))'),
+      ('CREATE INDEX IF NOT EXISTS files_project ON files ('
+       'project_name, build_target)')]
+
+  def __init__(self, path):
+    """Initializes an artifact catalog.
+
+    Args:
+      path (str): path of the SQLite database file.
+    """
+    super(ArtifactCatalog, self).__init__()
+    self._connection = None
+    self._path = os.path.abspath(path)
+    self._process_identifier = None
+
+  def _CalculateSHA256(self, path):
+    """Calculates the SHA-256 digest of a file.
+
+    Args:
+      path (str): path of the file.
+
+    Returns:
+      str: SHA-256 digest in hexadecimal representation.
+    """
+    hash_context = hashlib.sha256()
+    with io.open(path, 'rb') as file_object:
+      data = file_object.read(self._READ_BUFFER_SIZE)
+      while data:
+        hash_context.update(data)
+        data = file_object.read(self._READ_BUFFER_SIZE)
+
+    return hash_context.hexdigest()
+
+  def _GetConnection(self):
+    """Retrieves the database connection of the current process.
+
+    Returns:
+      sqlite3.Connection: database connection.
+    """
+    process_identifier = os.getpid()
+    if self._connection and self._process_identifier == process_identifier:
+      return self._connection
+
+    # Build worker processes share the database, hence the timeout to wait
+    # for the locks held by other processes.
+    connection = sqlite3.connect(self._path, timeout=60.0)
+    with connection:
+      for statement in self._SCHEMA:
+        connection.execute(statement)
+
+    self._connection = connection
+    self._process_identifier = process_identifier
+
+    return connection
+
+  def _GetDistribution(self, filename, distributions):
+    """Determines the distribution of a file of a build of distributions.
+
+    Args:
+      filename (str): name of the file.
+      distributions (list[str]): names of the distributions of the build.
+
+    Returns:
+      str: name of the distribution, which is determined by
+          the ~{distribution} suffix of the version in the name of the file,
+          or None if the file is not specific to one of the distributions.
+    """
+    for distribution in distributions:
+      if re.search(r'~{0:s}(?![0-9A-Za-z])'.format(
+          re.escape(distribution)), filename):
+        return distribution
+
+    return None
+
+  def _IsCatalogFilename(self, directory, filename):
+    """Determines if a file is the database file of the catalog.
+
+    Args:
+      directory (str): absolute path of the directory.
+      filename (str): name of the file.
+
+    Returns:
+      bool: True if the file is the database file or one of its temporary
+          files.
+    """
+    return (directory == os.path.dirname(self._path) and
+            filename.startswith(os.path.basename(self._path)))
+
+  def _ListDirectory(self, connection, directory):
+    """Lists the entries of a directory into the catalog.
+
+    Args:
+      connection (sqlite3.Connection): database connection.
+      directory (str): absolute path of the directory.
+    """
+    list_time = time.time()
+
+    try:
+      modification_time = os.stat(directory).st_mtime
+      filenames = os.listdir(directory)
+    except OSError:
+      modification_time = None
+      filenames = []
+
+    file_states = {}
+    for filename in filenames:
+      if self._IsCatalogFilename(directory, filename):
+        continue
+
+      try:
+        stat_object = os.stat(os.path.join(directory, filename))
+      except OSError:
+        continue
+
+      is_directory = os.path.isdir(os.path.join(directory, filename))
+      file_states[filename] = (
+          is_directory, stat_object.st_size, stat_object.st_mtime)
+
+    catalog_states = {
+        filename: (bool(is_directory), size, file_modification_time)
+        for filename, is_directory, size, file_modification_time in (
+            connection.execute(
+                'SELECT filename, is_directory, size, modification_time '
+                'FROM files WHERE directory = ?', (directory, )))}
+
+    removed_filenames = set(catalog_states).difference(file_states)
+
+    # Files that are new or changed are stored without the information
+    # about the build that produced them.
+    changed_files = [
+        (directory, filename, is_directory, size, file_modification_time)
+        for filename, (is_directory, size, file_modification_time) in (
+            file_states.items())
+        if catalog_states.get(filename, None) != (
+            is_directory, size, file_modification_time)]
+
+    connection.executemany(
+        'DELETE FROM files WHERE directory = ? AND filename = ?',
+        [(directory, filename) for filename in removed_filenames])
+    connection.executemany(
+        'INSERT OR REPLACE INTO files (directory, filename, is_directory, '
+        'size, modification_time) VALUES (?, ?, ?, ?, ?)', changed_files)
+    connection.execute(
+        'INSERT OR REPLACE INTO directories (path, modification_time, '
+        'list_time) VALUES (?, ?, ?)',
+        (directory, modification_time, list_time))
+
+  def _RefreshDirectory(self, connection, directory):
+    """Lists a directory into the catalog if it changed since the last time.
+
+    Args:
+      connection (sqlite3.Connection): database connection.
+      directory (str): absolute path of the directory.
+    """
+    try:
+      modification_time = os.stat(directory).st_mtime
+    except OSError:
+      modification_time = None
+
+    row = connection.execute(
+        'SELECT modification_time, list_time FROM directories '
+        'WHERE path = ?', (directory, )).fetchone()
+
+    if row:
+      previous_modification_time, list_time = row
+      if (modification_time == previous_modification_time and
+          modification_time is not None and
+          list_time - modification_time > self._RACY_MODIFICATION_TIME):
+        return
+
+    self._ListDirectory(connection, directory)
+
+  def _RemoveEntry(self, path):
+    """Removes the catalog entry of a file or directory that was removed.
+
+    Args:
+      path (str): path of the file or directory.
+    """
+    directory, filename = os.path.split(os.path.abspath(path))
+
+    connection = self._GetConnection()
+    with connection:
+      connection.execute(
+          'DELETE FROM files WHERE directory = ? AND filename = ?',
+          (directory, filename))
+
+  def GetArtifacts(self, project_name=None, build_target=None):
+    """Retrieves the artifacts that were produced by builds.
+
+    Args:
+      project_name (Optional[str]): name of the project, where None
+          represents all projects.
+      build_target (Optional[str]): build target, where None represents all
+          build targets.
+
+    Returns:
+      list[Artifact]: artifacts sorted by directory and filename.
+    """
+    query = (
+        'SELECT directory, filename, size, modification_time, project_name, '
+        'project_version, build_target, distribution, architecture, digest '
+        'FROM files WHERE project_name IS NOT NULL')
+    parameters = []
+
+    if project_name:
+      query = '{0:s} AND project_name = ?'.format(query)
+      parameters.append(project_name)
+
+    if build_target:
+      query = '{0:s} AND build_target = ?'.format(query)
+      parameters.append(build_target)
+
+    query = '{0:s} ORDER BY directory, filename'.format(query)
+
+    artifacts = []
+    for row in self._GetConnection().execute(query, parameters):
+      artifact = Artifact(row[0], row[1])
+      artifact.size = row[2]
+      artifact.modification_time = row[3]
+      artifact.project_name = row[4]
+      artifact.project_version = row[5]
+      artifact.build_target = row[6]
+      artifact.distribution = row[7]
+      artifact.architecture = row[8]
+      artifact.digest = row[9]
+      artifacts.append(artifact)
+
+    return artifacts
+
+  def GetFileStates(self, directory):
+    """Retrieves the size and modification time of the files in a directory.
+
+    Args:
+      directory (str): path of the directory.
+
+    Returns:
+      dict[str, tuple[int, float]]: size and modification time per filename.
+    """
+    directory = os.path.abspath(directory)
+
+    connection = self._GetConnection()
+    with connection:
+      self._RefreshDirectory(connection, directory)
+
+    return {
+        filename: (size, modification_time)
+        for filename, size, modification_time in connection.execute(
+            'SELECT filename, size, modification_time FROM files '
+            'WHERE directory = ? AND is_directory = 0', (directory, ))}
+
+  def Glob(self, pattern):
+    """Retrieves the paths that match a glob pattern.
+
+    Args:
+      pattern (str): glob pattern, where only the last path segment can
+          contain glob characters.
+
+    Returns:
+      list[str]: paths that match the pattern, in the same format as
+          returned by glob.glob().
+    """
+    dirname, basename = os.path.split(pattern)
+    if self._GLOB_MAGIC_RE.search(dirname):
+      return glob.glob(pattern)
+
+    directory = os.path.abspath(dirname or os.curdir)
+
+    connection = self._GetConnection()
+    with connection:
+      self._RefreshDirectory(connection, directory)
+
+    # Unlike glob.glob(), SQLite GLOB also matches names that start with
+    # a dot for "*" and "?".
+    filenames = [
+        filename for filename, in connection.execute(
+            'SELECT filename FROM files WHERE directory = ? AND '
+            'filename GLOB ? ORDER BY filename', (directory, basename))
+        if not filename.startswith('.') or basename.startswith('.')]
+
+    return [os.path.join(dirname, filename) for filename in filenames]
+
+  def ListDirectory(self, directory):
+    """Lists the entries of a directory.
+
+    Args:
+      directory (str): path of the directory.
+
+    Returns:
+      list[str]: names of the entries in the directory.
+    """
+    directory = os.path.abspath(directory)
+
+    connection = self._GetConnection()
+    with connection:
+      self._RefreshDirectory(connection, directory)
+
+    return [
+        filename for filename, in connection.execute(
+            'SELECT filename FROM files WHERE directory = ? '
+            'ORDER BY filename', (directory, ))]
+
+  def RecordArtifacts(
+      self, directory, previous_file_states, project_name, build_target,
+      project_version=None, distribution=None, architecture=None,
+      distributions=None):
+    """Records the files that were added or changed in a directory.
+
+    Args:
+      directory (str): path of the directory.
+      previous_file_states (dict[str, tuple[int, float]]): size and
+          modification time per filename before the build, as returned by
+          GetFileStates().
+      project_name (str): name of the project.
+      build_target (str): build target.
+      project_version (Optional[str]): version of the project.
+      distribution (Optional[str]): distribution of the build.
+      architecture (Optional[str]): architecture of the build.
+      distributions (Optional[list[str]]): distributions of a build of
+          multiple distributions, where the distribution of a file is
+          determined by the name of the file.
+
+    Returns:
+      list[str]: names of the recorded files.
+    """
+    directory = os.path.abspath(directory)
+
+    file_states = self.GetFileStates(directory)
+
+    artifacts = []
+    for filename, file_state in sorted(file_states.items()):
+      if previous_file_states.get(filename, None) == file_state:
+        continue
+
+      try:
+        digest = self._CalculateSHA256(os.path.join(directory, filename))
+      except IOError as exception:
+        logging.warning('Unable to read: {0:s} with error: {1!s}'.format(
+            filename, exception))
+        continue
+
+      file_distribution = distribution
+      if distributions:
+        file_distribution = self._GetDistribution(filename, distributions)
+
+      artifacts.append((
+          project_name, project_version, build_target, file_distribution,
+          architecture, digest, directory, filename))
+
+    connection = self._GetConnection()
+    with connection:
+      connection.executemany(
+          'UPDATE files SET project_name = ?, project_version = ?, '
+          'build_target = ?, distribution = ?, architecture = ?, digest = ? '
+          'WHERE directory = ? AND filename = ?', artifacts)
+
+    return [artifact[-1] for artifact in artifacts]
+
+  def RemoveDirectory(self, path):
+    """Removes a directory and its catalog entry.
+
+    Args:
+      path (str): path of the directory.
+    """
+    shutil.rmtree(path)
+    self._RemoveEntry(path)
+
+  def RemoveFile(self, path):
+    """Removes a file and its catalog entry.
+
+    Args:
+      path (str): path of the file.
+    """
+    os.remove(path)
+    self._RemoveEntry(path)
+
+
+_artifact_catalog = None
+
+
+def SetArtifactCatalog(artifact_catalog):
+  """Sets the artifact catalog used by the functions of this module.
+
+  Args:
+    artifact_catalog (ArtifactCatalog): artifact catalog or None to use
+        the file system directly.
+  """
+  global _artifact_catalog  # pylint: disable=global-statement
+  _artifact_catalog = artifact_catalog
+
+
+def Glob(pattern):
+  """Retrieves the paths that match a glob pattern.
+
+  Args:
+    pattern (str): glob pattern.
+
+  Returns:
+    list[str]: paths that match the pattern.
+  """
+  if not _artifact_catalog:
+    return glob.glob(pattern)
+
+  return _artifact_catalog.Glob(pattern)
+
+
+def ListDirectory(directory):
+  """Lists the entries of a directory.
+
+  Args:
+    directory (str): path of the directory.
+
+  Returns:
+    list[str]: names of the entries in the directory.
+  """
+  if not _artifact_catalog:
+    return os.listdir(directory)
+
+  return _artifact_catalog.ListDirectory(directory)
+
+
+@contextlib.contextmanager
+def RecordArtifacts(
+    project_name, build_target, project_version=None, distribution=None,
+    architecture=None, distributions=None):
+  """Records the files added or changed in the current working directory.
+
+  Args:
+    project_name (str): name of the project.
+    build_target (str): build target.
+    project_version (Optional[str]): version of the project.
+    distribution (Optional[str]): distribution of the build.
+    architecture (Optional[str]): architecture of the build.
+    distributions (Optional[list[str]]): distributions of a build of
+        multiple distributions, where the distribution of a file is
+        determined by the name of the file.
+
+  Yields:
+    None
+  """
+  if not _artifact_catalog:
+    yield None
+    return
+
+  directory = os.getcwd()
+  file_states = _artifact_catalog.GetFileStates(directory)
+
+  try:
+    yield None
+
+  finally:
+    _artifact_catalog.RecordArtifacts(
+        directory, file_states, project_name, build_target,
+        project_version=project_version, distribution=distribution,
+        architecture=architecture, distributions=distributions)
+
+
+def RemoveDirectory(path):
+  """Removes a directory.
+
+  Args:
+    path (str): path of the directory.
+  """
+  if not _artifact_catalog:
+    shutil.rmtree(path)
+  else:
+    _artifact_catalog.RemoveDirectory(path)
+
+
+def RemoveFile(path):
+  """Removes a file.
+
+  Args:
+    path (str): path of the file.
+  """
+  if not _artifact_catalog:
+    os.remove(path)
+  else:
+    _artifact_catalog.RemoveFile(path)
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+"""Environment of the compiler and make commands of builds."""
+
+from __future__ import unicode_literals
+
+import logging
+import os
+import re
+import subprocess
+
+
+def _FindExecutable(name):
+  """Finds an executable in the directories of the PATH environment variable.
+
+  Args:
+    name (str): name of the executable.
+
+  Returns:
+    str: path of the executable or None if not found.
+  """
+  for directory in os.environ.get('PATH', '').split(os.pathsep):
+    path = os.path.join(directory, name)
+    if os.path.isfile(path) and os.access(path, os.X_OK):
+      return path
+
+  return None
+
+
+class CompilerCacheStatistics(object):
+  """Statistics of the compiler cache.
+
+  Attributes:
+    hits (int): number of compilations of which the result was in the cache.
+    misses (int): number of compilations of which the result was not in
+        the cache.
+  """
+
+  def __init__(self, hits=0, misses=0):
+    """Initializes compiler cache statistics.
+
+    Args:
+      hits (Optional[int]): number of cache hits.
+      misses (Optional[int]): number of cache misses.
+    """
+    super(CompilerCacheStatistics, self).__init__()
+    self.hits = hits
+    self.misses = misses
+
+  def GetDifference(self, previous_statistics):
+    """Determines the statistics since previous statistics.
+
+    Args:
+      previous_statistics (CompilerCacheStatistics): statistics retrieved
+          earlier from the same compiler cache.
+
+    Returns:
+      CompilerCacheStatistics: statistics of the compilations since
+          the previous statistics.
+    """
+    return CompilerCacheStatistics(
+        hits=self.hits - previous_statistics.hits,
+        misses=self.misses - previous_statistics.misses)
+
+  def GetHitRate(self):
+    """Determines the hit rate.
+
+    Returns:
+      float: fraction of the compilations that were cache hits or None if
+          there were no compilations.
+    """
+    number_of_compilations = self.hits + self.misses
+    if not number_of_compilations:
+      return None
+
+    return float(self.hits) / number_of_compilations
+
+
+class BuildEnvironment(object):
+  """Environment of the compiler and make commands of builds.
+
+  The environment controls the number of jobs that make runs concurrently
+  and injects ccache into the compiler commands of configure and make based
+  builds. Projects that do not build correctly with either can opt out with
+  the no_parallel_make and no_compiler_cache build options.
+
+  Attributes:
+    compiler_cache_directory (str): path of the ccache directory or None if
+        no compiler cache is used.
+    number_of_make_jobs (int): number of jobs that make runs concurrently or
+        None to not change the number of jobs.
+  """
+
+  # Directories that contain ccache symbolic links named after the compilers,
+  # such as gcc and cc, which are prepended to PATH to inject ccache.
+  _CCACHE_MASQUERADE_DIRECTORIES = (
+      '/usr/lib/ccache',
+      '/usr/lib64/ccache',
+      '/usr/local/opt/ccache/libexec',
+      '/opt/homebrew/opt/ccache/libexec')
+
+  # The ccache --print-stats values that are counted as cache hits and misses.
+  _CCACHE_HIT_VALUE_NAMES = frozenset([
+      'direct_cache_hit', 'preprocessed_cache_hit'])
+
+  _CCACHE_MISS_VALUE_NAMES = frozenset(['cache_miss'])
+
+  # The ccache --show-stats values that are counted as cache hits and misses,
+  # which are used for ccache versions that do not support --print-stats.
+  _CCACHE_SUMMARY_HIT_VALUE_NAMES = frozenset([
+      'cache hit (direct)', 'cache hit (preprocessed)'])
+
+  _CCACHE_SUMMARY_MISS_VALUE_NAMES = frozenset(['cache miss'])
+
+  _CCACHE_SUMMARY_LINE_RE = re.compile(r'^(\S.*?)\s+([0-9]+)$')
+
+  def __init__(self, compiler_cache_directory=None, number_of_make_jobs=None):
+    """Initializes a build environment.
+
+    Args:
+      compiler_cache_directory (Optional[str]): path of the ccache directory
+          or None if no compiler cache is used.
+      number_of_make_jobs (Optional[int]): number of jobs that make runs
+          concurrently or None to not change the number of jobs.
+    """
+    super(BuildEnvironment, self).__init__()
+    self._ccache_path = None
+    self.compiler_cache_directory = compiler_cache_directory
+    self.number_of_make_jobs = number_of_make_jobs
+
+    if compiler_cache_directory:
+      self._ccache_path = _FindExecutable('ccache')
+
+  def _GetCompilerCacheEnvironmentVariables(self, environment):
+    """Retrieves the environment variables that inject ccache.
+
+    Args:
+      environment (dict[str, str]): environment variables.
+
+    Returns:
+      dict[str, str]: environment variables that inject ccache.
+    """
+    # Paths relative to the base directory are used in the cache keys,
+    # which allows projects that are built in different directories to
+    # share cache entries.
+    environment_variables = {
+        'CCACHE_BASEDIR': os.getcwd(),
+        'CCACHE_DIR': self.compiler_cache_directory}
+
+    for directory in self._CCACHE_MASQUERADE_DIRECTORIES:
+      if os.path.isdir(directory):
+        environment_variables['PATH'] = os.pathsep.join([
+            directory, environment.get('PATH', '')])
+        return environment_variables
+
+    # Without masquerade directory ccache is injected as compiler wrapper.
+    for name, default_compiler in (('CC', 'cc'), ('CXX', 'c++')):
+      compiler = environment.get(name, None) or default_compiler
+      if not compiler.startswith(self._ccache_path):
+        environment_variables[name] = '{0:s} {1:s}'.format(
+            self._ccache_path, compiler)
+
+    return environment_variables
+
+  def _GetParallelMakeEnvironmentVariables(
+      self, environment, number_of_make_jobs):
+    """Retrieves the environment variables that set the number of make jobs.
+
+    Args:
+      environment (dict[str, str]): environment variables.
+      number_of_make_jobs (int): number of jobs that make runs concurrently.
+
+    Returns:
+      dict[str, str]: environment variables that set the number of make jobs.
+    """
+    make_flags = [
+        flag for flag in environment.get('MAKEFLAGS', '').split()
+        if not flag.startswith('-j')]
+    make_flags.append('-j{0:d}'.format(number_of_make_jobs))
+
+    # dpkg-buildpackage and debhelper read the number of jobs from the
+    # parallel option of DEB_BUILD_OPTIONS.
+    deb_build_options = [
+        option for option in environment.get('DEB_BUILD_OPTIONS', '').split()
+        if not option.startswith('parallel=')]
+    deb_build_options.append('parallel={0:d}'.format(number_of_make_jobs))
+
+    # rpmbuild 4.15 and later determines %{_smp_mflags} from RPM_BUILD_NCPUS.
+    return {
+        'DEB_BUILD_OPTIONS': ' '.join(deb_build_options),
+        'MAKEFLAGS': ' '.join(make_flags),
+        'RPM_BUILD_NCPUS': '{0:d}'.format(number_of_make_jobs)}
+
+  def GetCompilerCacheStatistics(self):
+    """Retrieves the statistics of the compiler cache.
+
+    Returns:
+      CompilerCacheStatistics: statistics or None if no compiler cache is
+          used or the statistics cannot be retrieved.
+    """
+    if not self.IsCompilerCacheAvailable():
+      return None
+
+    environment = dict(os.environ)
+    environment['CCACHE_DIR'] = self.compiler_cache_directory
+
+    try:
+      with open(os.devnull, 'wb') as devnull:
+        output = subprocess.check_output(
+            [self._ccache_path, '--print-stats'], env=environment,
+            stderr=devnull)
+      return self.ParseCompilerCacheStatistics(output.decode('utf-8'))
+
+    except subprocess.CalledProcessError:
+      # ccache versions before 3.7 do not support --print-stats.
+      pass
+
+    except OSError as exception:
+      logging.warning(
+          'Unable to retrieve compiler cache statistics with error: '
+          '{0!s}'.format(exception))
+      return None
+
+    try:
+      output = subprocess.check_output(
+          [self._ccache_path, '--show-stats'], env=environment)
+    except (OSError, subprocess.CalledProcessError) as exception:
+      logging.warning(
+          'Unable to retrieve compiler cache statistics with error: '
+          '{0!s}'.format(exception))
+      return None
+
+    statistics = self.ParseCompilerCacheSummary(output.decode('utf-8'))
+    if not statistics:
+      logging.warning((
+          'Unsupported compiler cache statistics format, the compiler cache '
+          'hit rate is not available.'))
+
+    return statistics
+
+  def GetEnvironmentVariables(self, project_definition=None, environment=None):
+    """Retrieves the environment variables of the build commands.
+
+    Args:
+      project_definition (Optional[ProjectDefinition]): definition of
+          the project that is built, where the build options of the project
+          can disable parallel make and the compiler cache.
+      environment (Optional[dict[str, str]]): environment variables to
+          extend, where None represents the environment of the process.
+
+    Returns:
+      dict[str, str]: environment variables.
+    """
+    if environment is None:
+      environment = os.environ
+
+    build_options = []
+    if project_definition and project_definition.build_options:
+      build_options = project_definition.build_options
+
+    number_of_make_jobs = self.number_of_make_jobs
+    if 'no_parallel_make' in build_options:
+      number_of_make_jobs = 1
+
+    environment = dict(environment)
+
+    if number_of_make_jobs:
+      environment.update(self._GetParallelMakeEnvironmentVariables(
+          environment, number_of_make_jobs))
+
+    if (self.IsCompilerCacheAvailable() and
+        'no_compiler_cache' not in build_options):
+      environment.update(self._GetCompilerCacheEnvironmentVariables(
+          environment))
+
+    return environment
+
+  def IsCompilerCacheAvailable(self):
+    """Determines if the compiler cache is available.
+
+    Returns:
+      bool: True if a compiler cache directory is set and ccache is
+          installed.
+    """
+    return bool(self.compiler_cache_directory and self._ccache_path)
+
+  def ParseCompilerCacheStatistics(self, output):
+    """Parses the output of ccache --print-stats.
+
+    Args:
+      output (str): output of ccache --print-stats, which contains a tab
+          separated name and value per line.
+
+    Returns:
+      CompilerCacheStatistics: statistics.
+    """
+    statistics = CompilerCacheStatistics()
+    for line in output.splitlines():
+      name, _, value = line.partition('\t')
+      try:
+        value = int(value, 10)
+      except ValueError:
+        continue
+
+      if name in self._CCACHE_HIT_VALUE_NAMES:
+        statistics.hits += value
+      elif name in self._CCACHE_MISS_VALUE_NAMES:
+        statistics.misses += value
+
+    return statistics
+
+  def ParseCompilerCacheSummary(self, output):
+    """Parses the output of ccache --show-stats of ccache 3.
+
+    Args:
+      output (str): output of ccache --show-stats, which contains a name and
+          value, separated by white space, per line.
+
+    Returns:
+      CompilerCacheStatistics: statistics or None if the output does not
+          contain cache hits or misses, for example because the format of
+          the output is not supported.
+    """
+    statistics = None
+    for line in output.splitlines():
+      match = self._CCACHE_SUMMARY_LINE_RE.match(line.strip())
+      if not match:
+        continue
+
+      name = match.group(1)
+      value = int(match.group(2), 10)
+
+      if name in self._CCACHE_SUMMARY_HIT_VALUE_NAMES:
+        statistics = statistics or CompilerCacheStatistics()
+        statistics.hits += value
+      elif name in self._CCACHE_SUMMARY_MISS_VALUE_NAMES:
+        statistics = statistics or CompilerCacheStatistics()
+        statistics.misses += value
+
+    return statistics
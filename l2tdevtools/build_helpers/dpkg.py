@@ -4,7 +4,6 @@
 from __future__ import unicode_literals
 
 import datetime
-import glob
 import logging
 import os
 import platform
@@ -12,10 +11,14 @@ import re
 import shutil
 import subprocess
 import tarfile
+import tempfile
 import zipfile
 
+from l2tdevtools import artifact_catalog
 from l2tdevtools.build_helpers import interface
 from l2tdevtools import dpkg_files
+from l2tdevtools import source_store
+from l2tdevtools import tracing
 
 
 class DPKGBuildHelper(interface.BuildHelper):
@@ -97,8 +100,9 @@ class DPKGBuildHelper(interface.BuildHelper):
       command = 'sh ../{0:s} {1:s} {2!s} {3:s} {4:s} {5:s}'.format(
           self._prep_script, project_name, project_version, version_suffix,
           distribution, architecture)
-      exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-          source_directory, command), shell=True)
+      with tracing.StartSpan('prepare'):
+        exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
+            source_directory, command), shell=True)
       if exit_code != 0:
         logging.error('Running: "{0:s}" failed.'.format(command))
         return False
@@ -127,14 +131,126 @@ class DPKGBuildHelper(interface.BuildHelper):
       command = 'sh ../{0:s} {1:s} {2!s} {3:s} {4:s} {5:s}'.format(
           self._post_script, project_name, project_version, version_suffix,
           distribution, architecture)
-      exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-          source_directory, command), shell=True)
+      with tracing.StartSpan('finalize'):
+        exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
+            source_directory, command), shell=True)
       if exit_code != 0:
         logging.error('Running: "{0:s}" failed.'.format(command))
         return False
 
     return True
 
+  def _BuildSourceDPKGPackage(self, source_directory):
+    """Builds a source dpkg package from a source directory.
+
+    Args:
+      source_directory (str): name of the source directory.
+
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    log_file_path = os.path.join('..', self.log_filename)
+    command = 'debuild -S -sa > {0:s} 2>&1'.format(log_file_path)
+    with tracing.StartSpan('build', distribution=self.distribution):
+      exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
+          source_directory, command), shell=True)
+    if exit_code != 0:
+      logging.error(
+          'Failed to run: "(cd {0:s} && {1:s}" with exit code {2:d}.'.format(
+              source_directory, command, exit_code))
+      return False
+
+    return True
+
+  def _BuildSourceDPKGPackages(
+      self, source_helper_object, project_name, project_version,
+      distributions):
+    """Builds the source dpkg packages of multiple distributions.
+
+    The source package is extracted and the dpkg packaging files are
+    generated once. Since the prep script can change the packaging files for
+    a specific distribution, a copy of the generated packaging files is
+    restored before the source dpkg package of every other distribution is
+    built.
+
+    Args:
+      source_helper_object (SourceHelper): source helper.
+      project_name (str): name of the project passed to the prep and post
+          scripts.
+      project_version (str): version of the project.
+      distributions (list[str]): names of the distributions.
+
+    Returns:
+      list[str]: names of the distributions for which the source dpkg
+          packages were built, in the order of distributions. The list
+          stops at the first distribution that failed to build.
+    """
+    source_filename = source_helper_object.Download()
+    if not source_filename:
+      logging.info('Download of: {0:s} failed'.format(
+          source_helper_object.project_name))
+      return []
+
+    source_directory = source_helper_object.Create()
+    if not source_directory:
+      logging.error(
+          'Extraction of source package: {0:s} failed'.format(source_filename))
+      return []
+
+    logging.info('Building source deb of: {0:s}'.format(source_filename))
+
+    if not self._CreatePackagingFiles(
+        source_helper_object, source_directory, project_version):
+      return []
+
+    # If there is a temporary packaging directory remove it.
+    temporary_directory = os.path.join(source_directory, 'tmp')
+    if os.path.exists(temporary_directory):
+      logging.info('Removing: {0:s}'.format(temporary_directory))
+      shutil.rmtree(temporary_directory)
+
+    debian_directory = os.path.join(source_directory, 'debian')
+
+    packaging_files_copy_path = None
+    if len(distributions) > 1:
+      packaging_files_copy_path = os.path.join(
+          tempfile.mkdtemp(), 'debian')
+      shutil.copytree(debian_directory, packaging_files_copy_path)
+
+    built_distributions = []
+    try:
+      for distribution in distributions:
+        self.distribution = distribution
+
+        if built_distributions:
+          shutil.rmtree(debian_directory)
+          shutil.copytree(packaging_files_copy_path, debian_directory)
+
+        self._CreateOriginalSourcePackage(
+            source_filename, source_helper_object.project_name,
+            project_version)
+
+        if not self._BuildPrepare(
+            source_directory, project_name, project_version,
+            self.version_suffix, distribution, self.architecture):
+          break
+
+        if not self._BuildSourceDPKGPackage(source_directory):
+          break
+
+        if not self._BuildFinalize(
+            source_directory, project_name, project_version,
+            self.version_suffix, distribution, self.architecture):
+          break
+
+        built_distributions.append(distribution)
+
+    finally:
+      if packaging_files_copy_path:
+        shutil.rmtree(os.path.dirname(packaging_files_copy_path))
+
+    return built_distributions
+
   def _CheckIsInstalled(self, package_name):
     """Checks if a package is installed.
 
@@ -173,7 +289,7 @@ class DPKGBuildHelper(interface.BuildHelper):
           source_filename, deb_orig_source_filename)
     else:
       # TODO: add fix psutil package name.
-      shutil.copy(source_filename, deb_orig_source_filename)
+      source_store.LinkOrCopyFile(source_filename, deb_orig_source_filename)
 
   def _CreateOriginalSourcePackageFromZip(
       self, source_filename, orig_source_filename):
@@ -224,18 +340,19 @@ class DPKGBuildHelper(interface.BuildHelper):
     if not os.path.exists(dpkg_directory):
       dpkg_directory = os.path.join(source_directory, 'config', 'dpkg')
 
-    if os.path.exists(dpkg_directory):
-      shutil.copytree(dpkg_directory, debian_directory)
+    with tracing.StartSpan('generate'):
+      if os.path.exists(dpkg_directory):
+        shutil.copytree(dpkg_directory, debian_directory)
 
-    else:
-      os.chdir(source_directory)
+      else:
+        os.chdir(source_directory)
 
-      build_files_generator = dpkg_files.DPKGBuildFilesGenerator(
-          source_helper_object.project_name, project_version,
-          self._project_definition, self._data_path)
-      build_files_generator.GenerateFiles('debian')
+        build_files_generator = dpkg_files.DPKGBuildFilesGenerator(
+            source_helper_object.project_name, project_version,
+            self._project_definition, self._data_path)
+        build_files_generator.GenerateFiles('debian')
 
-      os.chdir('..')
+        os.chdir('..')
 
     if not os.path.exists(debian_directory):
       logging.error('Missing debian sub directory in: {0:s}'.format(
@@ -259,22 +376,22 @@ class DPKGBuildHelper(interface.BuildHelper):
     # project[-_]*version-[1-9]_architecture.*
     filenames_glob = '{0:s}[-_]*-[1-9]_{1:s}.*'.format(
         project_name, self.architecture)
-    filenames = glob.glob(filenames_glob)
+    filenames = artifact_catalog.Glob(filenames_glob)
 
     for filename in filenames:
       if not filenames_to_ignore.match(filename):
         logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+        artifact_catalog.RemoveFile(filename)
 
     # Remove files of previous versions in the format:
     # project[-_]*version-[1-9].*
     filenames_glob = '{0:s}[-_]*-[1-9].*'.format(project_name)
-    filenames = glob.glob(filenames_glob)
+    filenames = artifact_catalog.Glob(filenames_glob)
 
     for filename in filenames:
       if not filenames_to_ignore.match(filename):
         logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+        artifact_catalog.RemoveFile(filename)
 
   def _RemoveOlderOriginalSourcePackage(
       self, project_name, project_version, version_suffix=None,
@@ -304,12 +421,12 @@ class DPKGBuildHelper(interface.BuildHelper):
     else:
       filenames_glob = '{0:s}_*.orig.tar.gz'.format(project_name)
 
-    filenames = glob.glob(filenames_glob)
+    filenames = artifact_catalog.Glob(filenames_glob)
 
     for filename in filenames:
       if not filenames_to_ignore.match(filename):
         logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+        artifact_catalog.RemoveFile(filename)
 
   def _RemoveOlderSourceDPKGPackages(self, project_name, project_version):
     """Removes previous versions of source dpkg packages.
@@ -326,23 +443,23 @@ class DPKGBuildHelper(interface.BuildHelper):
     # project[-_]version-[1-9]suffix~distribution_architecture.*
     filenames_glob = '{0:s}[-_]*-[1-9]{1:s}~{2:s}_{3:s}.*'.format(
         project_name, self.version_suffix, self.distribution, self.architecture)
-    filenames = glob.glob(filenames_glob)
+    filenames = artifact_catalog.Glob(filenames_glob)
 
     for filename in filenames:
       if not filenames_to_ignore.match(filename):
         logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+        artifact_catalog.RemoveFile(filename)
 
     # Remove files of previous versions in the format:
     # project[-_]*version-[1-9]suffix~distribution.*
     filenames_glob = '{0:s}[-_]*-[1-9]{1:s}~{2:s}.*'.format(
         project_name, self.version_suffix, self.distribution)
-    filenames = glob.glob(filenames_glob)
+    filenames = artifact_catalog.Glob(filenames_glob)
 
     for filename in filenames:
       if not filenames_to_ignore.match(filename):
         logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+        artifact_catalog.RemoveFile(filename)
 
   def CheckBuildDependencies(self):
     """Checks if the build dependencies are met.
@@ -435,11 +552,13 @@ class ConfigureMakeDPKGBuildHelper(DPKGBuildHelper):
         self.version_suffix, self.distribution, self.architecture):
       return False
 
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', self.log_filename)
     command = 'dpkg-buildpackage -uc -us -rfakeroot > {0:s} 2>&1'.format(
         log_file_path)
-    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-        source_directory, command), shell=True)
+    with tracing.StartSpan('build'):
+      exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
+          source_directory, command), shell=True,
+          env=self._GetBuildEnvironmentVariables())
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
       return False
@@ -451,35 +570,36 @@ class ConfigureMakeDPKGBuildHelper(DPKGBuildHelper):
 
     return True
 
-  def CheckBuildRequired(self, source_helper_object):
-    """Checks if a build is required.
+  def Clean(self, source_helper_object):
+    """Cleans the dpkg packages in the current directory.
 
     Args:
       source_helper_object (SourceHelper): source helper.
-
-    Returns:
-      bool: True if a build is required, False otherwise.
     """
     project_version = source_helper_object.GetProjectVersion()
 
-    deb_filename = '{0:s}_{1!s}-1_{2:s}.deb'.format(
-        source_helper_object.project_name, project_version, self.architecture)
+    self._RemoveOlderOriginalSourcePackage(
+        source_helper_object.project_name, project_version)
 
-    return not os.path.exists(deb_filename)
+    self._RemoveOlderDPKGPackages(
+        source_helper_object.project_name, project_version)
 
-  def Clean(self, source_helper_object):
-    """Cleans the dpkg packages in the current directory.
+  def GetOutputFilenames(self, source_helper_object):
+    """Retrieves the names of the files produced by the build.
 
     Args:
       source_helper_object (SourceHelper): source helper.
+
+    Returns:
+      list[str]: paths of the files produced by the build, relative to
+          the build directory.
     """
     project_version = source_helper_object.GetProjectVersion()
 
-    self._RemoveOlderOriginalSourcePackage(
-        source_helper_object.project_name, project_version)
+    deb_filename = '{0:s}_{1!s}-1_{2:s}.deb'.format(
+        source_helper_object.project_name, project_version, self.architecture)
 
-    self._RemoveOlderDPKGPackages(
-        source_helper_object.project_name, project_version)
+    return [deb_filename]
 
 
 class ConfigureMakeSourceDPKGBuildHelper(DPKGBuildHelper):
@@ -509,73 +629,25 @@ class ConfigureMakeSourceDPKGBuildHelper(DPKGBuildHelper):
     Returns:
       bool: True if successful, False otherwise.
     """
-    source_filename = source_helper_object.Download()
-    if not source_filename:
-      logging.info('Download of: {0:s} failed'.format(
-          source_helper_object.project_name))
-      return False
-
-    project_version = source_helper_object.GetProjectVersion()
-
-    self._CreateOriginalSourcePackage(
-        source_filename, source_helper_object.project_name, project_version)
-
-    source_directory = source_helper_object.Create()
-    if not source_directory:
-      logging.error(
-          'Extraction of source package: {0:s} failed'.format(source_filename))
-      return False
-
-    logging.info('Building source deb of: {0:s}'.format(source_filename))
-
-    if not self._CreatePackagingFiles(
-        source_helper_object, source_directory, project_version):
-      return False
-
-    # If there is a temporary packaging directory remove it.
-    temporary_directory = os.path.join(source_directory, 'tmp')
-    if os.path.exists(temporary_directory):
-      logging.info('Removing: {0:s}'.format(temporary_directory))
-      shutil.rmtree(temporary_directory)
-
-    if not self._BuildPrepare(
-        source_directory, source_helper_object.project_name, project_version,
-        self.version_suffix, self.distribution, self.architecture):
-      return False
-
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
-    command = 'debuild -S -sa > {0:s} 2>&1'.format(log_file_path)
-    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-        source_directory, command), shell=True)
-    if exit_code != 0:
-      logging.error(
-          'Failed to run: "(cd {0:s} && {1:s}" with exit code {2:d}.'.format(
-              source_directory, command, exit_code))
-      return False
-
-    if not self._BuildFinalize(
-        source_directory, source_helper_object.project_name, project_version,
-        self.version_suffix, self.distribution, self.architecture):
-      return False
-
-    return True
+    return bool(self.BuildDistributions(
+        source_helper_object, [self.distribution]))
 
-  def CheckBuildRequired(self, source_helper_object):
-    """Checks if a build is required.
+  def BuildDistributions(self, source_helper_object, distributions):
+    """Builds the source dpkg packages of multiple distributions.
 
     Args:
       source_helper_object (SourceHelper): source helper.
+      distributions (list[str]): names of the distributions.
 
     Returns:
-      bool: True if a build is required, False otherwise.
+      list[str]: names of the distributions for which the source dpkg
+          packages were built.
     """
     project_version = source_helper_object.GetProjectVersion()
 
-    changes_filename = '{0:s}_{1!s}-1{2:s}~{3:s}_{4:s}.changes'.format(
-        source_helper_object.project_name, project_version,
-        self.version_suffix, self.distribution, self.architecture)
-
-    return not os.path.exists(changes_filename)
+    return self._BuildSourceDPKGPackages(
+        source_helper_object, source_helper_object.project_name,
+        project_version, distributions)
 
   def Clean(self, source_helper_object):
     """Cleans the source dpkg packages in the current directory.
@@ -591,6 +663,24 @@ class ConfigureMakeSourceDPKGBuildHelper(DPKGBuildHelper):
     self._RemoveOlderSourceDPKGPackages(
         source_helper_object.project_name, project_version)
 
+  def GetOutputFilenames(self, source_helper_object):
+    """Retrieves the names of the files produced by the build.
+
+    Args:
+      source_helper_object (SourceHelper): source helper.
+
+    Returns:
+      list[str]: paths of the files produced by the build, relative to
+          the build directory.
+    """
+    project_version = source_helper_object.GetProjectVersion()
+
+    changes_filename = '{0:s}_{1!s}-1{2:s}~{3:s}_{4:s}.changes'.format(
+        source_helper_object.project_name, project_version,
+        self.version_suffix, self.distribution, self.architecture)
+
+    return [changes_filename]
+
 
 class SetupPyDPKGBuildHelper(DPKGBuildHelper):
   """Helper to build dpkg packages (.deb)."""
@@ -687,11 +777,12 @@ class SetupPyDPKGBuildHelper(DPKGBuildHelper):
         self.distribution, self.architecture):
       return False
 
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', self.log_filename)
     command = 'dpkg-buildpackage -uc -us -rfakeroot > {0:s} 2>&1'.format(
         log_file_path)
-    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-        source_directory, command), shell=True)
+    with tracing.StartSpan('build'):
+      exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
+          source_directory, command), shell=True)
     if exit_code != 0:
       logging.error(
           'Failed to run: "(cd {0:s} && {1:s}" with exit code {2:d}.'.format(
@@ -705,23 +796,6 @@ class SetupPyDPKGBuildHelper(DPKGBuildHelper):
 
     return True
 
-  def CheckBuildRequired(self, source_helper_object):
-    """Checks if a build is required.
-
-    Args:
-      source_helper_object (SourceHelper): source helper.
-
-    Returns:
-      bool: True if a build is required, False otherwise.
-    """
-    project_name, project_version = self._GetFilenameSafeProjectInformation(
-        source_helper_object)
-
-    deb_filename = '{0:s}_{1!s}-1_{2:s}.deb'.format(
-        project_name, project_version, self.architecture)
-
-    return not os.path.exists(deb_filename)
-
   def Clean(self, source_helper_object):
     """Cleans the dpkg packages in the current directory.
 
@@ -741,6 +815,24 @@ class SetupPyDPKGBuildHelper(DPKGBuildHelper):
 
       self._RemoveOlderDPKGPackages(project_name, project_version)
 
+  def GetOutputFilenames(self, source_helper_object):
+    """Retrieves the names of the files produced by the build.
+
+    Args:
+      source_helper_object (SourceHelper): source helper.
+
+    Returns:
+      list[str]: paths of the files produced by the build, relative to
+          the build directory.
+    """
+    project_name, project_version = self._GetFilenameSafeProjectInformation(
+        source_helper_object)
+
+    deb_filename = '{0:s}_{1!s}-1_{2:s}.deb'.format(
+        project_name, project_version, self.architecture)
+
+    return [deb_filename]
+
 
 class SetupPySourceDPKGBuildHelper(DPKGBuildHelper):
   """Helper to build source dpkg packages (.deb)."""
@@ -795,74 +887,25 @@ class SetupPySourceDPKGBuildHelper(DPKGBuildHelper):
     Returns:
       bool: True if successful, False otherwise.
     """
-    source_filename = source_helper_object.Download()
-    if not source_filename:
-      logging.info('Download of: {0:s} failed'.format(
-          source_helper_object.project_name))
-      return False
+    return bool(self.BuildDistributions(
+        source_helper_object, [self.distribution]))
 
-    project_name, project_version = self._GetFilenameSafeProjectInformation(
-        source_helper_object)
-
-    self._CreateOriginalSourcePackage(
-        source_filename, source_helper_object.project_name, project_version)
-
-    source_directory = source_helper_object.Create()
-    if not source_directory:
-      logging.error(
-          'Extraction of source package: {0:s} failed'.format(source_filename))
-      return False
-
-    logging.info('Building source deb of: {0:s}'.format(source_filename))
-
-    if not self._CreatePackagingFiles(
-        source_helper_object, source_directory, project_version):
-      return False
-
-    # If there is a temporary packaging directory remove it.
-    temporary_directory = os.path.join(source_directory, 'tmp')
-    if os.path.exists(temporary_directory):
-      logging.info('Removing: {0:s}'.format(temporary_directory))
-      shutil.rmtree(temporary_directory)
-
-    if not self._BuildPrepare(
-        source_directory, project_name, project_version, self.version_suffix,
-        self.distribution, self.architecture):
-      return False
-
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
-    command = 'debuild -S -sa > {0:s} 2>&1'.format(log_file_path)
-    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-        source_directory, command), shell=True)
-    if exit_code != 0:
-      logging.error(
-          'Failed to run: "(cd {0:s} && {1:s}" with exit code {2:d}.'.format(
-              source_directory, command, exit_code))
-
-    if not self._BuildFinalize(
-        source_directory, project_name, project_version, self.version_suffix,
-        self.distribution, self.architecture):
-      return False
-
-    return True
-
-  def CheckBuildRequired(self, source_helper_object):
-    """Checks if a build is required.
+  def BuildDistributions(self, source_helper_object, distributions):
+    """Builds the source dpkg packages of multiple distributions.
 
     Args:
       source_helper_object (SourceHelper): source helper.
+      distributions (list[str]): names of the distributions.
 
     Returns:
-      bool: True if a build is required, False otherwise.
+      list[str]: names of the distributions for which the source dpkg
+          packages were built.
     """
     project_name, project_version = self._GetFilenameSafeProjectInformation(
         source_helper_object)
 
-    changes_filename = '{0:s}_{1!s}-1{2:s}~{3:s}_{4:s}.changes'.format(
-        project_name, project_version, self.version_suffix, self.distribution,
-        self.architecture)
-
-    return not os.path.exists(changes_filename)
+    return self._BuildSourceDPKGPackages(
+        source_helper_object, project_name, project_version, distributions)
 
   def Clean(self, source_helper_object):
     """Cleans the dpkg packages in the current directory.
@@ -878,3 +921,22 @@ class SetupPySourceDPKGBuildHelper(DPKGBuildHelper):
 
     self._RemoveOlderSourceDPKGPackages(
         source_helper_object.project_name, project_version)
+
+  def GetOutputFilenames(self, source_helper_object):
+    """Retrieves the names of the files produced by the build.
+
+    Args:
+      source_helper_object (SourceHelper): source helper.
+
+    Returns:
+      list[str]: paths of the files produced by the build, relative to
+          the build directory.
+    """
+    project_name, project_version = self._GetFilenameSafeProjectInformation(
+        source_helper_object)
+
+    changes_filename = '{0:s}_{1!s}-1{2:s}~{3:s}_{4:s}.changes'.format(
+        project_name, project_version, self.version_suffix, self.distribution,
+        self.architecture)
+
+    return [changes_filename]
@@ -7,7 +7,14 @@ import os
 
 
 class BuildHelper(object):
-  """Helper to build projects from source."""
+  """Helper to build projects from source.
+
+  Attributes:
+    build_environment (BuildEnvironment): environment of the compiler and
+        make commands or None to use the environment of the process.
+    log_filename (str): name of the build log file, which is specific to
+        the project so that projects can be build concurrently.
+  """
 
   LOG_FILENAME = 'build.log'
 
@@ -22,6 +29,23 @@ class BuildHelper(object):
     self._data_path = os.path.join(l2tdevtools_path, 'data')
     self._project_definition = project_definition
 
+    self.build_environment = None
+    self.log_filename = '{0:s}_{1:s}'.format(
+        project_definition.name, self.LOG_FILENAME)
+
+  def _GetBuildEnvironmentVariables(self):
+    """Retrieves the environment variables of the compiler and make commands.
+
+    Returns:
+      dict[str, str]: environment variables or None to use the environment
+          of the process.
+    """
+    if not self.build_environment:
+      return None
+
+    return self.build_environment.GetEnvironmentVariables(
+        project_definition=self._project_definition)
+
   def _IsPython2Only(self):
     """Determines if the project only supports Python version 2.
 
@@ -44,13 +68,35 @@ class BuildHelper(object):
       build_dependencies = []
     return list(build_dependencies)
 
-  def CheckBuildRequired(self, unused_source_helper_object):
+  def CheckBuildRequired(self, source_helper_object):
     """Checks if a build is required.
 
+    A build is required if one of the files produced by the build is missing.
+
     Args:
       source_helper_object (SourceHelper): source helper.
 
     Returns:
       bool: True if a build is required, False otherwise.
     """
-    return True
+    output_filenames = self.GetOutputFilenames(source_helper_object)
+    if not output_filenames:
+      return True
+
+    for output_filename in output_filenames:
+      if not os.path.exists(output_filename):
+        return True
+
+    return False
+
+  def GetOutputFilenames(self, unused_source_helper_object):
+    """Retrieves the names of the files produced by the build.
+
+    Args:
+      source_helper_object (SourceHelper): source helper.
+
+    Returns:
+      list[str]: paths of the files produced by the build, relative to
+          the build directory, or an empty list if not known.
+    """
+    return []
@@ -14,6 +14,7 @@ import shutil
 import subprocess
 import sys
 
+from l2tdevtools import artifact_catalog
 from l2tdevtools import source_helper
 from l2tdevtools.build_helpers import interface
 from l2tdevtools.download_helpers import zlib
@@ -550,23 +551,6 @@ class ConfigureMakeMSIBuildHelper(MSIBuildHelper):
 
     return result
 
-  def CheckBuildRequired(self, source_helper_object):
-    """Checks if a build is required.
-
-    Args:
-      source_helper_object (SourceHelper): source helper.
-
-    Returns:
-      bool: True if a build is required, False otherwise.
-    """
-    project_version = source_helper_object.GetProjectVersion()
-
-    msi_filename = '{0:s}-python-{1!s}.1.{2:s}-{3:s}.msi'.format(
-        source_helper_object.project_name, project_version, self.architecture,
-        self._python_version_suffix)
-
-    return not os.path.exists(msi_filename)
-
   def Clean(self, source_helper_object):
     """Cleans the build and dist directory.
 
@@ -584,12 +568,12 @@ class ConfigureMakeMSIBuildHelper(MSIBuildHelper):
     filenames_glob = 'py{0:s}-*.1.{1:s}-{2:s}.msi'.format(
         source_helper_object.project_name[3:], self.architecture,
         self._python_version_suffix)
-    filenames = glob.glob(filenames_glob)
+    filenames = artifact_catalog.Glob(filenames_glob)
 
     for filename in filenames:
       if not filenames_to_ignore.match(filename):
         logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+        artifact_catalog.RemoveFile(filename)
 
     filenames_to_ignore = '{0:s}-python-.*{1!s}.1.{2:s}-{3:s}.msi'.format(
         source_helper_object.project_name, project_version, self.architecture,
@@ -599,12 +583,30 @@ class ConfigureMakeMSIBuildHelper(MSIBuildHelper):
     filenames_glob = '{0:s}-python-*.1.{1:s}-{2:s}.msi'.format(
         source_helper_object.project_name, self.architecture,
         self._python_version_suffix)
-    filenames = glob.glob(filenames_glob)
+    filenames = artifact_catalog.Glob(filenames_glob)
 
     for filename in filenames:
       if not filenames_to_ignore.match(filename):
         logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+        artifact_catalog.RemoveFile(filename)
+
+  def GetOutputFilenames(self, source_helper_object):
+    """Retrieves the names of the files produced by the build.
+
+    Args:
+      source_helper_object (SourceHelper): source helper.
+
+    Returns:
+      list[str]: paths of the files produced by the build, relative to
+          the build directory.
+    """
+    project_version = source_helper_object.GetProjectVersion()
+
+    msi_filename = '{0:s}-python-{1!s}.1.{2:s}-{3:s}.msi'.format(
+        source_helper_object.project_name, project_version, self.architecture,
+        self._python_version_suffix)
+
+    return [msi_filename]
 
 
 class SetupPyMSIBuildHelper(MSIBuildHelper):
@@ -684,7 +686,7 @@ class SetupPyMSIBuildHelper(MSIBuildHelper):
           'include', 'stdint.h')
       os.environ['CL'] = '-FI"{0:s}"'.format(include_path)
 
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', self.log_filename)
     command = '\"{0:s}\" setup.py bdist_msi > {1:s} 2>&1'.format(
         sys.executable, log_file_path)
     exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
@@ -727,22 +729,23 @@ class SetupPyMSIBuildHelper(MSIBuildHelper):
         missing_packages.append(package_name)
     return missing_packages
 
-  def CheckBuildRequired(self, source_helper_object):
-    """Checks if a build is required.
+  def Clean(self, source_helper_object):
+    """Cleans the build and dist directory.
 
     Args:
       source_helper_object (SourceHelper): source helper.
-
-    Returns:
-      bool: True if a build is required, False otherwise.
     """
+    # Remove previous versions build directories.
+    for filename in ('build', 'dist'):
+      if os.path.exists(filename):
+        logging.info('Removing: {0:s}'.format(filename))
+        shutil.rmtree(filename, True)
+
+    # Remove previous versions of MSIs.
     project_name, project_version = self._GetFilenameSafeProjectInformation(
         source_helper_object)
 
-    # TODO: it looks like coverage is no architecture dependent on Windows.
-    # Check if it is architecture dependent on other platforms.
-    if (self._project_definition.architecture_dependent and
-        project_name != 'coverage'):
+    if self._project_definition.architecture_dependent:
       suffix = '-{0:s}'.format(self._python_version_suffix)
     else:
       suffix = ''
@@ -751,38 +754,46 @@ class SetupPyMSIBuildHelper(MSIBuildHelper):
     if '.' not in project_version:
       project_version = '{0!s}.1'.format(project_version)
 
-    # MSI does not support a 4 digit version, e.g. '1.2.3.4' therefore
-    # we remove the last digit.
+    # MSI does not support a 4 digit version, e.g. '1.2.3.4' there we remove
+    # the last digit.
     elif len(project_version.split('.')) == 4:
       project_version, _, _ = project_version.rpartition('.')
 
-    # MSI does not support a version containing a '-', e.g. '1.2.3-4'
-    # therefore we remove the digit after the '-'.
+    # MSI does not support a version containing a '-', e.g. '1.2.3-4' there
+    # we remove the digit after the '-'.
     elif '-' in project_version:
       project_version, _, _ = project_version.rpartition('-')
 
-    msi_filename = '{0:s}-{1:s}.{2:s}{3:s}.msi'.format(
+    filenames_to_ignore = '{0:s}-.*{1!s}.{2:s}{3:s}.msi'.format(
         project_name, project_version, self.architecture, suffix)
+    filenames_to_ignore = re.compile(filenames_to_ignore)
 
-    return not os.path.exists(msi_filename)
+    filenames_glob = '{0:s}-*.{1:s}{2:s}.msi'.format(
+        project_name, self.architecture, suffix)
+    filenames = artifact_catalog.Glob(filenames_glob)
 
-  def Clean(self, source_helper_object):
-    """Cleans the build and dist directory.
+    for filename in filenames:
+      if not filenames_to_ignore.match(filename):
+        logging.info('Removing: {0:s}'.format(filename))
+        artifact_catalog.RemoveFile(filename)
+
+  def GetOutputFilenames(self, source_helper_object):
+    """Retrieves the names of the files produced by the build.
 
     Args:
       source_helper_object (SourceHelper): source helper.
-    """
-    # Remove previous versions build directories.
-    for filename in ('build', 'dist'):
-      if os.path.exists(filename):
-        logging.info('Removing: {0:s}'.format(filename))
-        shutil.rmtree(filename, True)
 
-    # Remove previous versions of MSIs.
+    Returns:
+      list[str]: paths of the files produced by the build, relative to
+          the build directory.
+    """
     project_name, project_version = self._GetFilenameSafeProjectInformation(
         source_helper_object)
 
-    if self._project_definition.architecture_dependent:
+    # TODO: it looks like coverage is no architecture dependent on Windows.
+    # Check if it is architecture dependent on other platforms.
+    if (self._project_definition.architecture_dependent and
+        project_name != 'coverage'):
       suffix = '-{0:s}'.format(self._python_version_suffix)
     else:
       suffix = ''
@@ -791,25 +802,17 @@ class SetupPyMSIBuildHelper(MSIBuildHelper):
     if '.' not in project_version:
       project_version = '{0!s}.1'.format(project_version)
 
-    # MSI does not support a 4 digit version, e.g. '1.2.3.4' there we remove
-    # the last digit.
+    # MSI does not support a 4 digit version, e.g. '1.2.3.4' therefore
+    # we remove the last digit.
     elif len(project_version.split('.')) == 4:
       project_version, _, _ = project_version.rpartition('.')
 
-    # MSI does not support a version containing a '-', e.g. '1.2.3-4' there
-    # we remove the digit after the '-'.
+    # MSI does not support a version containing a '-', e.g. '1.2.3-4'
+    # therefore we remove the digit after the '-'.
     elif '-' in project_version:
       project_version, _, _ = project_version.rpartition('-')
 
-    filenames_to_ignore = '{0:s}-.*{1!s}.{2:s}{3:s}.msi'.format(
+    msi_filename = '{0:s}-{1:s}.{2:s}{3:s}.msi'.format(
         project_name, project_version, self.architecture, suffix)
-    filenames_to_ignore = re.compile(filenames_to_ignore)
 
-    filenames_glob = '{0:s}-*.{1:s}{2:s}.msi'.format(
-        project_name, self.architecture, suffix)
-    filenames = glob.glob(filenames_glob)
-
-    for filename in filenames:
-      if not filenames_to_ignore.match(filename):
-        logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+    return [msi_filename]
@@ -8,10 +8,10 @@ import logging
 import os
 import re
 import shlex
-import shutil
 import subprocess
 
 from l2tdevtools.build_helpers import interface
+from l2tdevtools import source_store
 from l2tdevtools import spec_file
 
 
@@ -95,7 +95,7 @@ class OSCBuildHelper(interface.BuildHelper):
     Returns:
       bool: True if successful, False otherwise.
     """
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', self.log_filename)
     command = 'osc -q add {0:s} >> {1:s} 2>&1'.format(path, log_file_path)
     exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
         self._OSC_PROJECT, command), shell=True)
@@ -112,7 +112,7 @@ class OSCBuildHelper(interface.BuildHelper):
       bool: True if successful, False otherwise.
     """
     command = 'osc -q checkout {0:s} >> {1:s} 2>&1 '.format(
-        self._OSC_PROJECT, self.LOG_FILENAME)
+        self._OSC_PROJECT, self.log_filename)
     exit_code = subprocess.call(command, shell=True)
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
@@ -131,7 +131,7 @@ class OSCBuildHelper(interface.BuildHelper):
     """
     # Running osc commit from the package sub directory is more efficient.
     osc_project_path = os.path.join(self._OSC_PROJECT, package_name)
-    log_file_path = os.path.join('..', '..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', '..', self.log_filename)
     command = 'osc -q commit -n >> {0:s} 2>&1'.format(log_file_path)
     exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
         osc_project_path, command), shell=True)
@@ -176,7 +176,7 @@ class OSCBuildHelper(interface.BuildHelper):
     Returns:
       bool: True if successful, False otherwise.
     """
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', self.log_filename)
     command = 'osc -q update >> {0:s} 2>&1'.format(log_file_path)
     exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
         self._OSC_PROJECT, command), shell=True)
@@ -264,7 +264,7 @@ class ConfigureMakeOSCBuildHelper(OSCBuildHelper):
 
     # Copy the source package to the package directory.
     osc_source_path = os.path.join(osc_package_path, osc_source_filename)
-    shutil.copy(source_filename, osc_source_path)
+    source_store.LinkOrCopyFile(source_filename, osc_source_path)
 
     osc_source_path = os.path.join(
         source_helper_object.project_name, osc_source_filename)
@@ -295,14 +295,15 @@ class ConfigureMakeOSCBuildHelper(OSCBuildHelper):
 
     return self._OSCCommit(source_helper_object.project_name)
 
-  def CheckBuildRequired(self, source_helper_object):
-    """Checks if a build is required.
+  def GetOutputFilenames(self, source_helper_object):
+    """Retrieves the names of the files produced by the build.
 
     Args:
       source_helper_object (SourceHelper): source helper.
 
     Returns:
-      bool: True if a build is required, False otherwise.
+      list[str]: paths of the files produced by the build, relative to
+          the build directory.
     """
     project_version = source_helper_object.GetProjectVersion()
 
@@ -313,7 +314,7 @@ class ConfigureMakeOSCBuildHelper(OSCBuildHelper):
         self._OSC_PROJECT, source_helper_object.project_name,
         osc_source_filename)
 
-    return not os.path.exists(osc_source_path)
+    return [osc_source_path]
 
 
 class SetupPyOSCBuildHelper(OSCBuildHelper):
@@ -371,7 +372,7 @@ class SetupPyOSCBuildHelper(OSCBuildHelper):
     osc_source_path = os.path.join(osc_package_path, source_filename)
     if not os.path.exists(osc_source_path):
       # Copy the source package to the package directory if needed.
-      shutil.copy(source_filename, osc_source_path)
+      source_store.LinkOrCopyFile(source_filename, osc_source_path)
 
       osc_source_path = os.path.join(
           source_helper_object.project_name, source_filename)
@@ -386,7 +387,7 @@ class SetupPyOSCBuildHelper(OSCBuildHelper):
 
     spec_file_generator = spec_file.RPMSpecFileGenerator(self._data_path)
 
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', self.log_filename)
     if not spec_file_generator.GenerateWithSetupPy(
         source_directory, log_file_path):
       return False
@@ -420,14 +421,15 @@ class SetupPyOSCBuildHelper(OSCBuildHelper):
 
     return self._OSCCommit(source_helper_object.project_name)
 
-  def CheckBuildRequired(self, source_helper_object):
-    """Checks if a build is required.
+  def GetOutputFilenames(self, source_helper_object):
+    """Retrieves the names of the files produced by the build.
 
     Args:
       source_helper_object (SourceHelper): source helper.
 
     Returns:
-      bool: True if a build is required, False otherwise.
+      list[str]: paths of the files produced by the build, relative to
+          the build directory.
     """
     project_version = source_helper_object.GetProjectVersion()
 
@@ -438,4 +440,4 @@ class SetupPyOSCBuildHelper(OSCBuildHelper):
         self._OSC_PROJECT, source_helper_object.project_name,
         osc_source_filename)
 
-    return not os.path.exists(osc_source_path)
+    return [osc_source_path]
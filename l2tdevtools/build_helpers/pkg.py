@@ -10,6 +10,7 @@ import re
 import shutil
 import subprocess
 
+from l2tdevtools import artifact_catalog
 from l2tdevtools.build_helpers import interface
 
 
@@ -83,22 +84,6 @@ class PKGBuildHelper(interface.BuildHelper):
     # TODO: implement build dependency check.
     return []
 
-  def CheckBuildRequired(self, source_helper_object):
-    """Checks if a build is required.
-
-    Args:
-      source_helper_object (SourceHelper): source helper.
-
-    Returns:
-      bool: True if a build is required, False otherwise.
-    """
-    project_version = source_helper_object.GetProjectVersion()
-
-    dmg_filename = '{0:s}-{1!s}.dmg'.format(
-        source_helper_object.project_name, project_version)
-
-    return not os.path.exists(dmg_filename)
-
   def Clean(self, source_helper_object):
     """Cleans the MacOS-X packages in the current directory.
 
@@ -114,22 +99,39 @@ class PKGBuildHelper(interface.BuildHelper):
     # Remove files of previous versions in the format:
     # project-*version.dmg
     filenames_glob = '{0:s}-*.dmg'.format(source_helper_object.project_name)
-    filenames = glob.glob(filenames_glob)
+    filenames = artifact_catalog.Glob(filenames_glob)
 
     for filename in filenames:
       if not filenames_to_ignore.match(filename):
         logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+        artifact_catalog.RemoveFile(filename)
 
     # Remove files of previous versions in the format:
     # project-*version.pkg
     filenames_glob = '{0:s}-*.pkg'.format(source_helper_object.project_name)
-    filenames = glob.glob(filenames_glob)
+    filenames = artifact_catalog.Glob(filenames_glob)
 
     for filename in filenames:
       if not filenames_to_ignore.match(filename):
         logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+        artifact_catalog.RemoveFile(filename)
+
+  def GetOutputFilenames(self, source_helper_object):
+    """Retrieves the names of the files produced by the build.
+
+    Args:
+      source_helper_object (SourceHelper): source helper.
+
+    Returns:
+      list[str]: paths of the files produced by the build, relative to
+          the build directory.
+    """
+    project_version = source_helper_object.GetProjectVersion()
+
+    dmg_filename = '{0:s}-{1!s}.dmg'.format(
+        source_helper_object.project_name, project_version)
+
+    return [dmg_filename]
 
 
 class ConfigureMakePKGBuildHelper(PKGBuildHelper):
@@ -183,7 +185,7 @@ class ConfigureMakePKGBuildHelper(PKGBuildHelper):
         source_helper_object.project_name, project_version)
     pkg_filename = '{0:s}-{1!s}.pkg'.format(
         source_helper_object.project_name, project_version)
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', self.log_filename)
 
     sdks_path = os.path.join(
         '/', 'Applications', 'Xcode.app', 'Contents', 'Developer',
@@ -204,6 +206,8 @@ class ConfigureMakePKGBuildHelper(PKGBuildHelper):
       ldflags = ''
 
     if not os.path.exists(pkg_filename):
+      environment = self._GetBuildEnvironmentVariables()
+
       prefix = '/usr/local'
       configure_options = ''
       if self._project_definition.pkg_configure_options:
@@ -225,14 +229,14 @@ class ConfigureMakePKGBuildHelper(PKGBuildHelper):
                 prefix, configure_options, log_file_path)
 
       exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-          source_directory, command), shell=True)
+          source_directory, command), shell=True, env=environment)
       if exit_code != 0:
         logging.error('Running: "{0:s}" failed.'.format(command))
         return False
 
       command = 'make >> {0:s} 2>&1'.format(log_file_path)
       exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-          source_directory, command), shell=True)
+          source_directory, command), shell=True, env=environment)
       if exit_code != 0:
         logging.error('Running: "{0:s}" failed.'.format(command))
         return False
@@ -240,7 +244,7 @@ class ConfigureMakePKGBuildHelper(PKGBuildHelper):
       command = 'make install DESTDIR={0:s}/tmp >> {1:s} 2>&1'.format(
           os.path.abspath(source_directory), log_file_path)
       exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-          source_directory, command), shell=True)
+          source_directory, command), shell=True, env=environment)
       if exit_code != 0:
         logging.error('Running: "{0:s}" failed.'.format(command))
         return False
@@ -312,7 +316,7 @@ class SetupPyPKGBuildHelper(PKGBuildHelper):
         source_helper_object.project_name, project_version)
     pkg_filename = '{0:s}-{1!s}.pkg'.format(
         source_helper_object.project_name, project_version)
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', self.log_filename)
 
     if not os.path.exists(pkg_filename):
       command = 'python setup.py build > {0:s} 2>&1'.format(log_file_path)
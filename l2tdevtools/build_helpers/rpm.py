@@ -11,9 +11,12 @@ import re
 import shutil
 import subprocess
 
+from l2tdevtools import artifact_catalog
 from l2tdevtools.build_helpers import interface
 from l2tdevtools import py2to3
+from l2tdevtools import source_store
 from l2tdevtools import spec_file
+from l2tdevtools import tracing
 
 
 class BaseRPMBuildHelper(interface.BuildHelper):
@@ -86,12 +89,17 @@ class BaseRPMBuildHelper(interface.BuildHelper):
     """
     spec_filename = os.path.join('SPECS', spec_filename)
 
+    # Keep the log file in the current directory instead of the rpmbuild
+    # directory, which is shared between projects.
+    log_file_path = os.path.abspath(self.log_filename)
+
     current_path = os.getcwd()
     os.chdir(self.rpmbuild_path)
 
     command = 'rpmbuild {0:s} {1:s} > {2:s} 2>&1'.format(
-        rpmbuild_flags, spec_filename, self.LOG_FILENAME)
-    exit_code = subprocess.call(command, shell=True)
+        rpmbuild_flags, spec_filename, log_file_path)
+    with tracing.StartSpan('build'):
+      exit_code = subprocess.call(command, shell=True)
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
 
@@ -113,8 +121,10 @@ class BaseRPMBuildHelper(interface.BuildHelper):
       bool: True if successful, False otherwise.
     """
     command = 'rpmbuild {0:s} {1:s} > {2:s} 2>&1'.format(
-        rpmbuild_flags, source_package_filename, self.LOG_FILENAME)
-    exit_code = subprocess.call(command, shell=True)
+        rpmbuild_flags, source_package_filename, self.log_filename)
+    with tracing.StartSpan('build'):
+      exit_code = subprocess.call(
+          command, shell=True, env=self._GetBuildEnvironmentVariables())
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
       return False
@@ -135,7 +145,7 @@ class BaseRPMBuildHelper(interface.BuildHelper):
     return exit_code == 0
 
   def _CopySourcePackageToRPMBuildSources(self, source_package_filename):
-    """Copies the source package to the rpmbuild SOURCES directory.
+    """Links or copies the source package to the rpmbuild SOURCES directory.
 
     Args:
       source_package_filename (str): name of the source package file.
@@ -146,7 +156,8 @@ class BaseRPMBuildHelper(interface.BuildHelper):
     if not os.path.exists(rpm_source_package_path):
       self._CreateRPMbuildDirectories()
 
-      shutil.copy(source_package_filename, rpm_source_package_path)
+      source_store.LinkOrCopyFile(
+          source_package_filename, rpm_source_package_path)
 
   def _CreateRPMbuildDirectories(self):
     """Creates the rpmbuild and sub directories."""
@@ -317,30 +328,31 @@ class RPMBuildHelper(BaseRPMBuildHelper):
 
     rpm_filenames_glob = '*{0:s}-*-1.{1:s}.rpm'.format(
         project_name, self.architecture)
-    filenames = glob.glob(rpm_filenames_glob)
+    filenames = artifact_catalog.Glob(rpm_filenames_glob)
 
     for filename in filenames:
       if not filenames_to_ignore.match(filename):
         logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+        artifact_catalog.RemoveFile(filename)
 
     filenames_glob = os.path.join(
         self.rpmbuild_path, 'RPMS', self.architecture, rpm_filenames_glob)
-    filenames = glob.glob(filenames_glob)
+    filenames = artifact_catalog.Glob(filenames_glob)
 
     for filename in filenames:
       if not filenames_to_ignore.match(filename):
         logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+        artifact_catalog.RemoveFile(filename)
 
-  def CheckBuildRequired(self, source_helper_object):
-    """Checks if a build is required.
+  def GetOutputFilenames(self, source_helper_object):
+    """Retrieves the names of the files produced by the build.
 
     Args:
       source_helper_object (SourceHelper): source helper.
 
     Returns:
-      bool: True if a build is required, False otherwise.
+      list[str]: paths of the files produced by the build, relative to
+          the build directory.
     """
     project_name, project_version = self._GetFilenameSafeProjectInformation(
         source_helper_object)
@@ -348,7 +360,7 @@ class RPMBuildHelper(BaseRPMBuildHelper):
     rpm_filename = '{0:s}-{1!s}-1.{2:s}.rpm'.format(
         project_name, project_version, self.architecture)
 
-    return not os.path.exists(rpm_filename)
+    return [rpm_filename]
 
 
 class ConfigureMakeRPMBuildHelper(RPMBuildHelper):
@@ -459,9 +471,11 @@ class SetupPyRPMBuildHelper(RPMBuildHelper):
 
     spec_file_generator = spec_file.RPMSpecFileGenerator(self._data_path)
 
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
-    if not spec_file_generator.GenerateWithSetupPy(
-        source_directory, log_file_path):
+    log_file_path = os.path.join('..', self.log_filename)
+    with tracing.StartSpan('generate'):
+      result = spec_file_generator.GenerateWithSetupPy(
+          source_directory, log_file_path)
+    if not result:
       return None
 
     if project_name.startswith('python-'):
@@ -590,49 +604,50 @@ class SRPMBuildHelper(BaseRPMBuildHelper):
     filenames_to_ignore = re.compile(filenames_to_ignore)
 
     src_rpm_filenames_glob = '{0:s}-*-1.src.rpm'.format(project_name)
-    filenames = glob.glob(src_rpm_filenames_glob)
+    filenames = artifact_catalog.Glob(src_rpm_filenames_glob)
 
     for filename in filenames:
       if not filenames_to_ignore.match(filename):
         logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+        artifact_catalog.RemoveFile(filename)
 
     filenames_glob = os.path.join(
         self.rpmbuild_path, 'SRPMS', src_rpm_filenames_glob)
-    filenames = glob.glob(filenames_glob)
+    filenames = artifact_catalog.Glob(filenames_glob)
 
     for filename in filenames:
       if not filenames_to_ignore.match(filename):
         logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+        artifact_catalog.RemoveFile(filename)
 
-  def CheckBuildRequired(self, source_helper_object):
-    """Checks if a build is required.
+  def Clean(self, source_helper_object):
+    """Cleans the rpmbuild directory.
 
     Args:
       source_helper_object (SourceHelper): source helper.
-
-    Returns:
-      bool: True if a build is required, False otherwise.
     """
     project_name, project_version = self._GetFilenameSafeProjectInformation(
         source_helper_object)
 
-    srpm_filename = '{0:s}-{1!s}-1.src.rpm'.format(
-        project_name, project_version)
+    self._RemoveOlderSourceRPMs(project_name, project_version)
 
-    return not os.path.exists(srpm_filename)
-
-  def Clean(self, source_helper_object):
-    """Cleans the rpmbuild directory.
+  def GetOutputFilenames(self, source_helper_object):
+    """Retrieves the names of the files produced by the build.
 
     Args:
       source_helper_object (SourceHelper): source helper.
+
+    Returns:
+      list[str]: paths of the files produced by the build, relative to
+          the build directory.
     """
     project_name, project_version = self._GetFilenameSafeProjectInformation(
         source_helper_object)
 
-    self._RemoveOlderSourceRPMs(project_name, project_version)
+    srpm_filename = '{0:s}-{1!s}-1.src.rpm'.format(
+        project_name, project_version)
+
+    return [srpm_filename]
 
 
 class ConfigureMakeSRPMBuildHelper(SRPMBuildHelper):
@@ -715,9 +730,11 @@ class SetupPySRPMBuildHelper(SRPMBuildHelper):
 
     spec_file_generator = spec_file.RPMSpecFileGenerator(self._data_path)
 
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
-    if not spec_file_generator.GenerateWithSetupPy(
-        source_directory, log_file_path):
+    log_file_path = os.path.join('..', self.log_filename)
+    with tracing.StartSpan('generate'):
+      result = spec_file_generator.GenerateWithSetupPy(
+          source_directory, log_file_path)
+    if not result:
       return None
 
     if project_name.startswith('python-'):
@@ -9,6 +9,7 @@ import subprocess
 import sys
 
 from l2tdevtools.build_helpers import interface
+from l2tdevtools import tracing
 
 
 class SourceBuildHelper(interface.BuildHelper):
@@ -45,17 +46,21 @@ class ConfigureMakeSourceBuildHelper(SourceBuildHelper):
       # TODO: add self._ApplyPatches
       pass
 
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
+    environment = self._GetBuildEnvironmentVariables()
+
+    log_file_path = os.path.join('..', self.log_filename)
     command = './configure > {0:s} 2>&1'.format(log_file_path)
-    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-        source_directory, command), shell=True)
+    with tracing.StartSpan('build'):
+      exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
+          source_directory, command), shell=True, env=environment)
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
       return False
 
     command = 'make >> {0:s} 2>&1'.format(log_file_path)
-    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-        source_directory, command), shell=True)
+    with tracing.StartSpan('build'):
+      exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
+          source_directory, command), shell=True, env=environment)
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
       return False
@@ -102,11 +107,12 @@ class SetupPySourceBuildHelper(SourceBuildHelper):
       # TODO: add self._ApplyPatches
       pass
 
-    log_file_path = os.path.join('..', self.LOG_FILENAME)
+    log_file_path = os.path.join('..', self.log_filename)
     command = '{0:s} setup.py build > {1:s} 2>&1'.format(
         sys.executable, log_file_path)
-    exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
-        source_directory, command), shell=True)
+    with tracing.StartSpan('build'):
+      exit_code = subprocess.call('(cd {0:s} && {1:s})'.format(
+          source_directory, command), shell=True)
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
       return False
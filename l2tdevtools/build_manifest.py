@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+"""Build manifest that tracks the fingerprints of the inputs of builds."""
+
+from __future__ import unicode_literals
+
+import hashlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+
+import l2tdevtools
+
+from l2tdevtools import dpkg_files
+from l2tdevtools import projects
+from l2tdevtools import spec_file
+
+
+class BuildFingerprint(object):
+  """Fingerprint of the inputs of a build.
+
+  Attributes:
+    inputs (dict[str, str]): digests of the inputs of the build per name.
+  """
+
+  def __init__(self, inputs=None):
+    """Initializes a build fingerprint.
+
+    Args:
+      inputs (Optional[dict[str, str]]): digests of the inputs of the build
+          per name.
+    """
+    super(BuildFingerprint, self).__init__()
+    self.inputs = inputs or {}
+
+  def GetChangedInputs(self, other):
+    """Determines the inputs that differ from another fingerprint.
+
+    Args:
+      other (BuildFingerprint): other fingerprint.
+
+    Returns:
+      list[str]: names of the inputs that were added, changed or removed.
+    """
+    names = set(self.inputs.keys()).union(set(other.inputs.keys()))
+    return sorted([
+        name for name in names
+        if self.inputs.get(name, None) != other.inputs.get(name, None)])
+
+
+class BuildFingerprinter(object):
+  """Determines the fingerprints of the inputs of builds.
+
+  The inputs of a build are:
+  * the source package;
+  * the fields of the project definition;
+  * the dpkg and rpm template files and patch files used by the project;
+  * the code that generates the build files;
+  * the build target, distribution and architecture.
+  """
+
+  _READ_BUFFER_SIZE = 64 * 1024
+
+  _TEMPLATE_ATTRIBUTES = {
+      'dpkg_template_control': 'dpkg_templates',
+      'dpkg_template_install_python2': 'dpkg_templates',
+      'dpkg_template_install_python3': 'dpkg_templates',
+      'dpkg_template_rules': 'dpkg_templates',
+      'rpm_template_spec': 'rpm_templates'}
+
+  def __init__(self, l2tdevtools_path):
+    """Initializes a build fingerprinter.
+
+    Args:
+      l2tdevtools_path (str): path to the l2tdevtools directory.
+    """
+    super(BuildFingerprinter, self).__init__()
+    self._data_path = os.path.join(l2tdevtools_path, 'data')
+    self._file_digests = {}
+
+  def _CalculateFileDigest(self, path):
+    """Calculates the SHA-256 digest of a file.
+
+    The digests are cached since the same files are used by multiple builds.
+
+    Args:
+      path (str): path of the file.
+
+    Returns:
+      str: SHA-256 digest in hexadecimal representation or None if the file
+          does not exist.
+    """
+    path = os.path.abspath(path)
+    if path not in self._file_digests:
+      if not os.path.isfile(path):
+        return None
+
+      hash_context = hashlib.sha256()
+      with open(path, 'rb') as file_object:
+        data = file_object.read(self._READ_BUFFER_SIZE)
+        while data:
+          hash_context.update(data)
+          data = file_object.read(self._READ_BUFFER_SIZE)
+
+      self._file_digests[path] = hash_context.hexdigest()
+
+    return self._file_digests[path]
+
+  def _CalculateValueDigest(self, value):
+    """Calculates the SHA-256 digest of a value.
+
+    Args:
+      value (object): JSON serializable value.
+
+    Returns:
+      str: SHA-256 digest in hexadecimal representation.
+    """
+    data = json.dumps(value, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+  def _GetModulePath(self, module_name):
+    """Retrieves the path of the source file of a module.
+
+    Args:
+      module_name (str): name of the module.
+
+    Returns:
+      str: path of the source file of the module or None if not available.
+    """
+    module = sys.modules.get(module_name, None)
+    path = getattr(module, '__file__', None)
+    if path and path.endswith('.pyc'):
+      path = path[:-1]
+    return path
+
+  def _GetProjectDefinitionValues(self, project_definition):
+    """Retrieves the values of the fields of a project definition.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+
+    Returns:
+      dict[str, object]: JSON serializable values per field name.
+    """
+    values = {}
+    for name, value in vars(project_definition).items():
+      if isinstance(value, projects.ProjectVersionDefinition):
+        value = getattr(value, 'version_string', None)
+      elif value is not None and not isinstance(
+          value, (bool, int, list, dict, type(''))):
+        value = '{0!s}'.format(value)
+
+      values[name] = value
+
+    return values
+
+  def GetFingerprint(
+      self, project_definition, build_helper_object, source_filename,
+      build_target):
+    """Determines the fingerprint of a build.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+      build_helper_object (BuildHelper): build helper.
+      source_filename (str): name of the source package file.
+      build_target (str): build target.
+
+    Returns:
+      BuildFingerprint: fingerprint of the build.
+    """
+    inputs = {
+        'project definition': self._CalculateValueDigest(
+            self._GetProjectDefinitionValues(project_definition)),
+        'source package': self._CalculateFileDigest(source_filename),
+        'target': self._CalculateValueDigest([
+            build_target,
+            getattr(build_helper_object, 'architecture', None),
+            getattr(build_helper_object, 'distribution', None),
+            getattr(build_helper_object, 'version_suffix', None)])}
+
+    for attribute_name, directory_name in sorted(
+        self._TEMPLATE_ATTRIBUTES.items()):
+      template_filenames = getattr(project_definition, attribute_name, None)
+      if not template_filenames:
+        continue
+
+      if not isinstance(template_filenames, list):
+        template_filenames = [template_filenames]
+
+      for template_filename in template_filenames:
+        path = os.path.join(self._data_path, directory_name, template_filename)
+        inputs['template: {0:s}'.format(template_filename)] = (
+            self._CalculateFileDigest(path))
+
+    for patch_filename in project_definition.patches or []:
+      path = os.path.join(self._data_path, 'patches', patch_filename)
+      inputs['patch: {0:s}'.format(patch_filename)] = (
+          self._CalculateFileDigest(path))
+
+    generator_digests = [l2tdevtools.__version__]
+    for module_name in sorted(set([
+        build_helper_object.__class__.__module__, dpkg_files.__name__,
+        spec_file.__name__])):
+      path = self._GetModulePath(module_name)
+      generator_digests.append(path and self._CalculateFileDigest(path))
+
+    inputs['generator'] = self._CalculateValueDigest(generator_digests)
+
+    return BuildFingerprint(inputs=inputs)
+
+
+class BuildManifest(object):
+  """Build manifest that tracks the fingerprints of the inputs of builds.
+
+  The manifest is stored as a JSON file in the build directory. It is read
+  and written for every update so that builds in different processes do not
+  lose each other's updates.
+  """
+
+  FILENAME = 'build_manifest.json'
+
+  def __init__(self, path=None):
+    """Initializes a build manifest.
+
+    Args:
+      path (Optional[str]): path of the manifest file, where None represents
+          the manifest file in the current working directory.
+    """
+    super(BuildManifest, self).__init__()
+    self._path = path or self.FILENAME
+
+  def _GetKey(self, project_name, build_target, distribution):
+    """Retrieves the key of a build.
+
+    Args:
+      project_name (str): name of the project.
+      build_target (str): build target.
+      distribution (str): name of the distribution or None.
+
+    Returns:
+      str: key of the build.
+    """
+    return '{0:s}:{1:s}:{2:s}'.format(
+        build_target, distribution or '', project_name)
+
+  def _ReadEntries(self):
+    """Reads the entries of the manifest file.
+
+    Returns:
+      dict[str, dict[str, str]]: digests of the inputs per key.
+    """
+    if not os.path.exists(self._path):
+      return {}
+
+    try:
+      with io.open(self._path, 'r', encoding='utf-8') as file_object:
+        entries = json.load(file_object)
+
+    except (IOError, ValueError) as exception:
+      logging.warning(
+          'Unable to read build manifest: {0:s} with error: {1!s}'.format(
+              self._path, exception))
+      return {}
+
+    if not isinstance(entries, dict):
+      return {}
+
+    return entries
+
+  def GetFingerprint(self, project_name, build_target, distribution=None):
+    """Retrieves the fingerprint of the last successful build.
+
+    Args:
+      project_name (str): name of the project.
+      build_target (str): build target.
+      distribution (Optional[str]): name of the distribution.
+
+    Returns:
+      BuildFingerprint: fingerprint or None if the manifest does not contain
+          a fingerprint of the build.
+    """
+    key = self._GetKey(project_name, build_target, distribution)
+    inputs = self._ReadEntries().get(key, None)
+    if not isinstance(inputs, dict):
+      return None
+
+    return BuildFingerprint(inputs=inputs)
+
+  def SetFingerprint(
+      self, project_name, build_target, fingerprint, distribution=None):
+    """Sets the fingerprint of a successful build.
+
+    Args:
+      project_name (str): name of the project.
+      build_target (str): build target.
+      fingerprint (BuildFingerprint): fingerprint of the build.
+      distribution (Optional[str]): name of the distribution.
+
+    Returns:
+      bool: True if the manifest was updated or False on error.
+    """
+    entries = self._ReadEntries()
+
+    key = self._GetKey(project_name, build_target, distribution)
+    entries[key] = fingerprint.inputs
+
+    data = json.dumps(entries, indent=2, sort_keys=True).encode('utf-8')
+
+    directory = os.path.dirname(os.path.abspath(self._path))
+    try:
+      file_descriptor, temporary_path = tempfile.mkstemp(
+          dir=directory, prefix='.tmp')
+      with os.fdopen(file_descriptor, 'wb') as file_object:
+        file_object.write(data)
+
+      # os.rename() does not overwrite an existing file on Windows.
+      if os.name == 'nt' and os.path.exists(self._path):
+        os.remove(self._path)
+      os.rename(temporary_path, self._path)
+
+    except (IOError, OSError) as exception:
+      logging.warning(
+          'Unable to write build manifest: {0:s} with error: {1!s}'.format(
+              self._path, exception))
+      return False
+
+    return True
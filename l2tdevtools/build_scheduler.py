@@ -0,0 +1,502 @@
+# -*- coding: utf-8 -*-
+"""Scheduler for building multiple projects."""
+
+from __future__ import unicode_literals
+
+import logging
+import multiprocessing
+import os
+import time
+
+try:
+  from multiprocessing import SimpleQueue
+except ImportError:
+  from multiprocessing.queues import SimpleQueue
+
+
+# Queue used by a worker process to signal which project it started to build.
+_started_queue = None
+
+
+def _InitializeWorker(started_queue, initializer):
+  """Initializes a worker process.
+
+  Args:
+    started_queue (SimpleQueue): queue to signal the name of
+        the project a worker started to build and the worker process
+        identifier (PID).
+    initializer (function): function that is called when the worker process
+        is started or None if not set.
+  """
+  global _started_queue  # pylint: disable=global-statement
+  _started_queue = started_queue
+
+  if initializer:
+    initializer()
+
+
+def _RunBuildFunction(build_function, project_definition):
+  """Runs a build function in a worker process.
+
+  Args:
+    build_function (function): function to build a single project.
+    project_definition (ProjectDefinition): project definition.
+
+  Returns:
+    bool: True if the build is successful or False on error.
+  """
+  if _started_queue:
+    _started_queue.put((project_definition.name, os.getpid()))
+
+  try:
+    return bool(build_function(project_definition))
+
+  except Exception as exception:  # pylint: disable=broad-except
+    logging.error('Build of: {0:s} raised: {1!s}'.format(
+        project_definition.name, exception))
+    return False
+
+
+class ProjectDependencyGraph(object):
+  """Graph of the dependencies between projects.
+
+  The dependencies of a project are derived from its build_dependencies,
+  dpkg_build_dependencies, dpkg_dependencies and rpm_build_dependencies
+  values. These contain package names, such as "python-six", which are
+  mapped to the name of the project that provides the package. Only
+  dependencies on projects in the graph are tracked, dependencies on other
+  packages are assumed to be provided by the system.
+  """
+
+  _PACKAGE_NAME_PREFIXES = ('python-', 'python2-', 'python3-')
+
+  _PACKAGE_NAME_SUFFIXES = ('-dev', '-devel', '-python')
+
+  def __init__(self, project_definitions):
+    """Initializes a project dependency graph.
+
+    Args:
+      project_definitions (list[ProjectDefinition]): definitions of
+          the projects in the graph.
+    """
+    super(ProjectDependencyGraph, self).__init__()
+    self._dependencies = {}
+    self._dependents = {}
+    self._project_names = []
+
+    self._Build(project_definitions)
+
+  def _GetPackageNames(self, project_definition):
+    """Retrieves the names of the packages provided by a project.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+
+    Returns:
+      set[str]: lower case package names.
+    """
+    names = set([project_definition.name])
+    for name in (
+        project_definition.dpkg_name, project_definition.dpkg_source_name,
+        project_definition.msi_name, project_definition.rpm_name,
+        project_definition.setup_name):
+      if name:
+        names.add(name)
+
+    package_names = set()
+    for name in names:
+      name = name.lower()
+      package_names.add(name)
+
+      for prefix in self._PACKAGE_NAME_PREFIXES:
+        if name.startswith(prefix):
+          package_names.add(name[len(prefix):])
+        else:
+          package_names.add('{0:s}{1:s}'.format(prefix, name))
+
+    return package_names
+
+  def _GetDependencyNames(self, project_definition):
+    """Retrieves the names of the packages a project depends on.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+
+    Returns:
+      set[str]: lower case package names.
+    """
+    dependency_names = set()
+    for dependencies in (
+        project_definition.build_dependencies,
+        project_definition.dpkg_build_dependencies,
+        project_definition.dpkg_dependencies,
+        project_definition.rpm_build_dependencies):
+      for dependency in dependencies or []:
+        # Remove version requirements, for example "python-six (>= 1.1.0)".
+        dependency, _, _ = dependency.partition('(')
+        dependency = dependency.strip().lower()
+        if not dependency:
+          continue
+
+        dependency_names.add(dependency)
+        for suffix in self._PACKAGE_NAME_SUFFIXES:
+          if dependency.endswith(suffix):
+            dependency_names.add(dependency[:-len(suffix)])
+
+    return dependency_names
+
+  def _Build(self, project_definitions):
+    """Builds the graph.
+
+    Args:
+      project_definitions (list[ProjectDefinition]): definitions of
+          the projects in the graph.
+    """
+    projects_per_package_name = {}
+    for project_definition in project_definitions:
+      self._project_names.append(project_definition.name)
+      self._dependencies[project_definition.name] = set()
+      self._dependents[project_definition.name] = set()
+
+      for package_name in self._GetPackageNames(project_definition):
+        projects_per_package_name.setdefault(
+            package_name, project_definition.name)
+
+    for project_definition in project_definitions:
+      for dependency_name in self._GetDependencyNames(project_definition):
+        project_name = projects_per_package_name.get(dependency_name, None)
+        if not project_name or project_name == project_definition.name:
+          continue
+
+        self._dependencies[project_definition.name].add(project_name)
+        self._dependents[project_name].add(project_definition.name)
+
+  @property
+  def project_names(self):
+    """list[str]: names of the projects in the graph in definition order."""
+    return list(self._project_names)
+
+  def GetBuildOrder(self):
+    """Determines an order in which to build the projects.
+
+    Projects are ordered after the projects they depend on. Projects that
+    are part of a dependency cycle are ordered in definition order.
+
+    Returns:
+      list[str]: project names.
+    """
+    remaining_dependencies = {
+        name: set(dependencies)
+        for name, dependencies in self._dependencies.items()}
+
+    build_order = []
+    while remaining_dependencies:
+      ready_names = [
+          name for name in self._project_names
+          if name in remaining_dependencies and
+          not remaining_dependencies[name]]
+
+      if not ready_names:
+        ready_names = [
+            name for name in self._project_names
+            if name in remaining_dependencies][:1]
+        logging.warning(
+            'Dependency cycle detected, building: {0:s} first.'.format(
+                ready_names[0]))
+
+      for name in ready_names:
+        del remaining_dependencies[name]
+        build_order.append(name)
+
+        for dependent_name in self._dependents[name]:
+          if dependent_name in remaining_dependencies:
+            remaining_dependencies[dependent_name].discard(name)
+
+    return build_order
+
+  def GetDependencies(self, project_name):
+    """Retrieves the projects a project directly depends on.
+
+    Args:
+      project_name (str): name of the project.
+
+    Returns:
+      set[str]: project names.
+    """
+    return set(self._dependencies.get(project_name, []))
+
+  def GetDependents(self, project_name):
+    """Retrieves the projects that directly depend on a project.
+
+    Args:
+      project_name (str): name of the project.
+
+    Returns:
+      set[str]: project names.
+    """
+    return set(self._dependents.get(project_name, []))
+
+  def GetDownstreamProjects(self, project_name):
+    """Retrieves the projects that directly or indirectly depend on a project.
+
+    Args:
+      project_name (str): name of the project.
+
+    Returns:
+      set[str]: project names.
+    """
+    downstream_names = set()
+    names_to_check = [project_name]
+    while names_to_check:
+      name = names_to_check.pop()
+      for dependent_name in self._dependents.get(name, []):
+        if dependent_name not in downstream_names:
+          downstream_names.add(dependent_name)
+          names_to_check.append(dependent_name)
+
+    downstream_names.discard(project_name)
+    return downstream_names
+
+
+class BuildScheduler(object):
+  """Scheduler that builds projects in dependency order.
+
+  Projects are built as soon as the projects they depend on have been built.
+  Projects that depend directly or indirectly on a project that failed to
+  build are skipped.
+
+  Note that the build function is run in a separate process and therefore
+  must be a module level function, since Python 2 cannot pickle methods.
+
+  Attributes:
+    skipped_builds (list[str]): names of the projects that were skipped
+        during the last build, because a project they depend on failed
+        to build.
+  """
+
+  # Interval, in seconds, to poll for completed builds.
+  _POLL_INTERVAL = 0.1
+
+  def __init__(self, build_function, number_of_jobs=1, initializer=None):
+    """Initializes a build scheduler.
+
+    Args:
+      build_function (function): function to build a single project, which
+          takes a project definition as argument and returns a boolean that
+          indicates if the build was successful.
+      number_of_jobs (Optional[int]): maximum number of projects that are
+          build concurrently, where 1 represents building the projects
+          sequentially in the current process.
+      initializer (Optional[function]): function that is called when a
+          worker process is started, for example to configure logging.
+    """
+    super(BuildScheduler, self).__init__()
+    self._build_function = build_function
+    self._initializer = initializer
+    self._number_of_jobs = max(number_of_jobs or 1, 1)
+
+    self.skipped_builds = []
+
+  def _BuildSequentially(self, dependency_graph, project_definitions):
+    """Builds the projects sequentially in the current process.
+
+    Args:
+      dependency_graph (ProjectDependencyGraph): project dependency graph.
+      project_definitions (dict[str, ProjectDefinition]): definitions of
+          the projects to build per name.
+
+    Returns:
+      set[str]: names of the projects that failed to build.
+    """
+    failed_builds = set()
+    for project_name in dependency_graph.GetBuildOrder():
+      if project_name in self.skipped_builds:
+        continue
+
+      logging.info('Processing: {0:s}'.format(project_name))
+
+      if not self._build_function(project_definitions[project_name]):
+        failed_builds.add(project_name)
+        self._SkipDownstreamProjects(dependency_graph, project_name)
+
+    return failed_builds
+
+  def _BuildConcurrently(self, dependency_graph, project_definitions):
+    """Builds the projects concurrently using a pool of worker processes.
+
+    Args:
+      dependency_graph (ProjectDependencyGraph): project dependency graph.
+      project_definitions (dict[str, ProjectDefinition]): definitions of
+          the projects to build per name.
+
+    Returns:
+      set[str]: names of the projects that failed to build.
+    """
+    build_order = dependency_graph.GetBuildOrder()
+    remaining_dependencies = {
+        project_name: dependency_graph.GetDependencies(project_name)
+        for project_name in build_order}
+
+    async_results = {}
+    failed_builds = set()
+    worker_pids = {}
+
+    # A simple queue is used since it writes to the underlying pipe directly,
+    # hence the signal is not lost when the worker process is terminated.
+    started_queue = SimpleQueue()
+    pool = multiprocessing.Pool(
+        processes=self._number_of_jobs, initializer=_InitializeWorker,
+        initargs=(started_queue, self._initializer))
+
+    try:
+      while remaining_dependencies or async_results:
+        ready_names = [
+            project_name for project_name in build_order
+            if project_name in remaining_dependencies and
+            not remaining_dependencies[project_name]]
+
+        if not ready_names and not async_results:
+          # The remaining projects are part of a dependency cycle.
+          ready_names = [
+              project_name for project_name in build_order
+              if project_name in remaining_dependencies][:1]
+
+        for project_name in ready_names:
+          del remaining_dependencies[project_name]
+
+          logging.info('Scheduling: {0:s}'.format(project_name))
+
+          async_results[project_name] = pool.apply_async(
+              _RunBuildFunction,
+              (self._build_function, project_definitions[project_name]))
+
+        project_name, build_successful = self._WaitForCompletedBuild(
+            async_results, started_queue, worker_pids)
+
+        if not build_successful:
+          failed_builds.add(project_name)
+          for skipped_name in self._SkipDownstreamProjects(
+              dependency_graph, project_name):
+            remaining_dependencies.pop(skipped_name, None)
+
+        for dependent_name in dependency_graph.GetDependents(project_name):
+          if dependent_name in remaining_dependencies:
+            remaining_dependencies[dependent_name].discard(project_name)
+
+      pool.close()
+
+    finally:
+      pool.terminate()
+      pool.join()
+
+    return failed_builds
+
+  def _WaitForCompletedBuild(self, async_results, started_queue, worker_pids):
+    """Waits for the build of a project to complete.
+
+    A build is considered failed if its result raises an exception, for
+    example because the project definition could not be passed to the worker
+    process, or if the worker process building the project was terminated.
+
+    Args:
+      async_results (dict[str, multiprocessing.pool.AsyncResult]): results
+          of the running builds per project name. The result of the completed
+          build is removed.
+      started_queue (SimpleQueue): queue the worker processes use
+          to signal the name of the project they started to build and their
+          process identifier (PID).
+      worker_pids (dict[str, int]): worker process identifiers (PIDs) of
+          the running builds per project name.
+
+    Returns:
+      tuple[str, bool]: name of the project and True if the build is
+          successful.
+    """
+    while True:
+      for project_name, async_result in sorted(async_results.items()):
+        if not async_result.ready():
+          continue
+
+        del async_results[project_name]
+        worker_pids.pop(project_name, None)
+
+        try:
+          return project_name, bool(async_result.get(0))
+
+        except Exception as exception:  # pylint: disable=broad-except
+          logging.error('Build of: {0:s} raised: {1!s}'.format(
+              project_name, exception))
+          return project_name, False
+
+      while not started_queue.empty():
+        project_name, worker_pid = started_queue.get()
+        if project_name in async_results:
+          worker_pids[project_name] = worker_pid
+
+      active_pids = set([
+          process.pid for process in multiprocessing.active_children()])
+
+      for project_name, worker_pid in sorted(worker_pids.items()):
+        if worker_pid in active_pids or async_results[project_name].ready():
+          continue
+
+        logging.error(
+            'Build of: {0:s} failed because its worker process: {1:d} '
+            'was terminated.'.format(project_name, worker_pid))
+
+        del async_results[project_name]
+        del worker_pids[project_name]
+        return project_name, False
+
+      time.sleep(self._POLL_INTERVAL)
+
+  def _SkipDownstreamProjects(self, dependency_graph, project_name):
+    """Marks the projects downstream of a failed project as skipped.
+
+    Args:
+      dependency_graph (ProjectDependencyGraph): project dependency graph.
+      project_name (str): name of the project that failed to build.
+
+    Returns:
+      list[str]: names of the projects that were skipped.
+    """
+    skipped_names = []
+    for downstream_name in sorted(
+        dependency_graph.GetDownstreamProjects(project_name)):
+      if downstream_name not in self.skipped_builds:
+        logging.warning(
+            'Skipping: {0:s} because build of: {1:s} failed.'.format(
+                downstream_name, project_name))
+        self.skipped_builds.append(downstream_name)
+        skipped_names.append(downstream_name)
+
+    return skipped_names
+
+  def Build(self, project_definitions):
+    """Builds projects.
+
+    Args:
+      project_definitions (list[ProjectDefinition]): definitions of
+          the projects to build.
+
+    Returns:
+      list[str]: names of the projects that failed to build, in the order
+          of the project definitions.
+    """
+    self.skipped_builds = []
+
+    dependency_graph = ProjectDependencyGraph(project_definitions)
+    project_definitions_per_name = {
+        project_definition.name: project_definition
+        for project_definition in project_definitions}
+
+    if self._number_of_jobs == 1 or len(project_definitions) <= 1:
+      failed_builds = self._BuildSequentially(
+          dependency_graph, project_definitions_per_name)
+    else:
+      failed_builds = self._BuildConcurrently(
+          dependency_graph, project_definitions_per_name)
+
+    return [
+        project_definition.name for project_definition in project_definitions
+        if project_definition.name in failed_builds]
@@ -11,6 +11,8 @@ try:
 except ImportError:
   import configparser  # pylint: disable=import-error
 
+from l2tdevtools import versions
+
 
 class DependencyDefinition(object):
   """Dependency definition.
@@ -109,7 +111,6 @@ class DependencyHelper(object):
   """
 
   _VERSION_NUMBERS_REGEX = re.compile(r'[0-9.]+')
-  _VERSION_SPLIT_REGEX = re.compile(r'\.|\-')
 
   def __init__(self, configuration_file='dependencies.ini'):
     """Initializes a dependency helper.
@@ -195,48 +196,23 @@ class DependencyHelper(object):
     # Make sure the module version is a string.
     module_version = '{0!s}'.format(module_version)
 
-    # Split the version string and convert every digit into an integer.
-    # A string compare of both version strings will yield an incorrect result.
-
     # Strip any semantic suffixes such as a1, b1, pre, post, rc, dev.
     module_version = self._VERSION_NUMBERS_REGEX.findall(module_version)[0]
 
     if module_version[-1] == '.':
       module_version = module_version[:-1]
 
-    try:
-      module_version_map = list(
-          map(int, self._VERSION_SPLIT_REGEX.split(module_version)))
-    except ValueError:
-      status_message = 'unable to parse module version: {0:s} {1:s}'.format(
-          module_name, module_version)
-      return False, status_message
+    module_version_key = versions.GetVersionKey(module_version)
 
     if minimum_version:
-      try:
-        minimum_version_map = list(
-            map(int, self._VERSION_SPLIT_REGEX.split(minimum_version)))
-      except ValueError:
-        status_message = 'unable to parse minimum version: {0:s} {1:s}'.format(
-            module_name, minimum_version)
-        return False, status_message
-
-      if module_version_map < minimum_version_map:
+      if module_version_key < versions.GetVersionKey(minimum_version):
         status_message = (
             '{0:s} version: {1!s} is too old, {2!s} or later required').format(
                 module_name, module_version, minimum_version)
         return False, status_message
 
     if maximum_version:
-      try:
-        maximum_version_map = list(
-            map(int, self._VERSION_SPLIT_REGEX.split(maximum_version)))
-      except ValueError:
-        status_message = 'unable to parse maximum version: {0:s} {1:s}'.format(
-            module_name, maximum_version)
-        return False, status_message
-
-      if module_version_map > maximum_version_map:
+      if module_version_key > versions.GetVersionKey(maximum_version):
         status_message = (
             '{0:s} version: {1!s} is too recent, {2!s} or earlier '
             'required').format(module_name, module_version, maximum_version)
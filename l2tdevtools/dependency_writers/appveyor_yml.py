@@ -135,5 +135,4 @@ class AppveyorYmlWriter(interface.DependencyFileWriter):
     file_content = '\n'.join(file_content)
     file_content = file_content.encode('utf-8')
 
-    with open(self.PATH, 'wb') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
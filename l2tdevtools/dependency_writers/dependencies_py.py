@@ -45,5 +45,4 @@ class DependenciesPyWriter(interface.DependencyFileWriter):
 
     file_content = file_content.encode('utf-8')
 
-    with open(self.PATH, 'wb') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
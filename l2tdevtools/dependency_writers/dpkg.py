@@ -135,5 +135,4 @@ class DPKGControlWriter(interface.DependencyFileWriter):
 
     file_content = file_content.encode('utf-8')
 
-    with open(self.PATH, 'wb') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
@@ -4,7 +4,8 @@
 from __future__ import unicode_literals
 
 import abc
-import string
+
+from l2tdevtools import templates
 
 
 class DependencyFileWriter(object):
@@ -26,16 +27,21 @@ class DependencyFileWriter(object):
   def _ReadTemplateFile(self, filename):
     """Reads a template string from file.
 
+    The template is read once and shared by all the dependency file writers.
+
     Args:
       filename (str): name of the file containing the template string.
 
     Returns:
-      string.Template: template string.
-    """
-    with open(filename, 'rb') as file_object:
-      file_data = file_object.read()
+      Template: template.
 
-    return string.Template(file_data)
+    Raises:
+      IOError: if the template file cannot be read.
+      UnicodeDecodeError: if the template file cannot be decoded.
+      ValueError: if the template file does not contain a valid template.
+    """
+    return templates.TemplateRegistry.GetTemplate(
+        filename, style=templates.Template.STYLE_STRING)
 
   def _GenerateFromTemplate(self, template_filename, template_mappings):
     """Generates file context based on a template file.
@@ -51,16 +57,24 @@ class DependencyFileWriter(object):
     Raises:
       RuntimeError: if the template cannot be formatted.
     """
-    template_string = self._ReadTemplateFile(template_filename)
-
     try:
-      return template_string.substitute(template_mappings)
+      template = self._ReadTemplateFile(template_filename)
+      return template.Render(template_mappings)
 
     except (KeyError, ValueError) as exception:
       raise RuntimeError(
           'Unable to format template: {0:s} with error: {1!s}'.format(
               template_filename, exception))
 
+  def _WriteFile(self, path, file_content):
+    """Writes a file if its content differs from the file on disk.
+
+    Args:
+      path (str): path of the file.
+      file_content (bytes): content of the file.
+    """
+    templates.WriteFileIfChanged(path, file_content)
+
   @abc.abstractmethod
   def Write(self):
     """Writes the file or files produced by the file writer."""
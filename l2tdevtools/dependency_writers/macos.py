@@ -29,8 +29,7 @@ class MacOSInstallScriptWriter(interface.DependencyFileWriter):
 
     file_content = file_content.encode('utf-8')
 
-    with open(self.PATH, 'wb') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
 
 
 class MacOSMakeDistScriptWriter(interface.DependencyFileWriter):
@@ -54,8 +53,7 @@ class MacOSMakeDistScriptWriter(interface.DependencyFileWriter):
 
     file_content = file_content.encode('utf-8')
 
-    with open(self.PATH, 'wb') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
 
 
 class MacOSUninstallScriptWriter(interface.DependencyFileWriter):
@@ -79,5 +77,4 @@ class MacOSUninstallScriptWriter(interface.DependencyFileWriter):
 
     file_content = file_content.encode('utf-8')
 
-    with open(self.PATH, 'wb') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
@@ -61,8 +61,7 @@ class SetupCfgWriter(interface.DependencyFileWriter):
     file_content = file_content.format(**template_mappings)
     file_content = file_content.encode('utf-8')
 
-    with open(self.PATH, 'wb') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
 
 
 class SetupPyWriter(interface.DependencyFileWriter):
@@ -228,5 +227,4 @@ class SetupPyWriter(interface.DependencyFileWriter):
 
     file_content = file_content.encode('utf-8')
 
-    with open(self.PATH, 'wb') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
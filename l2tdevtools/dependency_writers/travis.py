@@ -62,8 +62,9 @@ class TravisInstallScriptWriter(interface.DependencyFileWriter):
     template_file = os.path.join(self._l2tdevtools_path, self._TEMPLATE_FILE)
     file_content = self._GenerateFromTemplate(template_file, template_mappings)
 
-    with open(self.PATH, 'wb') as file_object:
-      file_object.write(file_content)
+    file_content = file_content.encode('utf-8')
+
+    self._WriteFile(self.PATH, file_content)
 
 
 class TravisRunTestsScriptWriter(interface.DependencyFileWriter):
@@ -94,8 +95,7 @@ class TravisRunTestsScriptWriter(interface.DependencyFileWriter):
 
     file_content = file_content.encode('utf-8')
 
-    with open(self.PATH, 'wb') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
 
 
 class TravisRunWithTimeoutScriptWriter(interface.DependencyFileWriter):
@@ -114,5 +114,4 @@ class TravisRunWithTimeoutScriptWriter(interface.DependencyFileWriter):
 
     file_content = file_content.encode('utf-8')
 
-    with open(self.PATH, 'wb') as file_object:
-      file_object.write(file_content)
+    self._WriteFile(self.PATH, file_content)
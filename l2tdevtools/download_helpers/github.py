@@ -5,11 +5,48 @@ from __future__ import unicode_literals
 
 import re
 
+from l2tdevtools import versions
 from l2tdevtools.download_helpers import project
 
 
-class GitHubReleasesDownloadHelper(project.ProjectDownloadHelper):
-  """Helps in downloading a project with GitHub releases."""
+class GitHubRelease(object):
+  """Release of a project on GitHub.
+
+  Attributes:
+    download_path (str): path of the download URL of the source package,
+        relative to https://github.com.
+    is_archive (bool): True if the source package is an archive of the git
+        tag created by GitHub instead of an asset uploaded to the release.
+    has_project_prefix (bool): True if the name of the archive is prefixed
+        with the project name.
+    status (str): status of the release, such as "alpha", or None if not set.
+    tag (str): git tag of the release.
+    version (str): version of the release, without a "release-" or "v"
+        prefix.
+  """
+
+  def __init__(self):
+    """Initializes a GitHub release."""
+    super(GitHubRelease, self).__init__()
+    self.download_path = None
+    self.has_project_prefix = False
+    self.is_archive = False
+    self.status = None
+    self.tag = None
+    self.version = None
+
+
+class GitHubReleaseIndex(object):
+  """Index of the releases of a project on GitHub.
+
+  The releases pages of the repository are parsed once into release records,
+  which are used to determine the latest version and the download URLs. Older
+  releases are listed on subsequent pages, which are only downloaded when
+  a release is not found on the pages that were read so far.
+  """
+
+  # The maximum number of releases pages to read.
+  _MAXIMUM_NUMBER_OF_PAGES = 20
 
   _VERSION_EXPRESSIONS = [
       '[0-9]+',
@@ -20,6 +57,270 @@ class GitHubReleasesDownloadHelper(project.ProjectDownloadHelper):
       'v[0-9]+[.][0-9]+[.][0-9]+',
       '[0-9]+[.][0-9]+[.][0-9]+[-][0-9]+']
 
+  def __init__(self, download_helper, organization, repository, project_name):
+    """Initializes a GitHub release index.
+
+    Args:
+      download_helper (DownloadHelper): download helper used to download
+          the releases pages.
+      organization (str): name of the organization on GitHub.
+      repository (str): name of the repository on GitHub.
+      project_name (str): name of the project.
+    """
+    super(GitHubReleaseIndex, self).__init__()
+    self._download_helper = download_helper
+    self._download_paths = set()
+    self._next_page_url = 'https://github.com/{0:s}/{1:s}/releases'.format(
+        organization, repository)
+    self._number_of_pages = 0
+    self._project_name = project_name
+    self.releases = []
+
+    version_expression = '(?:{0:s})'.format(
+        '|'.join(self._VERSION_EXPRESSIONS))
+
+    # The format of the project download URL is:
+    # /{organization}/{repository}/releases/download/{git tag}/
+    # {project name}-{status-}{version}.tar.gz
+    # Note that the status is optional and will be: beta, alpha or experimental.
+    # E.g. used by libyal.
+    #
+    # The format of the project archive download URL is either:
+    # /{organization}/{repository}/archive/{version}.tar.gz
+    # /{organization}/{repository}/archive/{project name}-{version}.tar.gz
+    self._download_path_re = re.compile((
+        '/{0:s}/{1:s}/(?:releases/download/(?P<tag>[^/"]*)/(?P<asset>[^/"]+)|'
+        'archive/(?P<archive>[^/"]+))[.]tar[.]gz(?=[^.])').format(
+            re.escape(organization), re.escape(repository)))
+
+    self._asset_name_re = re.compile(
+        '^{0:s}-(?P<status>[a-z-]*?)(?P<version>{1:s})$'.format(
+            re.escape(project_name), version_expression))
+
+    self._archive_name_re = re.compile(
+        '^(?P<project_prefix>{0:s}-)?(?P<version>{1:s})$'.format(
+            re.escape(project_name), version_expression))
+
+    # The format of the URL of the next releases page is:
+    # /{organization}/{repository}/releases?after={git tag}
+    self._next_page_re = re.compile((
+        'href="((?:https://github[.]com)?/{0:s}/{1:s}/releases[?]after='
+        '[^"]+)"').format(re.escape(organization), re.escape(repository)))
+
+  def _CreateRelease(self, match):
+    """Creates a release from a download path match.
+
+    Args:
+      match (re.Match): download path match.
+
+    Returns:
+      GitHubRelease: release or None if the download path does not contain
+          a supported version of the project.
+    """
+    release = GitHubRelease()
+
+    asset_name = match.group('asset')
+    if asset_name:
+      name_match = self._asset_name_re.match(asset_name)
+      if not name_match:
+        return None
+
+      release.status = name_match.group('status').rstrip('-') or None
+      release.tag = match.group('tag')
+
+    else:
+      archive_name = match.group('archive')
+      name_match = self._archive_name_re.match(archive_name)
+      if not name_match:
+        return None
+
+      release.has_project_prefix = bool(name_match.group('project_prefix'))
+      release.is_archive = True
+      release.tag = archive_name
+
+    version = name_match.group('version')
+    if version.startswith('release-'):
+      version = version[8:]
+    elif version.startswith('v'):
+      version = version[1:]
+
+    release.download_path = match.group(0)
+    release.version = version
+
+    return release
+
+  def _ReadNextPage(self):
+    """Reads the next releases page into the index.
+
+    Returns:
+      bool: True if a page was read, False if there are no more pages.
+    """
+    if (not self._next_page_url or
+        self._number_of_pages >= self._MAXIMUM_NUMBER_OF_PAGES):
+      return False
+
+    page_content = self._download_helper.DownloadPageContent(
+        self._next_page_url)
+
+    self._next_page_url = None
+    self._number_of_pages += 1
+
+    if not page_content:
+      return False
+
+    for match in self._download_path_re.finditer(page_content):
+      download_path = match.group(0)
+      if download_path in self._download_paths:
+        continue
+
+      self._download_paths.add(download_path)
+
+      release = self._CreateRelease(match)
+      if release:
+        self.releases.append(release)
+
+    match = self._next_page_re.search(page_content)
+    if match:
+      next_page_url = match.group(1)
+      if next_page_url.startswith('/'):
+        next_page_url = 'https://github.com{0:s}'.format(next_page_url)
+      self._next_page_url = next_page_url
+
+    return True
+
+  def _GetPreferredReleases(self):
+    """Retrieves the releases of the preferred type of source package.
+
+    Release assets are preferred over archives and archives without project
+    name prefix over archives with.
+
+    Returns:
+      list[GitHubRelease]: releases.
+    """
+    assets = []
+    archives = []
+    prefixed_archives = []
+    for release in self.releases:
+      if not release.is_archive:
+        assets.append(release)
+      elif release.has_project_prefix:
+        prefixed_archives.append(release)
+      else:
+        archives.append(release)
+
+    return assets or archives or prefixed_archives
+
+  def _GetLatestRelease(self, earliest_version, latest_version):
+    """Retrieves the latest release within the version constraints.
+
+    Args:
+      earliest_version (list[str]): earliest version constraint, where the
+          first item is the comparison operator, or None.
+      latest_version (list[str]): latest version constraint, where the
+          first item is the comparison operator, or None.
+
+    Returns:
+      GitHubRelease: latest release or None if not available.
+    """
+    latest_release = None
+    latest_version_key = None
+    for release in self._GetPreferredReleases():
+      if not versions.IsVersionInRange(
+          release.version, earliest_version=earliest_version,
+          latest_version=latest_version):
+        continue
+
+      version_key = versions.GetVersionKey(release.version)
+      if not latest_release or version_key > latest_version_key:
+        latest_release = release
+        latest_version_key = version_key
+
+    return latest_release
+
+  def _GetReleaseByVersion(self, version):
+    """Retrieves the release of a specific version.
+
+    Args:
+      version (str): version of the project.
+
+    Returns:
+      GitHubRelease: release or None if not available or ambiguous.
+    """
+    assets = [
+        release for release in self.releases
+        if not release.is_archive and release.version == version]
+
+    if len(assets) > 1:
+      # Use the asset without status in case the project provides multiple
+      # assets with a different status.
+      assets = [release for release in assets if not release.status]
+      if len(assets) != 1:
+        return None
+
+    if assets:
+      return assets[0]
+
+    archives_per_tag = {
+        release.tag: release for release in self.releases
+        if release.is_archive and release.version == version}
+
+    for tag in (
+        version, 'release-{0:s}'.format(version), 'v{0:s}'.format(version),
+        '{0:s}-{1:s}'.format(self._project_name, version)):
+      if tag in archives_per_tag:
+        return archives_per_tag[tag]
+
+    return None
+
+  def GetLatestVersion(self, earliest_version=None, latest_version=None):
+    """Retrieves the latest version within the version constraints.
+
+    Args:
+      earliest_version (Optional[list[str]]): earliest version constraint,
+          where the first item is the comparison operator.
+      latest_version (Optional[list[str]]): latest version constraint,
+          where the first item is the comparison operator.
+
+    Returns:
+      str: latest version or None if not available.
+    """
+    if not self._number_of_pages:
+      self._ReadNextPage()
+
+    release = self._GetLatestRelease(earliest_version, latest_version)
+    while not release and self._ReadNextPage():
+      release = self._GetLatestRelease(earliest_version, latest_version)
+
+    if not release:
+      return None
+
+    return release.version
+
+  def GetDownloadURL(self, version):
+    """Retrieves the download URL of a specific version.
+
+    Args:
+      version (str): version of the project.
+
+    Returns:
+      str: download URL or None if not available.
+    """
+    if not self._number_of_pages:
+      self._ReadNextPage()
+
+    release = self._GetReleaseByVersion(version)
+    while not release and self._ReadNextPage():
+      release = self._GetReleaseByVersion(version)
+
+    if not release:
+      return None
+
+    return 'https://github.com{0:s}'.format(release.download_path)
+
+
+class GitHubReleasesDownloadHelper(project.ProjectDownloadHelper):
+  """Helps in downloading a project with GitHub releases."""
+
   def __init__(self, download_url):
     """Initializes the download helper.
 
@@ -35,8 +336,24 @@ class GitHubReleasesDownloadHelper(project.ProjectDownloadHelper):
 
     super(GitHubReleasesDownloadHelper, self).__init__(download_url)
     self._organization = url_segments[3]
+    self._release_indexes = {}
     self._repository = url_segments[4]
 
+  def _GetReleaseIndex(self, project_name):
+    """Retrieves the release index of a project.
+
+    Args:
+      project_name (str): name of the project.
+
+    Returns:
+      GitHubReleaseIndex: release index.
+    """
+    if project_name not in self._release_indexes:
+      self._release_indexes[project_name] = GitHubReleaseIndex(
+          self, self._organization, self._repository, project_name)
+
+    return self._release_indexes[project_name]
+
   def GetLatestVersion(self, project_name, version_definition):
     """Retrieves the latest version number for a given project name.
 
@@ -58,113 +375,9 @@ class GitHubReleasesDownloadHelper(project.ProjectDownloadHelper):
 
       latest_version = version_definition.GetLatestVersion()
 
-    download_url = 'https://github.com/{0:s}/{1:s}/releases'.format(
-        self._organization, self._repository)
-
-    page_content = self.DownloadPageContent(download_url)
-    if not page_content:
-      return None
-
-    # The format of the project download URL is:
-    # /{organization}/{repository}/releases/download/{git tag}/
-    # {project name}{status-}{version}.tar.gz
-    # Note that the status is optional and will be: beta, alpha or experimental.
-    # E.g. used by libyal.
-    expression_string = (
-        '/{0:s}/{1:s}/releases/download/[^/]*/{2:s}-[a-z-]*({3:s})'
-        '[.]tar[.]gz[^.]').format(
-            self._organization, self._repository, project_name,
-            '|'.join(self._VERSION_EXPRESSIONS))
-    matches = re.findall(expression_string, page_content)
-
-    if not matches:
-      # The format of the project archive download URL is:
-      # /{organization}/{repository}/archive/{version}.tar.gz
-      expression_string = (
-          '/{0:s}/{1:s}/archive/({2:s})[.]tar[.]gz[^.]').format(
-              self._organization, self._repository,
-              '|'.join(self._VERSION_EXPRESSIONS))
-      matches = re.findall(expression_string, page_content)
-
-    if not matches:
-      # The format of the project archive download URL is:
-      # /{organization}/{repository}/archive/{project name}-{version}.tar.gz
-      expression_string = (
-          '/{0:s}/{1:s}/archive/{2:s}[-]({3:s})[.]tar[.]gz[^.]').format(
-              self._organization, self._repository, project_name,
-              '|'.join(self._VERSION_EXPRESSIONS))
-      matches = re.findall(expression_string, page_content)
-
-      # TODO: this check will fail if the case in the URL is different.
-      # Make checks case insenstive.
-
-    if not matches:
-      return None
-
-    # Split the version string and convert every digit into an integer.
-    # A string compare of both version strings will yield an incorrect result.
-    comparable_matches = {}
-
-    for match in matches:
-      # Remove a leading 'release-'.
-      if match.startswith('release-'):
-        match = match[8:]
-      # Remove a leading 'v'.
-      elif match.startswith('v'):
-        match = match[1:]
-
-      # Some versions contain '-' as the release number separator for the split
-      # we want this to be '.'.
-      comparable_match = match.replace('-', '.')
-
-      # Convert the result of map() into a list for Python 3.
-      comparable_match = list(map(int, comparable_match.split('.')))
-      comparable_matches[match] = comparable_match
-
-    # Find the latest version number.
-    comparable_earliest_version = None
-    if earliest_version:
-      comparable_earliest_version = [
-          int(digit) for digit in earliest_version[1:]]
-
-    comparable_latest_version = None
-    if latest_version:
-      comparable_latest_version = [
-          int(digit) for digit in latest_version[1:]]
-
-    comparable_matching_versions = list(comparable_matches.values())
-
-    latest_match = None
-    for match in comparable_matching_versions:
-      if latest_match is None:
-        latest_match = match
-        continue
-
-      if earliest_version is not None:
-        if earliest_version[0] == '>' and match <= comparable_earliest_version:
-          continue
-
-        if earliest_version[0] == '>=' and match < comparable_earliest_version:
-          continue
-
-      if latest_version is not None:
-        if latest_version[0] == '<' and match >= comparable_latest_version:
-          continue
-
-        if latest_version[0] == '<=' and match > comparable_latest_version:
-          continue
-
-      if match > latest_match:
-        latest_match = match
-
-    # Map the latest match value to its index within the dictionary.
-    # Convert the result of dict.values() into a list for Python 3.
-    latest_match = comparable_matching_versions.index(latest_match)
-
-    # Return the original version string which is stored as the key in within
-    # the dictionary.
-    # Convert the result of dict.keys() into a list for Python 3.
-    return list(comparable_matches.keys())[latest_match]
+    release_index = self._GetReleaseIndex(project_name)
+    return release_index.GetLatestVersion(
+        earliest_version=earliest_version, latest_version=latest_version)
 
   def GetDownloadURL(self, project_name, project_version):
     """Retrieves the download URL for a given project name and version.
@@ -176,85 +389,8 @@ class GitHubReleasesDownloadHelper(project.ProjectDownloadHelper):
     Returns:
       str: download URL of the project or None if not available.
     """
-    # TODO: add support for URL arguments '?after=release-2.2.0'
-    download_url = 'https://github.com/{0:s}/{1:s}/releases'.format(
-        self._organization, self._repository)
-
-    page_content = self.DownloadPageContent(download_url)
-    if not page_content:
-      return None
-
-    # The format of the project download URL is:
-    # /{organization}/{repository}/releases/download/{git tag}/
-    # {project name}{status-}{version}.tar.gz
-    # Note that the status is optional and will be: beta, alpha or experimental.
-    expression_string = (
-        '/{0:s}/{1:s}/releases/download/[^/]*/{2:s}-[a-z-]*{3!s}'
-        '[.]tar[.]gz[^.]').format(
-            self._organization, self._repository, project_name, project_version)
-    matches = re.findall(expression_string, page_content)
-
-    if len(matches) != 1:
-      # Try finding a match without the status in case the project provides
-      # multiple versions with a different status.
-      expression_string = (
-          '/{0:s}/{1:s}/releases/download/[^/]*/{2:s}-*{3!s}'
-          '[.]tar[.]gz[^.]').format(
-              self._organization, self._repository, project_name,
-              project_version)
-      matches = re.findall(expression_string, page_content)
-
-    if matches and len(matches) == 1:
-      return 'https://github.com{0:s}'.format(matches[0][:-1])
-
-    if matches and len(matches) != 1:
-      return None
-
-    # The format of the project archive download URL is:
-    # /{organization}/{repository}/archive/{version}.tar.gz
-    expression_string = (
-        '/{0:s}/{1:s}/archive/{2!s}[.]tar[.]gz[^.]').format(
-            self._organization, self._repository, project_version)
-    matches = re.findall(expression_string, page_content)
-
-    if matches and len(matches) == 1:
-      return 'https://github.com{0:s}'.format(matches[0][:-1])
-
-    if len(matches) != 1:
-      # The format of the project archive download URL is:
-      # /{organization}/{repository}/archive/release-{version}.tar.gz
-      expression_string = (
-          '/{0:s}/{1:s}/archive/release-{2!s}[.]tar[.]gz[^.]').format(
-              self._organization, self._repository, project_version)
-      matches = re.findall(expression_string, page_content)
-
-    if matches and len(matches) == 1:
-      return 'https://github.com{0:s}'.format(matches[0][:-1])
-
-    if len(matches) != 1:
-      # The format of the project archive download URL is:
-      # /{organization}/{repository}/archive/v{version}.tar.gz
-      expression_string = (
-          '/{0:s}/{1:s}/archive/v{2!s}[.]tar[.]gz[^.]').format(
-              self._organization, self._repository, project_version)
-      matches = re.findall(expression_string, page_content)
-
-    if matches and len(matches) == 1:
-      return 'https://github.com{0:s}'.format(matches[0][:-1])
-
-    if len(matches) != 1:
-      # The format of the project archive download URL is:
-      # /{organization}/{repository}/archive/{project name}-{version}.tar.gz
-      expression_string = (
-          '/{0:s}/{1:s}/archive/{2:s}[-]{3!s}[.]tar[.]gz[^.]').format(
-              self._organization, self._repository, project_name,
-              project_version)
-      matches = re.findall(expression_string, page_content)
-
-    if matches and len(matches) == 1:
-      return 'https://github.com{0:s}'.format(matches[0][:-1])
-
-    return None
+    release_index = self._GetReleaseIndex(project_name)
+    return release_index.GetDownloadURL('{0!s}'.format(project_version))
 
   def GetProjectIdentifier(self):
     """Retrieves the project identifier for a given project name.
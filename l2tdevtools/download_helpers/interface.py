@@ -3,24 +3,27 @@
 
 from __future__ import unicode_literals
 
+import hashlib
+import io
 import logging
 import os
-import sys
+import time
 
-# pylint: disable=import-error,no-name-in-module
-if sys.version_info[0] < 3:
-  import urllib2 as urllib_error
-  import urllib2 as urllib_request
-else:
-  import urllib.error as urllib_error
-  import urllib.request as urllib_request
-
-from l2tdevtools import py2to3  # pylint: disable=wrong-import-position
+from l2tdevtools import http_client
+from l2tdevtools import page_cache as page_cache_lib
+from l2tdevtools import py2to3
+from l2tdevtools.lib import errors
 
 
 class DownloadHelper(object):
   """Helps in downloading files and web content."""
 
+  # The size of the chunks in which files are downloaded.
+  _DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+  # The page cache shared by all download helpers.
+  _page_cache = None
+
   def __init__(self, download_url):
     """Initializes a download helper.
 
@@ -32,13 +35,170 @@ class DownloadHelper(object):
     self._cached_page_content = b''
     self._download_url = download_url
 
-  def DownloadFile(self, download_url):
+  def _DownloadToPartialFile(self, download_url, partial_filename):
+    """Downloads a file from the URL to a partial file.
+
+    If the partial file already exists the download is resumed with a HTTP
+    range request. If the server does not support range requests the
+    download is restarted.
+
+    Args:
+      download_url (str): URL where to download the file.
+      partial_filename (str): name of the partial file.
+
+    Returns:
+      tuple[str, int]: SHA-256 digest of the data in the partial file and
+          its expected size, or (None, None) if not available. The expected
+          size is None if the server did not provide it.
+    """
+    offset = 0
+    if os.path.exists(partial_filename):
+      offset = os.path.getsize(partial_filename)
+
+    headers = {}
+    if offset:
+      headers['Range'] = 'bytes={0:d}-'.format(offset)
+
+    # The file is downloaded as stored on the server, hence the response
+    # must not be compressed.
+    try:
+      response = http_client.GetHTTPClient().Request(
+          download_url, decompress=False, headers=headers)
+
+    except errors.ConnectivityError as exception:
+      logging.warning(
+          'Unable to download URL: {0:s} with error: {1!s}'.format(
+              download_url, exception))
+      return None, None
+
+    if offset and response.code == 416:
+      # The range is not satisfiable, restart the download.
+      response.close()
+      os.remove(partial_filename)
+      return self._DownloadToPartialFile(download_url, partial_filename)
+
+    if response.code not in (200, 206):
+      response.close()
+      logging.warning(
+          'Unable to download URL: {0:s} with status code: {1:d}'.format(
+              download_url, response.code))
+      return None, None
+
+    hash_context = hashlib.sha256()
+
+    content_length = response.headers.get('Content-Length', None)
+    expected_size = None
+    if content_length and content_length.isdigit():
+      expected_size = int(content_length, 10)
+
+    if response.code == 206:
+      logging.info('Resuming download at offset: {0:d}'.format(offset))
+
+      # Hash the data that was downloaded previously.
+      with open(partial_filename, 'rb') as file_object:
+        data = file_object.read(self._DOWNLOAD_CHUNK_SIZE)
+        while data:
+          hash_context.update(data)
+          data = file_object.read(self._DOWNLOAD_CHUNK_SIZE)
+
+      if expected_size is not None:
+        expected_size += offset
+      file_mode = 'ab'
+
+    else:
+      file_mode = 'wb'
+
+    start_time = time.time()
+    number_of_bytes = 0
+
+    with open(partial_filename, file_mode) as file_object:
+      try:
+        data = response.read(self._DOWNLOAD_CHUNK_SIZE)
+        while data:
+          hash_context.update(data)
+          file_object.write(data)
+          number_of_bytes += len(data)
+          data = response.read(self._DOWNLOAD_CHUNK_SIZE)
+
+      except IOError as exception:
+        logging.warning((
+            'Download of URL: {0:s} interrupted after: {1:d} bytes with '
+            'error: {2!s}').format(download_url, number_of_bytes, exception))
+        return None, None
+
+      finally:
+        response.close()
+
+    duration = max(time.time() - start_time, 0.001)
+    logging.info((
+        'Downloaded: {0:d} bytes in {1:.1f} seconds ({2:.1f} KiB/s) from: '
+        '{3:s}').format(
+            number_of_bytes, duration, number_of_bytes / duration / 1024,
+            download_url))
+
+    return hash_context.hexdigest(), expected_size
+
+  def _ReadPage(self, download_url, response):
+    """Reads the page content of a response.
+
+    Args:
+      download_url (str): URL of the page.
+      response (HTTPResponse): response.
+
+    Returns:
+      bytes: page content or None if the response is not successful or
+          the page content cannot be read.
+    """
+    if response.code != 200:
+      response.close()
+      logging.warning(
+          'Unable to download URL: {0:s} with status code: {1:d}'.format(
+              download_url, response.code))
+      return None
+
+    try:
+      return response.read()
+
+    except IOError as exception:
+      logging.warning(
+          'Unable to download URL: {0:s} with error: {1!s}'.format(
+              download_url, exception))
+      return None
+
+  def _RequestPage(self, download_url, decompress=True, headers=None):
+    """Requests a page.
+
+    Args:
+      download_url (str): URL of the page.
+      decompress (Optional[bool]): True if the server can compress the page
+          content, which is decompressed transparently.
+      headers (Optional[dict[str, str]]): request headers.
+
+    Returns:
+      HTTPResponse: response or None if the request failed.
+    """
+    try:
+      return http_client.GetHTTPClient().Request(
+          download_url, decompress=decompress, headers=headers)
+
+    except errors.ConnectivityError as exception:
+      logging.warning(
+          'Unable to download URL: {0:s} with error: {1!s}'.format(
+              download_url, exception))
+      return None
+
+  def DownloadFile(self, download_url, expected_sha256=None):
     """Downloads a file from the URL and returns the filename.
 
-    The filename is extracted from the last part of the URL.
+    The filename is extracted from the last part of the URL. The file is
+    downloaded in chunks to a partial file, which is renamed to the filename
+    once the download is complete and verified. An interrupted download is
+    resumed the next time the file is downloaded.
 
     Args:
       download_url (str): URL where to download the file.
+      expected_sha256 (Optional[str]): expected SHA-256 digest of the file,
+          in hexadecimal representation, or None if not known.
 
     Returns:
       str: filename if successful also if the file was already downloaded
@@ -49,25 +209,80 @@ class DownloadHelper(object):
     if not os.path.exists(filename):
       logging.info('Downloading: {0:s}'.format(download_url))
 
-      try:
-        url_object = urllib_request.urlopen(download_url)
-      except urllib_error.URLError as exception:
-        logging.warning(
-            'Unable to download URL: {0:s} with error: {1!s}'.format(
-                download_url, exception))
+      partial_filename = '{0:s}.part'.format(filename)
+      sha256, expected_size = self._DownloadToPartialFile(
+          download_url, partial_filename)
+      if not sha256:
+        return None
+
+      size = os.path.getsize(partial_filename)
+      if expected_size is not None and size != expected_size:
+        logging.warning((
+            'Unable to download URL: {0:s} size: {1:d} does not match '
+            'expected size: {2:d}').format(download_url, size, expected_size))
+        if size > expected_size:
+          os.remove(partial_filename)
         return None
 
-      if url_object.code != 200:
-        logging.warning(
-            'Unable to download URL: {0:s} with status code: {1:d}'.format(
-                download_url, url_object.code))
+      if expected_sha256 and sha256 != expected_sha256.lower():
+        logging.warning((
+            'Unable to download URL: {0:s} SHA-256: {1:s} does not match '
+            'expected SHA-256: {2:s}').format(
+                download_url, sha256, expected_sha256))
+        os.remove(partial_filename)
         return None
 
-      with open(filename, 'wb') as file_object:
-        file_object.write(url_object.read())
+      os.rename(partial_filename, filename)
 
     return filename
 
+  def _DownloadPageContentWithCache(self, download_url):
+    """Downloads the page content from the URL using the page cache.
+
+    Args:
+      download_url (str): URL where to download the page content.
+
+    Returns:
+      bytes: page content if successful or None if not available.
+    """
+    cache_entry = self._page_cache.GetEntry(download_url)
+    if cache_entry and self._page_cache.IsFresh(cache_entry):
+      return cache_entry.page_content
+
+    if self._page_cache.offline:
+      logging.warning(
+          'Unable to download URL: {0:s} in offline mode.'.format(
+              download_url))
+      return None
+
+    headers = {}
+    if cache_entry:
+      if cache_entry.etag:
+        headers['If-None-Match'] = cache_entry.etag
+      if cache_entry.last_modified:
+        headers['If-Modified-Since'] = cache_entry.last_modified
+
+    response = self._RequestPage(download_url, headers=headers)
+    if not response:
+      return None
+
+    if cache_entry and response.code == 304:
+      self._page_cache.StoreEntry(cache_entry)
+      return cache_entry.page_content
+
+    page_content = self._ReadPage(download_url, response)
+    if page_content is None:
+      return None
+
+    cache_entry = page_cache_lib.PageCacheEntry(download_url)
+    cache_entry.etag = response.headers.get('ETag', None)
+    cache_entry.last_modified = response.headers.get('Last-Modified', None)
+    cache_entry.page_content = page_content
+
+    self._page_cache.StoreEntry(cache_entry)
+
+    return cache_entry.page_content
+
   def DownloadPageContent(self, download_url, encoding='utf-8'):
     """Downloads the page content from the URL and caches it.
 
@@ -83,18 +298,19 @@ class DownloadHelper(object):
       return None
 
     if self._cached_url != download_url:
-      try:
-        url_object = urllib_request.urlopen(download_url)
-      except urllib_error.URLError as exception:
-        logging.warning(
-            'Unable to download URL: {0:s} with error: {1!s}'.format(
-                download_url, exception))
-        return None
+      if self._page_cache:
+        page_content = self._DownloadPageContentWithCache(download_url)
+        if page_content is None:
+          return None
 
-      if url_object.code != 200:
-        return None
+      else:
+        response = self._RequestPage(download_url)
+        if not response:
+          return None
 
-      page_content = url_object.read()
+        page_content = self._ReadPage(download_url, response)
+        if page_content is None:
+          return None
 
       if encoding and isinstance(page_content, py2to3.BYTES_TYPE):
         page_content = page_content.decode(encoding)
@@ -103,3 +319,48 @@ class DownloadHelper(object):
       self._cached_url = download_url
 
     return self._cached_page_content
+
+  def OpenPage(self, download_url):
+    """Opens the page content from the URL as a stream.
+
+    Unlike DownloadPageContent, the page content can be read while it is
+    being downloaded. If a page cache is set, the page content is downloaded
+    and cached first, since the page cache stores complete pages.
+
+    Args:
+      download_url (str): URL where to download the page content.
+
+    Returns:
+      file: binary file-like object of the page content, which the caller
+          must close, or None if not available.
+    """
+    if not download_url:
+      return None
+
+    if self._page_cache:
+      page_content = self._DownloadPageContentWithCache(download_url)
+      if page_content is None:
+        return None
+
+      return io.BytesIO(page_content)
+
+    # The page content is streamed as stored on the server, since
+    # the callers decompress compressed pages, such as Sources.gz.
+    response = self._RequestPage(download_url, decompress=False)
+    if not response:
+      return None
+
+    if response.code != 200:
+      response.close()
+      return None
+
+    return response
+
+  @classmethod
+  def SetPageCache(cls, page_cache):
+    """Sets the page cache shared by all download helpers.
+
+    Args:
+      page_cache (PageCache): page cache or None to disable caching.
+    """
+    DownloadHelper._page_cache = page_cache
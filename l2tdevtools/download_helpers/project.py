@@ -22,6 +22,18 @@ class ProjectDownloadHelper(interface.DownloadHelper):
     super(ProjectDownloadHelper, self).__init__(download_url)
     self._project_name = None
 
+  def _GetExpectedSHA256(self, unused_download_url):
+    """Retrieves the expected SHA-256 digest of a file to download.
+
+    Args:
+      download_url (str): URL where to download the file.
+
+    Returns:
+      str: SHA-256 digest in hexadecimal representation or None if not
+          available.
+    """
+    return None
+
   def Download(self, project_name, project_version):
     """Downloads the project for a given project name and version.
 
@@ -39,7 +51,8 @@ class ProjectDownloadHelper(interface.DownloadHelper):
           project_name))
       return None
 
-    filename = self.DownloadFile(download_url)
+    filename = self.DownloadFile(
+        download_url, expected_sha256=self._GetExpectedSHA256(download_url))
 
     # GitHub archive package filenames can be:
     # {project version}.tar.gz
@@ -3,16 +3,67 @@
 
 from __future__ import unicode_literals
 
+import json
+import logging
 import re
+import sys
+import threading
 
-# pylint: disable=wrong-import-position
-import pkg_resources
+from multiprocessing import pool as multiprocessing_pool
+
+# pylint: disable=import-error,no-name-in-module
+if sys.version_info[0] < 3:
+  import urlparse as urllib_parse
+else:
+  import urllib.parse as urllib_parse
 
+# pylint: disable=wrong-import-position
+from l2tdevtools import versions
 from l2tdevtools.download_helpers import project
 
 
+class PyPISourcePackage(object):
+  """Source package of a project on PyPI.
+
+  Attributes:
+    download_url (str): download URL of the source package.
+    filename (str): filename of the source package.
+    sha256 (str): SHA-256 digest of the source package in hexadecimal
+        representation or None if not available.
+    size (int): size of the source package in bytes or None if not available.
+    version (str): version of the project.
+  """
+
+  def __init__(self, version, filename, download_url):
+    """Initializes a source package.
+
+    Args:
+      version (str): version of the project.
+      filename (str): filename of the source package.
+      download_url (str): download URL of the source package.
+    """
+    super(PyPISourcePackage, self).__init__()
+    self.download_url = download_url
+    self.filename = filename
+    self.sha256 = None
+    self.size = None
+    self.version = version
+
+
 class PyPIDownloadHelper(project.ProjectDownloadHelper):
-  """Helps in downloading a PyPI code project."""
+  """Helps in downloading a PyPI code project.
+
+  The source packages of a project are determined with the PyPI JSON API,
+  which also provides their digests and sizes. The project page is used
+  as fallback if the JSON API is not available.
+  """
+
+  _SOURCE_PACKAGE_EXTENSIONS = ('.tar.bz2', '.tar.gz', '.zip')
+
+  # The source packages per project name shared by all PyPI download helpers,
+  # so that the JSON API is requested only once per project.
+  _source_packages_per_project = {}
+  _source_packages_lock = threading.Lock()
 
   def __init__(self, download_url):
     """Initializes the download helper.
@@ -32,22 +83,58 @@ class PyPIDownloadHelper(project.ProjectDownloadHelper):
     super(PyPIDownloadHelper, self).__init__(download_url)
     self._project_name = url_segments[4]
 
-  def GetLatestVersion(self, unused_project_name, version_definition):
-    """Retrieves the latest version number for a given project name.
+  def _GetDownloadURLFromProjectPage(self, project_version):
+    """Retrieves the download URL from the project page.
 
     Args:
-      project_name (str): name of the project.
-      version_definition (ProjectVersionDefinition): project version definition
-          or None.
+      project_version (str): version of the project.
 
     Returns:
-      str: latest version number or None if not available.
+      str: download URL of the project or None if not available.
     """
-    if version_definition:
-      earliest_version = version_definition.GetEarliestVersion()
-      if earliest_version and earliest_version[0] == '==':
-        return '.'.join(earliest_version[1:])
+    download_url = 'https://pypi.org/project/{0:s}/{1!s}'.format(
+        self._project_name, project_version)
+
+    page_content = self.DownloadPageContent(download_url)
+    if not page_content:
+      return None
+
+    # The format of the project download URL is:
+    # https://files.pythonhosted.org/packages/.*/.*/.*/
+    #     {project name}-{version}.{extension}
+    expression_string = (
+        '(https://files.pythonhosted.org/packages/.*/.*/.*/'
+        '{0:s}-{1!s}[.](tar[.]bz2|tar[.]gz|zip))').format(
+            self._project_name, project_version)
+    matches = re.findall(expression_string, page_content)
 
+    if not matches:
+      return None
+
+    return matches[0][0]
+
+  def _GetExpectedSHA256(self, download_url):
+    """Retrieves the expected SHA-256 digest of a file to download.
+
+    Args:
+      download_url (str): URL where to download the file.
+
+    Returns:
+      str: SHA-256 digest in hexadecimal representation or None if not
+          available.
+    """
+    for source_package in self._GetSourcePackages() or []:
+      if source_package.download_url == download_url:
+        return source_package.sha256
+
+    return None
+
+  def _GetLatestVersionFromProjectPage(self):
+    """Retrieves the latest version number from the project page.
+
+    Returns:
+      str: latest version number or None if not available.
+    """
     download_url = 'https://pypi.org/project/{0:s}#files'.format(
         self._project_name)
 
@@ -55,71 +142,136 @@ class PyPIDownloadHelper(project.ProjectDownloadHelper):
     if not page_content:
       return None
 
-    versions = {}
     expression_string = (
         r'"https://files.pythonhosted.org/packages/.*/.*/.*/'
         r'{0:s}-(?P<version>[\d\.\!]*(post\d+)?)'
         r'\.(tar\.bz2|tar\.gz|zip)"').format(self._project_name)
 
-    for match in re.finditer(expression_string, page_content):
-      version_string = match.group('version')
-      if version_string:
-        # We need to support PEP440 epoch versioning, which only newer versions
-        # of setuptools support. So this is a bit of hack to handle epochs
-        # but still use setuptools to handle most of the version matching.
-        epoch, _, epoch_version_string = version_string.partition('!')
-        if not epoch_version_string:
-          # Per PEP440, if there is no epoch specified, the epoch is 0.
-          epoch_version_string = epoch
-          epoch = 0
-        else:
-          epoch = int(epoch, 10)
-
-        # Note that pkg_resources.parse_version() returns an instance of
-        # pkg_resources.SetuptoolsVersion.
-        version_object = pkg_resources.parse_version(epoch_version_string)
-
-        # Add the epoch to the version string for comparison.
-        version_tuple = ((epoch, version_object), version_string)
-        versions[version_tuple] = version_string
-
-    latest_version = max(versions.keys())
-    if latest_version:
-      # Return the original string that defined the version
-      return versions[latest_version]
+    version_strings = [
+        match.group('version')
+        for match in re.finditer(expression_string, page_content)
+        if match.group('version')]
 
-    return None
+    return versions.GetLatestVersion(version_strings)
 
-  def GetDownloadURL(self, unused_project_name, project_version):
-    """Retrieves the download URL for a given project name and version.
+  def _GetSourcePackages(self):
+    """Retrieves the source packages of the project.
 
-    Args:
-      project_name (str): name of the project.
-      project_version (str): version of the project.
+    Returns:
+      list[PyPISourcePackage]: source packages or None if the JSON API is
+          not available.
+    """
+    with self._source_packages_lock:
+      if self._project_name in self._source_packages_per_project:
+        return self._source_packages_per_project[self._project_name]
+
+    source_packages = self._GetSourcePackagesFromJSONAPI()
+
+    with self._source_packages_lock:
+      self._source_packages_per_project[self._project_name] = source_packages
+
+    return source_packages
+
+  def _GetSourcePackagesFromJSONAPI(self):
+    """Retrieves the source packages of the project from the PyPI JSON API.
 
     Returns:
-      str: download URL of the project or None if not available.
+      list[PyPISourcePackage]: source packages or None if the JSON API is
+          not available.
     """
-    download_url = 'https://pypi.org/project/{0:s}/{1!s}'.format(
-        self._project_name, project_version)
+    download_url = 'https://pypi.org/pypi/{0:s}/json'.format(
+        self._project_name)
 
     page_content = self.DownloadPageContent(download_url)
     if not page_content:
       return None
 
-    # The format of the project download URL is:
-    # https://files.pythonhosted.org/packages/.*/.*/.*/
-    #     {project name}-{version}.{extension}
-    expression_string = (
-        '(https://files.pythonhosted.org/packages/.*/.*/.*/'
-        '{0:s}-{1!s}[.](tar[.]bz2|tar[.]gz|zip))').format(
-            self._project_name, project_version)
-    matches = re.findall(expression_string, page_content)
+    try:
+      json_dict = json.loads(page_content)
+    except ValueError as exception:
+      logging.warning(
+          'Unable to parse PyPI JSON API response of: {0:s} with error: '
+          '{1!s}'.format(self._project_name, exception))
+      return None
 
-    if not matches:
+    releases = json_dict.get('releases', None)
+    if not isinstance(releases, dict):
       return None
 
-    return matches[0][0]
+    source_packages = []
+    for version, release_files in sorted(releases.items()):
+      for release_file in release_files or []:
+        if release_file.get('packagetype', None) != 'sdist':
+          continue
+
+        if release_file.get('yanked', False):
+          continue
+
+        filename = release_file.get('filename', None) or ''
+        if not filename.endswith(self._SOURCE_PACKAGE_EXTENSIONS):
+          continue
+
+        # Mirrors of PyPI can provide URLs relative to the JSON API URL.
+        file_url = urllib_parse.urljoin(
+            download_url, release_file.get('url', None) or '')
+
+        source_package = PyPISourcePackage(version, filename, file_url)
+        source_package.sha256 = (
+            release_file.get('digests', None) or {}).get('sha256', None)
+        source_package.size = release_file.get('size', None)
+        source_packages.append(source_package)
+
+    return source_packages
+
+  def GetLatestVersion(self, unused_project_name, version_definition):
+    """Retrieves the latest version number for a given project name.
+
+    Args:
+      project_name (str): name of the project.
+      version_definition (ProjectVersionDefinition): project version definition
+          or None.
+
+    Returns:
+      str: latest version number or None if not available.
+    """
+    if version_definition:
+      earliest_version = version_definition.GetEarliestVersion()
+      if earliest_version and earliest_version[0] == '==':
+        return '.'.join(earliest_version[1:])
+
+    source_packages = self._GetSourcePackages()
+    if source_packages is None:
+      return self._GetLatestVersionFromProjectPage()
+
+    # Pre-releases and development releases are only used if pinned, like
+    # the project page that only matches release versions.
+    version_strings = [
+        source_package.version for source_package in source_packages
+        if not versions.IsPreRelease(source_package.version)]
+
+    return versions.GetLatestVersion(
+        version_strings, version_definition=version_definition)
+
+  def GetDownloadURL(self, unused_project_name, project_version):
+    """Retrieves the download URL for a given project name and version.
+
+    Args:
+      project_name (str): name of the project.
+      project_version (str): version of the project.
+
+    Returns:
+      str: download URL of the project or None if not available.
+    """
+    source_packages = self._GetSourcePackages()
+    if source_packages is None:
+      return self._GetDownloadURLFromProjectPage(project_version)
+
+    project_version = '{0!s}'.format(project_version)
+    for source_package in source_packages:
+      if source_package.version == project_version:
+        return source_package.download_url
+
+    return None
 
   def GetProjectIdentifier(self):
     """Retrieves the project identifier for a given project name.
@@ -128,3 +280,42 @@ class PyPIDownloadHelper(project.ProjectDownloadHelper):
       str: project identifier.
     """
     return 'org.pypi.{0:s}'.format(self._project_name)
+
+  @classmethod
+  def PrefetchSourcePackages(cls, download_urls, number_of_threads=8):
+    """Retrieves the source packages of multiple projects concurrently.
+
+    The source packages are shared by all PyPI download helpers, so that
+    the versions of all projects, for example those of a preset, are resolved
+    concurrently instead of one at a time during the builds.
+
+    Args:
+      download_urls (list[str]): download URLs of the projects, where URLs
+          that are not supported by the PyPI download helper are ignored.
+      number_of_threads (Optional[int]): maximum number of projects to
+          retrieve concurrently.
+    """
+    download_helpers = []
+    for download_url in download_urls:
+      # Unify http:// and https:// URLs as the download helper factory does.
+      if download_url.startswith('http://'):
+        download_url = 'https://{0:s}'.format(download_url[7:])
+
+      try:
+        download_helpers.append(cls(download_url))
+      except ValueError:
+        continue
+
+    if not download_helpers:
+      return
+
+    thread_pool = multiprocessing_pool.ThreadPool(
+        processes=min(number_of_threads, len(download_helpers)))
+
+    try:
+      thread_pool.map(
+          PyPIDownloadHelper._GetSourcePackages, download_helpers)
+
+    finally:
+      thread_pool.close()
+      thread_pool.join()
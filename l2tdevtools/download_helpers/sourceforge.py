@@ -5,6 +5,7 @@ from __future__ import unicode_literals
 
 import re
 
+from l2tdevtools import versions
 from l2tdevtools.download_helpers import project
 
 
@@ -73,8 +74,7 @@ class SourceForgeDownloadHelper(project.ProjectDownloadHelper):
     if not matches:
       return None
 
-    numeric_matches = [''.join(match.split('.')) for match in matches]
-    return matches[numeric_matches.index(max(numeric_matches))]
+    return versions.GetLatestVersion(matches)
 
   def GetDownloadURL(self, unused_project_name, project_version):
     """Retrieves the download URL for a given project name and version.
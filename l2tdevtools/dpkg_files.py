@@ -9,6 +9,8 @@ import shutil
 import stat
 import time
 
+from l2tdevtools import templates
+
 
 class DPKGBuildFilesGenerator(object):
   """Dpkg build files generator."""
@@ -295,18 +297,18 @@ class DPKGBuildFilesGenerator(object):
     if template_filename:
       template_file_path = os.path.join(
           self._data_path, 'dpkg_templates', template_filename)
-      with open(template_file_path, 'rb') as file_object:
-        template_data = file_object.read()
+      template = templates.TemplateRegistry.GetTemplate(template_file_path)
 
-      template_data = template_data.decode('utf-8')
+      if template_values:
+        template_data = template.Render(template_values)
+      else:
+        template_data = template.template_data
 
-    if template_values:
+    elif template_values:
       template_data = template_data.format(**template_values)
 
-    template_data = template_data.encode('utf-8')
-
-    with open(output_filename, 'wb') as file_object:
-      file_object.write(template_data)
+    templates.WriteFileIfChanged(
+        output_filename, template_data.encode('utf-8'))
 
   def _GenerateChangelogFile(self, dpkg_path):
     """Generates the dpkg build changelog file.
@@ -510,8 +512,7 @@ class DPKGBuildFilesGenerator(object):
 
     else:
       logging.warning('Missing license file: {0:s}'.format(license_file))
-      with open(filename, 'wb') as file_object:
-        file_object.write('\n')
+      templates.WriteFileIfChanged(filename, b'\n')
 
   def _GenerateInstallFiles(self, dpkg_path):
     """Generates the dpkg build .install files.
@@ -651,24 +652,20 @@ class DPKGBuildFilesGenerator(object):
     else:
       rules_template = self._RULES_TEMPLATE_SETUP_PY
 
-    # TODO: replace manual write of rules file by call to _GenerateFile.
     template_filename = self._project_definition.dpkg_template_rules
     if template_filename:
       template_file_path = os.path.join(
           self._data_path, 'dpkg_templates', template_filename)
-      with open(template_file_path, 'rb') as file_object:
-        rules_template = file_object.read()
+      template = templates.TemplateRegistry.GetTemplate(template_file_path)
+      data = template.Render(template_values)
+    else:
+      data = rules_template.format(**template_values)
 
-      rules_template = rules_template.decode('utf-8')
+    if package_name in ('astroid', 'pylint'):
+      data = ''.join([data, self._RULES_SETUP_PY_PYTHON2_OVERRIDE])
 
     output_filename = os.path.join(dpkg_path, 'rules')
-    with open(output_filename, 'wb') as file_object:
-      data = rules_template.format(**template_values)
-      file_object.write(data.encode('utf-8'))
-
-      if package_name in ('astroid', 'pylint'):
-        data = self._RULES_SETUP_PY_PYTHON2_OVERRIDE
-        file_object.write(data.encode('utf-8'))
+    templates.WriteFileIfChanged(output_filename, data.encode('utf-8'))
 
   def _GenerateSourceFormatFile(self, dpkg_path):
     """Generates the dpkg build source/format file.
@@ -809,6 +806,5 @@ class DPKGBuildFilesGenerator(object):
       os.chdir(current_path)
 
       filename = os.path.join(dpkg_path, 'patches', 'series')
-      with open(filename, 'wb') as file_object:
-        data = '\n'.join(patch_filenames)
-        file_object.write(data.encode('utf-8'))
+      data = '\n'.join(patch_filenames)
+      templates.WriteFileIfChanged(filename, data.encode('utf-8'))
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""Cache of bare mirrors of git repositories."""
+
+from __future__ import unicode_literals
+
+import contextlib
+import io
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+
+from multiprocessing import pool as multiprocessing_pool
+
+try:
+  import fcntl
+except ImportError:
+  fcntl = None
+
+
+class GitMirrorCache(object):
+  """Cache of bare mirrors of git repositories.
+
+  The mirror of a repository is stored in the format:
+  {path}/{host}/{repository path}.git
+
+  Since the layout of the cache follows the URLs of the repositories, the
+  repositories of a host and path prefix, such as https://github.com/libyal,
+  are available under the same prefix in the cache. This allows git to
+  rewrite the URLs of clones, such as those made by synclibs.sh, to use
+  the mirrors.
+
+  A mirror is created with a single clone of the repository and updated
+  with a fetch, which only transfers new objects, at most once per run.
+  Working trees are cloned from the mirror, which is a local copy where
+  the objects are hard linked if possible.
+  """
+
+  # The maximum number of mirrors that are updated concurrently.
+  _MAXIMUM_NUMBER_OF_UPDATE_THREADS = 8
+
+  _SCP_LIKE_URL_RE = re.compile(r'^(?:[^@/]+@)?([^:/]+):(?!//)(.+)$')
+
+  _URL_RE = re.compile(r'^[a-z][a-z0-9+.-]*://(?:[^@/]*@)?([^/]*)(/.*)?$')
+
+  def __init__(self, path):
+    """Initializes a git mirror cache.
+
+    Args:
+      path (str): path of the directory that contains the cache.
+    """
+    super(GitMirrorCache, self).__init__()
+    self._path = path
+    self._updated_git_urls = set()
+    self._updated_git_urls_lock = threading.Lock()
+
+  def _GetCachePath(self, url):
+    """Retrieves the path in the cache that corresponds with a URL.
+
+    Args:
+      url (str): URL of a git repository or URL prefix of git repositories,
+          such as "https://github.com/libyal".
+
+    Returns:
+      str: path in the cache.
+    """
+    match = self._URL_RE.match(url) or self._SCP_LIKE_URL_RE.match(url)
+    if match:
+      host, repository_path = match.groups()
+      path_segments = []
+      # Note that file:// URLs have no host.
+      if host:
+        path_segments.append(host.replace(':', '_'))
+    else:
+      repository_path = url
+      path_segments = []
+
+    path_segments.extend([
+        path_segment for path_segment in re.split(
+            r'[/\\]', repository_path or '')
+        if path_segment and path_segment not in ('.', '..')])
+
+    return os.path.join(self._path, *path_segments)
+
+  def _GetMirrorPath(self, git_url):
+    """Retrieves the path of the mirror of a repository.
+
+    Args:
+      git_url (str): URL of the git repository.
+
+    Returns:
+      str: path of the mirror.
+    """
+    mirror_path = self._GetCachePath(git_url)
+    if not mirror_path.endswith('.git'):
+      mirror_path = '{0:s}.git'.format(mirror_path)
+
+    return mirror_path
+
+  @contextlib.contextmanager
+  def _LockMirror(self, mirror_path):
+    """Locks a mirror, so that only one process updates it at a time.
+
+    Args:
+      mirror_path (str): path of the mirror.
+
+    Yields:
+      None
+    """
+    if not fcntl:
+      yield None
+      return
+
+    lock_path = '{0:s}.lock'.format(mirror_path)
+    with io.open(lock_path, 'wb') as file_object:
+      fcntl.flock(file_object.fileno(), fcntl.LOCK_EX)
+      try:
+        yield None
+      finally:
+        fcntl.flock(file_object.fileno(), fcntl.LOCK_UN)
+
+  def _RunGitCommand(self, arguments):
+    """Runs a git command.
+
+    Args:
+      arguments (list[str]): arguments of the git command.
+
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    command = ['git']
+    command.extend(arguments)
+
+    exit_code = subprocess.call(command)
+    if exit_code != 0:
+      logging.error('Running: "{0:s}" failed.'.format(' '.join(command)))
+      return False
+
+    return True
+
+  def CloneRepository(self, git_url, destination_path):
+    """Clones a repository from its mirror.
+
+    The remote origin of the clone is set to the URL of the repository,
+    so that the clone can be used as if it was cloned from the repository.
+
+    Args:
+      git_url (str): URL of the git repository.
+      destination_path (str): path of the clone.
+
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    if not self.UpdateMirror(git_url):
+      return False
+
+    mirror_path = self._GetMirrorPath(git_url)
+    if not self._RunGitCommand([
+        'clone', '--quiet', mirror_path, destination_path]):
+      return False
+
+    return self._RunGitCommand([
+        '--git-dir', os.path.join(destination_path, '.git'), 'remote',
+        'set-url', 'origin', git_url])
+
+  def GetURLRewriteEnvironment(self, url_prefixes, environment=None):
+    """Retrieves environment variables that make git use the mirrors.
+
+    The environment variables configure git to rewrite URLs that start with
+    one of the URL prefixes to the corresponding path in the cache. Note that
+    git does not rewrite local paths, only URLs such as file:// URLs, and
+    supports configuration in environment variables as of version 2.31,
+    earlier versions ignore the variables and use the URLs.
+
+    Args:
+      url_prefixes (list[str]): URL prefixes, such as
+          "https://github.com/libyal/".
+      environment (Optional[dict[str, str]]): environment variables to
+          extend, where None represents the environment of the process.
+
+    Returns:
+      dict[str, str]: environment variables.
+    """
+    if environment is None:
+      environment = os.environ
+
+    environment = dict(environment)
+
+    index = int(environment.get('GIT_CONFIG_COUNT', None) or '0', 10)
+    for url_prefix in url_prefixes:
+      prefix_path = self._GetCachePath(url_prefix)
+      if url_prefix.endswith('/'):
+        prefix_path = '{0:s}{1:s}'.format(prefix_path, os.sep)
+
+      environment['GIT_CONFIG_KEY_{0:d}'.format(index)] = (
+          'url.{0:s}.insteadOf'.format(prefix_path))
+      environment['GIT_CONFIG_VALUE_{0:d}'.format(index)] = url_prefix
+      index += 1
+
+    environment['GIT_CONFIG_COUNT'] = '{0:d}'.format(index)
+
+    return environment
+
+  def UpdateMirror(self, git_url):
+    """Creates or updates the mirror of a repository.
+
+    The mirror is updated at most once during the lifetime of the cache
+    object.
+
+    Args:
+      git_url (str): URL of the git repository.
+
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    with self._updated_git_urls_lock:
+      if git_url in self._updated_git_urls:
+        return True
+
+    mirror_path = self._GetMirrorPath(git_url)
+
+    parent_path = os.path.dirname(mirror_path)
+    if not os.path.isdir(parent_path):
+      try:
+        os.makedirs(parent_path)
+      except OSError:
+        # The directory can be created concurrently by another process.
+        if not os.path.isdir(parent_path):
+          raise
+
+    with self._LockMirror(mirror_path):
+      if os.path.isdir(mirror_path):
+        logging.info('Updating mirror of: {0:s}'.format(git_url))
+        result = self._RunGitCommand([
+            '--git-dir', mirror_path, 'fetch', '--quiet', '--prune',
+            'origin'])
+
+      else:
+        logging.info('Creating mirror of: {0:s}'.format(git_url))
+
+        # The mirror is cloned into a temporary directory first, so that
+        # a failed clone does not leave an incomplete mirror behind.
+        temporary_path = tempfile.mkdtemp(dir=parent_path)
+        try:
+          temporary_mirror_path = os.path.join(temporary_path, 'mirror.git')
+          result = self._RunGitCommand([
+              'clone', '--quiet', '--mirror', git_url, temporary_mirror_path])
+          if result:
+            os.rename(temporary_mirror_path, mirror_path)
+
+        finally:
+          shutil.rmtree(temporary_path, True)
+
+    if result:
+      with self._updated_git_urls_lock:
+        self._updated_git_urls.add(git_url)
+
+    return result
+
+  def UpdateMirrors(self, git_urls):
+    """Creates or updates the mirrors of multiple repositories concurrently.
+
+    Args:
+      git_urls (list[str]): URLs of the git repositories.
+
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    if not git_urls:
+      return True
+
+    thread_pool = multiprocessing_pool.ThreadPool(
+        processes=min(self._MAXIMUM_NUMBER_OF_UPDATE_THREADS, len(git_urls)))
+
+    try:
+      results = thread_pool.map(self.UpdateMirror, git_urls)
+
+    finally:
+      thread_pool.close()
+      thread_pool.join()
+
+    return all(results)
@@ -0,0 +1,494 @@
+# -*- coding: utf-8 -*-
+"""Client of the GitHub REST API."""
+
+from __future__ import unicode_literals
+
+import hashlib
+import json
+import logging
+import re
+import sys
+import threading
+import time
+
+# pylint: disable=import-error,no-name-in-module
+if sys.version_info[0] < 3:
+  import urlparse as urllib_parse
+else:
+  import urllib.parse as urllib_parse
+
+# pylint: disable=wrong-import-position
+from l2tdevtools import http_client
+from l2tdevtools import page_cache as page_cache_lib
+from l2tdevtools.lib import errors
+
+
+class GitHubRateLimit(object):
+  """Rate limit of the GitHub API for an access token.
+
+  Attributes:
+    limit (int): maximum number of requests per rate limit window or None
+        if not known.
+    next_request_time (float): POSIX timestamp of when the next request can
+        be sent.
+    remaining (int): number of requests remaining in the current rate limit
+        window or None if not known.
+    reset_time (float): POSIX timestamp of when the current rate limit
+        window ends or None if not known.
+  """
+
+  def __init__(self):
+    """Initializes a rate limit."""
+    super(GitHubRateLimit, self).__init__()
+    self.limit = None
+    self.next_request_time = 0.0
+    self.remaining = None
+    self.reset_time = None
+
+
+class GitHubAPIClient(object):
+  """Client of the GitHub REST API.
+
+  The client pages through list results with the Link headers of
+  the responses and sends conditional requests with the ETags of previous
+  responses, which are kept in an ETag store. GitHub does not count
+  responses that are not modified (304) against the rate limit. In offline
+  mode of the ETag store the stored responses are used without sending
+  requests.
+
+  Requests are scheduled against the remaining rate limit: when
+  the remaining number of requests runs low they are spread evenly over
+  the time until the rate limit window ends, and when it is exhausted
+  the client waits for the end of the window.
+
+  The rate limits are shared by all clients in the process that use
+  the same access token.
+  """
+
+  _API_URL = 'https://api.github.com'
+
+  _LINK_NEXT_RE = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+  # The maximum number of times a request is sent again after the API
+  # responded that the result is still being computed (202).
+  _MAXIMUM_NUMBER_OF_POLLS = 6
+
+  # The maximum number of times a request is sent again after it was
+  # rejected due to the rate limit.
+  _MAXIMUM_NUMBER_OF_RATE_LIMITED_RETRIES = 2
+
+  # Requests are spread over the time until the end of the rate limit window
+  # when less than this fraction of the rate limit remains.
+  _PACING_THRESHOLD = 0.1
+
+  _PER_PAGE = 100
+
+  # The ETag store shared by all clients.
+  _etag_store = None
+
+  # The rate limits per access token shared by all clients.
+  _rate_limits = {}
+  _rate_limits_lock = threading.Lock()
+
+  def __init__(self, access_token=None, maximum_wait=300):
+    """Initializes a GitHub API client.
+
+    Args:
+      access_token (Optional[str]): GitHub access token, where None
+          represents unauthenticated requests, which have a lower rate limit.
+      maximum_wait (Optional[int]): maximum number of seconds to wait for
+          the rate limit before a request fails.
+    """
+    super(GitHubAPIClient, self).__init__()
+    self._access_token = access_token
+    self._maximum_wait = maximum_wait
+
+  def _GetRateLimit(self, access_token):
+    """Retrieves the rate limit of an access token.
+
+    This function must be called with the rate limits lock held.
+
+    Args:
+      access_token (str): GitHub access token or None.
+
+    Returns:
+      GitHubRateLimit: rate limit.
+    """
+    rate_limit = self._rate_limits.get(access_token, None)
+    if not rate_limit:
+      rate_limit = GitHubRateLimit()
+      self._rate_limits[access_token] = rate_limit
+
+    return rate_limit
+
+  def _GetETagStoreKey(self, url, access_token):
+    """Retrieves the key of a response in the ETag store.
+
+    The responses of the API depend on the access token, for example for
+    private repositories, hence the key contains the identity of the access
+    token. A digest of the access token is used so that the access token
+    itself is not stored.
+
+    Args:
+      url (str): URL.
+      access_token (str): GitHub access token or None.
+
+    Returns:
+      str: key of the response in the ETag store.
+    """
+    if not access_token:
+      return url
+
+    token_digest = hashlib.sha256(access_token.encode('utf-8')).hexdigest()
+    return '{0:s}#token={1:s}'.format(url, token_digest[:16])
+
+  def _GetURL(self, path):
+    """Retrieves the URL of an API path.
+
+    Args:
+      path (str): path relative to the API URL, such as "users/username",
+          or URL.
+
+    Returns:
+      str: URL.
+    """
+    if path.startswith('https://') or path.startswith('http://'):
+      return path
+
+    return '{0:s}/{1:s}'.format(self._API_URL, path.lstrip('/'))
+
+  def _ParseJSON(self, url, status_code, response_data):
+    """Parses a JSON response.
+
+    Args:
+      url (str): URL.
+      status_code (int): HTTP status code.
+      response_data (bytes): response body.
+
+    Returns:
+      object: JSON result or None if the response body is empty.
+
+    Raises:
+      ConnectivityError: if the status code does not indicate success or
+          the response body cannot be parsed.
+    """
+    if status_code not in (200, 201):
+      raise errors.ConnectivityError(
+          'Failed requesting URL {0:s} with status code: {1:d}'.format(
+              url, status_code))
+
+    if not response_data:
+      return None
+
+    try:
+      return json.loads(response_data.decode('utf-8'))
+    except (UnicodeDecodeError, ValueError) as exception:
+      raise errors.ConnectivityError(
+          'Unable to parse JSON of URL: {0:s} with error: {1!s}'.format(
+              url, exception))
+
+  def _ReserveRequest(self, access_token):
+    """Reserves a request in the rate limit.
+
+    Args:
+      access_token (str): GitHub access token or None.
+
+    Returns:
+      float: number of seconds to wait before the request can be sent.
+
+    Raises:
+      ConnectivityError: if the rate limit requires a longer wait than
+          the maximum wait.
+    """
+    with self._rate_limits_lock:
+      rate_limit = self._GetRateLimit(access_token)
+
+      current_time = time.time()
+      request_time = max(current_time, rate_limit.next_request_time)
+
+      if rate_limit.remaining is not None and rate_limit.reset_time:
+        if current_time >= rate_limit.reset_time:
+          # A new rate limit window started, the actual values are known
+          # after the next response.
+          rate_limit.remaining = None
+
+        elif rate_limit.remaining <= 0:
+          request_time = max(request_time, rate_limit.reset_time + 1.0)
+
+        elif (rate_limit.limit and rate_limit.remaining <
+              rate_limit.limit * self._PACING_THRESHOLD):
+          interval = (
+              (rate_limit.reset_time - current_time) / rate_limit.remaining)
+          request_time = max(
+              request_time, rate_limit.next_request_time + interval)
+
+      wait = request_time - current_time
+      if wait > self._maximum_wait:
+        raise errors.ConnectivityError((
+            'GitHub API rate limit exceeded, the rate limit is reset at: '
+            '{0:s}').format(time.strftime(
+                '%Y-%m-%d %H:%M:%S', time.localtime(rate_limit.reset_time))))
+
+      if rate_limit.remaining:
+        rate_limit.remaining -= 1
+      rate_limit.next_request_time = request_time
+
+    return wait
+
+  def _SendRequest(self, url, access_token, data=None, method='GET'):
+    """Sends a request to the API.
+
+    Args:
+      url (str): URL.
+      access_token (str): GitHub access token or None.
+      data (Optional[bytes]): request body.
+      method (Optional[str]): HTTP method.
+
+    Returns:
+      tuple[int, bytes, str]: HTTP status code, response body and value of
+          the Link header or None if not set.
+
+    Raises:
+      ConnectivityError: if the request failed.
+    """
+    headers = {'Accept': 'application/vnd.github.v3+json'}
+    if access_token:
+      headers['Authorization'] = 'token {0:s}'.format(access_token)
+
+    cache_entry = None
+    etag_store_key = self._GetETagStoreKey(url, access_token)
+    if method == 'GET' and self._etag_store:
+      cache_entry = self._etag_store.GetEntry(etag_store_key)
+      if cache_entry and self._etag_store.offline:
+        return 200, cache_entry.page_content, cache_entry.link
+
+      if cache_entry and cache_entry.etag:
+        headers['If-None-Match'] = cache_entry.etag
+
+    number_of_retries = 0
+    while True:
+      wait = self._ReserveRequest(access_token)
+      if wait > 0:
+        logging.info(
+            'Waiting: {0:.1f} seconds for the GitHub API rate limit.'.format(
+                wait))
+        time.sleep(wait)
+
+      response = http_client.GetHTTPClient().Request(
+          url, data=data, headers=headers, method=method)
+
+      try:
+        response_data = response.read()
+      except IOError as exception:
+        raise errors.ConnectivityError(
+            'Unable to request URL: {0:s} with error: {1!s}'.format(
+                url, exception))
+
+      retry_after = self._UpdateRateLimit(access_token, response)
+
+      if response.code == 304 and cache_entry:
+        return 200, cache_entry.page_content, cache_entry.link
+
+      if (retry_after is None or number_of_retries >=
+          self._MAXIMUM_NUMBER_OF_RATE_LIMITED_RETRIES):
+        break
+
+      logging.info((
+          'Request of URL: {0:s} exceeded the GitHub API rate limit, '
+          'retrying in: {1:.1f} seconds.').format(url, retry_after))
+
+      if retry_after > self._maximum_wait:
+        break
+
+      time.sleep(retry_after)
+      number_of_retries += 1
+
+    link = response.headers.get('Link', None)
+
+    etag = response.headers.get('ETag', None)
+    if response.code == 200 and etag and self._etag_store:
+      cache_entry = page_cache_lib.PageCacheEntry(etag_store_key)
+      cache_entry.etag = etag
+      cache_entry.link = link
+      cache_entry.page_content = response_data
+      self._etag_store.StoreEntry(cache_entry)
+
+    return response.code, response_data, link
+
+  def _UpdateRateLimit(self, access_token, response):
+    """Updates the rate limit from the headers of a response.
+
+    Args:
+      access_token (str): GitHub access token or None.
+      response (HTTPResponse): response.
+
+    Returns:
+      float: number of seconds to wait before the request can be sent again
+          if the request was rejected due to the rate limit or None if not.
+    """
+    limit = response.headers.get('X-RateLimit-Limit', None) or ''
+    remaining = response.headers.get('X-RateLimit-Remaining', None) or ''
+    reset_time = response.headers.get('X-RateLimit-Reset', None) or ''
+
+    with self._rate_limits_lock:
+      rate_limit = self._GetRateLimit(access_token)
+
+      if limit.isdigit():
+        rate_limit.limit = int(limit, 10)
+      if remaining.isdigit():
+        rate_limit.remaining = int(remaining, 10)
+
+      elif response.code == 304 and rate_limit.remaining is not None:
+        # A conditional request that is answered with 304 Not Modified does
+        # not count against the rate limit, hence the reserved request is
+        # released.
+        rate_limit.remaining += 1
+      if reset_time.isdigit():
+        rate_limit.reset_time = float(reset_time)
+
+      if response.code not in (403, 429):
+        return None
+
+      # Secondary rate limits are indicated by the Retry-After header.
+      retry_after = response.headers.get('Retry-After', None) or ''
+      if retry_after.isdigit():
+        return float(retry_after)
+
+      if rate_limit.remaining == 0 and rate_limit.reset_time:
+        return max(rate_limit.reset_time - time.time(), 0.0) + 1.0
+
+    return None
+
+  def GetJSON(self, path, access_token=None):
+    """Retrieves a JSON result.
+
+    If the API responds that the result is still being computed, such as
+    for the statistics of a repository, the request is sent again with
+    an exponential backoff until the result is available.
+
+    Args:
+      path (str): path relative to the API URL, such as "users/username",
+          or URL.
+      access_token (Optional[str]): GitHub access token, where None
+          represents the access token of the client.
+
+    Returns:
+      object: JSON result.
+
+    Raises:
+      ConnectivityError: if the result cannot be retrieved.
+    """
+    access_token = access_token or self._access_token
+    url = self._GetURL(path)
+
+    for poll_number in range(self._MAXIMUM_NUMBER_OF_POLLS + 1):
+      status_code, response_data, _ = self._SendRequest(url, access_token)
+      if status_code != 202:
+        break
+
+      if poll_number < self._MAXIMUM_NUMBER_OF_POLLS:
+        time.sleep(2 ** poll_number)
+
+    if status_code == 202:
+      raise errors.ConnectivityError(
+          'Result of URL: {0:s} is still being computed.'.format(url))
+
+    return self._ParseJSON(url, status_code, response_data)
+
+  def GetPagedJSON(self, path, access_token=None):
+    """Retrieves a JSON list result of all pages.
+
+    Args:
+      path (str): path relative to the API URL, such as
+          "repos/organization/project/pulls?state=all", or URL.
+      access_token (Optional[str]): GitHub access token, where None
+          represents the access token of the client.
+
+    Returns:
+      list[object]: JSON list result of all pages.
+
+    Raises:
+      ConnectivityError: if the result cannot be retrieved.
+    """
+    access_token = access_token or self._access_token
+    url = self._GetURL(path)
+
+    url_segments = urllib_parse.urlsplit(url)
+    if 'per_page=' not in url_segments.query:
+      query = '&'.join([
+          value for value in (
+              url_segments.query, 'per_page={0:d}'.format(self._PER_PAGE))
+          if value])
+      url = urllib_parse.urlunsplit((
+          url_segments.scheme, url_segments.netloc, url_segments.path, query,
+          url_segments.fragment))
+
+    results = []
+    while url:
+      status_code, response_data, link = self._SendRequest(url, access_token)
+
+      json_result = self._ParseJSON(url, status_code, response_data)
+      if not isinstance(json_result, list):
+        raise errors.ConnectivityError(
+            'Unsupported JSON result of URL: {0:s}'.format(url))
+
+      results.extend(json_result)
+
+      match = self._LINK_NEXT_RE.search(link or '')
+      url = match.group(1) if match else None
+
+    return results
+
+  def GetRateLimit(self, access_token=None):
+    """Retrieves the rate limit of an access token.
+
+    Args:
+      access_token (Optional[str]): GitHub access token, where None
+          represents the access token of the client.
+
+    Returns:
+      tuple[int, int]: remaining number of requests and the maximum number
+          of requests in the current rate limit window, which are None if not
+          known.
+    """
+    access_token = access_token or self._access_token
+
+    with self._rate_limits_lock:
+      rate_limit = self._GetRateLimit(access_token)
+      return rate_limit.remaining, rate_limit.limit
+
+  def PostJSON(self, path, json_data, access_token=None):
+    """Posts JSON data.
+
+    Args:
+      path (str): path relative to the API URL, such as
+          "repos/organization/project/pulls", or URL.
+      json_data (object): JSON data.
+      access_token (Optional[str]): GitHub access token, where None
+          represents the access token of the client.
+
+    Returns:
+      object: JSON result or None if the response body is empty.
+
+    Raises:
+      ConnectivityError: if the request failed.
+    """
+    access_token = access_token or self._access_token
+    url = self._GetURL(path)
+
+    data = json.dumps(json_data).encode('utf-8')
+    status_code, response_data, _ = self._SendRequest(
+        url, access_token, data=data, method='POST')
+
+    return self._ParseJSON(url, status_code, response_data)
+
+  @classmethod
+  def SetETagStore(cls, etag_store):
+    """Sets the ETag store shared by all GitHub API clients.
+
+    Args:
+      etag_store (PageCache): page cache in which the ETags, Link headers
+          and content of responses are stored or None to not send
+          conditional requests.
+    """
+    GitHubAPIClient._etag_store = etag_store
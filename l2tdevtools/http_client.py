@@ -0,0 +1,780 @@
+# -*- coding: utf-8 -*-
+"""HTTP client with persistent connections shared by the network code."""
+
+from __future__ import unicode_literals
+
+import logging
+import os
+import random
+import socket
+import ssl
+import sys
+import threading
+import time
+import zlib
+
+# pylint: disable=import-error,no-name-in-module
+if sys.version_info[0] < 3:
+  import httplib as http_client
+  import urllib as urllib_request
+  import urlparse as urllib_parse
+else:
+  import http.client as http_client
+  import urllib.parse as urllib_parse
+  import urllib.request as urllib_request
+
+# pylint: disable=wrong-import-position
+import l2tdevtools
+
+from l2tdevtools.lib import errors
+
+
+class HTTPHostStatistics(object):
+  """Statistics of the requests to a host.
+
+  Attributes:
+    latency (float): total number of seconds between sending the requests
+        and receiving the response headers.
+    number_of_connections (int): number of connections that were opened.
+    number_of_errors (int): number of requests that failed with a connection
+        error.
+    number_of_requests (int): number of requests that were sent, including
+        retries and redirects.
+    number_of_retries (int): number of requests that were retried after
+        a transient error.
+  """
+
+  def __init__(
+      self, latency=0.0, number_of_connections=0, number_of_errors=0,
+      number_of_requests=0, number_of_retries=0):
+    """Initializes host statistics.
+
+    Args:
+      latency (Optional[float]): total number of seconds until the response
+          headers were received.
+      number_of_connections (Optional[int]): number of opened connections.
+      number_of_errors (Optional[int]): number of failed requests.
+      number_of_requests (Optional[int]): number of sent requests.
+      number_of_retries (Optional[int]): number of retried requests.
+    """
+    super(HTTPHostStatistics, self).__init__()
+    self.latency = latency
+    self.number_of_connections = number_of_connections
+    self.number_of_errors = number_of_errors
+    self.number_of_requests = number_of_requests
+    self.number_of_retries = number_of_retries
+
+  def CopyToDict(self):
+    """Copies the statistics to a dictionary.
+
+    Returns:
+      dict[str, object]: statistics values per name.
+    """
+    return {
+        'latency': self.latency,
+        'number_of_connections': self.number_of_connections,
+        'number_of_errors': self.number_of_errors,
+        'number_of_requests': self.number_of_requests,
+        'number_of_retries': self.number_of_retries}
+
+  def GetAverageLatency(self):
+    """Determines the average latency of the requests.
+
+    Returns:
+      float: average number of seconds until the response headers were
+          received or None if no requests were sent.
+    """
+    if not self.number_of_requests:
+      return None
+
+    return self.latency / self.number_of_requests
+
+  def GetDifference(self, previous_statistics):
+    """Determines the statistics since previous statistics.
+
+    Args:
+      previous_statistics (HTTPHostStatistics): statistics retrieved
+          earlier from the same HTTP client.
+
+    Returns:
+      HTTPHostStatistics: statistics of the requests since the previous
+          statistics.
+    """
+    return HTTPHostStatistics(
+        latency=self.latency - previous_statistics.latency,
+        number_of_connections=(
+            self.number_of_connections -
+            previous_statistics.number_of_connections),
+        number_of_errors=(
+            self.number_of_errors - previous_statistics.number_of_errors),
+        number_of_requests=(
+            self.number_of_requests - previous_statistics.number_of_requests),
+        number_of_retries=(
+            self.number_of_retries - previous_statistics.number_of_retries))
+
+
+class HTTPResponse(object):
+  """HTTP response.
+
+  The response is a file-like object of the response body, which is
+  decompressed if the body is gzip or deflate encoded. The connection is
+  returned to the pool of its host once the body has been read completely.
+
+  Attributes:
+    code (int): HTTP status code.
+    headers (httplib.HTTPMessage): response headers, which can be looked up
+        case-insensitively with get().
+    url (str): URL of the response, which differs from the requested URL if
+        the request was redirected.
+  """
+
+  # The size of the chunks in which the response body is read.
+  _READ_SIZE = 64 * 1024
+
+  def __init__(self, client, connection_key, connection, response, url):
+    """Initializes a HTTP response.
+
+    Args:
+      client (HTTPClient): client that owns the connection.
+      connection_key (tuple[str, str, int]): scheme, host and port of
+          the connection.
+      connection (httplib.HTTPConnection): connection of the response.
+      response (httplib.HTTPResponse): response.
+      url (str): URL of the response.
+    """
+    super(HTTPResponse, self).__init__()
+    self._buffer = b''
+    self._client = client
+    self._connection = connection
+    self._connection_key = connection_key
+    self._decompressor = None
+    self._end_of_stream = False
+    self._is_first_chunk = True
+    self._response = response
+
+    self.code = response.status
+    self.headers = response.msg
+    self.url = url
+
+    content_encoding = (self.headers.get('Content-Encoding', None) or '')
+    content_encoding = content_encoding.strip().lower()
+    if content_encoding in ('gzip', 'x-gzip'):
+      self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    elif content_encoding == 'deflate':
+      self._decompressor = zlib.decompressobj(zlib.MAX_WBITS)
+
+  def _Decompress(self, data):
+    """Decompresses response body data.
+
+    Args:
+      data (bytes): compressed data.
+
+    Returns:
+      bytes: decompressed data.
+
+    Raises:
+      zlib.error: if the data cannot be decompressed.
+    """
+    is_first_chunk = self._is_first_chunk
+    self._is_first_chunk = False
+
+    try:
+      return self._decompressor.decompress(data)
+
+    except zlib.error:
+      # Some servers send raw deflate data instead of zlib wrapped data.
+      if not is_first_chunk or self.headers.get(
+          'Content-Encoding', '').strip().lower() != 'deflate':
+        raise
+
+      self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+      return self._decompressor.decompress(data)
+
+  def _ReadChunk(self):
+    """Reads the next chunk of the response body.
+
+    Returns:
+      bytes: data of the chunk, which can be empty also if the end of
+          the response body has not been reached.
+
+    Raises:
+      IOError: if the response body cannot be read.
+    """
+    try:
+      data = self._response.read(self._READ_SIZE)
+
+      if not data:
+        self._end_of_stream = True
+        self._client._ReleaseConnection(  # pylint: disable=protected-access
+            self._connection_key, self._connection, self._response)
+        self._connection = None
+
+        if self._decompressor:
+          return self._decompressor.flush()
+
+      elif self._decompressor:
+        return self._Decompress(data)
+
+    except (http_client.HTTPException, socket.error, zlib.error) as exception:
+      self.close()
+      raise IOError('Unable to read response body with error: {0!s}'.format(
+          exception))
+
+    return data
+
+  def close(self):
+    """Closes the response.
+
+    If the response body has not been read completely, the connection is
+    closed instead of returned to the pool.
+    """
+    if self._connection:
+      self._connection.close()
+      self._connection = None
+
+    self._end_of_stream = True
+    self._buffer = b''
+
+  def getcode(self):
+    """Retrieves the HTTP status code.
+
+    Returns:
+      int: HTTP status code.
+    """
+    return self.code
+
+  def info(self):
+    """Retrieves the response headers.
+
+    Returns:
+      httplib.HTTPMessage: response headers.
+    """
+    return self.headers
+
+  def read(self, size=-1):
+    """Reads the response body.
+
+    Args:
+      size (Optional[int]): maximum number of bytes to read, where a negative
+          value or None represents all remaining data.
+
+    Returns:
+      bytes: data of the response body, which is empty if the end of
+          the response body has been reached.
+
+    Raises:
+      IOError: if the response body cannot be read.
+    """
+    if size is None or size < 0:
+      chunks = [self._buffer]
+      while not self._end_of_stream:
+        chunks.append(self._ReadChunk())
+
+      self._buffer = b''
+      return b''.join(chunks)
+
+    while len(self._buffer) < size and not self._end_of_stream:
+      self._buffer += self._ReadChunk()
+
+    data = self._buffer[:size]
+    self._buffer = self._buffer[size:]
+    return data
+
+
+class HTTPClient(object):
+  """HTTP client with persistent connections.
+
+  The client keeps a pool of idle keep-alive connections per scheme, host
+  and port, so that consecutive requests to the same host do not need to
+  set up a new TCP connection and TLS session. Requests that fail with
+  a connection error or a transient HTTP status code are retried with
+  an exponential backoff with random jitter. Redirects are followed and
+  proxies are determined from the environment, like urllib does.
+
+  The client can be used by multiple threads. Pooled connections are not
+  shared with child processes, which open their own connections.
+  """
+
+  DEFAULT_MAXIMUM_NUMBER_OF_RETRIES = 3
+
+  DEFAULT_TIMEOUT = 60.0
+
+  # The HTTP methods that can be retried without side effects.
+  _IDEMPOTENT_METHODS = frozenset([
+      'DELETE', 'GET', 'HEAD', 'OPTIONS', 'PUT'])
+
+  # The maximum number of seconds to wait before retrying a request.
+  _MAXIMUM_BACKOFF = 60.0
+
+  # The maximum number of seconds a connection is kept idle in the pool.
+  # Servers typically close idle keep-alive connections after 5 to 60
+  # seconds.
+  _MAXIMUM_IDLE_TIME = 30.0
+
+  _MAXIMUM_IDLE_CONNECTIONS_PER_HOST = 8
+
+  _MAXIMUM_NUMBER_OF_REDIRECTS = 10
+
+  _REDIRECT_STATUS_CODES = frozenset([301, 302, 303, 307, 308])
+
+  # The HTTP status codes that indicate a transient error.
+  _RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+
+  _USER_AGENT = 'l2tdevtools/{0:s}'.format(l2tdevtools.__version__)
+
+  def __init__(
+      self, backoff_factor=0.5,
+      maximum_number_of_retries=DEFAULT_MAXIMUM_NUMBER_OF_RETRIES,
+      timeout=DEFAULT_TIMEOUT):
+    """Initializes a HTTP client.
+
+    Args:
+      backoff_factor (Optional[float]): number of seconds of the backoff
+          before the first retry, which doubles for every next retry.
+      maximum_number_of_retries (Optional[int]): maximum number of times
+          a request is retried after a transient error.
+      timeout (Optional[float]): number of seconds to wait for a connection
+          to be established or data to be received.
+    """
+    super(HTTPClient, self).__init__()
+    self._backoff_factor = backoff_factor
+    self._idle_connections = {}
+    self._lock = threading.Lock()
+    self._maximum_number_of_retries = maximum_number_of_retries
+    self._process_identifier = os.getpid()
+    self._ssl_context = None
+    self._statistics = {}
+    self._timeout = timeout
+
+  def _GetBackoff(self, retry_number, retry_after=None):
+    """Determines the number of seconds to wait before retrying a request.
+
+    Args:
+      retry_number (int): number of the retry, where 0 represents the first
+          retry.
+      retry_after (Optional[str]): value of the Retry-After header of
+          the response.
+
+    Returns:
+      float: number of seconds to wait.
+    """
+    maximum_backoff = min(
+        self._MAXIMUM_BACKOFF, self._backoff_factor * (2 ** retry_number))
+
+    # Random jitter prevents concurrent clients from retrying in lockstep.
+    backoff = random.uniform(0.0, maximum_backoff)
+
+    if retry_after and retry_after.strip().isdigit():
+      backoff = max(backoff, min(
+          self._MAXIMUM_BACKOFF, float(retry_after.strip())))
+
+    return backoff
+
+  def _GetConnection(self, connection_key, reuse=True):
+    """Retrieves a connection from the pool or opens a new connection.
+
+    Args:
+      connection_key (tuple[str, str, int]): scheme, host and port.
+      reuse (Optional[bool]): True if a connection from the pool can be
+          reused.
+
+    Returns:
+      tuple[httplib.HTTPConnection, bool]: connection and True if
+          the connection was reused from the pool.
+    """
+    with self._lock:
+      if self._process_identifier != os.getpid():
+        # The connections of the parent process cannot be shared.
+        self._idle_connections = {}
+        self._process_identifier = os.getpid()
+
+      idle_connections = []
+      if reuse:
+        idle_connections = self._idle_connections.get(connection_key, [])
+
+      while idle_connections:
+        connection, idle_time = idle_connections.pop()
+        if time.time() - idle_time < self._MAXIMUM_IDLE_TIME:
+          return connection, True
+
+        connection.close()
+
+    return self._NewConnection(connection_key), False
+
+  def _GetHostStatistics(self, host):
+    """Retrieves the statistics of a host.
+
+    Args:
+      host (str): host and port if not the default port.
+
+    Returns:
+      HTTPHostStatistics: statistics of the host.
+    """
+    host_statistics = self._statistics.get(host, None)
+    if not host_statistics:
+      host_statistics = HTTPHostStatistics()
+      self._statistics[host] = host_statistics
+
+    return host_statistics
+
+  def _GetSSLContext(self):
+    """Retrieves the SSL context of HTTPS connections.
+
+    Returns:
+      ssl.SSLContext: SSL context, which is shared by all connections so
+          that TLS sessions can be resumed.
+    """
+    if not self._ssl_context:
+      self._ssl_context = ssl.create_default_context()
+    return self._ssl_context
+
+  def _GetProxyURL(self, scheme, host):
+    """Retrieves the URL of the proxy from the environment.
+
+    Args:
+      scheme (str): scheme, such as "https".
+      host (str): host.
+
+    Returns:
+      str: URL of the proxy or None if no proxy is used for the host.
+    """
+    if urllib_request.proxy_bypass(host):
+      return None
+
+    return urllib_request.getproxies().get(scheme, None)
+
+  def _DiscardResponse(self, response):
+    """Discards a response that is not returned to the caller.
+
+    A small response body is read, so that the connection can be reused.
+
+    Args:
+      response (HTTPResponse): response.
+    """
+    content_length = response.headers.get('Content-Length', None) or ''
+    if content_length.isdigit() and int(content_length, 10) <= 64 * 1024:
+      try:
+        response.read()
+        return
+      except IOError:
+        pass
+
+    response.close()
+
+  def _NewConnection(self, connection_key):
+    """Opens a new connection.
+
+    Args:
+      connection_key (tuple[str, str, int]): scheme, host and port.
+
+    Returns:
+      httplib.HTTPConnection: connection.
+    """
+    scheme, host, port = connection_key
+
+    proxy_url = self._GetProxyURL(scheme, host)
+    if proxy_url:
+      proxy_url = urllib_parse.urlsplit(proxy_url)
+      connection_host = proxy_url.hostname
+      connection_port = proxy_url.port or 80
+    else:
+      connection_host = host
+      connection_port = port
+
+    if scheme == 'https':
+      connection = http_client.HTTPSConnection(
+          connection_host, connection_port, timeout=self._timeout,
+          context=self._GetSSLContext())
+      if proxy_url:
+        connection.set_tunnel(host, port)
+
+    else:
+      connection = http_client.HTTPConnection(
+          connection_host, connection_port, timeout=self._timeout)
+
+    return connection
+
+  def _ReleaseConnection(self, connection_key, connection, response):
+    """Returns a connection to the pool after its response was read.
+
+    Args:
+      connection_key (tuple[str, str, int]): scheme, host and port.
+      connection (httplib.HTTPConnection): connection.
+      response (httplib.HTTPResponse): response that was read completely.
+    """
+    if not connection:
+      return
+
+    if response.will_close:
+      connection.close()
+      return
+
+    with self._lock:
+      if self._process_identifier == os.getpid():
+        idle_connections = self._idle_connections.setdefault(
+            connection_key, [])
+        if len(idle_connections) < self._MAXIMUM_IDLE_CONNECTIONS_PER_HOST:
+          idle_connections.append((connection, time.time()))
+          return
+
+    connection.close()
+
+  def _SendRequest(self, url, method, data, headers):
+    """Sends a single request.
+
+    A request with an idempotent method on a pooled connection that
+    the server has closed in the meantime is sent again on a new connection.
+    A request with a non-idempotent method, such as POST, is always sent on
+    a new connection, so that it is never sent twice.
+
+    Args:
+      url (str): URL.
+      method (str): HTTP method.
+      data (bytes): request body or None.
+      headers (dict[str, str]): request headers.
+
+    Returns:
+      HTTPResponse: response.
+
+    Raises:
+      ValueError: if the URL is not supported.
+      httplib.HTTPException: if the request failed.
+      socket.error: if the request failed.
+    """
+    url_segments = urllib_parse.urlsplit(url)
+    scheme = url_segments.scheme.lower()
+    if scheme not in ('http', 'https') or not url_segments.hostname:
+      raise ValueError('Unsupported URL: {0:s}'.format(url))
+
+    default_port = 443 if scheme == 'https' else 80
+    connection_key = (
+        scheme, url_segments.hostname, url_segments.port or default_port)
+
+    path = url_segments.path or '/'
+    if url_segments.query:
+      path = '{0:s}?{1:s}'.format(path, url_segments.query)
+
+    # Plain HTTP requests to a proxy contain the URL instead of the path.
+    if scheme == 'http' and self._GetProxyURL(scheme, url_segments.hostname):
+      path = urllib_parse.urlunsplit((
+          url_segments.scheme, url_segments.netloc, path, '', ''))
+
+    host_statistics_key = url_segments.netloc.lower()
+    is_idempotent = method in self._IDEMPOTENT_METHODS
+
+    while True:
+      connection, is_reused = self._GetConnection(
+          connection_key, reuse=is_idempotent)
+      if not is_reused:
+        with self._lock:
+          host_statistics = self._GetHostStatistics(host_statistics_key)
+          host_statistics.number_of_connections += 1
+
+      start_time = time.time()
+      try:
+        connection.request(method, path, body=data, headers=headers)
+        response = connection.getresponse()
+
+      except (http_client.HTTPException, socket.error):
+        connection.close()
+        if is_reused and is_idempotent:
+          continue
+        raise
+
+      finally:
+        with self._lock:
+          host_statistics = self._GetHostStatistics(host_statistics_key)
+          host_statistics.latency += time.time() - start_time
+          host_statistics.number_of_requests += 1
+
+      response = HTTPResponse(self, connection_key, connection, response, url)
+
+      # Responses without a body are released without being read.
+      if method == 'HEAD' or response.code in (204, 304):
+        response.read()
+
+      return response
+
+  def Close(self):
+    """Closes the idle connections in the pool."""
+    with self._lock:
+      idle_connections = self._idle_connections
+      self._idle_connections = {}
+
+    for connections in idle_connections.values():
+      for connection, _ in connections:
+        connection.close()
+
+  def GetStatistics(self):
+    """Retrieves the statistics of the requests per host.
+
+    Returns:
+      dict[str, HTTPHostStatistics]: copy of the statistics per host, where
+          the host contains the port if not the default port.
+    """
+    with self._lock:
+      return {
+          host: HTTPHostStatistics(**host_statistics.CopyToDict())
+          for host, host_statistics in self._statistics.items()}
+
+  def Request(
+      self, url, data=None, decompress=True, headers=None, method=None):
+    """Sends a request.
+
+    Unlike urllib, a response with an error status code is returned instead
+    of raised, so that the caller can handle it, for example a 304 response
+    of a conditional request.
+
+    Args:
+      url (str): URL.
+      data (Optional[bytes]): request body, where None represents no body.
+      decompress (Optional[bool]): True if the server can compress
+          the response body, which is decompressed transparently. Should
+          be False for downloads of files and range requests, which need
+          the body as stored on the server.
+      headers (Optional[dict[str, str]]): request headers.
+      method (Optional[str]): HTTP method, where None represents GET or
+          POST if a request body is provided.
+
+    Returns:
+      HTTPResponse: response, which the caller must read completely or
+          close.
+
+    Raises:
+      ConnectivityError: if the request failed after all retries or the URL
+          is not supported.
+    """
+    if not method:
+      method = 'POST' if data is not None else 'GET'
+
+    request_headers = {'User-Agent': self._USER_AGENT}
+    if decompress:
+      request_headers['Accept-Encoding'] = 'gzip, deflate'
+    if headers:
+      request_headers.update(headers)
+
+    number_of_redirects = 0
+    retry_number = 0
+
+    while True:
+      try:
+        response = self._SendRequest(url, method, data, request_headers)
+
+      except ValueError as exception:
+        raise errors.ConnectivityError(
+            'Unable to request URL: {0:s} with error: {1!s}'.format(
+                url, exception))
+
+      except (http_client.HTTPException, socket.error) as exception:
+        host = urllib_parse.urlsplit(url).netloc.lower()
+        with self._lock:
+          self._GetHostStatistics(host).number_of_errors += 1
+
+        # A host name that cannot be resolved is not a transient error and
+        # a request with a non-idempotent method could have been processed.
+        if (isinstance(exception, socket.gaierror) or
+            method not in self._IDEMPOTENT_METHODS or
+            retry_number >= self._maximum_number_of_retries):
+          raise errors.ConnectivityError(
+              'Unable to request URL: {0:s} with error: {1!s}'.format(
+                  url, exception))
+
+        backoff = self._GetBackoff(retry_number)
+        logging.info((
+            'Retrying request of URL: {0:s} in {1:.1f} seconds after '
+            'error: {2!s}').format(url, backoff, exception))
+
+      else:
+        location = response.headers.get('Location', None)
+        if (response.code in self._REDIRECT_STATUS_CODES and location and
+            number_of_redirects < self._MAXIMUM_NUMBER_OF_REDIRECTS):
+          self._DiscardResponse(response)
+
+          url = urllib_parse.urljoin(url, location)
+          number_of_redirects += 1
+
+          if response.code == 303 or (
+              response.code in (301, 302) and method == 'POST'):
+            data = None
+            method = 'GET'
+          continue
+
+        if (response.code not in self._RETRY_STATUS_CODES or
+            method not in self._IDEMPOTENT_METHODS or
+            retry_number >= self._maximum_number_of_retries):
+          return response
+
+        self._DiscardResponse(response)
+
+        backoff = self._GetBackoff(
+            retry_number, retry_after=response.headers.get(
+                'Retry-After', None))
+        logging.info((
+            'Retrying request of URL: {0:s} in {1:.1f} seconds after '
+            'status code: {2:d}').format(url, backoff, response.code))
+
+      host = urllib_parse.urlsplit(url).netloc.lower()
+      with self._lock:
+        self._GetHostStatistics(host).number_of_retries += 1
+
+      time.sleep(backoff)
+      retry_number += 1
+
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def FormatStatistics(statistics):
+  """Formats the statistics of the requests per host as a table.
+
+  Args:
+    statistics (dict[str, HTTPHostStatistics]): statistics per host.
+
+  Returns:
+    str: table with a row per host, sorted by host.
+  """
+  lines = ['{0:<32s} {1:>9s} {2:>12s} {3:>8s} {4:>7s} {5:>12s}'.format(
+      'Host', 'Requests', 'Connections', 'Retries', 'Errors', 'Latency (s)')]
+
+  for host, host_statistics in sorted(statistics.items()):
+    average_latency = host_statistics.GetAverageLatency()
+    if average_latency is None:
+      average_latency = '-'
+    else:
+      average_latency = '{0:.3f}'.format(average_latency)
+
+    lines.append('{0:<32s} {1:>9d} {2:>12d} {3:>8d} {4:>7d} {5:>12s}'.format(
+        host, host_statistics.number_of_requests,
+        host_statistics.number_of_connections,
+        host_statistics.number_of_retries, host_statistics.number_of_errors,
+        average_latency))
+
+  return '\n'.join(lines)
+
+
+def GetHTTPClient():
+  """Retrieves the HTTP client shared by the network code.
+
+  Returns:
+    HTTPClient: HTTP client, which is created with the default settings if
+        no client was set with SetHTTPClient.
+  """
+  global _http_client  # pylint: disable=global-statement
+  with _http_client_lock:
+    if not _http_client:
+      _http_client = HTTPClient()
+
+    return _http_client
+
+
+def SetHTTPClient(http_client_object):
+  """Sets the HTTP client shared by the network code.
+
+  Args:
+    http_client_object (HTTPClient): HTTP client or None to use a client
+        with the default settings.
+  """
+  global _http_client  # pylint: disable=global-statement
+  with _http_client_lock:
+    _http_client = http_client_object
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""Streaming parsers of package repository metadata.
+
+The metadata of package repositories, such as the primary.xml.gz of a yum
+repository and the Sources.gz of a dpkg repository, grows with the number of
+packages in the repository. The parsers read the metadata from a file-like
+object, such as a HTTP response, while it is downloaded and decompressed,
+so that it is never fully held in memory.
+"""
+
+from __future__ import unicode_literals
+
+import io
+import zlib
+
+from xml.etree import ElementTree
+
+
+class GzipDecompressedStream(io.RawIOBase):
+  """Stream that decompresses gzip compressed data while it is read.
+
+  Unlike gzip.GzipFile of Python 2, the stream does not require the
+  compressed file-like object to be seekable.
+  """
+
+  # The size of the chunks in which the compressed data is read.
+  _READ_SIZE = 64 * 1024
+
+  # The window bits value that makes zlib expect a gzip header and trailer.
+  _GZIP_WINDOW_BITS = 16 + zlib.MAX_WBITS
+
+  def __init__(self, file_object):
+    """Initializes a gzip decompressed stream.
+
+    Args:
+      file_object (file): file-like object that contains the gzip compressed
+          data.
+    """
+    super(GzipDecompressedStream, self).__init__()
+    self._decompressed_data = b''
+    self._decompressor = zlib.decompressobj(self._GZIP_WINDOW_BITS)
+    self._end_of_input = False
+    self._file_object = file_object
+
+  def _DecompressNextChunk(self):
+    """Reads and decompresses the next chunk of compressed data.
+
+    Raises:
+      zlib.error: if the compressed data cannot be decompressed.
+    """
+    compressed_data = self._file_object.read(self._READ_SIZE)
+    if not compressed_data:
+      self._end_of_input = True
+      self._decompressed_data = self._decompressor.flush()
+      return
+
+    decompressed_data = self._decompressor.decompress(compressed_data)
+
+    # A gzip file can consist of multiple members, where the data after the
+    # end of a member is the start of the next member.
+    while self._decompressor.unused_data:
+      compressed_data = self._decompressor.unused_data
+      self._decompressor = zlib.decompressobj(self._GZIP_WINDOW_BITS)
+      decompressed_data += self._decompressor.decompress(compressed_data)
+
+    self._decompressed_data = decompressed_data
+
+  def readable(self):
+    """Determines if the stream is readable.
+
+    Returns:
+      bool: True.
+    """
+    return True
+
+  def readinto(self, buffer_object):
+    """Reads decompressed data into a buffer.
+
+    Args:
+      buffer_object (bytearray): buffer to read into.
+
+    Returns:
+      int: number of bytes read, where 0 represents the end of the stream.
+
+    Raises:
+      zlib.error: if the compressed data cannot be decompressed.
+    """
+    while not self._decompressed_data and not self._end_of_input:
+      self._DecompressNextChunk()
+
+    read_size = min(len(buffer_object), len(self._decompressed_data))
+    buffer_object[:read_size] = self._decompressed_data[:read_size]
+    self._decompressed_data = self._decompressed_data[read_size:]
+
+    return read_size
+
+
+def OpenGzipDecompressedStream(file_object):
+  """Opens a buffered stream of the decompressed data of a gzip file.
+
+  Args:
+    file_object (file): file-like object that contains the gzip compressed
+        data.
+
+  Returns:
+    io.BufferedReader: buffered stream of the decompressed data.
+  """
+  return io.BufferedReader(GzipDecompressedStream(file_object))
+
+
+def ReadDeb822Stanzas(file_object, encoding='utf-8'):
+  """Reads the stanzas of a Deb822 file, such as a dpkg Sources file.
+
+  Args:
+    file_object (file): binary file-like object that supports readline().
+    encoding (Optional[str]): encoding of the file.
+
+  Yields:
+    dict[str, str]: values per field name of a stanza, where the lines of
+        a multi-line value are separated by "\\n".
+
+  Raises:
+    UnicodeDecodeError: if a line cannot be decoded.
+  """
+  field_name = None
+  stanza = {}
+
+  for line in iter(file_object.readline, b''):
+    line = line.decode(encoding).rstrip('\r\n')
+
+    if not line.strip():
+      if stanza:
+        yield stanza
+
+      field_name = None
+      stanza = {}
+
+    elif line[0] in (' ', '\t'):
+      # A line that starts with white space continues the value of the
+      # previous field.
+      if field_name:
+        stanza[field_name] = '\n'.join([stanza[field_name], line.strip()])
+
+    else:
+      field_name, _, value = line.partition(':')
+      field_name = field_name.strip()
+      stanza[field_name] = value.strip()
+
+  if stanza:
+    yield stanza
+
+
+def ReadRPMPrimaryPackages(file_object):
+  """Reads the packages of a yum repository primary.xml file.
+
+  Every package element is discarded after it has been read, so that only
+  the element of the current package is held in memory.
+
+  Args:
+    file_object (file): binary file-like object that contains the XML.
+
+  Yields:
+    tuple[str, str, str]: name, architecture and version of a package, where
+        a value is None if not available.
+
+  Raises:
+    SyntaxError: if the XML cannot be parsed, where ElementTree.ParseError is
+        a subclass of SyntaxError.
+  """
+  namespace = '{http://linux.duke.edu/metadata/common}'
+  package_tag = '{0:s}package'.format(namespace)
+
+  root_element = None
+  for event, element in ElementTree.iterparse(
+      file_object, events=('start', 'end')):
+    if root_element is None:
+      root_element = element
+
+    if event != 'end' or element.tag != package_tag:
+      continue
+
+    name = element.findtext('{0:s}name'.format(namespace))
+    architecture = element.findtext('{0:s}arch'.format(namespace))
+
+    version = None
+    version_element = element.find('{0:s}version'.format(namespace))
+    # Note explicitly checking xml.Element against None because of deprecation
+    # warning.
+    if version_element is not None:
+      version = version_element.get('ver', None)
+
+    yield name, architecture, version
+
+    # Remove the package elements that have been read from the root element.
+    root_element.clear()
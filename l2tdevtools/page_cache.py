@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""Persistent on-disk cache of downloaded page content."""
+
+from __future__ import unicode_literals
+
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import time
+
+
+class PageCacheEntry(object):
+  """Page cache entry.
+
+  Attributes:
+    etag (str): value of the ETag header of the response or None if not set.
+    last_modified (str): value of the Last-Modified header of the response
+        or None if not set.
+    link (str): value of the Link header of the response, which contains
+        the URLs of the other pages of paginated content, or None if not set.
+    page_content (bytes): page content.
+    timestamp (float): POSIX timestamp of when the page content was last
+        downloaded or revalidated.
+    url (str): URL of the page.
+  """
+
+  def __init__(self, url):
+    """Initializes a page cache entry.
+
+    Args:
+      url (str): URL of the page.
+    """
+    super(PageCacheEntry, self).__init__()
+    self.etag = None
+    self.last_modified = None
+    self.link = None
+    self.page_content = b''
+    self.timestamp = 0.0
+    self.url = url
+
+
+class PageCache(object):
+  """Persistent on-disk cache of downloaded page content.
+
+  Every entry is stored as a pair of files named after the SHA-256 digest of
+  the URL, one that contains the page content and one that contains the
+  metadata in JSON. The modification time of the content file is updated
+  every time the entry is read and used to evict the least recently used
+  entries when the size of the cache exceeds the maximum size.
+
+  Attributes:
+    offline (bool): True if stale entries should be used instead of
+        downloading or revalidating the page content.
+  """
+
+  _CONTENT_FILE_EXTENSION = '.data'
+  _METADATA_FILE_EXTENSION = '.json'
+
+  # The default maximum age of an entry before it needs to be revalidated.
+  DEFAULT_TIME_TO_LIVE = 60 * 60
+
+  # The default maximum size of the page content in the cache.
+  DEFAULT_MAXIMUM_SIZE = 64 * 1024 * 1024
+
+  def __init__(
+      self, path, maximum_size=DEFAULT_MAXIMUM_SIZE, offline=False,
+      time_to_live=DEFAULT_TIME_TO_LIVE):
+    """Initializes a page cache.
+
+    Args:
+      path (str): path of the directory that contains the cache.
+      maximum_size (Optional[int]): maximum size of the page content in
+          the cache in bytes.
+      offline (Optional[bool]): True if stale entries should be used instead
+          of downloading or revalidating the page content.
+      time_to_live (Optional[int]): maximum age of an entry in seconds before
+          it needs to be revalidated.
+    """
+    super(PageCache, self).__init__()
+    self._maximum_size = maximum_size
+    self._path = path
+    self._time_to_live = time_to_live
+
+    self.offline = offline
+
+  def _GetPaths(self, url):
+    """Retrieves the paths of the files of an entry.
+
+    Args:
+      url (str): URL of the page.
+
+    Returns:
+      tuple[str, str]: path of the content and metadata file.
+    """
+    digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    path = os.path.join(self._path, digest)
+    return (
+        '{0:s}{1:s}'.format(path, self._CONTENT_FILE_EXTENSION),
+        '{0:s}{1:s}'.format(path, self._METADATA_FILE_EXTENSION))
+
+  def _WriteFile(self, path, data):
+    """Writes a file atomically.
+
+    The data is first written to a temporary file in the cache directory,
+    which is then renamed, so that concurrent readers never see a partially
+    written file.
+
+    Args:
+      path (str): path of the file.
+      data (bytes): data to write.
+    """
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=self._path)
+    try:
+      with os.fdopen(file_descriptor, 'wb') as file_object:
+        file_object.write(data)
+
+      # os.rename() does not overwrite an existing file on Windows.
+      if os.name == 'nt' and os.path.exists(path):
+        os.remove(path)
+      os.rename(temporary_path, path)
+
+    except (IOError, OSError):
+      if os.path.exists(temporary_path):
+        os.remove(temporary_path)
+      raise
+
+  def _EvictEntries(self):
+    """Removes the least recently used entries that exceed the maximum size."""
+    content_files = []
+    total_size = 0
+    for filename in os.listdir(self._path):
+      if not filename.endswith(self._CONTENT_FILE_EXTENSION):
+        continue
+
+      path = os.path.join(self._path, filename)
+      try:
+        stat_object = os.stat(path)
+      except OSError:
+        continue
+
+      content_files.append((stat_object.st_mtime, stat_object.st_size, path))
+      total_size += stat_object.st_size
+
+    for _, size, path in sorted(content_files):
+      if total_size <= self._maximum_size:
+        break
+
+      metadata_path = '{0:s}{1:s}'.format(
+          path[:-len(self._CONTENT_FILE_EXTENSION)],
+          self._METADATA_FILE_EXTENSION)
+
+      for path_to_remove in (path, metadata_path):
+        try:
+          os.remove(path_to_remove)
+        except OSError:
+          pass
+
+      total_size -= size
+
+  def GetEntry(self, url):
+    """Retrieves an entry from the cache.
+
+    Args:
+      url (str): URL of the page.
+
+    Returns:
+      PageCacheEntry: entry or None if the cache does not contain the page.
+    """
+    content_path, metadata_path = self._GetPaths(url)
+    try:
+      with io.open(metadata_path, 'r', encoding='utf-8') as file_object:
+        metadata = json.load(file_object)
+
+      with open(content_path, 'rb') as file_object:
+        page_content = file_object.read()
+
+    except (IOError, OSError, ValueError):
+      return None
+
+    if metadata.get('url', None) != url:
+      return None
+
+    try:
+      # Mark the entry as recently used.
+      os.utime(content_path, None)
+    except OSError:
+      pass
+
+    entry = PageCacheEntry(url)
+    entry.etag = metadata.get('etag', None)
+    entry.last_modified = metadata.get('last_modified', None)
+    entry.link = metadata.get('link', None)
+    entry.page_content = page_content
+    entry.timestamp = metadata.get('timestamp', 0.0)
+    return entry
+
+  def IsFresh(self, entry):
+    """Determines if an entry can be used without revalidation.
+
+    Args:
+      entry (PageCacheEntry): entry.
+
+    Returns:
+      bool: True if the entry can be used without revalidation.
+    """
+    if self.offline:
+      return True
+
+    age = time.time() - entry.timestamp
+    return 0 <= age < self._time_to_live
+
+  def StoreEntry(self, entry):
+    """Stores an entry in the cache.
+
+    The timestamp of the entry is set to the current time.
+
+    Args:
+      entry (PageCacheEntry): entry.
+
+    Returns:
+      bool: True if the entry was stored or False on error.
+    """
+    entry.timestamp = time.time()
+
+    if len(entry.page_content) > self._maximum_size:
+      return False
+
+    metadata = {
+        'etag': entry.etag,
+        'last_modified': entry.last_modified,
+        'link': entry.link,
+        'timestamp': entry.timestamp,
+        'url': entry.url}
+
+    content_path, metadata_path = self._GetPaths(entry.url)
+    try:
+      if not os.path.exists(self._path):
+        os.makedirs(self._path)
+
+      self._WriteFile(content_path, entry.page_content)
+      self._WriteFile(
+          metadata_path, json.dumps(metadata, sort_keys=True).encode('utf-8'))
+
+      self._EvictEntries()
+
+    except (IOError, OSError) as exception:
+      logging.warning(
+          'Unable to store page content of URL: {0:s} in cache with error: '
+          '{1!s}'.format(entry.url, exception))
+      return False
+
+    return True
@@ -3,9 +3,14 @@
 
 from __future__ import unicode_literals
 
+import hashlib
+import io
+import json
 import logging
+import os
 import re
 import sys
+import tempfile
 
 try:
   import ConfigParser as configparser
@@ -23,7 +28,9 @@ class ProjectDefinition(object):
         dependent.
     build_dependencies (list[str]): build dependencies.
     build_options (list[str]): build options. Current supported build options
-        are: python2_only (to only build for Python version 2).
+        are: no_compiler_cache (to not use the compiler cache),
+        no_parallel_make (to run make with a single job) and python2_only
+        (to only build for Python version 2).
     build_system (str): build system.
     configure_options (list[str]): configure options.
     description_long (str): long description of the project.
@@ -377,3 +384,254 @@ class ProjectDefinitionReader(object):
 
       project_definition.version = ProjectVersionDefinition(
           project_definition.version)
+
+
+class ProjectDefinitionIndex(object):
+  """Index of the project definitions in a projects.ini file.
+
+  Parsing the projects.ini file with the configuration parser is relatively
+  expensive. Therefore the values of the project definitions are stored in
+  an index file, which is used instead of the projects.ini file as long as
+  the projects.ini file does not change. A change is detected by its
+  modification time and size and confirmed by its SHA-256 digest.
+
+  The project definitions are only created from the values in the index
+  when they are looked up.
+  """
+
+  _FORMAT_VERSION = 1
+
+  _READ_BUFFER_SIZE = 64 * 1024
+
+  def __init__(self, path, index_path=None):
+    """Initializes a project definition index.
+
+    Args:
+      path (str): path of the projects.ini file.
+      index_path (Optional[str]): path of the index file, where None
+          represents the default index file in the l2tdevtools cache
+          directory of the user.
+    """
+    super(ProjectDefinitionIndex, self).__init__()
+    self._index_path = index_path or self._GetDefaultIndexPath(path)
+    self._names = None
+    self._path = path
+    self._project_definitions = {}
+    self._values_per_name = None
+
+  def _CalculateFileDigest(self, path):
+    """Calculates the SHA-256 digest of a file.
+
+    Args:
+      path (str): path of the file.
+
+    Returns:
+      str: SHA-256 digest in hexadecimal representation.
+    """
+    hash_context = hashlib.sha256()
+    with open(path, 'rb') as file_object:
+      data = file_object.read(self._READ_BUFFER_SIZE)
+      while data:
+        hash_context.update(data)
+        data = file_object.read(self._READ_BUFFER_SIZE)
+
+    return hash_context.hexdigest()
+
+  def _GetDefaultIndexPath(self, path):
+    """Retrieves the path of the default index file.
+
+    Args:
+      path (str): path of the projects.ini file.
+
+    Returns:
+      str: path of the index file, which is specific to the location of
+          the projects.ini file.
+    """
+    cache_path = os.environ.get('XDG_CACHE_HOME', None)
+    if not cache_path:
+      cache_path = os.path.join(os.path.expanduser('~'), '.cache')
+
+    path_digest = hashlib.sha256(
+        os.path.abspath(path).encode('utf-8')).hexdigest()
+
+    return os.path.join(
+        cache_path, 'l2tdevtools', 'projects-{0:s}.json'.format(
+            path_digest[:16]))
+
+  def _GetValues(self, project_definition):
+    """Retrieves the values of a project definition.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+
+    Returns:
+      dict[str, object]: JSON serializable values per attribute name.
+    """
+    values = dict(vars(project_definition))
+
+    version = values.get('version', None)
+    if isinstance(version, ProjectVersionDefinition):
+      values['version'] = getattr(version, 'version_string', None)
+
+    return values
+
+  def _ReadIndexFile(self, file_stat):
+    """Reads the index file.
+
+    Args:
+      file_stat (os.stat_result): stat information of the projects.ini file.
+
+    Returns:
+      dict[str, object]: index or None if the index file does not exist or
+          is out of date.
+    """
+    if not os.path.exists(self._index_path):
+      return None
+
+    try:
+      with io.open(self._index_path, 'r', encoding='utf-8') as file_object:
+        index = json.load(file_object)
+
+    except (IOError, ValueError) as exception:
+      logging.warning(
+          'Unable to read project definition index: {0:s} with error: '
+          '{1!s}'.format(self._index_path, exception))
+      return None
+
+    if (not isinstance(index, dict) or
+        index.get('format_version', None) != self._FORMAT_VERSION):
+      return None
+
+    if (index.get('modification_time', None) == file_stat.st_mtime and
+        index.get('size', None) == file_stat.st_size):
+      return index
+
+    # The modification time changes when a file is checked out again,
+    # hence the content is compared before the index is rebuilt.
+    if index.get('sha256', None) != self._CalculateFileDigest(self._path):
+      return None
+
+    index['modification_time'] = file_stat.st_mtime
+    index['size'] = file_stat.st_size
+    self._WriteIndexFile(index)
+
+    return index
+
+  def _WriteIndexFile(self, index):
+    """Writes the index file.
+
+    Args:
+      index (dict[str, object]): index.
+    """
+    data = json.dumps(index, sort_keys=True).encode('utf-8')
+
+    directory = os.path.dirname(os.path.abspath(self._index_path))
+    try:
+      if not os.path.exists(directory):
+        os.makedirs(directory)
+
+      file_descriptor, temporary_path = tempfile.mkstemp(
+          dir=directory, prefix='.tmp')
+      with os.fdopen(file_descriptor, 'wb') as file_object:
+        file_object.write(data)
+
+      # os.rename() does not overwrite an existing file on Windows.
+      if os.name == 'nt' and os.path.exists(self._index_path):
+        os.remove(self._index_path)
+      os.rename(temporary_path, self._index_path)
+
+    except (IOError, OSError) as exception:
+      logging.warning(
+          'Unable to write project definition index: {0:s} with error: '
+          '{1!s}'.format(self._index_path, exception))
+
+  def _Load(self):
+    """Loads the index and rebuilds it if the projects.ini file changed."""
+    if self._values_per_name is not None:
+      return
+
+    file_stat = os.stat(self._path)
+
+    index = self._ReadIndexFile(file_stat)
+    if not index:
+      index = {
+          'format_version': self._FORMAT_VERSION,
+          'modification_time': file_stat.st_mtime,
+          'names': [],
+          'project_definitions': {},
+          'sha256': self._CalculateFileDigest(self._path),
+          'size': file_stat.st_size}
+
+      with io.open(self._path, 'r', encoding='utf-8') as file_object:
+        project_definition_reader = ProjectDefinitionReader()
+        for project_definition in project_definition_reader.Read(
+            file_object):
+          index['names'].append(project_definition.name)
+          index['project_definitions'][project_definition.name] = (
+              project_definition)
+
+      for name, project_definition in index['project_definitions'].items():
+        self._project_definitions[name] = project_definition
+        index['project_definitions'][name] = self._GetValues(
+            project_definition)
+
+      self._WriteIndexFile(index)
+
+    self._names = index['names']
+    self._values_per_name = index['project_definitions']
+
+  def GetNames(self):
+    """Retrieves the names of the projects.
+
+    Returns:
+      list[str]: names of the projects in the order of the projects.ini file.
+    """
+    self._Load()
+    return list(self._names)
+
+  def GetProjectDefinition(self, name):
+    """Retrieves a project definition.
+
+    Args:
+      name (str): name of the project.
+
+    Returns:
+      ProjectDefinition: project definition or None if not defined.
+    """
+    self._Load()
+
+    project_definition = self._project_definitions.get(name, None)
+    if not project_definition:
+      values = self._values_per_name.get(name, None)
+      if values is None:
+        return None
+
+      project_definition = ProjectDefinition(name)
+      for attribute_name, value in values.items():
+        if attribute_name == 'version':
+          value = ProjectVersionDefinition(value)
+        setattr(project_definition, attribute_name, value)
+
+      self._project_definitions[name] = project_definition
+
+    return project_definition
+
+  def GetProjectDefinitions(self, names=None):
+    """Retrieves project definitions.
+
+    Args:
+      names (Optional[list[str]]): names of the projects, where None
+          represents all projects.
+
+    Returns:
+      list[ProjectDefinition]: project definitions in the order of
+          the projects.ini file, where undefined projects are ignored.
+    """
+    self._Load()
+
+    if names is not None:
+      names = set(names)
+
+    return [
+        self.GetProjectDefinition(name) for name in self._names
+        if names is None or name in names]
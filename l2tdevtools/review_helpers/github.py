@@ -3,10 +3,9 @@
 
 from __future__ import unicode_literals
 
-import json
 import logging
 
-from l2tdevtools.review_helpers import url_lib
+from l2tdevtools import github_api
 from l2tdevtools.lib import errors
 
 
@@ -24,7 +23,7 @@ class GitHubHelper(object):
 
     self._organization = organization
     self._project = project
-    self._url_lib_helper = url_lib.URLLibHelper()
+    self._github_api_client = github_api.GitHubAPIClient()
 
   def AssignPullRequest(
       self, pull_request_number, access_token, assignees):
@@ -40,16 +39,12 @@ class GitHubHelper(object):
     Returns:
       bool: True if the assignees were successfully added.
     """
-    post_data = json.dumps({"assignees": assignees})
-
-    github_url = (
-        'https://api.github.com/repos/{0:s}/{1:s}/issues/{2:d}/'
-        'assignees?access_token={3:s}').format(
-            self._organization, self._project, pull_request_number,
-            access_token)
+    path = 'repos/{0:s}/{1:s}/issues/{2:d}/assignees'.format(
+        self._organization, self._project, pull_request_number)
 
     try:
-      self._url_lib_helper.Request(github_url, post_data=post_data)
+      self._github_api_client.PostJSON(
+          path, {'assignees': assignees}, access_token=access_token)
 
     except errors.ConnectivityError:
       return False
@@ -72,25 +67,18 @@ class GitHubHelper(object):
     Raises:
       ConnectivityError: if there's an error communicating with GitHub.
     """
-    post_data = (
-        '{{\n'
-        '  "title": "{0:s}",\n'
-        '  "body": "{1:s}",\n'
-        '  "head": "{2:s}",\n'
-        '  "base": "master"\n'
-        '}}\n').format(title, body, origin)
-
-    github_url = (
-        'https://api.github.com/repos/{0:s}/{1:s}/pulls?'
-        'access_token={2:s}').format(
-            self._organization, self._project, access_token)
+    json_data = {
+        'title': title,
+        'body': body,
+        'head': origin,
+        'base': 'master'}
 
-    response_data = self._url_lib_helper.Request(
-        github_url, post_data=post_data)
+    path = 'repos/{0:s}/{1:s}/pulls'.format(self._organization, self._project)
 
-    response_data = json.loads(response_data)
+    response_data = self._github_api_client.PostJSON(
+        path, json_data, access_token=access_token)
 
-    pull_request_number = response_data.get('number')
+    pull_request_number = (response_data or {}).get('number')
 
     return pull_request_number
 
@@ -106,16 +94,12 @@ class GitHubHelper(object):
     Returns:
       bool: True if the review was created.
     """
-    post_data = json.dumps({"reviewers": reviewers})
-
-    github_url = (
-        'https://api.github.com/repos/{0:s}/{1:s}/pulls/{2:d}/'
-        'requested_reviewers?access_token={3:s}').format(
-            self._organization, self._project, pull_request_number,
-            access_token)
+    path = 'repos/{0:s}/{1:s}/pulls/{2:d}/requested_reviewers'.format(
+        self._organization, self._project, pull_request_number)
 
     try:
-      self._url_lib_helper.Request(github_url, post_data=post_data)
+      self._github_api_client.PostJSON(
+          path, {'reviewers': reviewers}, access_token=access_token)
 
     except errors.ConnectivityError:
       return False
@@ -142,19 +126,15 @@ class GitHubHelper(object):
     Returns:
       str: GitHub user name or None if not available.
     """
-    github_url = (
-        'https://api.github.com/user?access_token={0:s}').format(
-            access_token)
-
     try:
-      response_data = self._url_lib_helper.Request(github_url)
+      response_data = self._github_api_client.GetJSON(
+          'user', access_token=access_token)
     except errors.ConnectivityError:
       return None
 
     if not response_data:
       return None
 
-    response_data = json.loads(response_data)
     return response_data.get('login', None)
 
   def QueryUser(self, username):
@@ -166,16 +146,13 @@ class GitHubHelper(object):
     Returns:
       dict[str,object]: JSON response or None if not available.
     """
-    github_url = 'https://api.github.com/users/{0:s}'.format(username)
+    path = 'users/{0:s}'.format(username)
 
     try:
-      response_data = self._url_lib_helper.Request(github_url)
+      response_data = self._github_api_client.GetJSON(path)
 
     except errors.ConnectivityError as exception:
       logging.warning('{0!s}'.format(exception))
       return None
 
-    if response_data:
-      return json.loads(response_data)
-
-    return None
+    return response_data or None
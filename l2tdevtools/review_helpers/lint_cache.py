@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""Cache of the files that passed code inspection."""
+
+from __future__ import unicode_literals
+
+import hashlib
+import io
+import json
+import logging
+import os
+import time
+
+
+class LintResultCache(object):
+  """Cache of the files that passed code inspection.
+
+  A file is identified by the name of the inspection tool, the digest of
+  the content of the file and the digest of the configuration file of
+  the tool. Only files that passed inspection are cached, so that files
+  with problems are always inspected again and their problems reported.
+  """
+
+  # The maximum number of entries retained in the cache file.
+  _MAXIMUM_NUMBER_OF_ENTRIES = 10000
+
+  _READ_BUFFER_SIZE = 64 * 1024
+
+  def __init__(self, path):
+    """Initializes a lint result cache.
+
+    Args:
+      path (str): path of the cache file.
+    """
+    super(LintResultCache, self).__init__()
+    self._entries = None
+    self._file_digests = {}
+    self._path = path
+
+  def _CalculateFileDigest(self, path):
+    """Calculates the SHA-256 digest of a file.
+
+    Args:
+      path (str): path of the file.
+
+    Returns:
+      str: SHA-256 digest in hexadecimal representation or None if the file
+          cannot be read.
+    """
+    path = os.path.abspath(path)
+    if path not in self._file_digests:
+      hash_context = hashlib.sha256()
+      try:
+        with open(path, 'rb') as file_object:
+          data = file_object.read(self._READ_BUFFER_SIZE)
+          while data:
+            hash_context.update(data)
+            data = file_object.read(self._READ_BUFFER_SIZE)
+
+      except IOError:
+        return None
+
+      self._file_digests[path] = hash_context.hexdigest()
+
+    return self._file_digests[path]
+
+  def _GetEntries(self):
+    """Retrieves the entries of the cache.
+
+    Returns:
+      dict[str, float]: POSIX timestamp of when the entry was last used
+          per key.
+    """
+    if self._entries is None:
+      self._entries = {}
+
+      if os.path.exists(self._path):
+        try:
+          with io.open(self._path, 'r', encoding='utf-8') as file_object:
+            entries = json.load(file_object)
+
+          if isinstance(entries, dict):
+            self._entries = entries
+
+        except (IOError, ValueError) as exception:
+          logging.warning(
+              'Unable to read lint result cache: {0:s} with error: '
+              '{1!s}'.format(self._path, exception))
+
+    return self._entries
+
+  def _GetKey(self, tool_name, filename, rcfile):
+    """Retrieves the key of a file.
+
+    Args:
+      tool_name (str): name of the inspection tool.
+      filename (str): name of the file.
+      rcfile (str): path of the configuration file of the tool.
+
+    Returns:
+      str: key or None if the file cannot be read.
+    """
+    file_digest = self._CalculateFileDigest(filename)
+    if not file_digest:
+      return None
+
+    rcfile_digest = ''
+    if rcfile:
+      rcfile_digest = self._CalculateFileDigest(rcfile) or ''
+
+    return '{0:s}:{1:s}:{2:s}'.format(tool_name, file_digest, rcfile_digest)
+
+  def HasPassed(self, tool_name, filename, rcfile):
+    """Determines if a file passed inspection before.
+
+    Args:
+      tool_name (str): name of the inspection tool.
+      filename (str): name of the file.
+      rcfile (str): path of the configuration file of the tool.
+
+    Returns:
+      bool: True if the same content of the file passed inspection with
+          the same configuration file before.
+    """
+    key = self._GetKey(tool_name, filename, rcfile)
+    entries = self._GetEntries()
+    if not key or key not in entries:
+      return False
+
+    entries[key] = time.time()
+    return True
+
+  def SetPassed(self, tool_name, filename, rcfile):
+    """Marks a file as passed inspection.
+
+    Args:
+      tool_name (str): name of the inspection tool.
+      filename (str): name of the file.
+      rcfile (str): path of the configuration file of the tool.
+    """
+    key = self._GetKey(tool_name, filename, rcfile)
+    if key:
+      self._GetEntries()[key] = time.time()
+
+  def Write(self):
+    """Writes the cache file.
+
+    Returns:
+      bool: True if the cache file was written or False on error.
+    """
+    entries = self._GetEntries()
+    if len(entries) > self._MAXIMUM_NUMBER_OF_ENTRIES:
+      keys = sorted(entries.keys(), key=entries.get, reverse=True)
+      for key in keys[self._MAXIMUM_NUMBER_OF_ENTRIES:]:
+        del entries[key]
+
+    data = json.dumps(entries, sort_keys=True)
+    try:
+      directory = os.path.dirname(os.path.abspath(self._path))
+      if not os.path.exists(directory):
+        os.makedirs(directory)
+
+      with io.open(self._path, 'w', encoding='utf-8') as file_object:
+        file_object.write('{0:s}'.format(data))
+
+    except (IOError, OSError) as exception:
+      logging.warning(
+          'Unable to write lint result cache: {0:s} with error: {1!s}'.format(
+              self._path, exception))
+      return False
+
+    return True
@@ -4,8 +4,11 @@
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import multiprocessing
 import os
+import re
 import subprocess
+import sys
 
 from l2tdevtools.review_helpers import cli
 
@@ -19,25 +22,87 @@ class PylintHelper(cli.CLIHelper):
 
   _RCFILE_NAME = '.pylintrc'
 
-  def CheckFiles(self, filenames, rcfile):
+  _MODULE_HEADER_RE = re.compile(r'^\*+ Module (\S+)', re.MULTILINE)
+
+  def _GetFailedFilenames(self, output, filenames):
+    """Determines the names of the files with linter errors.
+
+    Args:
+      output (str): output of pylint.
+      filenames (list[str]): names of the files that were linted.
+
+    Returns:
+      list[str]: names of the files with linter errors.
+    """
+    module_names = set(self._MODULE_HEADER_RE.findall(output))
+
+    failed_filenames = []
+    for filename in filenames:
+      module_path, _ = os.path.splitext(os.path.normpath(filename))
+      module_path = module_path.replace(os.sep, '.')
+      if module_path.endswith('.__init__'):
+        module_path = module_path[:-9]
+
+      for module_name in module_names:
+        if (module_path == module_name or
+            module_path.endswith('.{0:s}'.format(module_name))):
+          failed_filenames.append(filename)
+          break
+
+    return failed_filenames
+
+  def CheckFiles(self, filenames, rcfile, result_cache=None):
     """Checks if the linting of the files is correct using pylint.
 
+    The files are linted by a single pylint process that uses multiple jobs.
+
     Args:
       filenames (list[str]): names of the files to lint.
       rcfile (str): path to the pylint configuration file to use.
+      result_cache (Optional[LintResultCache]): cache of the files that
+          passed linting before, which are not linted again if they did not
+          change.
 
     Returns:
       bool: True if the files were linted without errors.
     """
     print('Running linter on changed files.')
-    failed_filenames = []
+    filenames_to_check = []
     for filename in filenames:
+      if result_cache and result_cache.HasPassed('pylint', filename, rcfile):
+        print('Skipping: {0:s} unchanged since last linted.'.format(filename))
+        continue
+
       print('Checking: {0:s}'.format(filename))
+      filenames_to_check.append(filename)
 
-      command = 'pylint --rcfile="{0:s}" {1:s}'.format(rcfile, filename)
-      exit_code = subprocess.call(command, shell=True)
-      if exit_code != 0:
-        failed_filenames.append(filename)
+    failed_filenames = []
+    if filenames_to_check:
+      number_of_jobs = min(
+          multiprocessing.cpu_count(), len(filenames_to_check))
+
+      command = 'pylint --rcfile="{0:s}" -j {1:d} {2:s}'.format(
+          rcfile, number_of_jobs, ' '.join(filenames_to_check))
+      process = subprocess.Popen(
+          command, shell=True, stdout=subprocess.PIPE)
+      output, _ = process.communicate()
+
+      output = output.decode('utf-8', 'replace')
+      sys.stdout.write(output)
+      sys.stdout.flush()
+
+      if process.returncode != 0:
+        failed_filenames = self._GetFailedFilenames(
+            output, filenames_to_check)
+        if not failed_filenames:
+          # The errors could not be attributed to specific files.
+          failed_filenames = list(filenames_to_check)
+
+    if result_cache:
+      for filename in filenames_to_check:
+        if filename not in failed_filenames:
+          result_cache.SetPassed('pylint', filename, rcfile)
+      result_cache.Write()
 
     if failed_filenames:
       print('\nFiles with linter errors:\n{0:s}\n'.format(
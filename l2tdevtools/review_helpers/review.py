@@ -14,6 +14,7 @@ from l2tdevtools.lib import errors
 from l2tdevtools.lib import netrcfile
 from l2tdevtools.review_helpers import git
 from l2tdevtools.review_helpers import github
+from l2tdevtools.review_helpers import lint_cache
 from l2tdevtools.review_helpers import pylint
 from l2tdevtools.review_helpers import yapf
 
@@ -71,6 +72,23 @@ class ReviewHelper(object):
       self._fork_username, _, self._fork_feature_branch = (
           self._github_origin.partition(':'))
 
+  def _GetLintResultCache(self):
+    """Retrieves the cache of the files that passed code inspection.
+
+    The cache is stored in the .git directory of the project, so that it is
+    not part of the changes under review.
+
+    Returns:
+      LintResultCache: lint result cache or None if the project has no .git
+          directory.
+    """
+    git_directory = os.path.join(self._project_path, '.git')
+    if not os.path.isdir(git_directory):
+      return None
+
+    path = os.path.join(git_directory, 'l2tdevtools_lint_results.json')
+    return lint_cache.LintResultCache(path)
+
   # yapf: disable
   def CheckLocalGitState(self):
     """Checks the state of the local git repository.
@@ -334,7 +352,9 @@ class ReviewHelper(object):
     changed_python_files = self._git_helper.GetChangedPythonFiles(
         diffbase=diffbase)
 
-    if not yapf_helper.CheckFiles(changed_python_files, configuration):
+    if not yapf_helper.CheckFiles(
+        changed_python_files, configuration,
+        result_cache=self._GetLintResultCache()):
       message = '{0:s} aborted - unable to pass style inspection.'.format(
           self._command.title())
       print(message)
@@ -375,7 +395,9 @@ class ReviewHelper(object):
         diffbase=diffbase)
 
     pylint_configuration = pylint_helper.GetRCFile(self._project_path)
-    if not pylint_helper.CheckFiles(changed_python_files, pylint_configuration):
+    if not pylint_helper.CheckFiles(
+        changed_python_files, pylint_configuration,
+        result_cache=self._GetLintResultCache()):
       print('{0:s} aborted - unable to pass linter.'.format(
           self._command.title()))
 
@@ -4,7 +4,9 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import os
+import re
 import subprocess
+import sys
 
 from l2tdevtools.review_helpers import cli
 
@@ -18,25 +20,79 @@ class YapfHelper(cli.CLIHelper):
 
   _RCFILE_NAME = '.style.yapf'
 
-  def CheckFiles(self, filenames, rcfile):
+  _DIFF_HEADER_RE = re.compile(r'^--- (.+?)\s+\(original\)$', re.MULTILINE)
+
+  def _GetFailedFilenames(self, output, filenames):
+    """Determines the names of the files with code style problems.
+
+    Args:
+      output (str): diff output of yapf.
+      filenames (list[str]): names of the files that were checked.
+
+    Returns:
+      list[str]: names of the files with code style problems.
+    """
+    diff_filenames = set([
+        os.path.normpath(filename)
+        for filename in self._DIFF_HEADER_RE.findall(output)])
+
+    return [
+        filename for filename in filenames
+        if os.path.normpath(filename) in diff_filenames]
+
+  def CheckFiles(self, filenames, rcfile, result_cache=None):
     """Checks if the style of the files is correct using yapf.
 
+    The files are checked by a single yapf process.
+
     Args:
       filenames (list[str]): names of the files to lint.
       rcfile (str): path to the pylint configuration file to use.
+      result_cache (Optional[LintResultCache]): cache of the files that
+          passed the check before, which are not checked again if they did
+          not change.
 
     Returns:
       bool: True if the files were checked without errors.
     """
     print('Checking code style with yapf in changed files.')
-    failed_filenames = []
+    filenames_to_check = []
     for filename in filenames:
+      if result_cache and result_cache.HasPassed('yapf', filename, rcfile):
+        print('Skipping: {0:s} unchanged since last checked.'.format(filename))
+        continue
+
       print('Checking: {0:s}'.format(filename))
+      filenames_to_check.append(filename)
 
-      command = 'yapf --style="{0:s}" --diff {1:s}'.format(rcfile, filename)
-      exit_code = subprocess.call(command, shell=True)
-      if exit_code != 0:
-        failed_filenames.append(filename)
+    failed_filenames = []
+    if filenames_to_check:
+      command = 'yapf --style="{0:s}" --diff'.format(rcfile)
+      # The parallel mode of yapf requires concurrent.futures.
+      if sys.version_info[0] >= 3 and len(filenames_to_check) > 1:
+        command = '{0:s} --parallel'.format(command)
+
+      command = '{0:s} {1:s}'.format(command, ' '.join(filenames_to_check))
+      process = subprocess.Popen(
+          command, shell=True, stdout=subprocess.PIPE)
+      output, _ = process.communicate()
+
+      output = output.decode('utf-8', 'replace')
+      sys.stdout.write(output)
+      sys.stdout.flush()
+
+      if process.returncode != 0:
+        failed_filenames = self._GetFailedFilenames(
+            output, filenames_to_check)
+        if not failed_filenames:
+          # The problems could not be attributed to specific files.
+          failed_filenames = list(filenames_to_check)
+
+    if result_cache:
+      for filename in filenames_to_check:
+        if filename not in failed_filenames:
+          result_cache.SetPassed('yapf', filename, rcfile)
+      result_cache.Write()
 
     if failed_filenames:
       print(
@@ -4,16 +4,58 @@
 from __future__ import unicode_literals
 
 import abc
-import glob
+import functools
+import io
 import logging
 import os
 import re
 import shutil
 import subprocess
 import tarfile
+import time
 import zipfile
 
+from multiprocessing import pool as multiprocessing_pool
+
+from l2tdevtools import artifact_catalog
 from l2tdevtools import py2to3
+from l2tdevtools import tracing
+
+
+def _IsSafeZipMemberName(filename):
+  """Determines if the name of a .zip member is safe to extract.
+
+  Args:
+    filename (str): name of the member.
+
+  Returns:
+    bool: True if the name is relative and does not contain parent directory
+        components, False otherwise.
+  """
+  if filename.startswith('/') or filename.startswith('\\'):
+    return False
+
+  # Names with a drive letter, such as "C:", are absolute on Windows.
+  if re.match(r'^[A-Za-z]:', filename):
+    return False
+
+  path_segments = re.split(r'[/\\]', filename)
+  return '..' not in path_segments
+
+
+def _ExtractZipMembers(source_filename, zip_infos):
+  """Extracts members of a .zip file.
+
+  This function is used to extract members concurrently, where every thread
+  opens the .zip file with its own file object.
+
+  Args:
+    source_filename (str): filename of the .zip file.
+    zip_infos (list[zipfile.ZipInfo]): members to extract.
+  """
+  with zipfile.ZipFile(source_filename, 'r') as archive:
+    for zip_info in zip_infos:
+      archive.extract(zip_info)
 
 
 class SourceHelper(object):
@@ -50,6 +92,9 @@ class SourceHelper(object):
 class GitRepositorySourceHelper(SourceHelper):
   """Class that manages the source code from a git repository."""
 
+  # The git mirror cache shared by all git repository source helpers.
+  _git_mirror_cache = None
+
   def __init__(self, project_name, project_definition):
     """Initializes a source helper.
 
@@ -67,6 +112,29 @@ class GitRepositorySourceHelper(SourceHelper):
       logging.info('Removing: {0:s}'.format(self.project_name))
       shutil.rmtree(self.project_name)
 
+  def _CloneRepository(self):
+    """Clones the git repository into the source directory.
+
+    If a git mirror cache is set the repository is cloned from its mirror.
+
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    if self._git_mirror_cache:
+      with tracing.StartSpan('download'):
+        return self._git_mirror_cache.CloneRepository(
+            self._git_url, self.project_name)
+
+    command = 'git clone {0:s}'.format(self._git_url)
+    with tracing.StartSpan('download'):
+      exit_code = subprocess.call(
+          '{0:s}'.format(command), shell=True)
+    if exit_code != 0:
+      logging.error('Running: "{0:s}" failed.'.format(command))
+      return False
+
+    return True
+
   def Create(self):
     """Creates the source directory from the git repository.
 
@@ -76,11 +144,7 @@ class GitRepositorySourceHelper(SourceHelper):
     if not self.project_name or not self._git_url:
       return None
 
-    command = 'git clone {0:s}'.format(self._git_url)
-    exit_code = subprocess.call(
-        '{0:s}'.format(command), shell=True)
-    if exit_code != 0:
-      logging.error('Running: "{0:s}" failed.'.format(command))
+    if not self._CloneRepository():
       return None
 
     return self.project_name
@@ -94,10 +158,72 @@ class GitRepositorySourceHelper(SourceHelper):
     # TODO: determine project identifier based on git url.
     return None
 
+  @classmethod
+  def SetGitMirrorCache(cls, git_mirror_cache):
+    """Sets the git mirror cache shared by all git repository source helpers.
+
+    Args:
+      git_mirror_cache (GitMirrorCache): git mirror cache or None to clone
+          the repositories directly.
+    """
+    GitRepositorySourceHelper._git_mirror_cache = git_mirror_cache
+
 
 class LibyalGitRepositorySourceHelper(GitRepositorySourceHelper):
   """Class that manages the source code from a libyal git repository."""
 
+  _SYNCLIBS_GIT_URL_PREFIX_RE = re.compile(
+      r'^GIT_URL_PREFIX="([^"]+)"', re.MULTILINE)
+
+  _SYNCLIBS_LOCAL_LIBS_RE = re.compile(
+      r'^LOCAL_LIBS="([^"]*)"', re.MULTILINE)
+
+  def _GetSyncLibsEnvironment(self, source_directory):
+    """Retrieves the environment of synclibs.sh.
+
+    If a git mirror cache is set the mirrors of the local libraries that
+    synclibs.sh clones are updated and the environment makes git clone the
+    local libraries from their mirrors.
+
+    Args:
+      source_directory (str): name of the source directory.
+
+    Returns:
+      dict[str, str]: environment variables or None to use the environment
+          of the process.
+    """
+    if not self._git_mirror_cache:
+      return None
+
+    script_path = os.path.join(source_directory, 'synclibs.sh')
+    try:
+      with io.open(script_path, 'r', encoding='utf-8') as file_object:
+        script = file_object.read()
+
+    except (IOError, UnicodeDecodeError) as exception:
+      logging.warning('Unable to read: {0:s} with error: {1!s}'.format(
+          script_path, exception))
+      return None
+
+    git_url_prefix_match = self._SYNCLIBS_GIT_URL_PREFIX_RE.search(script)
+    local_libs_match = self._SYNCLIBS_LOCAL_LIBS_RE.search(script)
+    if not git_url_prefix_match or not local_libs_match:
+      logging.warning(
+          'Unable to determine local libraries in: {0:s}'.format(script_path))
+      return None
+
+    git_url_prefix = git_url_prefix_match.group(1).rstrip('/')
+    git_urls = [
+        '{0:s}/{1:s}.git'.format(git_url_prefix, local_lib)
+        for local_lib in local_libs_match.group(1).split()]
+
+    with tracing.StartSpan('download'):
+      if not self._git_mirror_cache.UpdateMirrors(git_urls):
+        return None
+
+    return self._git_mirror_cache.GetURLRewriteEnvironment([
+        '{0:s}/'.format(git_url_prefix)])
+
   def Create(self):
     """Creates the source directory from the git repository.
 
@@ -107,18 +233,15 @@ class LibyalGitRepositorySourceHelper(GitRepositorySourceHelper):
     if not self.project_name or not self._git_url:
       return None
 
-    command = 'git clone {0:s}'.format(self._git_url)
-    exit_code = subprocess.call(
-        '{0:s}'.format(command), shell=True)
-    if exit_code != 0:
-      logging.error('Running: "{0:s}" failed.'.format(command))
+    if not self._CloneRepository():
       return None
 
     source_directory = self.project_name
 
     command = './synclibs.sh'
     exit_code = subprocess.call(
-        '(cd {0:s} && {1:s})'.format(source_directory, command), shell=True)
+        '(cd {0:s} && {1:s})'.format(source_directory, command), shell=True,
+        env=self._GetSyncLibsEnvironment(source_directory))
     if exit_code != 0:
       logging.error('Running: "{0:s}" failed.'.format(command))
       return None
@@ -145,6 +268,15 @@ class SourcePackageHelper(SourceHelper):
 
   ENCODING = 'utf-8'
 
+  _MAXIMUM_NUMBER_OF_EXTRACTION_THREADS = 4
+
+  # The minimum number of files extracted per thread, since for a small
+  # number of files the overhead of the threads outweighs the gain.
+  _MINIMUM_NUMBER_OF_FILES_PER_THREAD = 64
+
+  # The source store shared by all source package helpers.
+  _source_store = None
+
   def __init__(self, project_name, project_definition, download_helper_object):
     """Initializes a source package helper.
 
@@ -161,6 +293,9 @@ class SourcePackageHelper(SourceHelper):
   def _CreateFromTar(self, source_filename):
     """Creates the source directory from a .tar source package.
 
+    The .tar source package is extracted in a single sequential pass, which
+    prevents a compressed source package from being decompressed twice.
+
     Args:
       source_filename (str): filename of the source package.
 
@@ -168,53 +303,68 @@ class SourcePackageHelper(SourceHelper):
       str: name of the source directory or None if no files can be extracted
           from the .tar.gz source package.
     """
-    archive = tarfile.open(source_filename, 'r:*', encoding='utf-8')
-    directory_name = ''
+    start_time = time.time()
 
-    for tar_info in archive.getmembers():
-      filename = getattr(tar_info, 'name', None)
+    archive = tarfile.open(source_filename, 'r|*', encoding='utf-8')
+    directory_name = ''
+    number_of_members = 0
+
+    try:
+      for tar_info in archive:
+        filename = getattr(tar_info, 'name', None)
+
+        if isinstance(filename, py2to3.BYTES_TYPE):
+          try:
+            filename = filename.decode(self.ENCODING)
+          except UnicodeDecodeError:
+            logging.warning(
+                'Unable to decode filename in tar file: {0:s}'.format(
+                    source_filename))
+            continue
+
+        if filename is None:
+          logging.warning('Missing filename in tar file: {0:s}'.format(
+              source_filename))
+          continue
 
-      if isinstance(filename, py2to3.BYTES_TYPE):
-        try:
-          filename = filename.decode(self.ENCODING)
-        except UnicodeDecodeError:
+        if not directory_name:
+          # Note that this will set directory name to an empty string
+          # if filename start with a /.
+          directory_name, _, _ = filename.partition('/')
+          if not directory_name or directory_name.startswith('..'):
+            logging.error(
+                'Unsupported directory name in tar file: {0:s}'.format(
+                    source_filename))
+            return None
+          if os.path.exists(directory_name):
+            break
+          logging.info('Extracting: {0:s}'.format(source_filename))
+
+        elif not filename.startswith(directory_name):
           logging.warning(
-              'Unable to decode filename in tar file: {0:s}'.format(
-                  source_filename))
+              'Skipping: {0:s} in tar file: {1:s}'.format(
+                  filename, source_filename))
           continue
 
-      if filename is None:
-        logging.warning('Missing filename in tar file: {0:s}'.format(
-            source_filename))
-        continue
-
-      if not directory_name:
-        # Note that this will set directory name to an empty string
-        # if filename start with a /.
-        directory_name, _, _ = filename.partition('/')
-        if not directory_name or directory_name.startswith('..'):
-          logging.error(
-              'Unsupported directory name in tar file: {0:s}'.format(
-                  source_filename))
-          return None
-        if os.path.exists(directory_name):
-          break
-        logging.info('Extracting: {0:s}'.format(source_filename))
+        archive.extract(tar_info)
+        number_of_members += 1
 
-      elif not filename.startswith(directory_name):
-        logging.warning(
-            'Skipping: {0:s} in tar file: {1:s}'.format(
-                filename, source_filename))
-        continue
+    finally:
+      archive.close()
 
-      archive.extract(tar_info)
-    archive.close()
+    if number_of_members:
+      logging.info(
+          'Extracted: {0:d} members from: {1:s} in {2:.1f} seconds'.format(
+              number_of_members, source_filename, time.time() - start_time))
 
     return directory_name
 
   def _CreateFromZip(self, source_filename):
     """Creates the source directory from a .zip source package.
 
+    The directories are created first after which the files are extracted
+    concurrently, where every thread uses its own file object.
+
     Args:
       source_filename (str): filename of the source package.
 
@@ -222,39 +372,86 @@ class SourcePackageHelper(SourceHelper):
       str: name of the source directory or None if no files can be extracted
           from the .zip source package.
     """
+    start_time = time.time()
+
     archive = zipfile.ZipFile(source_filename, 'r')
     directory_name = ''
+    zip_infos = []
+
+    try:
+      for zip_info in archive.infolist():
+        filename = getattr(zip_info, 'filename', None)
+        if filename is None:
+          logging.warning('Missing filename in zip file: {0:s}'.format(
+              source_filename))
+          continue
 
-    for zip_info in archive.infolist():
-      filename = getattr(zip_info, 'filename', None)
-      if filename is None:
-        logging.warning('Missing filename in zip file: {0:s}'.format(
-            source_filename))
-        continue
-
-      if not directory_name:
-        # Note that this will set directory name to an empty string
-        # if filename start with a /.
-        directory_name, _, _ = filename.partition('/')
-        if not directory_name or directory_name.startswith('..'):
-          logging.error(
-              'Unsupported directory name in zip file: {0:s}'.format(
-                  source_filename))
-          return None
+        # The names are checked before any file system call, since the
+        # parent directories are created without ZipFile.extract().
+        if not _IsSafeZipMemberName(filename):
+          logging.warning(
+              'Skipping unsafe: {0:s} in zip file: {1:s}'.format(
+                  filename, source_filename))
+          continue
 
-        if os.path.exists(directory_name):
-          break
+        if not directory_name:
+          # Note that this will set directory name to an empty string
+          # if filename start with a /.
+          directory_name, _, _ = filename.partition('/')
+          if not directory_name or directory_name.startswith('..'):
+            logging.error(
+                'Unsupported directory name in zip file: {0:s}'.format(
+                    source_filename))
+            return None
 
-        logging.info('Extracting: {0:s}'.format(source_filename))
+          if os.path.exists(directory_name):
+            return directory_name
 
-      elif not filename.startswith(directory_name):
-        logging.warning(
-            'Skipping: {0:s} in zip file: {1:s}'.format(
-                filename, source_filename))
-        continue
+          logging.info('Extracting: {0:s}'.format(source_filename))
 
-      archive.extract(zip_info)
-    archive.close()
+        elif not filename.startswith(directory_name):
+          logging.warning(
+              'Skipping: {0:s} in zip file: {1:s}'.format(
+                  filename, source_filename))
+          continue
+
+        if filename.endswith('/'):
+          archive.extract(zip_info)
+        else:
+          zip_infos.append(zip_info)
+
+      # Create the parent directories up front, so that the extraction
+      # threads do not race to create them.
+      for zip_info in zip_infos:
+        parent_directory = os.path.dirname(zip_info.filename)
+        if parent_directory and not os.path.isdir(parent_directory):
+          os.makedirs(parent_directory)
+
+    finally:
+      archive.close()
+
+    number_of_threads = min(
+        self._MAXIMUM_NUMBER_OF_EXTRACTION_THREADS,
+        len(zip_infos) // self._MINIMUM_NUMBER_OF_FILES_PER_THREAD)
+
+    if number_of_threads <= 1:
+      _ExtractZipMembers(source_filename, zip_infos)
+
+    else:
+      chunks = [
+          zip_infos[index::number_of_threads]
+          for index in range(number_of_threads)]
+
+      pool = multiprocessing_pool.ThreadPool(processes=number_of_threads)
+      try:
+        pool.map(functools.partial(_ExtractZipMembers, source_filename), chunks)
+        pool.close()
+      finally:
+        pool.terminate()
+        pool.join()
+
+    logging.info('Extracted: {0:d} files from: {1:s} in {2:.1f} seconds'.format(
+        len(zip_infos), source_filename, time.time() - start_time))
 
     return directory_name
 
@@ -269,35 +466,36 @@ class SourcePackageHelper(SourceHelper):
 
     # Remove previous versions of source packages in the format:
     # project-*.tar.gz
-    filenames = glob.glob('{0:s}-*.tar.gz'.format(self.project_name))
+    filenames = artifact_catalog.Glob(
+        '{0:s}-*.tar.gz'.format(self.project_name))
     for filename in filenames:
       if not filenames_to_ignore.match(filename):
         logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+        artifact_catalog.RemoveFile(filename)
 
     # Remove previous versions of source packages in the format:
     # project-*.tgz
-    filenames = glob.glob('{0:s}-*.tgz'.format(self.project_name))
+    filenames = artifact_catalog.Glob('{0:s}-*.tgz'.format(self.project_name))
     for filename in filenames:
       if not filenames_to_ignore.match(filename):
         logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+        artifact_catalog.RemoveFile(filename)
 
     # Remove previous versions of source packages in the format:
     # project-*.zip
-    filenames = glob.glob('{0:s}-*.zip'.format(self.project_name))
+    filenames = artifact_catalog.Glob('{0:s}-*.zip'.format(self.project_name))
     for filename in filenames:
       if not filenames_to_ignore.match(filename):
         logging.info('Removing: {0:s}'.format(filename))
-        os.remove(filename)
+        artifact_catalog.RemoveFile(filename)
 
     # Remove previous versions of source directories in the format:
     # project-{version}
-    filenames = glob.glob('{0:s}-*'.format(self.project_name))
+    filenames = artifact_catalog.Glob('{0:s}-*'.format(self.project_name))
     for filename in filenames:
       if os.path.isdir(filename) and not filenames_to_ignore.match(filename):
         logging.info('Removing: {0:s}'.format(filename))
-        shutil.rmtree(filename)
+        artifact_catalog.RemoveDirectory(filename)
 
   def Create(self):
     """Creates the source directory from the source package.
@@ -312,13 +510,14 @@ class SourcePackageHelper(SourceHelper):
       return None
 
     directory_name = None
-    if (self._source_filename.endswith('.tar.bz2') or
-        self._source_filename.endswith('.tar.gz') or
-        self._source_filename.endswith('.tgz')):
-      directory_name = self._CreateFromTar(self._source_filename)
+    with tracing.StartSpan('extract'):
+      if (self._source_filename.endswith('.tar.bz2') or
+          self._source_filename.endswith('.tar.gz') or
+          self._source_filename.endswith('.tgz')):
+        directory_name = self._CreateFromTar(self._source_filename)
 
-    elif self._source_filename.endswith('.zip'):
-      directory_name = self._CreateFromZip(self._source_filename)
+      elif self._source_filename.endswith('.zip'):
+        directory_name = self._CreateFromZip(self._source_filename)
 
     return directory_name
 
@@ -330,12 +529,22 @@ class SourcePackageHelper(SourceHelper):
           if the file was already downloaded or None on error.
     """
     if not self._source_filename:
-      project_version = self.GetProjectVersion()
-      if not project_version:
-        return None
+      with tracing.StartSpan('download'):
+        project_version = self.GetProjectVersion()
+        if not project_version:
+          return None
+
+        if self._source_store:
+          self._source_filename = self._source_store.LinkFile(
+              self.project_name, project_version)
 
-      self._source_filename = self._download_helper.Download(
-          self.project_name, project_version)
+        if not self._source_filename:
+          self._source_filename = self._download_helper.Download(
+              self.project_name, project_version)
+
+          if self._source_filename and self._source_store:
+            self._source_store.AddFile(
+                self.project_name, project_version, self._source_filename)
 
     return self._source_filename
 
@@ -359,3 +568,12 @@ class SourcePackageHelper(SourceHelper):
           self.project_name, version_definition)
 
     return self._project_version
+
+  @classmethod
+  def SetSourceStore(cls, source_store):
+    """Sets the source store shared by all source package helpers.
+
+    Args:
+      source_store (SourceStore): source store or None to disable the store.
+    """
+    SourcePackageHelper._source_store = source_store
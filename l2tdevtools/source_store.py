@@ -0,0 +1,371 @@
+# -*- coding: utf-8 -*-
+"""Content-addressed store of source packages."""
+
+from __future__ import unicode_literals
+
+import hashlib
+import io
+import logging
+import os
+import shutil
+import stat
+import tempfile
+
+
+def LinkOrCopyFile(source_path, destination_path):
+  """Links a file or copies it if the file cannot be linked.
+
+  A hard link is used when the source and destination are on the same file
+  system, which avoids a full copy of the file. Note that the file should be
+  treated as read-only since changes are visible through every link.
+
+  On Windows the file is always copied, since a hard link shares the
+  read-only attribute of the source and read-only files cannot be removed.
+  The permissions of the source are not copied.
+
+  Args:
+    source_path (str): path of the source file.
+    destination_path (str): path of the destination file, which is replaced
+        if it already exists.
+  """
+  if os.path.exists(destination_path):
+    RemoveFile(destination_path)
+
+  if hasattr(os, 'link') and os.name != 'nt':
+    try:
+      os.link(source_path, destination_path)
+      return
+    except OSError:
+      pass
+
+  shutil.copyfile(source_path, destination_path)
+
+
+def RemoveFile(path):
+  """Removes a file that can be read-only.
+
+  Args:
+    path (str): path of the file.
+  """
+  try:
+    os.remove(path)
+  except OSError:
+    # On Windows read-only files cannot be removed.
+    os.chmod(path, stat.S_IWUSR | stat.S_IRUSR)
+    os.remove(path)
+
+
+class SourceStore(object):
+  """Content-addressed store of source packages.
+
+  The source packages are stored in the format:
+  {path}/{project name}/{project version}/{SHA-256}/{filename}
+
+  The modification time of the version directory is updated every time a
+  source package is added or retrieved and used to determine which versions
+  to remove when collecting garbage.
+
+  The source packages in the store are read-only. The size and modification
+  time of a source package are recorded when it is added to the store and
+  its SHA-256 digest is only verified again when they change.
+  """
+
+  _READ_BUFFER_SIZE = 64 * 1024
+
+  _VERIFIED_FILENAME = '.verified'
+
+  def __init__(self, path):
+    """Initializes a source store.
+
+    Args:
+      path (str): path of the directory that contains the store.
+    """
+    super(SourceStore, self).__init__()
+    self._path = path
+
+  def _CalculateSHA256(self, path):
+    """Calculates the SHA-256 digest of a file.
+
+    Args:
+      path (str): path of the file.
+
+    Returns:
+      str: SHA-256 digest in hexadecimal representation.
+    """
+    hash_context = hashlib.sha256()
+    with open(path, 'rb') as file_object:
+      data = file_object.read(self._READ_BUFFER_SIZE)
+      while data:
+        hash_context.update(data)
+        data = file_object.read(self._READ_BUFFER_SIZE)
+
+    return hash_context.hexdigest()
+
+  def _GetFileStatus(self, path):
+    """Retrieves the status of a file used to detect changes.
+
+    Args:
+      path (str): path of the file.
+
+    Returns:
+      str: size and modification time of the file.
+    """
+    stat_object = os.stat(path)
+    return '{0:d}:{1:f}'.format(stat_object.st_size, stat_object.st_mtime)
+
+  def _GetVersionPath(self, project_name, project_version):
+    """Retrieves the path of the directory of a project version.
+
+    Args:
+      project_name (str): name of the project.
+      project_version (str): version of the project.
+
+    Returns:
+      str: path of the version directory.
+    """
+    return os.path.join(
+        self._path, project_name, '{0!s}'.format(project_version))
+
+  def _RemoveDirectory(self, path):
+    """Removes a directory that can contain read-only files.
+
+    Args:
+      path (str): path of the directory.
+    """
+    def _OnError(function, error_path, unused_exc_info):
+      """Makes a file writable and retries to remove it.
+
+      Args:
+        function (function): function that raised the error.
+        error_path (str): path that the function was called with.
+      """
+      try:
+        os.chmod(error_path, stat.S_IWUSR | stat.S_IRUSR)
+        function(error_path)
+      except OSError:
+        pass
+
+    shutil.rmtree(path, onerror=_OnError)
+
+  def _IsVerified(self, store_path):
+    """Determines if a source package was verified and did not change since.
+
+    Args:
+      store_path (str): path of the source package in the store.
+
+    Returns:
+      bool: True if the source package was verified and its size and
+          modification time did not change since.
+    """
+    verified_path = os.path.join(
+        os.path.dirname(store_path), self._VERIFIED_FILENAME)
+
+    try:
+      with io.open(verified_path, 'r', encoding='utf-8') as file_object:
+        verified_status = file_object.read()
+
+      return verified_status == self._GetFileStatus(store_path)
+
+    except (IOError, OSError):
+      return False
+
+  def _MarkAsVerified(self, store_path):
+    """Records the size and modification time of a verified source package.
+
+    Args:
+      store_path (str): path of the source package in the store.
+    """
+    verified_path = os.path.join(
+        os.path.dirname(store_path), self._VERIFIED_FILENAME)
+
+    try:
+      with io.open(verified_path, 'w', encoding='utf-8') as file_object:
+        file_object.write(self._GetFileStatus(store_path))
+
+    except (IOError, OSError) as exception:
+      logging.warning(
+          'Unable to write: {0:s} with error: {1!s}'.format(
+              verified_path, exception))
+
+  def _MarkAsUsed(self, version_path):
+    """Marks a version directory as recently used.
+
+    Args:
+      version_path (str): path of the version directory.
+    """
+    try:
+      os.utime(version_path, None)
+    except OSError:
+      pass
+
+  def AddFile(self, project_name, project_version, path):
+    """Adds a source package to the store.
+
+    Args:
+      project_name (str): name of the project.
+      project_version (str): version of the project.
+      path (str): path of the source package.
+
+    Returns:
+      str: path of the source package in the store or None on error.
+    """
+    sha256 = self._CalculateSHA256(path)
+    version_path = self._GetVersionPath(project_name, project_version)
+    digest_path = os.path.join(version_path, sha256)
+    store_path = os.path.join(digest_path, os.path.basename(path))
+
+    if not os.path.exists(store_path):
+      logging.info('Adding: {0:s} to source store'.format(path))
+
+      try:
+        if not os.path.exists(digest_path):
+          os.makedirs(digest_path)
+
+        # Copy to a temporary file first, so that concurrent readers never
+        # see a partially written file. The file is copied instead of linked
+        # so that making it read-only does not affect the source package.
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=digest_path, prefix='.tmp')
+        os.close(file_descriptor)
+
+        shutil.copyfile(path, temporary_path)
+
+        # The file is made read-only since it can be linked into multiple
+        # build directories.
+        os.chmod(temporary_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.rename(temporary_path, store_path)
+
+        self._MarkAsVerified(store_path)
+
+      except (IOError, OSError) as exception:
+        logging.warning(
+            'Unable to add: {0:s} to source store with error: {1!s}'.format(
+                path, exception))
+        return None
+
+    self._MarkAsUsed(version_path)
+
+    return store_path
+
+  def CollectGarbage(self, maximum_number_of_versions=2):
+    """Removes the least recently used versions of every project.
+
+    Args:
+      maximum_number_of_versions (Optional[int]): maximum number of versions
+          to retain per project.
+
+    Returns:
+      int: number of versions removed.
+    """
+    if not os.path.isdir(self._path):
+      return 0
+
+    number_of_removed_versions = 0
+    for project_name in sorted(os.listdir(self._path)):
+      project_path = os.path.join(self._path, project_name)
+      if not os.path.isdir(project_path):
+        continue
+
+      version_paths = []
+      for project_version in os.listdir(project_path):
+        version_path = os.path.join(project_path, project_version)
+        if os.path.isdir(version_path):
+          version_paths.append((os.stat(version_path).st_mtime, version_path))
+
+      version_paths = sorted(version_paths, reverse=True)
+      for _, version_path in version_paths[maximum_number_of_versions:]:
+        logging.info('Removing: {0:s} from source store'.format(version_path))
+        self._RemoveDirectory(version_path)
+        number_of_removed_versions += 1
+
+    return number_of_removed_versions
+
+  def GetFile(self, project_name, project_version):
+    """Retrieves a source package from the store.
+
+    Args:
+      project_name (str): name of the project.
+      project_version (str): version of the project.
+
+    The SHA-256 digest of a source package is only calculated when its size
+    or modification time changed since it was last verified. A source
+    package of which the SHA-256 digest does not match the digest it was
+    stored under is corrupt and is removed from the store.
+
+    Returns:
+      str: path of the source package in the store or None if the store
+          does not contain an intact source package of the project version.
+    """
+    version_path = self._GetVersionPath(project_name, project_version)
+    if not os.path.isdir(version_path):
+      return None
+
+    for sha256 in sorted(os.listdir(version_path)):
+      digest_path = os.path.join(version_path, sha256)
+      if not os.path.isdir(digest_path):
+        continue
+
+      for filename in sorted(os.listdir(digest_path)):
+        # Ignore the verified status and temporary files of additions in
+        # progress.
+        if filename.startswith('.'):
+          continue
+
+        store_path = os.path.join(digest_path, filename)
+        if self._IsVerified(store_path):
+          self._MarkAsUsed(version_path)
+          return store_path
+
+        try:
+          calculated_sha256 = self._CalculateSHA256(store_path)
+        except IOError as exception:
+          logging.warning(
+              'Unable to read: {0:s} with error: {1!s}'.format(
+                  store_path, exception))
+          continue
+
+        if calculated_sha256 != sha256:
+          logging.warning((
+              'Removing: {0:s} from source store since its SHA-256 digest: '
+              '{1:s} does not match').format(store_path, calculated_sha256))
+          self._RemoveDirectory(digest_path)
+          break
+
+        self._MarkAsVerified(store_path)
+        self._MarkAsUsed(version_path)
+        return store_path
+
+    return None
+
+  def LinkFile(self, project_name, project_version, directory=None):
+    """Links a source package from the store into a directory.
+
+    Args:
+      project_name (str): name of the project.
+      project_version (str): version of the project.
+      directory (Optional[str]): path of the directory to link into, where
+          None represents the current working directory.
+
+    Returns:
+      str: path of the linked source package or None if the store does not
+          contain a source package of the project version.
+    """
+    store_path = self.GetFile(project_name, project_version)
+    if not store_path:
+      return None
+
+    path = os.path.basename(store_path)
+    if directory:
+      path = os.path.join(directory, path)
+
+    if not os.path.exists(path):
+      logging.info('Linking: {0:s} from source store'.format(path))
+      try:
+        LinkOrCopyFile(store_path, path)
+      except (IOError, OSError) as exception:
+        logging.warning(
+            'Unable to link: {0:s} from source store with error: {1!s}'.format(
+                path, exception))
+        return None
+
+    return path
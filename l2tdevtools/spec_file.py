@@ -9,6 +9,8 @@ import os
 import subprocess
 import sys
 
+from l2tdevtools import templates
+
 
 class RPMSpecFileGenerator(object):
   """Class that helps in generating RPM spec files."""
@@ -575,14 +577,10 @@ class RPMSpecFileGenerator(object):
 
     template_file_path = os.path.join(
         self._data_path, 'rpm_templates', template_filename)
-    with open(template_file_path, 'rb') as file_object:
-      rules_template = file_object.read()
-
-    rules_template = rules_template.decode('utf-8')
+    template = templates.TemplateRegistry.GetTemplate(template_file_path)
 
-    with open(output_file, 'wb') as file_object:
-      data = rules_template.format(**template_values)
-      file_object.write(data.encode('utf-8'))
+    data = template.Render(template_values)
+    templates.WriteFileIfChanged(output_file, data.encode('utf-8'))
 
     return True
 
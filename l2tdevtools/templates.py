@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""Templates shared by the generators of build and dependency files."""
+
+from __future__ import unicode_literals
+
+import io
+import os
+import string
+import threading
+
+
+class Template(object):
+  """Template that has been read and parsed.
+
+  Attributes:
+    path (str): path of the template file.
+    placeholders (frozenset[str]): names of the placeholders in the template.
+    style (str): style of the template, either STYLE_FORMAT for templates
+        with "{name}" placeholders, which are rendered with str.format(),
+        or STYLE_STRING for templates with "$name" placeholders, which are
+        rendered with string.Template.
+    template_data (str): template data.
+  """
+
+  STYLE_FORMAT = 'format'
+  STYLE_STRING = 'string'
+
+  def __init__(self, path, template_data, style=STYLE_FORMAT):
+    """Initializes a template.
+
+    Args:
+      path (str): path of the template file.
+      template_data (str): template data.
+      style (Optional[str]): style of the template.
+
+    Raises:
+      ValueError: if the style is not supported or the template data is
+          not a valid template of the style.
+    """
+    if style not in (self.STYLE_FORMAT, self.STYLE_STRING):
+      raise ValueError('Unsupported template style: {0!s}'.format(style))
+
+    super(Template, self).__init__()
+    self._string_template = None
+    self.path = path
+    self.style = style
+    self.template_data = template_data
+
+    if style == self.STYLE_FORMAT:
+      self.placeholders = self._GetFormatPlaceholders(template_data)
+    else:
+      self._string_template = string.Template(template_data)
+      self.placeholders = self._GetStringPlaceholders(self._string_template)
+
+  def _GetFormatPlaceholders(self, template_data):
+    """Retrieves the placeholders of a str.format() template.
+
+    Args:
+      template_data (str): template data.
+
+    Returns:
+      frozenset[str]: names of the placeholders.
+
+    Raises:
+      ValueError: if the template data is not a valid template.
+    """
+    placeholders = set()
+    for _, field_name, _, _ in string.Formatter().parse(template_data):
+      if field_name is None:
+        continue
+
+      # Only the first part of the field name, such as "name" of "name[0]"
+      # or "name.attribute", is a template value.
+      name = field_name.split('.')[0].split('[')[0]
+      if not name or name.isdigit():
+        raise ValueError((
+            'Unsupported positional placeholder in template: {0:s}').format(
+                self.path))
+
+      placeholders.add(name)
+
+    return frozenset(placeholders)
+
+  def _GetStringPlaceholders(self, string_template):
+    """Retrieves the placeholders of a string.Template template.
+
+    Args:
+      string_template (string.Template): template.
+
+    Returns:
+      frozenset[str]: names of the placeholders.
+
+    Raises:
+      ValueError: if the template data is not a valid template.
+    """
+    placeholders = set()
+    for match in string_template.pattern.finditer(string_template.template):
+      if match.group('invalid') is not None:
+        raise ValueError('Invalid placeholder in template: {0:s}'.format(
+            self.path))
+
+      name = match.group('named') or match.group('braced')
+      if name:
+        placeholders.add(name)
+
+    return frozenset(placeholders)
+
+  def Render(self, template_values):
+    """Renders the template.
+
+    Args:
+      template_values (dict[str, object]): template values per placeholder
+          name or None if the template has no placeholders.
+
+    Returns:
+      str: rendered template.
+
+    Raises:
+      KeyError: if a template value is missing.
+    """
+    template_values = template_values or {}
+
+    missing_names = self.placeholders.difference(template_values.keys())
+    if missing_names:
+      raise KeyError('Missing template values: {0:s} of: {1:s}'.format(
+          ', '.join(sorted(missing_names)), self.path))
+
+    if self.style == self.STYLE_STRING:
+      return self._string_template.substitute(template_values)
+
+    return self.template_data.format(**template_values)
+
+
+class TemplateRegistry(object):
+  """Registry of the templates shared by all the generators of the process.
+
+  Every template file is read, decoded and parsed once, instead of every
+  time a file is generated from it.
+  """
+
+  # The templates per path and style shared by all the generators.
+  _templates = {}
+  _templates_lock = threading.Lock()
+
+  @classmethod
+  def ClearTemplates(cls):
+    """Removes all the templates from the registry."""
+    with cls._templates_lock:
+      cls._templates = {}
+
+  @classmethod
+  def GetTemplate(cls, path, style=Template.STYLE_FORMAT):
+    """Retrieves a template.
+
+    Args:
+      path (str): path of the template file.
+      style (Optional[str]): style of the template.
+
+    Returns:
+      Template: template.
+
+    Raises:
+      IOError: if the template file cannot be read.
+      UnicodeDecodeError: if the template file cannot be decoded.
+      ValueError: if the template file does not contain a valid template.
+    """
+    lookup_key = (os.path.abspath(path), style)
+
+    with cls._templates_lock:
+      template = cls._templates.get(lookup_key, None)
+
+    if not template:
+      with io.open(path, 'rb') as file_object:
+        template_data = file_object.read()
+
+      template = Template(path, template_data.decode('utf-8'), style=style)
+
+      with cls._templates_lock:
+        cls._templates[lookup_key] = template
+
+    return template
+
+
+def WriteFileIfChanged(path, file_content):
+  """Writes a file if its content differs from the file on disk.
+
+  A file that is not changed keeps its modification time, which prevents
+  tools that compare modification times from processing it again.
+
+  Args:
+    path (str): path of the file.
+    file_content (bytes): content of the file.
+
+  Returns:
+    bool: True if the file was written, False if the file was not changed.
+  """
+  try:
+    if os.path.getsize(path) == len(file_content):
+      with io.open(path, 'rb') as file_object:
+        if file_object.read() == file_content:
+          return False
+
+  except (IOError, OSError):
+    pass
+
+  with io.open(path, 'wb') as file_object:
+    file_object.write(file_content)
+
+  return True
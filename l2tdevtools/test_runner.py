@@ -0,0 +1,445 @@
+# -*- coding: utf-8 -*-
+"""Test runner that runs test modules concurrently."""
+
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import multiprocessing
+import os
+import sys
+import time
+import unittest
+
+try:
+  import Queue as queue
+except ImportError:
+  import queue  # pylint: disable=import-error
+
+try:
+  from StringIO import StringIO
+except ImportError:
+  from io import StringIO  # pylint: disable=ungrouped-imports
+
+
+class TimedTextTestResult(unittest.TextTestResult):
+  """Text test result that records the duration of every test.
+
+  Attributes:
+    durations (list[tuple[str, float]]): identifier and duration in seconds
+        of every test that was run.
+  """
+
+  def __init__(self, *args, **kwargs):
+    """Initializes a timed text test result."""
+    super(TimedTextTestResult, self).__init__(*args, **kwargs)
+    self._start_time = None
+    self.durations = []
+
+  def startTest(self, test):
+    """Called when a test is about to be run.
+
+    Args:
+      test (unittest.TestCase): test.
+    """
+    self._start_time = time.time()
+    super(TimedTextTestResult, self).startTest(test)
+
+  def stopTest(self, test):
+    """Called when a test has been run.
+
+    Args:
+      test (unittest.TestCase): test.
+    """
+    super(TimedTextTestResult, self).stopTest(test)
+    if self._start_time is not None:
+      self.durations.append((test.id(), time.time() - self._start_time))
+      self._start_time = None
+
+
+class TestModuleResult(object):
+  """Result of running the tests of a module.
+
+  Attributes:
+    durations (list[tuple[str, float]]): identifier and duration in seconds
+        of every test that was run.
+    number_of_errors (int): number of tests that raised an unexpected
+        exception.
+    number_of_expected_failures (int): number of tests that failed as
+        expected.
+    number_of_failures (int): number of tests that failed.
+    number_of_skipped (int): number of tests that were skipped.
+    number_of_tests (int): number of tests that were run.
+    number_of_unexpected_successes (int): number of tests that were expected
+        to fail but succeeded.
+    module_name (str): name of the test module.
+    output (str): output of the text test runner.
+  """
+
+  def __init__(self, module_name):
+    """Initializes the result of running the tests of a module.
+
+    Args:
+      module_name (str): name of the test module.
+    """
+    super(TestModuleResult, self).__init__()
+    self.durations = []
+    self.module_name = module_name
+    self.number_of_errors = 0
+    self.number_of_expected_failures = 0
+    self.number_of_failures = 0
+    self.number_of_skipped = 0
+    self.number_of_tests = 0
+    self.number_of_unexpected_successes = 0
+    self.output = ''
+
+
+def _RunTestModule(start_directory, module_name, verbosity):
+  """Runs the tests of a module.
+
+  Args:
+    start_directory (str): path of the directory the tests were discovered
+        in, which is the top level directory of the test modules.
+    module_name (str): name of the test module.
+    verbosity (int): verbosity of the text test runner.
+
+  Returns:
+    TestModuleResult: result of running the tests of the module.
+  """
+  if start_directory not in sys.path:
+    sys.path.insert(0, start_directory)
+
+  module_result = TestModuleResult(module_name)
+
+  stream = StringIO()
+  test_runner = unittest.TextTestRunner(
+      resultclass=TimedTextTestResult, stream=stream, verbosity=verbosity)
+
+  try:
+    test_suite = unittest.TestLoader().loadTestsFromName(module_name)
+    test_result = test_runner.run(test_suite)
+
+  # SystemExit is caught since a test module can for example call sys.exit()
+  # when it is imported. KeyboardInterrupt is not caught so that the test
+  # run can be interrupted.
+  except (Exception, SystemExit) as exception:  # pylint: disable=broad-except
+    module_result.number_of_errors = 1
+    module_result.output = (
+        'Unable to run tests of: {0:s} with error: {1!s}\n').format(
+            module_name, exception)
+    return module_result
+
+  module_result.durations = test_result.durations
+  module_result.number_of_errors = len(test_result.errors)
+  module_result.number_of_expected_failures = len(
+      test_result.expectedFailures)
+  module_result.number_of_failures = len(test_result.failures)
+  module_result.number_of_skipped = len(test_result.skipped)
+  module_result.number_of_tests = test_result.testsRun
+  module_result.number_of_unexpected_successes = len(
+      test_result.unexpectedSuccesses)
+  module_result.output = stream.getvalue()
+
+  return module_result
+
+
+def _TestWorker(
+    worker_index, start_directory, verbosity, task_queue, result_queue):
+  """Runs test modules until there are no more modules to run.
+
+  Note that the worker is run in a non-daemonic process, so that tests can
+  start processes of their own.
+
+  Args:
+    worker_index (int): index of the worker.
+    start_directory (str): path of the directory the tests were discovered
+        in.
+    verbosity (int): verbosity of the text test runner.
+    task_queue (multiprocessing.Queue): queue of names of test modules to
+        run, where None indicates that there are no more modules to run.
+    result_queue (multiprocessing.Queue): queue of the worker index, name of
+        the test module and result of running the tests of the module, where
+        a result of None indicates that the worker started to run the tests
+        of the module.
+  """
+  module_name = task_queue.get()
+  while module_name is not None:
+    result_queue.put((worker_index, module_name, None))
+
+    module_result = _RunTestModule(start_directory, module_name, verbosity)
+    result_queue.put((worker_index, module_name, module_result))
+
+    module_name = task_queue.get()
+
+
+class ParallelTestRunner(object):
+  """Test runner that runs test modules concurrently.
+
+  The tests are discovered and grouped per module. Every module is run in
+  one of the worker processes and the results are merged.
+  """
+
+  # Number of seconds to wait for a result before checking if the worker
+  # processes are still alive.
+  _POLL_INTERVAL = 1.0
+
+  def __init__(
+      self, number_of_jobs=1, number_of_slowest_tests=10, output_writer=None,
+      verbosity=2):
+    """Initializes a parallel test runner.
+
+    Args:
+      number_of_jobs (Optional[int]): maximum number of test modules to run
+          concurrently, where 1 represents running the test modules
+          sequentially in the current process.
+      number_of_slowest_tests (Optional[int]): number of the slowest tests to
+          report, where 0 represents no report.
+      output_writer (Optional[file]): output writer, where None represents
+          stdout.
+      verbosity (Optional[int]): verbosity of the text test runner.
+    """
+    super(ParallelTestRunner, self).__init__()
+    self._number_of_jobs = max(number_of_jobs or 1, 1)
+    self._number_of_slowest_tests = number_of_slowest_tests
+    self._output_writer = output_writer or sys.stdout
+    self._verbosity = verbosity
+
+  def _DiscoverModuleNames(self, start_directory, pattern):
+    """Discovers the names of the test modules.
+
+    Args:
+      start_directory (str): path of the directory to discover tests in.
+      pattern (str): pattern of the filenames of the test modules.
+
+    Returns:
+      list[str]: names of the test modules that contain tests.
+    """
+    test_suite = unittest.TestLoader().discover(
+        start_directory, pattern=pattern)
+
+    module_names = []
+    test_suites = [test_suite]
+    while test_suites:
+      test_suite = test_suites.pop(0)
+      for test in test_suite:
+        if isinstance(test, unittest.TestSuite):
+          test_suites.append(test)
+          continue
+
+        module_name = test.__class__.__module__
+        if module_name == 'unittest.loader':
+          # Discovery failed to import the module, for which the loader
+          # returns a failing test.
+          module_name = test.id().rpartition('.')[2]
+
+        if module_name not in module_names:
+          module_names.append(module_name)
+
+    return module_names
+
+  def _RunConcurrently(self, start_directory, module_names):
+    """Runs the test modules concurrently.
+
+    Args:
+      start_directory (str): path of the directory the tests were discovered
+          in.
+      module_names (list[str]): names of the test modules.
+
+    Yields:
+      TestModuleResult: result of running the tests of a module.
+    """
+    task_queue = multiprocessing.Queue()
+    result_queue = multiprocessing.Queue()
+
+    for module_name in module_names:
+      task_queue.put(module_name)
+
+    number_of_workers = min(self._number_of_jobs, len(module_names))
+    workers = []
+    for worker_index in range(number_of_workers):
+      task_queue.put(None)
+
+      worker = multiprocessing.Process(
+          target=_TestWorker, args=(
+              worker_index, start_directory, self._verbosity, task_queue,
+              result_queue))
+      worker.start()
+      workers.append(worker)
+
+    # The name of the test module every worker is running per worker index.
+    running_module_names = {}
+    remaining_module_names = set(module_names)
+
+    try:
+      while remaining_module_names:
+        try:
+          worker_index, module_name, module_result = result_queue.get(
+              timeout=self._POLL_INTERVAL)
+
+        except queue.Empty:
+          for module_result in self._GetTerminatedWorkerResults(
+              workers, running_module_names, remaining_module_names):
+            remaining_module_names.discard(module_result.module_name)
+            yield module_result
+
+          continue
+
+        if module_result is None:
+          running_module_names[worker_index] = module_name
+        else:
+          running_module_names.pop(worker_index, None)
+          remaining_module_names.discard(module_name)
+          yield module_result
+
+    finally:
+      for worker in workers:
+        worker.join(timeout=1)
+        if worker.is_alive():
+          worker.terminate()
+
+  def _GetTerminatedWorkerResults(
+      self, workers, running_module_names, remaining_module_names):
+    """Retrieves the results of the test modules of terminated workers.
+
+    The tests of a module that a worker was running when it terminated, for
+    example because it crashed or was killed, are reported as an error. If
+    no worker is alive the modules that were not run are reported as an
+    error as well.
+
+    Args:
+      workers (list[multiprocessing.Process]): worker processes.
+      running_module_names (dict[int, str]): name of the test module every
+          worker is running per worker index. The terminated workers are
+          removed.
+      remaining_module_names (set[str]): names of the test modules of which
+          no result was reported yet.
+
+    Returns:
+      list[TestModuleResult]: results of the test modules that could not be
+          run.
+    """
+    module_results = []
+    for worker_index, worker in enumerate(workers):
+      module_name = running_module_names.get(worker_index, None)
+      if not module_name or worker.is_alive():
+        continue
+
+      del running_module_names[worker_index]
+
+      module_result = TestModuleResult(module_name)
+      module_result.number_of_errors = 1
+      module_result.output = (
+          'Unable to run tests of: {0:s} since worker process terminated '
+          'with exit code: {1!s}\n').format(module_name, worker.exitcode)
+      module_results.append(module_result)
+
+    if not any(worker.is_alive() for worker in workers):
+      reported_module_names = set(
+          module_result.module_name for module_result in module_results)
+
+      for module_name in sorted(remaining_module_names):
+        if module_name in reported_module_names:
+          continue
+
+        module_result = TestModuleResult(module_name)
+        module_result.number_of_errors = 1
+        module_result.output = (
+            'Unable to run tests of: {0:s} since no worker process is '
+            'alive\n').format(module_name)
+        module_results.append(module_result)
+
+    return module_results
+
+  def _WriteSlowestTests(self, durations):
+    """Writes a report of the slowest tests.
+
+    Args:
+      durations (list[tuple[str, float]]): identifier and duration in seconds
+          of every test that was run.
+    """
+    slowest_durations = sorted(
+        durations, key=lambda duration: duration[1], reverse=True)
+    slowest_durations = slowest_durations[:self._number_of_slowest_tests]
+    if not slowest_durations:
+      return
+
+    self._output_writer.write('\nSlowest tests:\n')
+    for test_identifier, duration in slowest_durations:
+      self._output_writer.write('{0:8.3f}s {1:s}\n'.format(
+          duration, test_identifier))
+
+  def Run(self, start_directory='tests', pattern='*.py'):
+    """Discovers and runs tests.
+
+    Args:
+      start_directory (Optional[str]): path of the directory to discover
+          tests in.
+      pattern (Optional[str]): pattern of the filenames of the test modules.
+
+    Returns:
+      bool: True if all tests were successful.
+    """
+    start_directory = os.path.abspath(start_directory)
+    start_time = time.time()
+
+    module_names = self._DiscoverModuleNames(start_directory, pattern)
+
+    if self._number_of_jobs == 1 or len(module_names) <= 1:
+      module_results = (
+          _RunTestModule(start_directory, module_name, self._verbosity)
+          for module_name in module_names)
+    else:
+      module_results = self._RunConcurrently(start_directory, module_names)
+
+    durations = []
+    number_of_errors = 0
+    number_of_expected_failures = 0
+    number_of_failures = 0
+    number_of_skipped = 0
+    number_of_tests = 0
+    number_of_unexpected_successes = 0
+
+    for module_result in module_results:
+      self._output_writer.write(module_result.output)
+      self._output_writer.flush()
+
+      durations.extend(module_result.durations)
+      number_of_errors += module_result.number_of_errors
+      number_of_expected_failures += module_result.number_of_expected_failures
+      number_of_failures += module_result.number_of_failures
+      number_of_skipped += module_result.number_of_skipped
+      number_of_tests += module_result.number_of_tests
+      number_of_unexpected_successes += (
+          module_result.number_of_unexpected_successes)
+
+    if self._number_of_slowest_tests:
+      self._WriteSlowestTests(durations)
+
+    self._output_writer.write('\n{0:s}\n'.format('=' * 70))
+    self._output_writer.write((
+        'Ran {0:d} tests from {1:d} modules in {2:.3f}s using {3:d} '
+        'jobs\n\n').format(
+            number_of_tests, len(module_names), time.time() - start_time,
+            self._number_of_jobs))
+
+    details = []
+    for description, value in (
+        ('failures', number_of_failures),
+        ('errors', number_of_errors),
+        ('skipped', number_of_skipped),
+        ('expected failures', number_of_expected_failures),
+        ('unexpected successes', number_of_unexpected_successes)):
+      if value:
+        details.append('{0:s}={1:d}'.format(description, value))
+
+    successful = not (
+        number_of_errors or number_of_failures or
+        number_of_unexpected_successes)
+
+    status = 'OK' if successful else 'FAILED'
+    if details:
+      status = '{0:s} ({1:s})'.format(status, ', '.join(details))
+
+    self._output_writer.write('{0:s}\n'.format(status))
+    self._output_writer.flush()
+
+    return successful
@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""Tracing of the phases of builds."""
+
+from __future__ import unicode_literals
+
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import time
+
+try:
+  import resource
+except ImportError:
+  resource = None
+
+
+def _GetCPUTime():
+  """Retrieves the CPU time used by the process and its child processes.
+
+  Returns:
+    float: user and system CPU time in seconds.
+  """
+  user_time, system_time, children_user_time, children_system_time, _ = (
+      os.times())
+  return user_time + system_time + children_user_time + children_system_time
+
+
+def _GetPeakRSS():
+  """Retrieves the peak resident set size of the process and its children.
+
+  Note that the peak resident set size is the maximum over the lifetime of
+  the process and of its terminated child processes, not of a single span.
+
+  Returns:
+    int: peak resident set size in bytes or None if not supported on
+        the platform.
+  """
+  if not resource:
+    return None
+
+  peak_rss = max(
+      resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+      resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+  # On Mac OS X the resident set size is in bytes, elsewhere in kilobytes.
+  if sys.platform != 'darwin':
+    peak_rss *= 1024
+
+  return peak_rss
+
+
+class Span(object):
+  """Span that records the duration and resource usage of a phase.
+
+  Attributes:
+    attributes (dict[str, str]): attributes of the span, such as the name
+        of the project and the build target.
+    cpu_time (float): user and system CPU time used by the process and its
+        child processes during the span in seconds.
+    name (str): name of the span, such as the name of the phase.
+    peak_rss (int): peak resident set size of the process and its child
+        processes so far, at the end of the span, in bytes or None if not
+        available. This is a lifetime maximum of the process, which can be
+        reached during an earlier span.
+    process_identifier (int): identifier of the process that recorded
+        the span.
+    start_time (float): POSIX timestamp of the start of the span.
+    wall_time (float): wall clock time of the span in seconds.
+  """
+
+  def __init__(self, name, attributes=None):
+    """Initializes a span.
+
+    Args:
+      name (str): name of the span.
+      attributes (Optional[dict[str, str]]): attributes of the span.
+    """
+    super(Span, self).__init__()
+    self.attributes = attributes or {}
+    self.cpu_time = None
+    self.name = name
+    self.peak_rss = None
+    self.process_identifier = None
+    self.start_time = None
+    self.wall_time = None
+
+  def CopyFromDict(self, span_dict):
+    """Copies the span from a dictionary.
+
+    Args:
+      span_dict (dict[str, object]): span values per name.
+    """
+    self.attributes = span_dict.get('attributes', None) or {}
+    self.cpu_time = span_dict.get('cpu_time', None)
+    self.name = span_dict.get('name', None)
+    self.peak_rss = span_dict.get('peak_rss', None)
+    self.process_identifier = span_dict.get('process_identifier', None)
+    self.start_time = span_dict.get('start_time', None)
+    self.wall_time = span_dict.get('wall_time', None)
+
+  def CopyToDict(self):
+    """Copies the span to a dictionary.
+
+    Returns:
+      dict[str, object]: span values per name.
+    """
+    return {
+        'attributes': self.attributes,
+        'cpu_time': self.cpu_time,
+        'name': self.name,
+        'peak_rss': self.peak_rss,
+        'process_identifier': self.process_identifier,
+        'start_time': self.start_time,
+        'wall_time': self.wall_time}
+
+
+class Tracer(object):
+  """Tracer that records spans.
+
+  Spans are nested and inherit the attributes of the span they are nested
+  in, so that for example the phases of a build inherit the name of the
+  project. Every completed span is appended as a JSON line to the trace file,
+  which allows processes that build projects concurrently to share the same
+  trace file.
+  """
+
+  def __init__(self, path=None):
+    """Initializes a tracer.
+
+    Args:
+      path (Optional[str]): path of the JSON lines trace file, where None
+          represents keeping the spans in memory only.
+    """
+    super(Tracer, self).__init__()
+    self._attributes_stack = []
+    self._path = path
+    self._spans = []
+
+  def _WriteSpan(self, span):
+    """Writes a span to the trace file.
+
+    Args:
+      span (Span): span.
+    """
+    data = json.dumps(span.CopyToDict(), sort_keys=True)
+
+    try:
+      # The file is opened per span, since multiple processes append to it.
+      with io.open(self._path, 'a', encoding='utf-8') as file_object:
+        file_object.write('{0:s}\n'.format(data))
+
+    except IOError as exception:
+      logging.warning(
+          'Unable to write trace file: {0:s} with error: {1!s}'.format(
+              self._path, exception))
+
+  def GetSpans(self):
+    """Retrieves the recorded spans.
+
+    Returns:
+      list[Span]: spans, including those recorded by other processes that
+          share the trace file.
+    """
+    if not self._path:
+      return list(self._spans)
+
+    return ReadSpans(self._path)
+
+  @contextlib.contextmanager
+  def StartSpan(self, name, **kwargs):
+    """Starts a span.
+
+    Args:
+      name (str): name of the span.
+      kwargs (dict[str, str]): attributes of the span.
+
+    Yields:
+      Span: span, where the wall time, CPU time and peak resident set size
+          are set when the span ends.
+    """
+    attributes = {}
+    if self._attributes_stack:
+      attributes.update(self._attributes_stack[-1])
+    attributes.update({
+        key: value for key, value in kwargs.items() if value is not None})
+
+    span = Span(name, attributes=attributes)
+    span.process_identifier = os.getpid()
+
+    self._attributes_stack.append(attributes)
+
+    cpu_time = _GetCPUTime()
+    span.start_time = time.time()
+
+    try:
+      yield span
+
+    finally:
+      span.wall_time = time.time() - span.start_time
+      span.cpu_time = _GetCPUTime() - cpu_time
+      span.peak_rss = _GetPeakRSS()
+
+      self._attributes_stack.pop()
+
+      if self._path:
+        self._WriteSpan(span)
+      else:
+        self._spans.append(span)
+
+
+_tracer = None
+
+
+def SetTracer(tracer):
+  """Sets the tracer used by StartSpan.
+
+  Args:
+    tracer (Tracer): tracer or None to disable tracing.
+  """
+  global _tracer  # pylint: disable=global-statement
+  _tracer = tracer
+
+
+@contextlib.contextmanager
+def StartSpan(name, **kwargs):
+  """Starts a span using the tracer set by SetTracer.
+
+  Args:
+    name (str): name of the span.
+    kwargs (dict[str, str]): attributes of the span.
+
+  Yields:
+    Span: span or None if no tracer is set.
+  """
+  if not _tracer:
+    yield None
+
+  else:
+    with _tracer.StartSpan(name, **kwargs) as span:
+      yield span
+
+
+def ReadSpans(path):
+  """Reads spans from a JSON lines trace file.
+
+  Args:
+    path (str): path of the trace file.
+
+  Returns:
+    list[Span]: spans ordered by start time.
+  """
+  spans = []
+  if not os.path.exists(path):
+    return spans
+
+  with io.open(path, 'r', encoding='utf-8') as file_object:
+    for line in file_object:
+      line = line.strip()
+      if not line:
+        continue
+
+      try:
+        span_dict = json.loads(line)
+      except ValueError:
+        logging.warning('Unable to parse span in trace file: {0:s}'.format(
+            path))
+        continue
+
+      span = Span(None)
+      span.CopyFromDict(span_dict)
+      spans.append(span)
+
+  return sorted(spans, key=lambda span: span.start_time or 0.0)
+
+
+def WriteChromeTrace(spans, path):
+  """Writes spans as a Chrome trace event file.
+
+  The file can be loaded in chrome://tracing or Perfetto, where every build
+  process is shown as a separate row.
+
+  Args:
+    spans (list[Span]): spans.
+    path (str): path of the Chrome trace event file.
+
+  Returns:
+    bool: True if the file was written or False on error.
+  """
+  trace_events = []
+  for span in spans:
+    arguments = dict(span.attributes)
+    arguments['cpu_time'] = span.cpu_time
+    arguments['peak_rss'] = span.peak_rss
+
+    category = span.attributes.get('target', None) or 'build'
+
+    trace_events.append({
+        'args': arguments,
+        'cat': category,
+        'dur': int((span.wall_time or 0.0) * 1000000),
+        'name': span.name,
+        'ph': 'X',
+        'pid': span.process_identifier,
+        'tid': span.process_identifier,
+        'ts': int((span.start_time or 0.0) * 1000000)})
+
+  data = json.dumps({
+      'displayTimeUnit': 'ms', 'traceEvents': trace_events}, sort_keys=True)
+
+  try:
+    with io.open(path, 'w', encoding='utf-8') as file_object:
+      file_object.write('{0:s}'.format(data))
+
+  except IOError as exception:
+    logging.warning(
+        'Unable to write Chrome trace file: {0:s} with error: {1!s}'.format(
+            path, exception))
+    return False
+
+  return True
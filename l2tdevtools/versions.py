@@ -1,5 +1,156 @@
 # -*- coding: utf-8 -*-
-"""Functions to handle package versions."""
+"""Functions to handle package versions.
+
+A version string is converted into a version key, which is a hashable tuple
+that defines a total order of versions, for example:
+
+  1.0.dev1 < 1.0a1 < 1.0b1 < 1.0rc1 < 1.0 < 1.0.post1 < 1.0.1 < 1.1 < 1!0.1
+
+Version keys are cached, so that comparing the same versions multiple times,
+for example of all the packages in a repository, only parses every version
+string once.
+"""
+
+from __future__ import unicode_literals
+
+import functools
+import re
+
+
+# The maximum number of version keys to cache.
+_MAXIMUM_NUMBER_OF_CACHED_KEYS = 8192
+
+# The epoch of a version, such as "1!" in PEP 440 versions or "1:" in Debian
+# package versions.
+_EPOCH_RE = re.compile(r'^([0-9]+)[!:]')
+
+# The separators of the parts of a version.
+_PART_SEPARATOR_RE = re.compile(r'[.+_~-]+')
+
+# A run of digits or a run of other characters within a version part, where
+# every run is compared as a separate part, so that for example "1.0rc1" and
+# "1.0.rc1" are equivalent.
+_RUN_RE = re.compile(r'[0-9]+|[^0-9]+')
+
+# Textual parts that indicate a pre-release and their rank among each other.
+_PRE_RELEASE_RANKS = {
+    'dev': 0,
+    'a': 1,
+    'alpha': 1,
+    'b': 2,
+    'beta': 2,
+    'c': 3,
+    'pre': 3,
+    'preview': 3,
+    'rc': 3}
+
+# Every part of a version is represented by a tuple of the same types, which
+# makes them comparable to each other in both Python 2 and 3, where the first
+# value defines the order of the type of part:
+# * 0, a pre-release part, such as "rc", which is smaller than the end of
+#   the version, so that "1.0rc1" is smaller than "1.0";
+# * 1, the end of the version;
+# * 2, another textual part, such as "post", which is larger than the end of
+#   the version, but smaller than a numeric part, so that "1.0.post1" is
+#   larger than "1.0" and smaller than "1.0.1";
+# * 3, a numeric part.
+_END_OF_VERSION = (1, 0, '')
+
+_OPERATORS = {
+    '<': lambda first_key, second_key: first_key < second_key,
+    '<=': lambda first_key, second_key: first_key <= second_key,
+    '==': lambda first_key, second_key: first_key == second_key,
+    '>': lambda first_key, second_key: first_key > second_key,
+    '>=': lambda first_key, second_key: first_key >= second_key}
+
+
+def _CreateVersionKey(version_string):
+  """Creates a version key.
+
+  Args:
+    version_string (str): version string.
+
+  Returns:
+    tuple: version key.
+  """
+  version_string = version_string.strip().lower()
+
+  epoch = 0
+  match = _EPOCH_RE.match(version_string)
+  if match:
+    epoch = int(match.group(1), 10)
+    version_string = version_string[match.end():]
+
+  version_parts = []
+  for version_part in _PART_SEPARATOR_RE.split(version_string):
+    for run in _RUN_RE.findall(version_part):
+      if run.isdigit():
+        version_parts.append((3, int(run, 10), ''))
+      elif run in _PRE_RELEASE_RANKS:
+        version_parts.append((0, _PRE_RELEASE_RANKS[run], run))
+      else:
+        version_parts.append((2, 0, run))
+
+  version_parts.append(_END_OF_VERSION)
+  return epoch, tuple(version_parts)
+
+
+if hasattr(functools, 'lru_cache'):
+  _GetCachedVersionKey = functools.lru_cache(
+      maxsize=_MAXIMUM_NUMBER_OF_CACHED_KEYS)(_CreateVersionKey)
+
+else:
+  # Python 2 does not provide functools.lru_cache, hence a cache is used that
+  # is cleared when full.
+  _version_key_cache = {}
+
+  def _GetCachedVersionKey(version_string):
+    """Retrieves a cached version key.
+
+    Args:
+      version_string (str): version string.
+
+    Returns:
+      tuple: version key.
+    """
+    version_key = _version_key_cache.get(version_string, None)
+    if version_key is None:
+      if len(_version_key_cache) >= _MAXIMUM_NUMBER_OF_CACHED_KEYS:
+        _version_key_cache.clear()
+
+      version_key = _CreateVersionKey(version_string)
+      _version_key_cache[version_string] = version_key
+
+    return version_key
+
+  _GetCachedVersionKey.cache_clear = _version_key_cache.clear
+
+
+def _MatchesConstraint(version_key, constraint):
+  """Determines if a version key matches a version constraint.
+
+  Args:
+    version_key (tuple): version key.
+    constraint (list[str]): version constraint, where the first item is the
+        comparison operator, such as ">=", and the other items are the version
+        parts, for example as returned by
+        ProjectVersionDefinition.GetEarliestVersion().
+
+  Returns:
+    bool: True if the version key matches the constraint or if the comparison
+        operator is not supported.
+  """
+  compare_function = _OPERATORS.get(constraint[0], None)
+  if not compare_function:
+    return True
+
+  constraint_key = GetVersionKey('.'.join(constraint[1:]))
+  return compare_function(version_key, constraint_key)
+
+
+def ClearVersionKeyCache():
+  """Clears the version key cache."""
+  _GetCachedVersionKey.cache_clear()
 
 
 def CompareVersions(first_version_list, second_version_list):
@@ -15,26 +166,125 @@ def CompareVersions(first_version_list, second_version_list):
     int: 1 if the first is larger than the second, -1 if the first is smaller
         than the second, or 0 if the first and second are equal.
   """
-  first_version_list_length = len(first_version_list)
-  second_version_list_length = len(second_version_list)
+  first_version_key = GetVersionKey('.'.join(first_version_list))
+  second_version_key = GetVersionKey('.'.join(second_version_list))
 
-  for index in range(0, first_version_list_length):
-    if index >= second_version_list_length:
-      return 1
+  if first_version_key > second_version_key:
+    return 1
+  elif first_version_key < second_version_key:
+    return -1
 
-    try:
-      first_version_part = int(first_version_list[index], 10)
-      second_version_part = int(second_version_list[index], 10)
-    except ValueError:
-      first_version_part = first_version_list[index]
-      second_version_part = second_version_list[index]
+  return 0
 
-    if first_version_part > second_version_part:
-      return 1
-    elif first_version_part < second_version_part:
-      return -1
 
-  if first_version_list_length < second_version_list_length:
-    return -1
+def FilterVersions(version_strings, version_definition):
+  """Filters versions by a project version definition.
 
-  return 0
+  Args:
+    version_strings (list[str]): version strings.
+    version_definition (ProjectVersionDefinition): project version definition
+        or None.
+
+  Returns:
+    list[str]: version strings within the earliest and latest version of the
+        project version definition, in their original order.
+  """
+  earliest_version = None
+  latest_version = None
+  if version_definition:
+    earliest_version = version_definition.GetEarliestVersion()
+    latest_version = version_definition.GetLatestVersion()
+
+  return [
+      version_string for version_string in version_strings
+      if IsVersionInRange(
+          version_string, earliest_version=earliest_version,
+          latest_version=latest_version)]
+
+
+def GetLatestVersion(version_strings, version_definition=None):
+  """Retrieves the latest version.
+
+  Args:
+    version_strings (list[str]): version strings.
+    version_definition (Optional[ProjectVersionDefinition]): project version
+        definition, where versions outside the earliest and latest version
+        are ignored.
+
+  Returns:
+    str: latest version or None if no version is available.
+  """
+  if version_definition:
+    version_strings = FilterVersions(version_strings, version_definition)
+
+  if not version_strings:
+    return None
+
+  return max(version_strings, key=GetVersionKey)
+
+
+def GetVersionKey(version_string):
+  """Retrieves a key to compare versions.
+
+  Args:
+    version_string (str): version string.
+
+  Returns:
+    tuple: hashable version key, where the keys of 2 versions compare the same
+        as the versions.
+  """
+  return _GetCachedVersionKey(version_string)
+
+
+def IsPreRelease(version_string):
+  """Determines if a version is a pre-release or development release.
+
+  Args:
+    version_string (str): version string.
+
+  Returns:
+    bool: True if the version contains a pre-release part, such as "rc1" in
+        "1.0rc1" or "dev1" in "1.0.dev1".
+  """
+  _, version_parts = GetVersionKey(version_string)
+  return any(version_part[0] == 0 for version_part in version_parts)
+
+
+def IsVersionInRange(
+    version_string, earliest_version=None, latest_version=None):
+  """Determines if a version is within an earliest and latest version.
+
+  Args:
+    version_string (str): version string.
+    earliest_version (Optional[list[str]]): earliest version constraint,
+        where the first item is the comparison operator.
+    latest_version (Optional[list[str]]): latest version constraint,
+        where the first item is the comparison operator.
+
+  Returns:
+    bool: True if the version is within the earliest and latest version.
+  """
+  version_key = GetVersionKey(version_string)
+
+  if earliest_version and not _MatchesConstraint(
+      version_key, earliest_version):
+    return False
+
+  if latest_version and not _MatchesConstraint(version_key, latest_version):
+    return False
+
+  return True
+
+
+def SortVersions(version_strings, reverse=False):
+  """Sorts versions.
+
+  Args:
+    version_strings (list[str]): version strings.
+    reverse (Optional[bool]): True to sort from the latest to the earliest
+        version.
+
+  Returns:
+    list[str]: sorted version strings.
+  """
+  return sorted(version_strings, key=GetVersionKey, reverse=reverse)
@@ -4,12 +4,31 @@
 
 from __future__ import unicode_literals
 
-import unittest
+import argparse
+import multiprocessing
 import sys
 
+from l2tdevtools import test_runner
+
 
 if __name__ == '__main__':
-  test_suite = unittest.TestLoader().discover('tests', pattern='*.py')
-  test_results = unittest.TextTestRunner(verbosity=2).run(test_suite)
-  if not test_results.wasSuccessful():
+  argument_parser = argparse.ArgumentParser(description=(
+      'Runs the tests.'))
+
+  argument_parser.add_argument(
+      '-j', '--jobs', dest='jobs', action='store', type=int,
+      default=multiprocessing.cpu_count(), metavar='NUMBER', help=(
+          'maximum number of test modules to run concurrently, 1 runs '
+          'the test modules sequentially.'))
+
+  argument_parser.add_argument(
+      '--slowest', dest='slowest', action='store', type=int, default=10,
+      metavar='NUMBER', help=(
+          'number of the slowest tests to report, 0 disables the report.'))
+
+  options = argument_parser.parse_args()
+
+  parallel_test_runner = test_runner.ParallelTestRunner(
+      number_of_jobs=options.jobs, number_of_slowest_tests=options.slowest)
+  if not parallel_test_runner.Run(start_directory='tests', pattern='*.py'):
     sys.exit(1)
@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the catalog of the files in build directories."""
+
+from __future__ import unicode_literals
+
+import glob
+import hashlib
+import io
+import os
+import unittest
+
+from l2tdevtools import artifact_catalog
+
+from tests import test_lib
+
+
+class ArtifactCatalogTest(test_lib.BaseTestCase):
+  """Tests for the artifact catalog."""
+
+  # pylint: disable=protected-access
+
+  _FILENAMES = [
+      '.hidden-1.0.tar.gz',
+      'libyal_20180101-1_amd64.deb',
+      'libyal_20180101.orig.tar.gz',
+      'libyal-20180101-1ppa1~bionic_source.changes',
+      'libyal-20171201-1ppa1~bionic_source.changes',
+      'libyal-python_20180101-1_amd64.deb',
+      'plaso-20180101.tar.gz']
+
+  def _CreateFile(self, path, data=b'data'):
+    """Creates a file.
+
+    Args:
+      path (str): path of the file.
+      data (Optional[bytes]): data of the file.
+    """
+    with io.open(path, 'wb') as file_object:
+      file_object.write(data)
+
+  def testGlob(self):
+    """Tests the Glob function."""
+    with test_lib.TempDirectory() as temporary_directory:
+      build_directory = os.path.join(temporary_directory, 'build')
+      os.mkdir(build_directory)
+
+      for filename in self._FILENAMES:
+        self._CreateFile(os.path.join(build_directory, filename))
+
+      catalog = artifact_catalog.ArtifactCatalog(
+          os.path.join(temporary_directory, 'catalog.db'))
+
+      for basename in (
+          '*', '*.tar.gz', 'libyal[-_]*-[1-9]_amd64.*',
+          'libyal-*-1ppa1~bionic_source.changes', 'libyal_?????????.*',
+          '.hidden*'):
+        pattern = os.path.join(build_directory, basename)
+        self.assertEqual(catalog.Glob(pattern), sorted(glob.glob(pattern)))
+
+      self.assertEqual(catalog.Glob(os.path.join(build_directory, 'bogus')), [])
+
+  def testGlobRefresh(self):
+    """Tests that Glob lists a directory again after it changed."""
+    with test_lib.TempDirectory() as temporary_directory:
+      catalog = artifact_catalog.ArtifactCatalog(
+          os.path.join(temporary_directory, 'catalog.db'))
+
+      pattern = os.path.join(temporary_directory, '*.deb')
+      self.assertEqual(catalog.Glob(pattern), [])
+
+      path = os.path.join(temporary_directory, 'test_1.0-1_amd64.deb')
+      self._CreateFile(path)
+      self.assertEqual(catalog.Glob(pattern), [path])
+
+      catalog.RemoveFile(path)
+      self.assertFalse(os.path.exists(path))
+      self.assertEqual(catalog.Glob(pattern), [])
+
+      # The catalog database file is not part of the listing.
+      self.assertEqual(catalog.ListDirectory(temporary_directory), [])
+
+  def testListDirectoryUnchanged(self):
+    """Tests that ListDirectory does not list an unchanged directory again."""
+    with test_lib.TempDirectory() as temporary_directory:
+      build_directory = os.path.join(temporary_directory, 'build')
+      os.mkdir(build_directory)
+
+      self._CreateFile(os.path.join(build_directory, 'test-1.0.tar.gz'))
+
+      # Set the modification time of the directory in the past so that it is
+      # not considered racy.
+      os.utime(build_directory, (1500000000, 1500000000))
+
+      catalog = artifact_catalog.ArtifactCatalog(
+          os.path.join(temporary_directory, 'catalog.db'))
+
+      self.assertEqual(
+          catalog.ListDirectory(build_directory), ['test-1.0.tar.gz'])
+
+      connection = catalog._GetConnection()
+      with connection:
+        connection.execute('DELETE FROM files')
+
+      # The catalog is used since the directory did not change.
+      self.assertEqual(catalog.ListDirectory(build_directory), [])
+
+      self._CreateFile(os.path.join(build_directory, 'test-1.1.tar.gz'))
+
+      self.assertEqual(catalog.ListDirectory(build_directory), [
+          'test-1.0.tar.gz', 'test-1.1.tar.gz'])
+
+  def testRecordArtifacts(self):
+    """Tests the RecordArtifacts function."""
+    with test_lib.TempDirectory() as temporary_directory:
+      catalog = artifact_catalog.ArtifactCatalog(
+          os.path.join(temporary_directory, 'catalog.db'))
+
+      self._CreateFile(os.path.join(temporary_directory, 'test-1.0.tar.gz'))
+      self._CreateFile(
+          os.path.join(temporary_directory, 'unchanged-1.0.tar.gz'))
+
+      file_states = catalog.GetFileStates(temporary_directory)
+
+      self._CreateFile(
+          os.path.join(temporary_directory, 'test_1.0-1_amd64.deb'),
+          data=b'package')
+
+      filenames = catalog.RecordArtifacts(
+          temporary_directory, file_states, 'test', 'dpkg',
+          project_version='1.0', distribution='bionic', architecture='amd64')
+      self.assertEqual(filenames, ['test_1.0-1_amd64.deb'])
+
+      artifacts = catalog.GetArtifacts()
+      self.assertEqual(len(artifacts), 1)
+
+      artifact = artifacts[0]
+      self.assertEqual(artifact.directory, temporary_directory)
+      self.assertEqual(artifact.filename, 'test_1.0-1_amd64.deb')
+      self.assertEqual(artifact.size, 7)
+      self.assertEqual(artifact.project_name, 'test')
+      self.assertEqual(artifact.project_version, '1.0')
+      self.assertEqual(artifact.build_target, 'dpkg')
+      self.assertEqual(artifact.distribution, 'bionic')
+      self.assertEqual(artifact.architecture, 'amd64')
+      self.assertEqual(
+          artifact.digest, hashlib.sha256(b'package').hexdigest())
+
+      self.assertEqual(catalog.GetArtifacts(project_name='bogus'), [])
+      self.assertEqual(len(catalog.GetArtifacts(build_target='dpkg')), 1)
+
+  def testRecordArtifactsWithDistributions(self):
+    """Tests the RecordArtifacts function with multiple distributions."""
+    with test_lib.TempDirectory() as temporary_directory:
+      catalog = artifact_catalog.ArtifactCatalog(
+          os.path.join(temporary_directory, 'catalog.db'))
+
+      file_states = catalog.GetFileStates(temporary_directory)
+
+      for filename in (
+          'test_1.0.orig.tar.gz', 'test_1.0-1ppa1~bionic.dsc',
+          'test_1.0-1ppa1~bionic_source.changes',
+          'test_1.0-1ppa1~xenial_source.changes'):
+        self._CreateFile(os.path.join(temporary_directory, filename))
+
+      catalog.RecordArtifacts(
+          temporary_directory, file_states, 'test', 'dpkg-source',
+          project_version='1.0', distributions=['bionic', 'xenial'])
+
+      distributions = {
+          artifact.filename: artifact.distribution
+          for artifact in catalog.GetArtifacts()}
+
+    self.assertEqual(distributions, {
+        'test_1.0.orig.tar.gz': None,
+        'test_1.0-1ppa1~bionic.dsc': 'bionic',
+        'test_1.0-1ppa1~bionic_source.changes': 'bionic',
+        'test_1.0-1ppa1~xenial_source.changes': 'xenial'})
+
+
+class ArtifactCatalogFunctionsTest(test_lib.BaseTestCase):
+  """Tests for the artifact catalog functions."""
+
+  def testRecordArtifacts(self):
+    """Tests the RecordArtifacts function."""
+    with test_lib.TempDirectory() as temporary_directory:
+      catalog = artifact_catalog.ArtifactCatalog(
+          os.path.join(temporary_directory, 'catalog.db'))
+
+      build_directory = os.path.join(temporary_directory, 'build')
+      os.mkdir(build_directory)
+
+      current_working_directory = os.getcwd()
+      os.chdir(build_directory)
+
+      artifact_catalog.SetArtifactCatalog(catalog)
+      try:
+        with artifact_catalog.RecordArtifacts(
+            'test', 'download', project_version='1.0'):
+          with io.open('test-1.0.tar.gz', 'wb') as file_object:
+            file_object.write(b'data')
+
+        self.assertEqual(
+            artifact_catalog.Glob('test-*.tar.gz'), ['test-1.0.tar.gz'])
+
+        artifacts = catalog.GetArtifacts(project_name='test')
+        self.assertEqual(len(artifacts), 1)
+        self.assertEqual(artifacts[0].build_target, 'download')
+
+        artifact_catalog.RemoveFile('test-1.0.tar.gz')
+        self.assertEqual(artifact_catalog.Glob('test-*.tar.gz'), [])
+
+      finally:
+        artifact_catalog.SetArtifactCatalog(None)
+        os.chdir(current_working_directory)
+
+      self.assertEqual(catalog.GetArtifacts(), [])
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,374 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the build tool."""
+
+from __future__ import unicode_literals
+
+import io
+import json
+import os
+import unittest
+
+from l2tdevtools import projects
+from l2tdevtools import source_helper
+from l2tdevtools import tracing
+from l2tdevtools.download_helpers import interface
+from tools import build
+
+from tests import test_lib
+
+
+class TestDownloadHelper(object):
+  """Download helper for testing."""
+
+  def __init__(self, project_version):
+    """Initializes the download helper.
+
+    Args:
+      project_version (str): latest version of the project or None if not
+          available.
+    """
+    super(TestDownloadHelper, self).__init__()
+    self._project_version = project_version
+
+  def GetDownloadURL(self, project_name, project_version):
+    """Retrieves the download URL for a given project name and version.
+
+    Args:
+      project_name (str): name of the project.
+      project_version (str): version of the project.
+
+    Returns:
+      str: download URL of the project.
+    """
+    return 'https://example.com/{0:s}-{1:s}.tar.gz'.format(
+        project_name, project_version)
+
+  def GetLatestVersion(self, unused_project_name, unused_version_definition):
+    """Retrieves the latest version number for a given project name.
+
+    Args:
+      project_name (str): name of the project.
+      version_definition (ProjectVersionDefinition): project version
+          definition.
+
+    Returns:
+      str: latest version number or None if not available.
+    """
+    return self._project_version
+
+
+class TestBuildHelper(object):
+  """Build helper for testing that only builds if its output is missing.
+
+  Attributes:
+    distribution (str): name of the distribution.
+    output_existed (bool): True if the build output existed when Build was
+        called.
+  """
+
+  def __init__(self):
+    """Initializes the build helper."""
+    super(TestBuildHelper, self).__init__()
+    self.distribution = None
+    self.output_existed = None
+
+  def Build(self, unused_source_helper_object):
+    """Builds the output file if it does not exist.
+
+    Args:
+      source_helper_object (SourceHelper): source helper.
+
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    self.output_existed = os.path.exists('test.deb')
+    if not self.output_existed:
+      with io.open('test.deb', 'wb') as file_object:
+        file_object.write(b'new')
+
+    return True
+
+  def CheckBuildRequired(self, unused_source_helper_object):
+    """Checks if a build is required.
+
+    Args:
+      source_helper_object (SourceHelper): source helper.
+
+    Returns:
+      bool: True if a build is required, False otherwise.
+    """
+    return not os.path.exists('test.deb')
+
+  def Clean(self, unused_source_helper_object):
+    """Cleans the build and dist directory.
+
+    Args:
+      source_helper_object (SourceHelper): source helper.
+    """
+    return
+
+  def GetOutputFilenames(self, unused_source_helper_object):
+    """Retrieves the names of the files produced by the build.
+
+    Args:
+      source_helper_object (SourceHelper): source helper.
+
+    Returns:
+      list[str]: paths of the files produced by the build.
+    """
+    return ['test.deb']
+
+
+class TestSourceHelper(object):
+  """Source helper for testing.
+
+  Attributes:
+    project_name (str): name of the project.
+  """
+
+  def __init__(self, project_name):
+    """Initializes the source helper.
+
+    Args:
+      project_name (str): name of the project.
+    """
+    super(TestSourceHelper, self).__init__()
+    self.project_name = project_name
+
+  def GetProjectVersion(self):
+    """Retrieves the version number for a given project name.
+
+    Returns:
+      str: version number.
+    """
+    return '20180831'
+
+
+class TestProjectBuilder(build.ProjectBuilder):
+  """Project builder for testing."""
+
+  def __init__(self, build_target, project_versions):
+    """Initializes the project builder.
+
+    Args:
+      build_target (str): build target.
+      project_versions (dict[str, str]): latest version per project name.
+    """
+    super(TestProjectBuilder, self).__init__(build_target)
+    self._project_versions = project_versions
+
+  def _CreateDownloadHelper(self, project_definition):
+    """Creates a download helper.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+
+    Returns:
+      TestDownloadHelper: download helper.
+    """
+    return TestDownloadHelper(
+        self._project_versions.get(project_definition.name, None))
+
+
+class ProjectBuildPlanTest(test_lib.BaseTestCase):
+  """Tests for the build plan of a project."""
+
+  def testCopyToDict(self):
+    """Tests the CopyToDict function."""
+    plan = build.ProjectBuildPlan('test', 'dpkg')
+    plan.artifacts = ['test_20180831-1_amd64.deb']
+    plan.build_required = True
+    plan.version = '20180831'
+
+    expected_dict = {
+        'artifacts': ['test_20180831-1_amd64.deb'],
+        'build_required': True,
+        'build_target': 'dpkg',
+        'distributions': [],
+        'download_url': None,
+        'error': None,
+        'name': 'test',
+        'reason': None,
+        'version': '20180831'}
+
+    self.assertEqual(plan.CopyToDict(), expected_dict)
+
+
+class ProjectBuilderTest(test_lib.BaseTestCase):
+  """Tests for the project builder."""
+
+  # pylint: disable=protected-access
+
+  def _CreateProjectDefinition(self, name):
+    """Creates a project definition.
+
+    Args:
+      name (str): name of the project.
+
+    Returns:
+      ProjectDefinition: project definition.
+    """
+    project_definition = projects.ProjectDefinition(name)
+    project_definition.build_system = 'configure_make'
+    project_definition.download_url = 'https://example.com/{0:s}'.format(name)
+    return project_definition
+
+  def testBuildProjectForDistributionWithChangedInputs(self):
+    """Tests the _BuildProjectForDistribution function with changed inputs."""
+    project_builder = TestProjectBuilder('dpkg', {})
+    project_builder._CheckFingerprint = (
+        lambda *unused_args: (None, 'the inputs changed: source'))
+
+    build_helper_object = TestBuildHelper()
+    source_helper_object = TestSourceHelper('test')
+
+    current_working_directory = os.getcwd()
+
+    try:
+      with test_lib.TempDirectory() as temporary_directory:
+        os.chdir(temporary_directory)
+
+        with io.open('test.deb', 'wb') as file_object:
+          file_object.write(b'stale')
+
+        result = project_builder._BuildProjectForDistribution(
+            None, build_helper_object, source_helper_object, None)
+        self.assertTrue(result)
+
+        with io.open('test.deb', 'rb') as file_object:
+          data = file_object.read()
+
+    finally:
+      os.chdir(current_working_directory)
+
+    self.assertFalse(build_helper_object.output_existed)
+    self.assertEqual(data, b'new')
+
+  def testPlan(self):
+    """Tests the Plan function."""
+    project_builder = TestProjectBuilder('dpkg-source', {'test': '20180831'})
+
+    project_definition = self._CreateProjectDefinition('test')
+
+    with test_lib.TempDirectory() as temporary_directory:
+      changes_path = os.path.join(
+          temporary_directory, 'test_20180831-1ppa1~xenial_source.changes')
+      with io.open(changes_path, 'wb') as file_object:
+        file_object.write(b'changes')
+
+      plan = project_builder.Plan(project_definition, temporary_directory)
+
+    self.assertIsNone(plan.error)
+    self.assertEqual(plan.version, '20180831')
+    self.assertEqual(
+        plan.download_url, 'https://example.com/test-20180831.tar.gz')
+    self.assertTrue(plan.build_required)
+    self.assertEqual(plan.distributions, ['bionic', 'trusty'])
+    self.assertEqual(plan.artifacts, [
+        'test_20180831-1ppa1~bionic_source.changes',
+        'test_20180831-1ppa1~trusty_source.changes',
+        'test_20180831-1ppa1~xenial_source.changes'])
+
+    project_definition = self._CreateProjectDefinition('bogus')
+
+    with test_lib.TempDirectory() as temporary_directory:
+      plan = project_builder.Plan(project_definition, temporary_directory)
+
+    self.assertEqual(plan.error, 'unable to determine the latest version')
+    self.assertFalse(plan.build_required)
+
+
+class BuildPlanTest(test_lib.BaseTestCase):
+  """Tests for the build plan functions."""
+
+  # pylint: disable=protected-access
+
+  def testPlanBuilds(self):
+    """Tests the _PlanBuilds function."""
+    project_builder = TestProjectBuilder(
+        'dpkg-source', {'first': '1.0', 'second': '2.0'})
+
+    project_definitions = []
+    for name in ('second', 'first'):
+      project_definition = projects.ProjectDefinition(name)
+      project_definition.build_system = 'setup_py'
+      project_definition.download_url = 'https://example.com/{0:s}'.format(
+          name)
+      project_definitions.append(project_definition)
+
+    project_definitions[0].dpkg_build_dependencies = ['python-first']
+
+    with test_lib.TempDirectory() as temporary_directory:
+      os.mkdir(os.path.join(temporary_directory, 'first'))
+
+      changes_path = os.path.join(
+          temporary_directory, 'first',
+          'python-first_1.0-1ppa1~{0:s}_source.changes')
+      for distribution in ('bionic', 'trusty', 'xenial'):
+        with io.open(changes_path.format(distribution), 'wb') as file_object:
+          file_object.write(b'changes')
+
+      plans = build._PlanBuilds(
+          project_builder, temporary_directory, project_definitions,
+          use_project_directories=True, number_of_threads=2)
+
+    self.assertEqual([plan.name for plan in plans], ['first', 'second'])
+    self.assertFalse(plans[0].build_required)
+    self.assertTrue(plans[1].build_required)
+
+  def testInitializeWorker(self):
+    """Tests the _InitializeWorker function."""
+    with test_lib.TempDirectory() as temporary_directory:
+      page_cache_path = os.path.join(temporary_directory, 'cache')
+      source_store_path = os.path.join(temporary_directory, 'store')
+
+      try:
+        build._InitializeWorker(
+            None, git_mirror_cache_path=temporary_directory,
+            page_cache_path=page_cache_path, page_cache_offline=True,
+            page_cache_time_to_live=60, source_store_path=source_store_path)
+
+        git_mirror_cache = (
+            source_helper.GitRepositorySourceHelper._git_mirror_cache)
+        self.assertIsNotNone(git_mirror_cache)
+        self.assertEqual(git_mirror_cache._path, temporary_directory)
+
+        page_cache = interface.DownloadHelper._page_cache
+        self.assertIsNotNone(page_cache)
+        self.assertEqual(page_cache._path, page_cache_path)
+        self.assertEqual(page_cache._time_to_live, 60)
+        self.assertTrue(page_cache.offline)
+
+        source_store = source_helper.SourcePackageHelper._source_store
+        self.assertIsNotNone(source_store)
+        self.assertEqual(source_store._path, source_store_path)
+
+      finally:
+        interface.DownloadHelper.SetPageCache(None)
+        source_helper.GitRepositorySourceHelper.SetGitMirrorCache(None)
+        source_helper.SourcePackageHelper.SetSourceStore(None)
+        tracing.SetTracer(None)
+
+  def testWriteBuildPlan(self):
+    """Tests the _WriteBuildPlan function."""
+    plan = build.ProjectBuildPlan('test', 'dpkg')
+
+    with test_lib.TempDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'plan.json')
+
+      result = build._WriteBuildPlan(path, 'dpkg', [plan], ['disabled'], [])
+      self.assertTrue(result)
+
+      with io.open(path, 'r', encoding='utf-8') as file_object:
+        json_dict = json.load(file_object)
+
+    self.assertEqual(json_dict['build_target'], 'dpkg')
+    self.assertEqual(json_dict['disabled_projects'], ['disabled'])
+    self.assertEqual(json_dict['undefined_projects'], [])
+    self.assertEqual(len(json_dict['projects']), 1)
+    self.assertEqual(json_dict['projects'][0]['name'], 'test')
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the environment of the compiler and make commands of builds."""
+
+from __future__ import unicode_literals
+
+import io
+import os
+import stat
+import unittest
+
+from l2tdevtools import build_environment
+from l2tdevtools import projects
+
+from tests import test_lib
+
+
+class TestBuildEnvironment(build_environment.BuildEnvironment):
+  """Build environment for testing without ccache masquerade directories."""
+
+  _CCACHE_MASQUERADE_DIRECTORIES = ()
+
+
+class CompilerCacheStatisticsTest(test_lib.BaseTestCase):
+  """Tests for the compiler cache statistics."""
+
+  def testGetDifference(self):
+    """Tests the GetDifference function."""
+    previous_statistics = build_environment.CompilerCacheStatistics(
+        hits=10, misses=5)
+    statistics = build_environment.CompilerCacheStatistics(hits=40, misses=15)
+
+    statistics = statistics.GetDifference(previous_statistics)
+    self.assertEqual(statistics.hits, 30)
+    self.assertEqual(statistics.misses, 10)
+
+  def testGetHitRate(self):
+    """Tests the GetHitRate function."""
+    statistics = build_environment.CompilerCacheStatistics(hits=3, misses=1)
+    self.assertEqual(statistics.GetHitRate(), 0.75)
+
+    statistics = build_environment.CompilerCacheStatistics()
+    self.assertIsNone(statistics.GetHitRate())
+
+
+class BuildEnvironmentTest(test_lib.BaseTestCase):
+  """Tests for the build environment."""
+
+  _PRINT_STATS_OUTPUT = '\n'.join([
+      'stats_updated_timestamp\t1535712000',
+      'direct_cache_hit\t120',
+      'preprocessed_cache_hit\t30',
+      'cache_miss\t50',
+      'called_for_link\t7',
+      ''])
+
+  _SHOW_STATS_OUTPUT = '\n'.join([
+      'cache directory                     /tmp/ccache',
+      'primary config                      /tmp/ccache/ccache.conf',
+      'cache hit (direct)                   120',
+      'cache hit (preprocessed)              30',
+      'cache miss                            50',
+      'cache hit rate                     75.00 %',
+      'called for link                        7',
+      'files in cache                       300',
+      ''])
+
+  def testGetEnvironmentVariablesParallelMake(self):
+    """Tests the GetEnvironmentVariables function with parallel make."""
+    environment = build_environment.BuildEnvironment(number_of_make_jobs=8)
+
+    environment_variables = environment.GetEnvironmentVariables(environment={
+        'DEB_BUILD_OPTIONS': 'nocheck parallel=2',
+        'MAKEFLAGS': '-j2 -s',
+        'PATH': '/usr/bin'})
+
+    self.assertEqual(environment_variables, {
+        'DEB_BUILD_OPTIONS': 'nocheck parallel=8',
+        'MAKEFLAGS': '-s -j8',
+        'PATH': '/usr/bin',
+        'RPM_BUILD_NCPUS': '8'})
+
+    project_definition = projects.ProjectDefinition('test')
+    project_definition.build_options = ['no_parallel_make']
+
+    environment_variables = environment.GetEnvironmentVariables(
+        project_definition=project_definition, environment={})
+
+    self.assertEqual(environment_variables['MAKEFLAGS'], '-j1')
+
+    environment = build_environment.BuildEnvironment()
+
+    environment_variables = environment.GetEnvironmentVariables(
+        environment={'PATH': '/usr/bin'})
+    self.assertEqual(environment_variables, {'PATH': '/usr/bin'})
+
+  def testGetEnvironmentVariablesCompilerCache(self):
+    """Tests the GetEnvironmentVariables function with a compiler cache."""
+    with test_lib.TempDirectory() as temporary_directory:
+      ccache_path = os.path.join(temporary_directory, 'ccache')
+      with io.open(ccache_path, 'wb') as file_object:
+        file_object.write(b'#!/bin/sh\nprintf "direct_cache_hit\\t3\\n"\n')
+      os.chmod(ccache_path, stat.S_IRWXU)
+
+      path = os.environ.get('PATH', '')
+      os.environ['PATH'] = os.pathsep.join([temporary_directory, path])
+      try:
+        environment = TestBuildEnvironment(
+            compiler_cache_directory='/tmp/ccache')
+      finally:
+        os.environ['PATH'] = path
+
+      self.assertTrue(environment.IsCompilerCacheAvailable())
+
+      environment_variables = environment.GetEnvironmentVariables(
+          environment={'CC': 'gcc'})
+
+      self.assertEqual(environment_variables['CCACHE_DIR'], '/tmp/ccache')
+      self.assertEqual(
+          environment_variables['CC'], '{0:s} gcc'.format(ccache_path))
+      self.assertEqual(
+          environment_variables['CXX'], '{0:s} c++'.format(ccache_path))
+
+      project_definition = projects.ProjectDefinition('test')
+      project_definition.build_options = ['no_compiler_cache']
+
+      environment_variables = environment.GetEnvironmentVariables(
+          project_definition=project_definition, environment={'CC': 'gcc'})
+      self.assertEqual(environment_variables, {'CC': 'gcc'})
+
+      statistics = environment.GetCompilerCacheStatistics()
+      self.assertEqual(statistics.hits, 3)
+      self.assertEqual(statistics.misses, 0)
+
+  def testGetCompilerCacheStatistics(self):
+    """Tests the GetCompilerCacheStatistics function."""
+    environment = build_environment.BuildEnvironment()
+    self.assertFalse(environment.IsCompilerCacheAvailable())
+    self.assertIsNone(environment.GetCompilerCacheStatistics())
+
+  def testGetCompilerCacheStatisticsWithShowStats(self):
+    """Tests the GetCompilerCacheStatistics function with ccache 3."""
+    with test_lib.TempDirectory() as temporary_directory:
+      ccache_path = os.path.join(temporary_directory, 'ccache')
+      with io.open(ccache_path, 'wb') as file_object:
+        file_object.write(b'\n'.join([
+            b'#!/bin/sh',
+            b'if test "$1" = "--print-stats"; then exit 1; fi',
+            b'echo "cache hit (direct)                     2"',
+            b'echo "cache miss                             1"',
+            b'']))
+      os.chmod(ccache_path, stat.S_IRWXU)
+
+      path = os.environ.get('PATH', '')
+      os.environ['PATH'] = os.pathsep.join([temporary_directory, path])
+      try:
+        environment = TestBuildEnvironment(
+            compiler_cache_directory='/tmp/ccache')
+      finally:
+        os.environ['PATH'] = path
+
+      statistics = environment.GetCompilerCacheStatistics()
+      self.assertEqual(statistics.hits, 2)
+      self.assertEqual(statistics.misses, 1)
+
+  def testParseCompilerCacheStatistics(self):
+    """Tests the ParseCompilerCacheStatistics function."""
+    environment = build_environment.BuildEnvironment()
+
+    statistics = environment.ParseCompilerCacheStatistics(
+        self._PRINT_STATS_OUTPUT)
+    self.assertEqual(statistics.hits, 150)
+    self.assertEqual(statistics.misses, 50)
+
+  def testParseCompilerCacheSummary(self):
+    """Tests the ParseCompilerCacheSummary function."""
+    environment = build_environment.BuildEnvironment()
+
+    statistics = environment.ParseCompilerCacheSummary(
+        self._SHOW_STATS_OUTPUT)
+    self.assertEqual(statistics.hits, 150)
+    self.assertEqual(statistics.misses, 50)
+
+    statistics = environment.ParseCompilerCacheSummary('Hits: 1 / 2\n')
+    self.assertIsNone(statistics)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -4,11 +4,115 @@
 
 from __future__ import unicode_literals
 
+import io
+import os
 import unittest
 
+from l2tdevtools.build_helpers import dpkg
+from l2tdevtools import projects
+
 from tests import test_lib
 
 
+class TestSourceHelper(object):
+  """Source helper for testing.
+
+  Attributes:
+    number_of_extractions (int): number of times the source directory was
+        created.
+    project_name (str): name of the project.
+  """
+
+  def __init__(self, project_name, project_version):
+    """Initializes the source helper.
+
+    Args:
+      project_name (str): name of the project.
+      project_version (str): version of the project.
+    """
+    super(TestSourceHelper, self).__init__()
+    self._project_version = project_version
+    self.number_of_extractions = 0
+    self.project_name = project_name
+
+  def Create(self):
+    """Creates the source directory with a dpkg packaging directory.
+
+    Returns:
+      str: name of the source directory.
+    """
+    self.number_of_extractions += 1
+
+    source_directory = '{0:s}-{1:s}'.format(
+        self.project_name, self._project_version)
+    dpkg_directory = os.path.join(source_directory, 'dpkg')
+    os.makedirs(dpkg_directory)
+
+    changelog_path = os.path.join(dpkg_directory, 'changelog')
+    with io.open(changelog_path, 'wb') as file_object:
+      file_object.write(b'unstable\n')
+
+    return source_directory
+
+  def Download(self):
+    """Downloads the source package.
+
+    Returns:
+      str: filename of the source package.
+    """
+    source_filename = '{0:s}-{1:s}.tar.gz'.format(
+        self.project_name, self._project_version)
+    if not os.path.exists(source_filename):
+      with io.open(source_filename, 'wb') as file_object:
+        file_object.write(b'source')
+
+    return source_filename
+
+  def GetProjectVersion(self):
+    """Retrieves the version of the project.
+
+    Returns:
+      str: version of the project.
+    """
+    return self._project_version
+
+
+class TestConfigureMakeSourceDPKGBuildHelper(
+    dpkg.ConfigureMakeSourceDPKGBuildHelper):
+  """Helper to build source dpkg packages (.deb) for testing.
+
+  Attributes:
+    changelogs (dict[str, bytes]): content of the changelog per distribution
+        at the time the source dpkg package was built.
+  """
+
+  def __init__(self, project_definition, l2tdevtools_path):
+    """Initializes a build helper.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+      l2tdevtools_path (str): path to the l2tdevtools directory.
+    """
+    super(TestConfigureMakeSourceDPKGBuildHelper, self).__init__(
+        project_definition, l2tdevtools_path)
+    self.changelogs = {}
+
+  def _BuildSourceDPKGPackage(self, source_directory):
+    """Builds a source dpkg package from a source directory.
+
+    Args:
+      source_directory (str): name of the source directory.
+
+    Returns:
+      bool: True if successful, False otherwise.
+    """
+    changelog_path = os.path.join(source_directory, 'debian', 'changelog')
+    with io.open(changelog_path, 'rb') as file_object:
+      self.changelogs[self.distribution] = file_object.read()
+
+    return self.distribution != 'failing'
+
+
 class DPKGBuildHelperTest(test_lib.BaseTestCase):
   """Tests for the helper to build dpkg packages (.deb)."""
 
@@ -24,7 +128,85 @@ class ConfigureMakeDPKGBuildHelperTest(test_lib.BaseTestCase):
 class ConfigureMakeSourceDPKGBuildHelperTest(test_lib.BaseTestCase):
   """Tests for the helper to build source dpkg packages (.deb)."""
 
-  # TODO: add tests.
+  def testBuildDistributions(self):
+    """Tests the BuildDistributions function."""
+    project_definition = projects.ProjectDefinition('test')
+
+    current_working_directory = os.getcwd()
+    with test_lib.TempDirectory() as temporary_directory:
+      os.chdir(temporary_directory)
+
+      try:
+        # The prep script changes the packaging files in place.
+        with io.open('prep-dpkg-source.sh', 'wb') as file_object:
+          file_object.write(b'echo "$4" >> debian/changelog\n')
+
+        build_helper = TestConfigureMakeSourceDPKGBuildHelper(
+            project_definition, '')
+        source_helper = TestSourceHelper('test', '20180831')
+
+        built_distributions = build_helper.BuildDistributions(
+            source_helper, ['bionic', 'trusty', 'xenial'])
+
+        self.assertEqual(built_distributions, ['bionic', 'trusty', 'xenial'])
+        self.assertEqual(source_helper.number_of_extractions, 1)
+        self.assertEqual(build_helper.changelogs, {
+            'bionic': b'unstable\nbionic\n',
+            'trusty': b'unstable\ntrusty\n',
+            'xenial': b'unstable\nxenial\n'})
+
+        self.assertTrue(os.path.exists(
+            'test_20180831ppa1~xenial.orig.tar.gz'))
+
+        build_helper = TestConfigureMakeSourceDPKGBuildHelper(
+            project_definition, '')
+        source_helper = TestSourceHelper('test2', '20180831')
+
+        built_distributions = build_helper.BuildDistributions(
+            source_helper, ['bionic', 'failing', 'xenial'])
+
+        self.assertEqual(built_distributions, ['bionic'])
+
+      finally:
+        os.chdir(current_working_directory)
+
+  def testCheckBuildRequired(self):
+    """Tests the CheckBuildRequired function."""
+    project_definition = projects.ProjectDefinition('test')
+    build_helper = dpkg.ConfigureMakeSourceDPKGBuildHelper(
+        project_definition, '')
+    build_helper.distribution = 'xenial'
+    source_helper = TestSourceHelper('test', '20180831')
+
+    current_working_directory = os.getcwd()
+    with test_lib.TempDirectory() as temporary_directory:
+      os.chdir(temporary_directory)
+
+      try:
+        result = build_helper.CheckBuildRequired(source_helper)
+        self.assertTrue(result)
+
+        with io.open(
+            'test_20180831-1ppa1~xenial_source.changes', 'wb') as file_object:
+          file_object.write(b'changes')
+
+        result = build_helper.CheckBuildRequired(source_helper)
+        self.assertFalse(result)
+
+      finally:
+        os.chdir(current_working_directory)
+
+  def testGetOutputFilenames(self):
+    """Tests the GetOutputFilenames function."""
+    project_definition = projects.ProjectDefinition('test')
+    build_helper = dpkg.ConfigureMakeSourceDPKGBuildHelper(
+        project_definition, '')
+    build_helper.distribution = 'bionic'
+    source_helper = TestSourceHelper('test', '20180831')
+
+    output_filenames = build_helper.GetOutputFilenames(source_helper)
+    self.assertEqual(
+        output_filenames, ['test_20180831-1ppa1~bionic_source.changes'])
 
 
 class SetupPyDPKGBuildHelperTest(test_lib.BaseTestCase):
@@ -31,6 +31,14 @@ class BuildHelperTest(test_lib.BaseTestCase):
     result = build_helper.CheckBuildRequired(None)
     self.assertTrue(result)
 
+  def testGetOutputFilenames(self):
+    """Tests the GetOutputFilenames function."""
+    project_definition = projects.ProjectDefinition('test')
+    build_helper = interface.BuildHelper(project_definition, '')
+
+    output_filenames = build_helper.GetOutputFilenames(None)
+    self.assertEqual(output_filenames, [])
+
 
 if __name__ == '__main__':
   unittest.main()
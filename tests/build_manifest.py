@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the build manifest."""
+
+from __future__ import unicode_literals
+
+import os
+import unittest
+
+from l2tdevtools import build_manifest
+from l2tdevtools import projects
+from l2tdevtools.build_helpers import dpkg
+
+from tests import test_lib
+
+
+class BuildFingerprintTest(test_lib.BaseTestCase):
+  """Tests for the build fingerprint."""
+
+  def testGetChangedInputs(self):
+    """Tests the GetChangedInputs function."""
+    fingerprint = build_manifest.BuildFingerprint(inputs={
+        'generator': '1', 'patch: test.patch': '2', 'source package': '3'})
+
+    other_fingerprint = build_manifest.BuildFingerprint(inputs={
+        'generator': '1', 'source package': '4', 'target': '5'})
+
+    changed_inputs = fingerprint.GetChangedInputs(other_fingerprint)
+    self.assertEqual(
+        changed_inputs, ['patch: test.patch', 'source package', 'target'])
+
+    changed_inputs = fingerprint.GetChangedInputs(fingerprint)
+    self.assertEqual(changed_inputs, [])
+
+
+class BuildFingerprinterTest(test_lib.BaseTestCase):
+  """Tests for the build fingerprinter."""
+
+  def testGetFingerprint(self):
+    """Tests the GetFingerprint function."""
+    l2tdevtools_path = os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__)))
+
+    project_definition = projects.ProjectDefinition('efilter')
+    project_definition.patches = ['efilter-1.3-setup.patch']
+
+    build_helper_object = dpkg.ConfigureMakeDPKGBuildHelper(
+        project_definition, l2tdevtools_path)
+
+    fingerprinter = build_manifest.BuildFingerprinter(l2tdevtools_path)
+
+    with test_lib.TempDirectory() as temporary_directory:
+      source_filename = os.path.join(
+          temporary_directory, 'efilter-1.3.tar.gz')
+      with open(source_filename, 'wb') as file_object:
+        file_object.write(b'source')
+
+      fingerprint = fingerprinter.GetFingerprint(
+          project_definition, build_helper_object, source_filename, 'dpkg')
+
+      self.assertEqual(sorted(fingerprint.inputs.keys()), [
+          'generator', 'patch: efilter-1.3-setup.patch', 'project definition',
+          'source package', 'target'])
+      self.assertIsNotNone(
+          fingerprint.inputs['patch: efilter-1.3-setup.patch'])
+
+      project_definition.dpkg_name = 'python-efilter'
+
+      other_fingerprint = fingerprinter.GetFingerprint(
+          project_definition, build_helper_object, source_filename, 'dpkg')
+
+      changed_inputs = fingerprint.GetChangedInputs(other_fingerprint)
+      self.assertEqual(changed_inputs, ['project definition'])
+
+      build_helper_object.distribution = 'bionic'
+
+      other_fingerprint = fingerprinter.GetFingerprint(
+          project_definition, build_helper_object, source_filename, 'dpkg')
+
+      changed_inputs = fingerprint.GetChangedInputs(other_fingerprint)
+      self.assertEqual(changed_inputs, ['project definition', 'target'])
+
+
+class BuildManifestTest(test_lib.BaseTestCase):
+  """Tests for the build manifest."""
+
+  def testGetAndSetFingerprint(self):
+    """Tests the GetFingerprint and SetFingerprint functions."""
+    with test_lib.TempDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'build_manifest.json')
+      manifest = build_manifest.BuildManifest(path=path)
+
+      fingerprint = manifest.GetFingerprint('dfvfs', 'dpkg')
+      self.assertIsNone(fingerprint)
+
+      fingerprint = build_manifest.BuildFingerprint(inputs={'generator': '1'})
+      result = manifest.SetFingerprint('dfvfs', 'dpkg', fingerprint)
+      self.assertTrue(result)
+
+      result = manifest.SetFingerprint(
+          'dfvfs', 'dpkg-source', fingerprint, distribution='bionic')
+      self.assertTrue(result)
+
+      fingerprint = manifest.GetFingerprint('dfvfs', 'dpkg')
+      self.assertIsNotNone(fingerprint)
+      self.assertEqual(fingerprint.inputs, {'generator': '1'})
+
+      fingerprint = manifest.GetFingerprint(
+          'dfvfs', 'dpkg-source', distribution='bionic')
+      self.assertIsNotNone(fingerprint)
+
+      fingerprint = manifest.GetFingerprint('dfvfs', 'dpkg-source')
+      self.assertIsNone(fingerprint)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the scheduler for building multiple projects."""
+
+from __future__ import unicode_literals
+
+import os
+import signal
+import unittest
+
+from l2tdevtools import build_scheduler
+from l2tdevtools import projects
+
+from tests import test_lib
+
+
+def _BuildProject(project_definition):
+  """Builds a project for testing.
+
+  Args:
+    project_definition (ProjectDefinition): project definition.
+
+  Returns:
+    bool: False if the name of the project starts with "fail".
+  """
+  if project_definition.name.startswith('kill'):
+    os.kill(os.getpid(), signal.SIGKILL)
+
+  return not project_definition.name.startswith('fail')
+
+
+def _CreateProjectDefinition(name, dpkg_dependencies=None):
+  """Creates a project definition for testing.
+
+  Args:
+    name (str): name of the project.
+    dpkg_dependencies (Optional[list[str]]): dpkg dependencies.
+
+  Returns:
+    ProjectDefinition: project definition.
+  """
+  project_definition = projects.ProjectDefinition(name)
+  project_definition.dpkg_dependencies = dpkg_dependencies or []
+  return project_definition
+
+
+class ProjectDependencyGraphTest(test_lib.BaseTestCase):
+  """Tests for the project dependency graph."""
+
+  def _CreateProjectDefinitions(self):
+    """Creates project definitions for testing.
+
+    Returns:
+      list[ProjectDefinition]: project definitions.
+    """
+    dateutil_definition = _CreateProjectDefinition(
+        'dateutil', dpkg_dependencies=['python-six'])
+    dateutil_definition.dpkg_name = 'python-dateutil'
+
+    return [
+        _CreateProjectDefinition(
+            'dfvfs', dpkg_dependencies=['python-dateutil', 'libbde-python']),
+        dateutil_definition,
+        _CreateProjectDefinition('six'),
+        _CreateProjectDefinition('libbde', dpkg_dependencies=['libfuse-dev'])]
+
+  def testGetDependencies(self):
+    """Tests the GetDependencies function."""
+    dependency_graph = build_scheduler.ProjectDependencyGraph(
+        self._CreateProjectDefinitions())
+
+    dependencies = dependency_graph.GetDependencies('dfvfs')
+    self.assertEqual(dependencies, set(['dateutil', 'libbde']))
+
+    dependencies = dependency_graph.GetDependencies('libbde')
+    self.assertEqual(dependencies, set())
+
+  def testGetDependents(self):
+    """Tests the GetDependents function."""
+    dependency_graph = build_scheduler.ProjectDependencyGraph(
+        self._CreateProjectDefinitions())
+
+    dependents = dependency_graph.GetDependents('six')
+    self.assertEqual(dependents, set(['dateutil']))
+
+  def testGetDownstreamProjects(self):
+    """Tests the GetDownstreamProjects function."""
+    dependency_graph = build_scheduler.ProjectDependencyGraph(
+        self._CreateProjectDefinitions())
+
+    downstream_projects = dependency_graph.GetDownstreamProjects('six')
+    self.assertEqual(downstream_projects, set(['dateutil', 'dfvfs']))
+
+  def testGetBuildOrder(self):
+    """Tests the GetBuildOrder function."""
+    dependency_graph = build_scheduler.ProjectDependencyGraph(
+        self._CreateProjectDefinitions())
+
+    build_order = dependency_graph.GetBuildOrder()
+    self.assertEqual(build_order, ['six', 'libbde', 'dateutil', 'dfvfs'])
+
+    project_definitions = [
+        _CreateProjectDefinition('first', dpkg_dependencies=['second']),
+        _CreateProjectDefinition('second', dpkg_dependencies=['first']),
+        _CreateProjectDefinition('third', dpkg_dependencies=['second'])]
+
+    dependency_graph = build_scheduler.ProjectDependencyGraph(
+        project_definitions)
+
+    build_order = dependency_graph.GetBuildOrder()
+    self.assertEqual(build_order, ['first', 'second', 'third'])
+
+
+class BuildSchedulerTest(test_lib.BaseTestCase):
+  """Tests for the build scheduler."""
+
+  def _CreateProjectDefinitions(self):
+    """Creates project definitions for testing.
+
+    Returns:
+      list[ProjectDefinition]: project definitions.
+    """
+    return [
+        _CreateProjectDefinition('dfvfs', dpkg_dependencies=['python-fail1']),
+        _CreateProjectDefinition('fail1'),
+        _CreateProjectDefinition('plaso', dpkg_dependencies=['python-dfvfs']),
+        _CreateProjectDefinition('fail2'),
+        _CreateProjectDefinition('pytsk3')]
+
+  def testBuildSequentially(self):
+    """Tests the Build function with a single job."""
+    scheduler = build_scheduler.BuildScheduler(_BuildProject)
+
+    failed_builds = scheduler.Build(self._CreateProjectDefinitions())
+    self.assertEqual(failed_builds, ['fail1', 'fail2'])
+    self.assertEqual(scheduler.skipped_builds, ['dfvfs', 'plaso'])
+
+  def testBuildConcurrently(self):
+    """Tests the Build function with multiple jobs."""
+    scheduler = build_scheduler.BuildScheduler(
+        _BuildProject, number_of_jobs=2)
+
+    failed_builds = scheduler.Build(self._CreateProjectDefinitions())
+    self.assertEqual(failed_builds, ['fail1', 'fail2'])
+    self.assertEqual(scheduler.skipped_builds, ['dfvfs', 'plaso'])
+
+  def testBuildConcurrentlyWithUnpicklableProject(self):
+    """Tests the Build function with a project that cannot be submitted."""
+    scheduler = build_scheduler.BuildScheduler(
+        _BuildProject, number_of_jobs=2)
+
+    project_definitions = [
+        _CreateProjectDefinition('dfvfs'),
+        _CreateProjectDefinition('plaso', dpkg_dependencies=['python-dfvfs']),
+        _CreateProjectDefinition('pytsk3')]
+    project_definitions[0].unpicklable = lambda: None
+
+    failed_builds = scheduler.Build(project_definitions)
+    self.assertEqual(failed_builds, ['dfvfs'])
+    self.assertEqual(scheduler.skipped_builds, ['plaso'])
+
+  @unittest.skipUnless(hasattr(signal, 'SIGKILL'), 'requires SIGKILL')
+  def testBuildConcurrentlyWithTerminatedWorker(self):
+    """Tests the Build function with a worker process that is terminated."""
+    scheduler = build_scheduler.BuildScheduler(
+        _BuildProject, number_of_jobs=2)
+
+    project_definitions = [
+        _CreateProjectDefinition('kill1'),
+        _CreateProjectDefinition('plaso', dpkg_dependencies=['python-kill1']),
+        _CreateProjectDefinition('pytsk3')]
+
+    failed_builds = scheduler.Build(project_definitions)
+    self.assertEqual(failed_builds, ['kill1'])
+    self.assertEqual(scheduler.skipped_builds, ['plaso'])
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -12,6 +12,143 @@ from l2tdevtools.download_helpers import github
 from tests import test_lib
 
 
+class TestGitHubReleasesDownloadHelper(
+    github.GitHubReleasesDownloadHelper):
+  """GitHub releases download helper that serves predefined pages.
+
+  Attributes:
+    downloaded_urls (list[str]): URLs of the pages that were downloaded.
+  """
+
+  def __init__(self, download_url, pages):
+    """Initializes the download helper.
+
+    Args:
+      download_url (str): download URL.
+      pages (dict[str, str]): content of the pages per URL.
+    """
+    super(TestGitHubReleasesDownloadHelper, self).__init__(download_url)
+    self._pages = pages
+    self.downloaded_urls = []
+
+  def DownloadPageContent(self, download_url, encoding='utf-8'):
+    """Downloads the page content from the URL.
+
+    Args:
+      download_url (str): URL where to download the page content.
+      encoding (Optional[str]): encoding of the page content.
+
+    Returns:
+      str: page content if successful, None otherwise.
+    """
+    self.downloaded_urls.append(download_url)
+    return self._pages.get(download_url, None)
+
+
+class GitHubReleaseIndexTest(test_lib.BaseTestCase):
+  """Tests for the GitHub release index."""
+
+  _DOWNLOAD_URL = 'https://github.com/libyal/libevt/releases'
+
+  _FIRST_PAGE = '\n'.join([
+      '<a href="/libyal/libevt/releases/download/20180317/'
+      'libevt-alpha-20180317.tar.gz">',
+      '<a href="/libyal/libevt/releases/download/20180317/'
+      'libevt-alpha-20180317.tar.gz">',
+      '<a href="/libyal/libevt/archive/20180317.tar.gz">',
+      '<a href="/libyal/libevt/releases/download/20171231/'
+      'libevt-experimental-20171231.tar.gz">',
+      '<a href="/libyal/libevt/releases/download/20171231/'
+      'libevt-20171231.tar.gz">',
+      '<a href="/libyal/libevt/archive/20171231.tar.gz">',
+      '<a class="next_page" href="https://github.com/libyal/libevt/releases'
+      '?after=20171231">Next</a>'])
+
+  _SECOND_PAGE = '\n'.join([
+      '<a href="/libyal/libevt/releases/download/20160421/'
+      'libevt-alpha-20160421.tar.gz">',
+      '<a href="/libyal/libevt/archive/20160421.tar.gz">'])
+
+  def _CreateDownloadHelper(self):
+    """Creates a download helper for testing.
+
+    Returns:
+      TestGitHubReleasesDownloadHelper: download helper.
+    """
+    return TestGitHubReleasesDownloadHelper(self._DOWNLOAD_URL, {
+        'https://github.com/libyal/libevt/releases': self._FIRST_PAGE,
+        'https://github.com/libyal/libevt/releases?after=20171231': (
+            self._SECOND_PAGE)})
+
+  def testGetLatestVersion(self):
+    """Tests the GetLatestVersion function."""
+    download_helper = self._CreateDownloadHelper()
+    release_index = github.GitHubReleaseIndex(
+        download_helper, 'libyal', 'libevt', 'libevt')
+
+    latest_version = release_index.GetLatestVersion()
+    self.assertEqual(latest_version, '20180317')
+    self.assertEqual(len(download_helper.downloaded_urls), 1)
+
+    # The releases on the first page are indexed once.
+    self.assertEqual(len(release_index.releases), 5)
+
+    latest_version = release_index.GetLatestVersion(
+        latest_version=['<', '20170101'])
+    self.assertEqual(latest_version, '20160421')
+    self.assertEqual(len(download_helper.downloaded_urls), 2)
+
+    latest_version = release_index.GetLatestVersion(
+        earliest_version=['>', '20180317'])
+    self.assertIsNone(latest_version)
+
+  def testGetDownloadURL(self):
+    """Tests the GetDownloadURL function."""
+    download_helper = self._CreateDownloadHelper()
+    release_index = github.GitHubReleaseIndex(
+        download_helper, 'libyal', 'libevt', 'libevt')
+
+    download_url = release_index.GetDownloadURL('20180317')
+    self.assertEqual(download_url, (
+        'https://github.com/libyal/libevt/releases/download/20180317/'
+        'libevt-alpha-20180317.tar.gz'))
+
+    # The asset without status is used if there are multiple assets.
+    download_url = release_index.GetDownloadURL('20171231')
+    self.assertEqual(download_url, (
+        'https://github.com/libyal/libevt/releases/download/20171231/'
+        'libevt-20171231.tar.gz'))
+    self.assertEqual(len(download_helper.downloaded_urls), 1)
+
+    download_url = release_index.GetDownloadURL('20160421')
+    self.assertEqual(download_url, (
+        'https://github.com/libyal/libevt/releases/download/20160421/'
+        'libevt-alpha-20160421.tar.gz'))
+    self.assertEqual(len(download_helper.downloaded_urls), 2)
+
+    download_url = release_index.GetDownloadURL('20150101')
+    self.assertIsNone(download_url)
+    self.assertEqual(len(download_helper.downloaded_urls), 2)
+
+  def testGetDownloadURLFromArchive(self):
+    """Tests the GetDownloadURL function with archives."""
+    download_helper = TestGitHubReleasesDownloadHelper(
+        'https://github.com/docopt/docopt/releases', {
+            'https://github.com/docopt/docopt/releases': (
+                '<a href="/docopt/docopt/archive/0.6.2.tar.gz">\n'
+                '<a href="/docopt/docopt/archive/v0.6.1.tar.gz">\n')})
+
+    latest_version = download_helper.GetLatestVersion('docopt', None)
+    self.assertEqual(latest_version, '0.6.2')
+
+    download_url = download_helper.GetDownloadURL('docopt', '0.6.1')
+    self.assertEqual(
+        download_url, 'https://github.com/docopt/docopt/archive/v0.6.1.tar.gz')
+
+    # The releases page is downloaded once per project.
+    self.assertEqual(len(download_helper.downloaded_urls), 1)
+
+
 @unittest.skipIf(
     os.environ.get('TRAVIS_OS_NAME') == 'osx',
     'TLS 1.2 not supported by macOS on Travis')
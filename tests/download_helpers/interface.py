@@ -4,14 +4,52 @@
 
 from __future__ import unicode_literals
 
+import hashlib
 import os
+import threading
 import unittest
 
+try:
+  import BaseHTTPServer as http_server
+except ImportError:
+  from http import server as http_server  # pylint: disable=import-error
+
+from l2tdevtools import page_cache
 from l2tdevtools.download_helpers import interface
 
 from tests import test_lib
 
 
+class TestHTTPRequestHandler(http_server.BaseHTTPRequestHandler):
+  """HTTP request handler for testing that supports range requests."""
+
+  DATA = b'0123456789' * 16384
+
+  # pylint: disable=invalid-name
+  def do_GET(self):
+    """Handles a GET request."""
+    offset = 0
+    range_header = self.headers.get('Range', None)
+    if range_header and range_header.startswith('bytes='):
+      offset = int(range_header[6:].rstrip('-'), 10)
+
+    data = self.DATA[offset:]
+    if offset:
+      self.send_response(206)
+      self.send_header('Content-Range', 'bytes {0:d}-{1:d}/{2:d}'.format(
+          offset, len(self.DATA) - 1, len(self.DATA)))
+    else:
+      self.send_response(200)
+
+    self.send_header('Content-Length', '{0:d}'.format(len(data)))
+    self.end_headers()
+    self.wfile.write(data)
+
+  def log_message(self, *unused_args):  # pylint: disable=arguments-differ
+    """Suppresses logging of requests."""
+    return
+
+
 class DownloadHelperTest(test_lib.BaseTestCase):
   """Tests for the download helper."""
 
@@ -36,6 +74,29 @@ class DownloadHelperTest(test_lib.BaseTestCase):
 
     self.assertEqual(page_content, expected_page_content)
 
+  def testDownloadPageContentWithPageCache(self):
+    """Tests the DownloadPageContent functions with a page cache."""
+    download_helper = interface.DownloadHelper('')
+
+    with test_lib.TempDirectory() as temporary_directory:
+      test_cache = page_cache.PageCache(temporary_directory, offline=True)
+
+      cache_entry = page_cache.PageCacheEntry(self._download_url)
+      cache_entry.page_content = b'cached page content'
+      test_cache.StoreEntry(cache_entry)
+
+      interface.DownloadHelper.SetPageCache(test_cache)
+      try:
+        page_content = download_helper.DownloadPageContent(self._download_url)
+        self.assertEqual(page_content, 'cached page content')
+
+        page_content = download_helper.DownloadPageContent(
+            '{0:s}.missing'.format(self._download_url))
+        self.assertIsNone(page_content)
+
+      finally:
+        interface.DownloadHelper.SetPageCache(None)
+
   def testDownloadFile(self):
     """Tests the DownloadFile functions."""
     download_helper = interface.DownloadHelper(self._download_url)
@@ -43,14 +104,16 @@ class DownloadHelperTest(test_lib.BaseTestCase):
     current_working_directory = os.getcwd()
 
     page_content = b''
-    with test_lib.TempDirectory() as temporary_directory:
-      os.chdir(temporary_directory)
-      filename = download_helper.DownloadFile(self._download_url)
+    try:
+      with test_lib.TempDirectory() as temporary_directory:
+        os.chdir(temporary_directory)
+        filename = download_helper.DownloadFile(self._download_url)
 
-      with open(filename, 'rb') as file_object:
-        page_content = file_object.read()
+        with open(filename, 'rb') as file_object:
+          page_content = file_object.read()
 
-    os.chdir(current_working_directory)
+    finally:
+      os.chdir(current_working_directory)
 
     expected_page_content = b''
     with open(self._FILENAME, 'rb') as file_object:
@@ -58,6 +121,52 @@ class DownloadHelperTest(test_lib.BaseTestCase):
 
     self.assertEqual(page_content, expected_page_content)
 
+  def testDownloadFileWithLocalServer(self):
+    """Tests the DownloadFile functions with a local HTTP server."""
+    server = http_server.HTTPServer(('127.0.0.1', 0), TestHTTPRequestHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    download_url = 'http://127.0.0.1:{0:d}/test.tar.gz'.format(
+        server.server_address[1])
+    download_helper = interface.DownloadHelper(download_url)
+
+    expected_data = TestHTTPRequestHandler.DATA
+    expected_sha256 = hashlib.sha256(expected_data).hexdigest()
+
+    current_working_directory = os.getcwd()
+
+    try:
+      with test_lib.TempDirectory() as temporary_directory:
+        os.chdir(temporary_directory)
+
+        # Test a download with a mismatching digest.
+        filename = download_helper.DownloadFile(
+            download_url, expected_sha256='0' * 64)
+        self.assertIsNone(filename)
+        self.assertFalse(os.path.exists('test.tar.gz'))
+        self.assertFalse(os.path.exists('test.tar.gz.part'))
+
+        # Test resuming a partial download.
+        with open('test.tar.gz.part', 'wb') as file_object:
+          file_object.write(expected_data[:1000])
+
+        filename = download_helper.DownloadFile(
+            download_url, expected_sha256=expected_sha256)
+        self.assertEqual(filename, 'test.tar.gz')
+        self.assertFalse(os.path.exists('test.tar.gz.part'))
+
+        with open(filename, 'rb') as file_object:
+          data = file_object.read()
+
+        self.assertEqual(data, expected_data)
+
+    finally:
+      os.chdir(current_working_directory)
+      server.shutdown()
+      server.server_close()
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -4,6 +4,7 @@
 
 from __future__ import unicode_literals
 
+import json
 import os
 import re
 import unittest
@@ -13,6 +14,149 @@ from l2tdevtools.download_helpers import pypi
 from tests import test_lib
 
 
+class TestPyPIDownloadHelper(pypi.PyPIDownloadHelper):
+  """PyPI download helper that serves predefined pages.
+
+  Attributes:
+    downloaded_urls (list[str]): URLs of the pages that were downloaded.
+  """
+
+  def __init__(self, download_url, pages):
+    """Initializes the download helper.
+
+    Args:
+      download_url (str): download URL.
+      pages (dict[str, str]): content of the pages per URL.
+    """
+    super(TestPyPIDownloadHelper, self).__init__(download_url)
+    self._pages = pages
+    self.downloaded_urls = []
+
+  def DownloadPageContent(self, download_url, encoding='utf-8'):
+    """Downloads the page content from the URL.
+
+    Args:
+      download_url (str): URL where to download the page content.
+      encoding (Optional[str]): encoding of the page content.
+
+    Returns:
+      str: page content if successful, None otherwise.
+    """
+    self.downloaded_urls.append(download_url)
+    return self._pages.get(download_url, None)
+
+
+class PyPIDownloadHelperWithJSONAPITest(test_lib.BaseTestCase):
+  """Tests for the PyPi download helper with the JSON API."""
+
+  _DOWNLOAD_URL = 'https://pypi.org/project/testproject'
+
+  _JSON_API_URL = 'https://pypi.org/pypi/testproject/json'
+
+  _RELEASES = {
+      '1.9': [{
+          'digests': {'sha256': 'a' * 64},
+          'filename': 'testproject-1.9.tar.gz',
+          'packagetype': 'sdist',
+          'size': 1024,
+          'url': 'https://files.pythonhosted.org/testproject-1.9.tar.gz'}],
+      '1.10': [{
+          'digests': {'sha256': 'b' * 64},
+          'filename': 'testproject-1.10-py2.py3-none-any.whl',
+          'packagetype': 'bdist_wheel',
+          'url': 'https://files.pythonhosted.org/testproject-1.10.whl'}, {
+          'digests': {'sha256': 'c' * 64},
+          'filename': 'testproject-1.10.tar.gz',
+          'packagetype': 'sdist',
+          'size': 2048,
+          'url': 'https://files.pythonhosted.org/testproject-1.10.tar.gz'}],
+      '2.0': [{
+          'digests': {'sha256': 'd' * 64},
+          'filename': 'testproject-2.0.tar.gz',
+          'packagetype': 'sdist',
+          'url': 'https://files.pythonhosted.org/testproject-2.0.tar.gz',
+          'yanked': True}]}
+
+  # pylint: disable=protected-access
+
+  def setUp(self):
+    """Sets up the needed objects used throughout the test."""
+    pypi.PyPIDownloadHelper._source_packages_per_project = {}
+
+  def tearDown(self):
+    """Cleans up the needed objects used throughout the test."""
+    pypi.PyPIDownloadHelper._source_packages_per_project = {}
+
+  def testGetLatestVersion(self):
+    """Tests the GetLatestVersion functions."""
+    download_helper = TestPyPIDownloadHelper(self._DOWNLOAD_URL, {
+        self._JSON_API_URL: json.dumps({'releases': self._RELEASES})})
+
+    latest_version = download_helper.GetLatestVersion('testproject', None)
+    self.assertEqual(latest_version, '1.10')
+    self.assertEqual(download_helper.downloaded_urls, [self._JSON_API_URL])
+
+  def testGetLatestVersionWithPreRelease(self):
+    """Tests the GetLatestVersion functions with a newer pre-release."""
+    releases = dict(self._RELEASES)
+    for version in ('2.1rc1', '2.2.dev1'):
+      releases[version] = [{
+          'digests': {'sha256': 'e' * 64},
+          'filename': 'testproject-{0:s}.tar.gz'.format(version),
+          'packagetype': 'sdist',
+          'url': (
+              'https://files.pythonhosted.org/testproject-{0:s}.tar.gz').format(
+                  version)}]
+
+    download_helper = TestPyPIDownloadHelper(self._DOWNLOAD_URL, {
+        self._JSON_API_URL: json.dumps({'releases': releases})})
+
+    latest_version = download_helper.GetLatestVersion('testproject', None)
+    self.assertEqual(latest_version, '1.10')
+
+    # A pre-release can still be downloaded if its version is pinned.
+    download_url = download_helper.GetDownloadURL('testproject', '2.1rc1')
+    self.assertEqual(
+        download_url,
+        'https://files.pythonhosted.org/testproject-2.1rc1.tar.gz')
+
+  def testGetLatestVersionFromProjectPage(self):
+    """Tests the GetLatestVersion functions with the project page."""
+    project_page_url = 'https://pypi.org/project/testproject#files'
+    download_helper = TestPyPIDownloadHelper(self._DOWNLOAD_URL, {
+        project_page_url: (
+            '<a href="https://files.pythonhosted.org/packages/aa/bb/cc/'
+            'testproject-1.9.tar.gz">')})
+
+    latest_version = download_helper.GetLatestVersion('testproject', None)
+    self.assertEqual(latest_version, '1.9')
+    self.assertEqual(
+        download_helper.downloaded_urls,
+        [self._JSON_API_URL, project_page_url])
+
+  def testGetDownloadURL(self):
+    """Tests the GetDownloadURL functions."""
+    download_helper = TestPyPIDownloadHelper(self._DOWNLOAD_URL, {
+        self._JSON_API_URL: json.dumps({'releases': self._RELEASES})})
+
+    download_url = download_helper.GetDownloadURL('testproject', '1.10')
+    self.assertEqual(
+        download_url, 'https://files.pythonhosted.org/testproject-1.10.tar.gz')
+
+    sha256 = download_helper._GetExpectedSHA256(download_url)
+    self.assertEqual(sha256, 'c' * 64)
+
+    download_url = download_helper.GetDownloadURL('testproject', '2.0')
+    self.assertIsNone(download_url)
+
+  def testPrefetchSourcePackages(self):
+    """Tests the PrefetchSourcePackages function."""
+    pypi.PyPIDownloadHelper.PrefetchSourcePackages([
+        'https://github.com/log2timeline/dfvfs/releases'])
+
+    self.assertEqual(pypi.PyPIDownloadHelper._source_packages_per_project, {})
+
+
 @unittest.skipIf(
     os.environ.get('TRAVIS_OS_NAME') == 'osx',
     'Test is flaky for macOS on Travis')
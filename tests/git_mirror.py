@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the cache of bare mirrors of git repositories."""
+
+from __future__ import unicode_literals
+
+import io
+import os
+import shutil
+import subprocess
+import unittest
+
+from l2tdevtools import git_mirror
+
+from tests import test_lib
+
+
+def _CreateRepository(path, filename):
+  """Creates a git repository with a single commit.
+
+  Args:
+    path (str): path of the repository.
+    filename (str): name of the file to add in the commit.
+  """
+  subprocess.check_call(['git', 'init', '--quiet', path])
+  _CreateCommit(path, filename)
+
+
+def _CreateCommit(path, filename):
+  """Creates a commit that adds a file to a git repository.
+
+  Args:
+    path (str): path of the repository.
+    filename (str): name of the file to add.
+  """
+  with io.open(os.path.join(path, filename), 'wb') as file_object:
+    file_object.write(filename.encode('utf-8'))
+
+  subprocess.check_call(['git', '-C', path, 'add', filename])
+  subprocess.check_call([
+      'git', '-C', path, '-c', 'user.name=Test', '-c',
+      'user.email=test@example.com', 'commit', '--quiet', '-m', filename])
+
+
+class GitMirrorCacheTest(test_lib.BaseTestCase):
+  """Tests for the git mirror cache."""
+
+  # pylint: disable=protected-access
+
+  def testGetMirrorPath(self):
+    """Tests the _GetMirrorPath function."""
+    cache = git_mirror.GitMirrorCache('/cache')
+
+    mirror_path = cache._GetMirrorPath('https://github.com/libyal/libbde.git')
+    self.assertEqual(mirror_path, os.path.join(
+        '/cache', 'github.com', 'libyal', 'libbde.git'))
+
+    mirror_path = cache._GetMirrorPath('https://github.com/libyal/libbde')
+    self.assertEqual(mirror_path, os.path.join(
+        '/cache', 'github.com', 'libyal', 'libbde.git'))
+
+    mirror_path = cache._GetMirrorPath('git@github.com:log2timeline/plaso.git')
+    self.assertEqual(mirror_path, os.path.join(
+        '/cache', 'github.com', 'log2timeline', 'plaso.git'))
+
+    mirror_path = cache._GetMirrorPath('/src/../dfvfs')
+    self.assertEqual(mirror_path, os.path.join('/cache', 'src', 'dfvfs.git'))
+
+  def testCloneRepository(self):
+    """Tests the CloneRepository and UpdateMirror functions."""
+    with test_lib.TempDirectory() as temporary_directory:
+      upstream_path = os.path.join(temporary_directory, 'upstream', 'libtest')
+      _CreateRepository(upstream_path, 'first')
+
+      cache = git_mirror.GitMirrorCache(
+          os.path.join(temporary_directory, 'cache'))
+
+      clone_path = os.path.join(temporary_directory, 'clone1')
+      result = cache.CloneRepository(upstream_path, clone_path)
+      self.assertTrue(result)
+      self.assertTrue(os.path.exists(os.path.join(clone_path, 'first')))
+
+      origin_url = subprocess.check_output([
+          'git', '-C', clone_path, 'remote', 'get-url', 'origin'])
+      self.assertEqual(origin_url.decode('utf-8').strip(), upstream_path)
+
+      _CreateCommit(upstream_path, 'second')
+
+      # The mirror is only updated once per cache object.
+      clone_path = os.path.join(temporary_directory, 'clone2')
+      result = cache.CloneRepository(upstream_path, clone_path)
+      self.assertTrue(result)
+      self.assertFalse(os.path.exists(os.path.join(clone_path, 'second')))
+
+      cache = git_mirror.GitMirrorCache(
+          os.path.join(temporary_directory, 'cache'))
+
+      clone_path = os.path.join(temporary_directory, 'clone3')
+      result = cache.CloneRepository(upstream_path, clone_path)
+      self.assertTrue(result)
+      self.assertTrue(os.path.exists(os.path.join(clone_path, 'second')))
+
+      result = cache.CloneRepository(
+          os.path.join(temporary_directory, 'bogus'),
+          os.path.join(temporary_directory, 'clone4'))
+      self.assertFalse(result)
+
+  def testGetURLRewriteEnvironment(self):
+    """Tests the GetURLRewriteEnvironment function."""
+    with test_lib.TempDirectory() as temporary_directory:
+      repository_path = os.path.join(temporary_directory, 'libtest')
+      _CreateRepository(repository_path, 'first')
+
+      upstream_prefix = os.path.join(temporary_directory, 'upstream')
+      subprocess.check_call([
+          'git', 'clone', '--quiet', '--bare', repository_path,
+          os.path.join(upstream_prefix, 'libtest.git')])
+
+      # Git only rewrites URLs, hence a file:// URL is used instead of a path.
+      upstream_url_prefix = 'file://{0:s}/'.format(upstream_prefix)
+      upstream_url = '{0:s}libtest.git'.format(upstream_url_prefix)
+
+      cache = git_mirror.GitMirrorCache(
+          os.path.join(temporary_directory, 'cache'))
+
+      result = cache.UpdateMirrors([upstream_url])
+      self.assertTrue(result)
+
+      # The clone uses the mirror after the upstream repository is removed.
+      shutil.rmtree(upstream_prefix)
+
+      environment = cache.GetURLRewriteEnvironment(
+          [upstream_url_prefix], environment={})
+      self.assertEqual(environment['GIT_CONFIG_COUNT'], '1')
+
+      clone_path = os.path.join(temporary_directory, 'clone')
+      exit_code = subprocess.call([
+          'git', 'clone', '--quiet', upstream_url, clone_path],
+          env=environment)
+      self.assertEqual(exit_code, 0)
+      self.assertTrue(os.path.exists(os.path.join(clone_path, 'first')))
+
+
+if __name__ == '__main__':
+  unittest.main()
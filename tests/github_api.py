@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the client of the GitHub REST API."""
+
+from __future__ import unicode_literals
+
+import time
+import unittest
+
+from l2tdevtools import github_api
+from l2tdevtools import http_client
+from l2tdevtools import page_cache
+from l2tdevtools.lib import errors
+
+from tests import test_lib
+
+
+class TestHTTPResponse(object):
+  """HTTP response for testing.
+
+  Attributes:
+    code (int): HTTP status code.
+    headers (dict[str, str]): response headers.
+  """
+
+  def __init__(self, code, data=b'', headers=None):
+    """Initializes a HTTP response for testing.
+
+    Args:
+      code (int): HTTP status code.
+      data (Optional[bytes]): response body.
+      headers (Optional[dict[str, str]]): response headers.
+    """
+    super(TestHTTPResponse, self).__init__()
+    self._data = data
+    self.code = code
+    self.headers = headers or {}
+
+  def read(self):
+    """Reads the response body.
+
+    Returns:
+      bytes: response body.
+    """
+    return self._data
+
+
+class TestHTTPClient(object):
+  """HTTP client for testing that returns predefined responses.
+
+  Attributes:
+    requests (list[tuple[str, dict[str, str]]]): URL and headers of
+        the requests that were sent.
+  """
+
+  def __init__(self, responses):
+    """Initializes a HTTP client for testing.
+
+    Args:
+      responses (list[TestHTTPResponse]): responses to return in order.
+    """
+    super(TestHTTPClient, self).__init__()
+    self._responses = list(responses)
+    self.requests = []
+
+  def Request(self, url, headers=None, **unused_kwargs):
+    """Sends a request.
+
+    Args:
+      url (str): URL.
+      headers (Optional[dict[str, str]]): request headers.
+
+    Returns:
+      TestHTTPResponse: next predefined response.
+    """
+    self.requests.append((url, dict(headers or {})))
+    return self._responses.pop(0)
+
+
+class GitHubAPIClientTest(test_lib.BaseTestCase):
+  """Tests for the GitHub API client."""
+
+  # pylint: disable=protected-access
+
+  def setUp(self):
+    """Sets up the needed objects used throughout the test."""
+    github_api.GitHubAPIClient._rate_limits = {}
+
+  def tearDown(self):
+    """Cleans up the needed objects used throughout the test."""
+    github_api.GitHubAPIClient.SetETagStore(None)
+    github_api.GitHubAPIClient._rate_limits = {}
+    http_client.SetHTTPClient(None)
+
+  def testGetJSON(self):
+    """Tests the GetJSON function."""
+    test_http_client = TestHTTPClient([
+        TestHTTPResponse(202),
+        TestHTTPResponse(200, data=b'{"login": "test"}', headers={
+            'X-RateLimit-Limit': '5000',
+            'X-RateLimit-Remaining': '4999',
+            'X-RateLimit-Reset': '{0:d}'.format(int(time.time()) + 3600)}),
+        TestHTTPResponse(404)])
+    http_client.SetHTTPClient(test_http_client)
+
+    client = github_api.GitHubAPIClient(access_token='TOKEN')
+
+    json_result = client.GetJSON('users/test')
+    self.assertEqual(json_result, {'login': 'test'})
+
+    url, headers = test_http_client.requests[0]
+    self.assertEqual(url, 'https://api.github.com/users/test')
+    self.assertEqual(headers['Authorization'], 'token TOKEN')
+
+    self.assertEqual(client.GetRateLimit(), (4999, 5000))
+
+    with self.assertRaises(errors.ConnectivityError):
+      client.GetJSON('users/bogus')
+
+  def testGetJSONConditional(self):
+    """Tests the GetJSON function with conditional requests."""
+    test_http_client = TestHTTPClient([
+        TestHTTPResponse(200, data=b'[1, 2]', headers={'ETag': '"1234"'}),
+        TestHTTPResponse(304)])
+    http_client.SetHTTPClient(test_http_client)
+
+    with test_lib.TempDirectory() as temporary_directory:
+      github_api.GitHubAPIClient.SetETagStore(
+          page_cache.PageCache(temporary_directory))
+
+      client = github_api.GitHubAPIClient()
+
+      self.assertEqual(client.GetJSON('repos/test/test/contents'), [1, 2])
+      self.assertEqual(client.GetJSON('repos/test/test/contents'), [1, 2])
+
+    _, headers = test_http_client.requests[0]
+    self.assertNotIn('If-None-Match', headers)
+
+    _, headers = test_http_client.requests[1]
+    self.assertEqual(headers['If-None-Match'], '"1234"')
+
+  def testGetJSONConditionalWithAccessTokens(self):
+    """Tests the GetJSON function with conditional requests and tokens."""
+    test_http_client = TestHTTPClient([
+        TestHTTPResponse(200, data=b'[1, 2]', headers={'ETag': '"1234"'}),
+        TestHTTPResponse(200, data=b'[1]', headers={'ETag': '"5678"'}),
+        TestHTTPResponse(304)])
+    http_client.SetHTTPClient(test_http_client)
+
+    with test_lib.TempDirectory() as temporary_directory:
+      github_api.GitHubAPIClient.SetETagStore(
+          page_cache.PageCache(temporary_directory))
+
+      client = github_api.GitHubAPIClient(access_token='FIRST')
+      self.assertEqual(client.GetJSON('repos/test/test/contents'), [1, 2])
+
+      # The response cached for another access token is not used.
+      client = github_api.GitHubAPIClient(access_token='SECOND')
+      self.assertEqual(client.GetJSON('repos/test/test/contents'), [1])
+
+      rate_limit = client._GetRateLimit('SECOND')
+      rate_limit.remaining = 10
+
+      self.assertEqual(client.GetJSON('repos/test/test/contents'), [1])
+
+      # A request answered with 304 does not count against the rate limit.
+      self.assertEqual(rate_limit.remaining, 10)
+
+    _, headers = test_http_client.requests[1]
+    self.assertNotIn('If-None-Match', headers)
+
+    _, headers = test_http_client.requests[2]
+    self.assertEqual(headers['If-None-Match'], '"5678"')
+
+  def testGetETagStoreKey(self):
+    """Tests the _GetETagStoreKey function."""
+    client = github_api.GitHubAPIClient()
+
+    url = 'https://api.github.com/users/test'
+    self.assertEqual(client._GetETagStoreKey(url, None), url)
+
+    key = client._GetETagStoreKey(url, 'TOKEN')
+    self.assertTrue(key.startswith('{0:s}#token='.format(url)))
+    self.assertNotIn('TOKEN', key)
+    self.assertNotEqual(key, client._GetETagStoreKey(url, 'OTHER'))
+
+  def testGetPagedJSON(self):
+    """Tests the GetPagedJSON function."""
+    next_url = 'https://api.github.com/repositories/1/pulls?state=all&page=2'
+    link = (
+        '<{0:s}>; rel="next", '
+        '<https://api.github.com/repositories/1/pulls?page=2>; '
+        'rel="last"').format(next_url)
+
+    test_http_client = TestHTTPClient([
+        TestHTTPResponse(200, data=b'[1, 2]', headers={'Link': link}),
+        TestHTTPResponse(200, data=b'[3]')])
+    http_client.SetHTTPClient(test_http_client)
+
+    client = github_api.GitHubAPIClient()
+
+    json_result = client.GetPagedJSON('repos/test/test/pulls?state=all')
+    self.assertEqual(json_result, [1, 2, 3])
+
+    url, _ = test_http_client.requests[0]
+    self.assertEqual(url, (
+        'https://api.github.com/repos/test/test/pulls?state=all&per_page=100'))
+
+    url, _ = test_http_client.requests[1]
+    self.assertEqual(url, next_url)
+
+  def testPostJSON(self):
+    """Tests the PostJSON function."""
+    test_http_client = TestHTTPClient([
+        TestHTTPResponse(201, data=b'{"number": 1}')])
+    http_client.SetHTTPClient(test_http_client)
+
+    client = github_api.GitHubAPIClient()
+
+    json_result = client.PostJSON(
+        'repos/test/test/pulls', {'title': 'title "quoted"'})
+    self.assertEqual(json_result, {'number': 1})
+
+  def testReserveRequest(self):
+    """Tests the _ReserveRequest function."""
+    client = github_api.GitHubAPIClient(maximum_wait=60)
+
+    wait = client._ReserveRequest(None)
+    self.assertEqual(wait, 0.0)
+
+    rate_limit = client._GetRateLimit(None)
+    rate_limit.limit = 60
+    rate_limit.remaining = 2
+    rate_limit.reset_time = time.time() + 20.0
+
+    # Less than 10% of the rate limit remains, hence the requests are spread
+    # over the time until the reset.
+    wait = client._ReserveRequest(None)
+    self.assertGreater(wait, 5.0)
+    self.assertLessEqual(wait, 10.0)
+    self.assertEqual(rate_limit.remaining, 1)
+
+    rate_limit.remaining = 0
+    rate_limit.reset_time = time.time() + 3600.0
+
+    with self.assertRaises(errors.ConnectivityError):
+      client._ReserveRequest(None)
+
+  def testUpdateRateLimit(self):
+    """Tests the _UpdateRateLimit function."""
+    client = github_api.GitHubAPIClient()
+
+    response = TestHTTPResponse(403, headers={'Retry-After': '30'})
+    retry_after = client._UpdateRateLimit(None, response)
+    self.assertEqual(retry_after, 30.0)
+
+    response = TestHTTPResponse(403, headers={
+        'X-RateLimit-Remaining': '0',
+        'X-RateLimit-Reset': '{0:d}'.format(int(time.time()) + 10)})
+    retry_after = client._UpdateRateLimit(None, response)
+    self.assertGreater(retry_after, 5.0)
+
+    response = TestHTTPResponse(200, headers={'X-RateLimit-Remaining': '10'})
+    retry_after = client._UpdateRateLimit(None, response)
+    self.assertIsNone(retry_after)
+
+
+if __name__ == '__main__':
+  unittest.main()
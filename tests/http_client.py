@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the HTTP client with persistent connections."""
+
+from __future__ import unicode_literals
+
+import gzip
+import io
+import sys
+import threading
+import unittest
+import zlib
+
+# pylint: disable=import-error,no-name-in-module
+if sys.version_info[0] < 3:
+  import BaseHTTPServer as http_server
+  import SocketServer as socketserver
+else:
+  import http.server as http_server
+  import socketserver
+
+# pylint: disable=wrong-import-position
+from l2tdevtools import http_client
+from l2tdevtools.lib import errors
+
+from tests import test_lib
+
+
+class TestHTTPRequestHandler(http_server.BaseHTTPRequestHandler):
+  """HTTP request handler for testing."""
+
+  protocol_version = 'HTTP/1.1'
+
+  def _SendResponse(self, status_code, data, headers=None):
+    """Sends a response.
+
+    Args:
+      status_code (int): HTTP status code.
+      data (bytes): response body.
+      headers (Optional[dict[str, str]]): response headers.
+    """
+    self.send_response(status_code)
+    self.send_header('Content-Length', '{0:d}'.format(len(data)))
+    for name, value in (headers or {}).items():
+      self.send_header(name, value)
+    self.end_headers()
+    self.wfile.write(data)
+
+  def do_GET(self):  # pylint: disable=invalid-name
+    """Handles a GET request."""
+    if self.path == '/page':
+      self._SendResponse(200, b'page')
+
+    elif self.path == '/gzip':
+      file_object = io.BytesIO()
+      with gzip.GzipFile(fileobj=file_object, mode='wb') as gzip_file_object:
+        gzip_file_object.write(b'gzip page')
+
+      encoding = self.headers.get('Accept-Encoding', None) or ''
+      if 'gzip' in encoding:
+        self._SendResponse(
+            200, file_object.getvalue(), headers={'Content-Encoding': 'gzip'})
+      else:
+        self._SendResponse(200, b'gzip page')
+
+    elif self.path == '/deflate':
+      compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+      data = compressor.compress(b'deflate page') + compressor.flush()
+      self._SendResponse(200, data, headers={'Content-Encoding': 'deflate'})
+
+    elif self.path == '/redirect':
+      self._SendResponse(302, b'', headers={'Location': '/page'})
+
+    elif self.path == '/unavailable':
+      self.server.number_of_unavailable_requests += 1
+      if self.server.number_of_unavailable_requests < 3:
+        self._SendResponse(503, b'unavailable')
+      else:
+        self._SendResponse(200, b'available')
+
+    else:
+      self._SendResponse(404, b'not found')
+
+  def do_POST(self):  # pylint: disable=invalid-name
+    """Handles a POST request."""
+    content_length = int(self.headers.get('Content-Length', '0'), 10)
+    data = self.rfile.read(content_length)
+    self._SendResponse(201, data)
+
+  def log_message(self, *unused_args):  # pylint: disable=arguments-differ
+    """Does not log the requests."""
+    return
+
+
+class TestHTTPServer(socketserver.ThreadingMixIn, http_server.HTTPServer):
+  """HTTP server for testing."""
+
+  daemon_threads = True
+
+  def __init__(self):
+    """Initializes a HTTP server for testing on a free local port."""
+    http_server.HTTPServer.__init__(
+        self, ('127.0.0.1', 0), TestHTTPRequestHandler)
+    self.number_of_unavailable_requests = 0
+
+
+class HTTPHostStatisticsTest(test_lib.BaseTestCase):
+  """Tests for the statistics of the requests to a host."""
+
+  def testGetAverageLatency(self):
+    """Tests the GetAverageLatency function."""
+    host_statistics = http_client.HTTPHostStatistics()
+    self.assertIsNone(host_statistics.GetAverageLatency())
+
+    host_statistics = http_client.HTTPHostStatistics(
+        latency=3.0, number_of_requests=2)
+    self.assertEqual(host_statistics.GetAverageLatency(), 1.5)
+
+  def testGetDifference(self):
+    """Tests the GetDifference function."""
+    previous_statistics = http_client.HTTPHostStatistics(
+        latency=1.0, number_of_connections=1, number_of_requests=2)
+    host_statistics = http_client.HTTPHostStatistics(
+        latency=4.0, number_of_connections=2, number_of_errors=1,
+        number_of_requests=5, number_of_retries=1)
+
+    difference = host_statistics.GetDifference(previous_statistics)
+    self.assertEqual(difference.CopyToDict(), {
+        'latency': 3.0,
+        'number_of_connections': 1,
+        'number_of_errors': 1,
+        'number_of_requests': 3,
+        'number_of_retries': 1})
+
+
+class HTTPClientTest(test_lib.BaseTestCase):
+  """Tests for the HTTP client."""
+
+  # pylint: disable=protected-access
+
+  def setUp(self):
+    """Sets up the needed objects used throughout the test."""
+    self._server = TestHTTPServer()
+    self._server_thread = threading.Thread(target=self._server.serve_forever)
+    self._server_thread.daemon = True
+    self._server_thread.start()
+
+    self._clients = []
+    self._url = 'http://127.0.0.1:{0:d}'.format(self._server.server_port)
+    self._host = '127.0.0.1:{0:d}'.format(self._server.server_port)
+
+  def tearDown(self):
+    """Cleans up the needed objects used throughout the test."""
+    for client in self._clients:
+      client.Close()
+
+    self._server.shutdown()
+    self._server.server_close()
+
+  def _CreateClient(self, **kwargs):
+    """Creates a HTTP client that is closed when the test ends.
+
+    Args:
+      kwargs (dict[str, object]): keyword arguments of the client.
+
+    Returns:
+      HTTPClient: HTTP client.
+    """
+    client = http_client.HTTPClient(**kwargs)
+    self._clients.append(client)
+    return client
+
+  def testRequest(self):
+    """Tests the Request function."""
+    client = self._CreateClient()
+
+    for _ in range(3):
+      response = client.Request('{0:s}/page'.format(self._url))
+      self.assertEqual(response.code, 200)
+      self.assertEqual(response.read(), b'page')
+
+    response = client.Request('{0:s}/bogus'.format(self._url))
+    self.assertEqual(response.code, 404)
+    response.close()
+
+    response = client.Request(
+        '{0:s}/post'.format(self._url), data=b'post data')
+    self.assertEqual(response.code, 201)
+    self.assertEqual(response.read(), b'post data')
+
+    # The POST request uses a new connection, as does any request after
+    # the 404 response that was not read.
+    statistics = client.GetStatistics()[self._host]
+    self.assertEqual(statistics.number_of_connections, 2)
+    self.assertEqual(statistics.number_of_requests, 5)
+    self.assertEqual(statistics.number_of_errors, 0)
+    self.assertIsNotNone(statistics.GetAverageLatency())
+
+  def testRequestDecompress(self):
+    """Tests the Request function with compressed responses."""
+    client = self._CreateClient()
+
+    response = client.Request('{0:s}/gzip'.format(self._url))
+    self.assertEqual(response.headers.get('Content-Encoding'), 'gzip')
+    self.assertEqual(response.read(4), b'gzip')
+    self.assertEqual(response.read(), b' page')
+
+    response = client.Request(
+        '{0:s}/gzip'.format(self._url), decompress=False)
+    self.assertIsNone(response.headers.get('Content-Encoding'))
+    self.assertEqual(response.read(), b'gzip page')
+
+    response = client.Request('{0:s}/deflate'.format(self._url))
+    self.assertEqual(response.read(), b'deflate page')
+
+  def testRequestRedirect(self):
+    """Tests the Request function with a redirect."""
+    client = self._CreateClient()
+
+    response = client.Request('{0:s}/redirect'.format(self._url))
+    self.assertEqual(response.code, 200)
+    self.assertEqual(response.url, '{0:s}/page'.format(self._url))
+    self.assertEqual(response.read(), b'page')
+
+    statistics = client.GetStatistics()[self._host]
+    self.assertEqual(statistics.number_of_connections, 1)
+
+  def testFormatStatistics(self):
+    """Tests the FormatStatistics function."""
+    client = self._CreateClient()
+
+    response = client.Request('{0:s}/page'.format(self._url))
+    response.read()
+
+    lines = http_client.FormatStatistics(client.GetStatistics()).split('\n')
+    self.assertEqual(len(lines), 2)
+    self.assertTrue(lines[0].startswith('Host'))
+    self.assertEqual(lines[1].split()[:5], [self._host, '1', '1', '0', '0'])
+
+  def testRequestRetry(self):
+    """Tests the Request function with transient errors."""
+    client = self._CreateClient(backoff_factor=0.01)
+
+    response = client.Request('{0:s}/unavailable'.format(self._url))
+    self.assertEqual(response.code, 200)
+    self.assertEqual(response.read(), b'available')
+
+    statistics = client.GetStatistics()[self._host]
+    self.assertEqual(statistics.number_of_retries, 2)
+
+    self._server.number_of_unavailable_requests = 0
+
+    client = self._CreateClient(
+        backoff_factor=0.01, maximum_number_of_retries=1)
+
+    response = client.Request('{0:s}/unavailable'.format(self._url))
+    self.assertEqual(response.code, 503)
+    response.close()
+
+  def testRequestConnectivityError(self):
+    """Tests the Request function with connection errors."""
+    client = self._CreateClient(
+        backoff_factor=0.01, maximum_number_of_retries=1)
+
+    self._server.shutdown()
+    self._server.server_close()
+
+    with self.assertRaises(errors.ConnectivityError):
+      client.Request('{0:s}/page'.format(self._url))
+
+    statistics = client.GetStatistics()[self._host]
+    self.assertEqual(statistics.number_of_errors, 2)
+    self.assertEqual(statistics.number_of_retries, 1)
+
+    # A request with a non-idempotent method is not retried.
+    with self.assertRaises(errors.ConnectivityError):
+      client.Request('{0:s}/post'.format(self._url), data=b'post data')
+
+    statistics = client.GetStatistics()[self._host]
+    self.assertEqual(statistics.number_of_errors, 3)
+    self.assertEqual(statistics.number_of_retries, 1)
+
+    with self.assertRaises(errors.ConnectivityError):
+      client.Request('ftp://127.0.0.1/page')
+
+  def testGetBackoff(self):
+    """Tests the _GetBackoff function."""
+    client = self._CreateClient(backoff_factor=1.0)
+
+    backoff = client._GetBackoff(2)
+    self.assertGreaterEqual(backoff, 0.0)
+    self.assertLessEqual(backoff, 4.0)
+
+    backoff = client._GetBackoff(0, retry_after='5')
+    self.assertEqual(backoff, 5.0)
+
+
+if __name__ == '__main__':
+  unittest.main()
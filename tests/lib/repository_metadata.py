@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the streaming parsers of package repository metadata."""
+
+from __future__ import unicode_literals
+
+import gzip
+import io
+import unittest
+
+from l2tdevtools.lib import repository_metadata
+
+from tests import test_lib
+
+
+def _CompressData(data):
+  """Compresses data with gzip.
+
+  Args:
+    data (bytes): data.
+
+  Returns:
+    bytes: gzip compressed data.
+  """
+  file_object = io.BytesIO()
+  with gzip.GzipFile(fileobj=file_object, mode='wb') as gzip_file_object:
+    gzip_file_object.write(data)
+
+  return file_object.getvalue()
+
+
+class GzipDecompressedStreamTest(test_lib.BaseTestCase):
+  """Tests for the gzip decompressed stream."""
+
+  def testRead(self):
+    """Tests the read function."""
+    data = b''.join([
+        'line {0:d}\n'.format(index).encode('ascii')
+        for index in range(50000)])
+
+    file_object = io.BytesIO(_CompressData(data))
+    stream = repository_metadata.OpenGzipDecompressedStream(file_object)
+
+    self.assertEqual(stream.readline(), b'line 0\n')
+    self.assertEqual(stream.read(), data[7:])
+
+  def testReadMultipleMembers(self):
+    """Tests the read function with multiple gzip members."""
+    file_object = io.BytesIO(_CompressData(b'first\n') + _CompressData(
+        b'second\n'))
+    stream = repository_metadata.OpenGzipDecompressedStream(file_object)
+
+    self.assertEqual(stream.read(), b'first\nsecond\n')
+
+
+class RepositoryMetadataFunctionsTest(test_lib.BaseTestCase):
+  """Tests for the streaming parsers of package repository metadata."""
+
+  def testReadDeb822Stanzas(self):
+    """Tests the ReadDeb822Stanzas function."""
+    file_object = io.BytesIO((
+        'Package: dfvfs\n'
+        'Version: 20180831-1ppa1~trusty\n'
+        'Binary: python-dfvfs,\n'
+        ' python3-dfvfs\n'
+        '\n'
+        '\n'
+        'Package: plaso\n'
+        'Version: 20180818-1ppa1~trusty\n').encode('utf-8'))
+
+    stanzas = list(repository_metadata.ReadDeb822Stanzas(file_object))
+    self.assertEqual(len(stanzas), 2)
+
+    self.assertEqual(stanzas[0], {
+        'Binary': 'python-dfvfs,\npython3-dfvfs',
+        'Package': 'dfvfs',
+        'Version': '20180831-1ppa1~trusty'})
+    self.assertEqual(stanzas[1]['Package'], 'plaso')
+
+  def testReadRPMPrimaryPackages(self):
+    """Tests the ReadRPMPrimaryPackages function."""
+    file_object = io.BytesIO((
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<metadata xmlns="http://linux.duke.edu/metadata/common" '
+        'packages="2">\n'
+        '<package type="rpm"><name>dfvfs</name><arch>src</arch>'
+        '<version epoch="0" ver="20180831" rel="1"/></package>\n'
+        '<package type="rpm"><name>python-dfvfs</name><arch>noarch</arch>'
+        '<version epoch="0" ver="20180831" rel="1"/></package>\n'
+        '</metadata>\n').encode('utf-8'))
+
+    packages = list(repository_metadata.ReadRPMPrimaryPackages(file_object))
+    self.assertEqual(packages, [
+        ('dfvfs', 'src', '20180831'),
+        ('python-dfvfs', 'noarch', '20180831')])
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the manage tool."""
+
+from __future__ import unicode_literals
+
+import gzip
+import io
+import json
+import threading
+import unittest
+
+from tools import manage
+
+from tests import test_lib
+
+
+class TestDownloadHelper(object):
+  """Download helper for testing."""
+
+  def __init__(self, page_contents):
+    """Initializes the download helper.
+
+    Args:
+      page_contents (dict[str, str]): page contents per download URL.
+    """
+    super(TestDownloadHelper, self).__init__()
+    self._page_contents = page_contents
+
+  def DownloadPageContent(self, download_url, encoding='utf-8'):
+    """Downloads the page content from the URL.
+
+    Args:
+      download_url (str): URL where to download the page content.
+      encoding (Optional[str]): encoding of the page content, where None
+          represents no encoding (or binary data).
+
+    Returns:
+      str: page content if successful or None if not available.
+    """
+    return self._page_contents.get(download_url, None)
+
+  def OpenPage(self, download_url):
+    """Opens the page content from the URL as a stream.
+
+    Args:
+      download_url (str): URL where to download the page content.
+
+    Returns:
+      file: binary file-like object of the page content or None if not
+          available.
+    """
+    page_content = self._page_contents.get(download_url, None)
+    if page_content is None:
+      return None
+
+    return io.BytesIO(page_content)
+
+
+class TestLaunchpadPPAManager(manage.LaunchpadPPAManager):
+  """Launchpad PPA manager for testing."""
+
+  def __init__(self, page_contents):
+    """Initializes the Launchpad PPA manager.
+
+    Args:
+      page_contents (dict[str, bytes]): page contents per download URL.
+    """
+    super(TestLaunchpadPPAManager, self).__init__('gift')
+    self._page_contents = page_contents
+
+  def _CreateDownloadHelper(self):
+    """Creates a download helper.
+
+    Returns:
+      TestDownloadHelper: download helper.
+    """
+    return TestDownloadHelper(self._page_contents)
+
+
+class TestPyPIManager(manage.PyPIManager):
+  """PyPI manager for testing."""
+
+  _PYPI_PACKAGE_NAMES = {
+      'dfvfs': 'dfvfs',
+      'libbde-python': 'libbde',
+      'python-dateutil': 'dateutil'}
+
+  def __init__(self, page_contents):
+    """Initializes the PyPI manager.
+
+    Args:
+      page_contents (dict[str, str]): page contents per download URL.
+    """
+    super(TestPyPIManager, self).__init__()
+    self._page_contents = page_contents
+
+  def _CreateDownloadHelper(self):
+    """Creates a download helper.
+
+    Returns:
+      TestDownloadHelper: download helper.
+    """
+    return TestDownloadHelper(self._page_contents)
+
+
+class PackagesFetcherTest(test_lib.BaseTestCase):
+  """Tests for the packages fetcher."""
+
+  def testFetch(self):
+    """Tests the Fetch function."""
+    thread_names = set()
+
+    def _GetPackages(name):
+      thread_names.add(threading.current_thread().name)
+      return {name: '1.0'}
+
+    tasks = [
+        (name, _GetPackages, (name, )) for name in ('a', 'b', 'c', 'd')]
+
+    packages_fetcher = manage.PackagesFetcher(number_of_jobs=2)
+    results = packages_fetcher.Fetch(tasks)
+
+    self.assertEqual(len(results), 4)
+    self.assertEqual(results['c'], {'c': '1.0'})
+    self.assertNotIn(threading.current_thread().name, thread_names)
+
+    packages_fetcher = manage.PackagesFetcher(number_of_jobs=1)
+    results = packages_fetcher.Fetch(tasks)
+    self.assertEqual(len(results), 4)
+
+    results = packages_fetcher.Fetch([])
+    self.assertEqual(results, {})
+
+
+class LaunchpadPPAManagerTest(test_lib.BaseTestCase):
+  """Tests for the Launchpad PPA manager."""
+
+  def testGetPackages(self):
+    """Tests the GetPackages function."""
+    sources = (
+        'Package: dfvfs\n'
+        'Version: 20180831-1ppa1~trusty\n'
+        '\n'
+        'Package: plaso\n'
+        'Version: 20180818-1ppa1~trusty\n').encode('utf-8')
+
+    file_object = io.BytesIO()
+    with gzip.GzipFile(fileobj=file_object, mode='wb') as gzip_file_object:
+      gzip_file_object.write(sources)
+
+    download_url = (
+        'http://ppa.launchpad.net/gift/testing/ubuntu/dists/trusty/main/'
+        'source/Sources.gz')
+
+    launchpad_ppa_manager = TestLaunchpadPPAManager({
+        download_url: file_object.getvalue()})
+
+    packages = launchpad_ppa_manager.GetPackages('testing')
+    self.assertEqual(packages, {'dfvfs': '20180831', 'plaso': '20180818'})
+
+    packages = launchpad_ppa_manager.GetPackages('dev')
+    self.assertIsNone(packages)
+
+    launchpad_ppa_manager = TestLaunchpadPPAManager({
+        download_url: b'not gzip'})
+
+    packages = launchpad_ppa_manager.GetPackages('testing')
+    self.assertIsNone(packages)
+
+
+class PyPIManagerTest(test_lib.BaseTestCase):
+  """Tests for the PyPI manager."""
+
+  _PAGE_CONTENTS = {
+      'https://pypi.org/pypi/dfvfs/json': json.dumps({
+          'info': {'version': '20180831'}}),
+      'https://pypi.org/pypi/python-dateutil/json': json.dumps({
+          'info': {'version': '2.7.3'}}),
+      'https://pypi.org/pypi/libbde-python/json': '<html>'}
+
+  def testGetPackageVersion(self):
+    """Tests the GetPackageVersion function."""
+    pypi_manager = TestPyPIManager(self._PAGE_CONTENTS)
+
+    version = pypi_manager.GetPackageVersion('dfvfs')
+    self.assertEqual(version, '20180831')
+
+    version = pypi_manager.GetPackageVersion('libbde-python')
+    self.assertIsNone(version)
+
+    version = pypi_manager.GetPackageVersion('bogus')
+    self.assertIsNone(version)
+
+  def testGetPackages(self):
+    """Tests the GetPackages function."""
+    pypi_manager = TestPyPIManager(self._PAGE_CONTENTS)
+    packages_fetcher = manage.PackagesFetcher(number_of_jobs=4)
+
+    packages = pypi_manager.GetPackages(packages_fetcher)
+    self.assertEqual(packages, {'dateutil': '2.7.3', 'dfvfs': '20180831'})
+
+
+class PackagesManagerTest(test_lib.BaseTestCase):
+  """Tests for the packages manager."""
+
+  # pylint: disable=protected-access
+
+  def testComparePackages(self):
+    """Tests the _ComparePackages function."""
+    packages_manager = manage.PackagesManager()
+
+    new_packages, new_versions = packages_manager._ComparePackages(
+        {'dfvfs': '20180831', 'plaso': '20180818', 'six': '1.11.0'},
+        {'dfvfs': '20180703', 'six': '1.11.0'})
+
+    self.assertEqual(new_packages, {'plaso': '20180818'})
+    self.assertEqual(new_versions, {'dfvfs': '20180831'})
+
+
+if __name__ == '__main__':
+  unittest.main()
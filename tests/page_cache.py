@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the persistent on-disk cache of downloaded page content."""
+
+from __future__ import unicode_literals
+
+import os
+import unittest
+
+from l2tdevtools import page_cache
+
+from tests import test_lib
+
+
+class PageCacheTest(test_lib.BaseTestCase):
+  """Tests for the page cache."""
+
+  _URL = 'https://pypi.org/simple/dfvfs/'
+
+  def _CreateEntry(self, url, page_content):
+    """Creates a page cache entry for testing.
+
+    Args:
+      url (str): URL of the page.
+      page_content (bytes): page content.
+
+    Returns:
+      PageCacheEntry: page cache entry.
+    """
+    entry = page_cache.PageCacheEntry(url)
+    entry.etag = '"12345"'
+    entry.page_content = page_content
+    return entry
+
+  def testGetEntryAndStoreEntry(self):
+    """Tests the GetEntry and StoreEntry functions."""
+    with test_lib.TempDirectory() as temporary_directory:
+      cache_path = os.path.join(temporary_directory, 'cache')
+      test_cache = page_cache.PageCache(cache_path)
+
+      entry = test_cache.GetEntry(self._URL)
+      self.assertIsNone(entry)
+
+      result = test_cache.StoreEntry(self._CreateEntry(self._URL, b'content'))
+      self.assertTrue(result)
+
+      entry = test_cache.GetEntry(self._URL)
+      self.assertIsNotNone(entry)
+      self.assertEqual(entry.etag, '"12345"')
+      self.assertIsNone(entry.last_modified)
+      self.assertEqual(entry.page_content, b'content')
+      self.assertEqual(entry.url, self._URL)
+
+  def testIsFresh(self):
+    """Tests the IsFresh function."""
+    with test_lib.TempDirectory() as temporary_directory:
+      test_cache = page_cache.PageCache(temporary_directory, time_to_live=60)
+
+      entry = self._CreateEntry(self._URL, b'content')
+      test_cache.StoreEntry(entry)
+      self.assertTrue(test_cache.IsFresh(entry))
+
+      entry.timestamp -= 120
+      self.assertFalse(test_cache.IsFresh(entry))
+
+      test_cache.offline = True
+      self.assertTrue(test_cache.IsFresh(entry))
+
+  # pylint: disable=protected-access
+  def testEvictEntries(self):
+    """Tests the eviction of the least recently used entries."""
+    with test_lib.TempDirectory() as temporary_directory:
+      test_cache = page_cache.PageCache(temporary_directory, maximum_size=20)
+
+      first_url = '{0:s}1'.format(self._URL)
+      second_url = '{0:s}2'.format(self._URL)
+      third_url = '{0:s}3'.format(self._URL)
+
+      test_cache.StoreEntry(self._CreateEntry(first_url, b'0123456789'))
+      test_cache.StoreEntry(self._CreateEntry(second_url, b'0123456789'))
+
+      # Make sure the first entry is more recently used than the second.
+      content_path, _ = test_cache._GetPaths(second_url)
+      os.utime(content_path, (0, 0))
+      test_cache.GetEntry(first_url)
+
+      test_cache.StoreEntry(self._CreateEntry(third_url, b'0123456789'))
+
+      self.assertIsNotNone(test_cache.GetEntry(first_url))
+      self.assertIsNone(test_cache.GetEntry(second_url))
+      self.assertIsNotNone(test_cache.GetEntry(third_url))
+
+      result = test_cache.StoreEntry(self._CreateEntry(self._URL, b'0' * 32))
+      self.assertFalse(result)
+
+
+if __name__ == '__main__':
+  unittest.main()
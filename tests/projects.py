@@ -100,5 +100,89 @@ class ProjectDefinitionReaderTest(test_lib.BaseTestCase):
     self.assertEqual(project_definition.download_url, expected_download_url)
 
 
+class ProjectDefinitionIndexTest(test_lib.BaseTestCase):
+  """Tests for the project definition index."""
+
+  # pylint: disable=protected-access
+
+  def testGetProjectDefinition(self):
+    """Tests the GetProjectDefinition function."""
+    with test_lib.TempDirectory() as temporary_directory:
+      index_path = os.path.join(temporary_directory, 'projects.json')
+      index = projects.ProjectDefinitionIndex(
+          os.path.join('data', 'projects.ini'), index_path=index_path)
+
+      project_definition = index.GetProjectDefinition('artifacts')
+      self.assertIsNotNone(project_definition)
+      self.assertEqual(
+          project_definition.version.version_string, '>=20150409')
+      self.assertTrue(os.path.exists(index_path))
+
+      # Read the project definitions from the index file.
+      index = projects.ProjectDefinitionIndex(
+          os.path.join('data', 'projects.ini'), index_path=index_path)
+      index._Load()
+      self.assertEqual(index._project_definitions, {})
+
+      project_definition = index.GetProjectDefinition('artifacts')
+      self.assertIsNotNone(project_definition)
+      self.assertEqual(project_definition.name, 'artifacts')
+      self.assertEqual(
+          project_definition.version.version_string, '>=20150409')
+
+      expected_download_url = (
+          'https://github.com/ForensicArtifacts/artifacts/releases')
+      self.assertEqual(project_definition.download_url, expected_download_url)
+
+      project_definition = index.GetProjectDefinition('bogus')
+      self.assertIsNone(project_definition)
+
+  def testGetProjectDefinitions(self):
+    """Tests the GetProjectDefinitions function."""
+    with test_lib.TempDirectory() as temporary_directory:
+      index = projects.ProjectDefinitionIndex(
+          os.path.join('data', 'projects.ini'),
+          index_path=os.path.join(temporary_directory, 'projects.json'))
+
+      project_definitions = index.GetProjectDefinitions(
+          names=['dfvfs', 'artifacts', 'bogus'])
+      self.assertEqual(
+          [project_definition.name for project_definition in (
+              project_definitions)], ['artifacts', 'dfvfs'])
+
+      project_definitions = index.GetProjectDefinitions()
+      self.assertEqual(len(project_definitions), len(index.GetNames()))
+
+  def testInvalidation(self):
+    """Tests that the index is rebuilt when the projects.ini file changes."""
+    with test_lib.TempDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'projects.ini')
+      index_path = os.path.join(temporary_directory, 'projects.json')
+
+      with open(path, 'w') as file_object:
+        file_object.write(
+            '[test]\ndownload_url: https://pypi.org/project/test\n')
+
+      index = projects.ProjectDefinitionIndex(path, index_path=index_path)
+      self.assertEqual(index.GetNames(), ['test'])
+
+      # The same content with a different modification time does not
+      # invalidate the index.
+      os.utime(path, (1, 1))
+
+      index = projects.ProjectDefinitionIndex(path, index_path=index_path)
+      index._Load()
+      self.assertEqual(index._project_definitions, {})
+      self.assertEqual(index.GetNames(), ['test'])
+
+      with open(path, 'w') as file_object:
+        file_object.write(
+            '[test]\ndownload_url: https://pypi.org/project/test\n'
+            '[other]\ndownload_url: https://pypi.org/project/other\n')
+
+      index = projects.ProjectDefinitionIndex(path, index_path=index_path)
+      self.assertEqual(index.GetNames(), ['test', 'other'])
+
+
 if __name__ == '__main__':
   unittest.main()
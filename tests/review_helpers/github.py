@@ -4,7 +4,6 @@
 
 from __future__ import unicode_literals
 
-import json
 import unittest
 
 from l2tdevtools.review_helpers import github
@@ -22,7 +21,7 @@ class GitHubHelperTest(shared_test_lib.BaseTestCase):
     """Tests the AssignPullReview function."""
     helper = github.GitHubHelper(
         organization='test', project='test_project')
-    helper._url_lib_helper = test_lib.TestURLLibHelper()
+    helper._github_api_client = test_lib.TestGitHubAPIClient()
 
     result = helper.AssignPullRequest(4, 'TOKEN', ['Onager'])
 
@@ -30,11 +29,10 @@ class GitHubHelperTest(shared_test_lib.BaseTestCase):
 
   def testCreatePullRequest(self):
     """Tests the CreatePullRequest function."""
-    create_result = json.dumps({"number": 1})
-
     helper = github.GitHubHelper(
         organization='test', project='test_project')
-    helper._url_lib_helper = test_lib.TestURLLibHelper(result=create_result)
+    helper._github_api_client = test_lib.TestGitHubAPIClient(
+        result={'number': 1})
 
     result = helper.CreatePullRequest('TOKEN', 'origin', 'title', 'body')
     self.assertEqual(result, 1)
@@ -43,7 +41,7 @@ class GitHubHelperTest(shared_test_lib.BaseTestCase):
     """Tests the CreatePullRequestReview function."""
     helper = github.GitHubHelper(
         organization='test', project='test_project')
-    helper._url_lib_helper = test_lib.TestURLLibHelper()
+    helper._github_api_client = test_lib.TestGitHubAPIClient()
 
     result = helper.CreatePullRequestReview(4, 'TOKEN', ['Onager'])
 
@@ -53,19 +51,27 @@ class GitHubHelperTest(shared_test_lib.BaseTestCase):
     """Tests the GetForkGitRepoUrl function."""
     helper = github.GitHubHelper(
         organization='test', project='test_project')
-    helper._url_lib_helper = test_lib.TestURLLibHelper()
+    helper._github_api_client = test_lib.TestGitHubAPIClient()
 
     expected_url = 'https://github.com/test_user/test_project.git'
     url = helper.GetForkGitRepoUrl('test_user')
     self.assertEqual(url, expected_url)
 
-  # TODO: add tests for GetUsername.
+  def testGetUsername(self):
+    """Tests the GetUsername function."""
+    helper = github.GitHubHelper(
+        organization='test', project='test_project')
+    helper._github_api_client = test_lib.TestGitHubAPIClient(
+        result={'login': 'test_user'})
+
+    result = helper.GetUsername('TOKEN')
+    self.assertEqual(result, 'test_user')
 
   def testQueryUser(self):
     """Tests the QueryUser function."""
     helper = github.GitHubHelper(
         organization='test', project='test_project')
-    helper._url_lib_helper = test_lib.TestURLLibHelper()
+    helper._github_api_client = test_lib.TestGitHubAPIClient()
 
     result = helper.QueryUser('test_user')
     self.assertIsNone(result)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the cache of the files that passed code inspection."""
+
+from __future__ import unicode_literals
+
+import os
+import unittest
+
+from l2tdevtools.review_helpers import lint_cache
+
+from tests import test_lib
+
+
+class LintResultCacheTest(test_lib.BaseTestCase):
+  """Tests the lint result cache."""
+
+  def testHasPassedAndSetPassed(self):
+    """Tests the HasPassed and SetPassed functions."""
+    with test_lib.TempDirectory() as temporary_directory:
+      cache_path = os.path.join(temporary_directory, 'cache.json')
+      filename = os.path.join(temporary_directory, 'test.py')
+      rcfile = os.path.join(temporary_directory, '.pylintrc')
+
+      with open(filename, 'wb') as file_object:
+        file_object.write(b'import os\n')
+
+      with open(rcfile, 'wb') as file_object:
+        file_object.write(b'[MASTER]\n')
+
+      result_cache = lint_cache.LintResultCache(cache_path)
+      self.assertFalse(result_cache.HasPassed('pylint', filename, rcfile))
+
+      result_cache.SetPassed('pylint', filename, rcfile)
+      self.assertTrue(result_cache.HasPassed('pylint', filename, rcfile))
+      self.assertFalse(result_cache.HasPassed('yapf', filename, rcfile))
+
+      result = result_cache.Write()
+      self.assertTrue(result)
+
+      result_cache = lint_cache.LintResultCache(cache_path)
+      self.assertTrue(result_cache.HasPassed('pylint', filename, rcfile))
+
+      with open(rcfile, 'wb') as file_object:
+        file_object.write(b'[MASTER]\njobs=2\n')
+
+      result_cache = lint_cache.LintResultCache(cache_path)
+      self.assertFalse(result_cache.HasPassed('pylint', filename, rcfile))
+
+      missing_filename = os.path.join(temporary_directory, 'missing.py')
+      result_cache.SetPassed('pylint', missing_filename, rcfile)
+      self.assertFalse(
+          result_cache.HasPassed('pylint', missing_filename, rcfile))
+
+
+if __name__ == '__main__':
+  unittest.main()
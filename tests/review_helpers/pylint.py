@@ -19,6 +19,31 @@ class PylintHelperTest(test_lib.BaseTestCase):
     helper = pylint.PylintHelper()
     self.assertIsNotNone(helper)
 
+  # pylint: disable=protected-access
+
+  def testGetFailedFilenames(self):
+    """Tests the _GetFailedFilenames function."""
+    helper = pylint.PylintHelper()
+
+    output = '\n'.join([
+        '************* Module l2tdevtools.review_helpers.pylint',
+        'C: 10, 0: Line too long (81/80) (line-too-long)',
+        '************* Module setup',
+        'W:  5, 0: Unused import os (unused-import)',
+        '************* Module tests',
+        'W:  1, 0: Unused import os (unused-import)'])
+
+    filenames = [
+        'l2tdevtools/review_helpers/pylint.py',
+        'l2tdevtools/review_helpers/yapf.py',
+        'setup.py',
+        'tests/__init__.py']
+
+    failed_filenames = helper._GetFailedFilenames(output, filenames)
+    self.assertEqual(failed_filenames, [
+        'l2tdevtools/review_helpers/pylint.py', 'setup.py',
+        'tests/__init__.py'])
+
 
 if __name__ == '__main__':
   unittest.main()
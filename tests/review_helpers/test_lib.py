@@ -28,3 +28,47 @@ class TestURLLibHelper(object):
       ConnectivityError: if the request failed.
     """
     return self._result
+
+
+class TestGitHubAPIClient(object):
+  """GitHub API client for testing."""
+
+  def __init__(self, result=None):
+    """Initializes a GitHub API client.
+
+    Args:
+      result (Optional[object]): JSON result that should be returned.
+    """
+    super(TestGitHubAPIClient, self).__init__()
+    self._result = result
+
+  def GetJSON(self, unused_path, **unused_kwargs):
+    """Retrieves a JSON result.
+
+    Args:
+      path (str): path relative to the API URL.
+      access_token (Optional[str]): GitHub access token.
+
+    Returns:
+      object: JSON result.
+
+    Raises:
+      ConnectivityError: if the result cannot be retrieved.
+    """
+    return self._result
+
+  def PostJSON(self, unused_path, unused_json_data, **unused_kwargs):
+    """Posts JSON data.
+
+    Args:
+      path (str): path relative to the API URL.
+      json_data (object): JSON data.
+      access_token (Optional[str]): GitHub access token.
+
+    Returns:
+      object: JSON result.
+
+    Raises:
+      ConnectivityError: if the request failed.
+    """
+    return self._result
@@ -19,6 +19,26 @@ class YapfHelperTest(test_lib.BaseTestCase):
     helper = yapf.YapfHelper()
     self.assertIsNotNone(helper)
 
+  # pylint: disable=protected-access
+
+  def testGetFailedFilenames(self):
+    """Tests the _GetFailedFilenames function."""
+    helper = yapf.YapfHelper()
+
+    output = '\n'.join([
+        '--- l2tdevtools/review_helpers/yapf.py\t(original)',
+        '+++ l2tdevtools/review_helpers/yapf.py\t(reformatted)',
+        '@@ -1,3 +1,3 @@',
+        '-x=1',
+        '+x = 1'])
+
+    filenames = [
+        'l2tdevtools/review_helpers/pylint.py',
+        'l2tdevtools/review_helpers/yapf.py']
+
+    failed_filenames = helper._GetFailedFilenames(output, filenames)
+    self.assertEqual(failed_filenames, ['l2tdevtools/review_helpers/yapf.py'])
+
 
 if __name__ == '__main__':
   unittest.main()
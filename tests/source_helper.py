@@ -4,8 +4,15 @@
 
 from __future__ import unicode_literals
 
+import io
+import os
+import subprocess
+import tarfile
 import unittest
+import zipfile
 
+from l2tdevtools import git_mirror
+from l2tdevtools import projects
 from l2tdevtools import source_helper
 
 from tests import test_lib
@@ -20,7 +27,173 @@ class SourceHelperTest(test_lib.BaseTestCase):
     self.assertIsNotNone(source_helper_object)
 
 
-# TODO: add tests.
+class LibyalGitRepositorySourceHelperTest(test_lib.BaseTestCase):
+  """Tests for the helper to manager libyal git repositories."""
+
+  # pylint: disable=protected-access
+
+  def testGetSyncLibsEnvironment(self):
+    """Tests the _GetSyncLibsEnvironment function."""
+    project_definition = projects.ProjectDefinition('libtest')
+    project_definition.git_url = 'https://github.com/libyal/libtest.git'
+
+    source_helper_object = source_helper.LibyalGitRepositorySourceHelper(
+        'libtest', project_definition)
+
+    with test_lib.TempDirectory() as temporary_directory:
+      upstream_path = os.path.join(temporary_directory, 'libcerror.git')
+      subprocess.check_call(['git', 'init', '--quiet', '--bare', upstream_path])
+
+      source_directory = os.path.join(temporary_directory, 'libtest')
+      os.mkdir(source_directory)
+
+      script_path = os.path.join(source_directory, 'synclibs.sh')
+      with io.open(script_path, 'w', encoding='utf-8') as file_object:
+        file_object.write((
+            '#!/bin/sh\n'
+            'GIT_URL_PREFIX="file://{0:s}";\n'
+            'LOCAL_LIBS="libcerror";\n').format(temporary_directory))
+
+      environment = source_helper_object._GetSyncLibsEnvironment(
+          source_directory)
+      self.assertIsNone(environment)
+
+      cache_path = os.path.join(temporary_directory, 'cache')
+      source_helper.GitRepositorySourceHelper.SetGitMirrorCache(
+          git_mirror.GitMirrorCache(cache_path))
+
+      try:
+        environment = source_helper_object._GetSyncLibsEnvironment(
+            source_directory)
+      finally:
+        source_helper.GitRepositorySourceHelper.SetGitMirrorCache(None)
+
+      self.assertIsNotNone(environment)
+      self.assertEqual(
+          environment['GIT_CONFIG_VALUE_0'],
+          'file://{0:s}/'.format(temporary_directory))
+
+      mirror_path = os.path.join(
+          cache_path, temporary_directory.lstrip(os.sep), 'libcerror.git')
+      self.assertTrue(os.path.isdir(mirror_path))
+
+
+class SourcePackageHelperTest(test_lib.BaseTestCase):
+  """Tests for the helper to manager source packages."""
+
+  # pylint: disable=protected-access
+
+  _NUMBER_OF_FILES = 200
+
+  def _CreateSourcePackageHelper(self):
+    """Creates a source package helper for testing.
+
+    Returns:
+      SourcePackageHelper: source package helper.
+    """
+    project_definition = projects.ProjectDefinition('test')
+    return source_helper.SourcePackageHelper('test', project_definition, None)
+
+  def _CheckSourceDirectory(self, directory_name):
+    """Checks the extracted source directory.
+
+    Args:
+      directory_name (str): name of the source directory.
+    """
+    self.assertEqual(directory_name, 'test-1.0')
+
+    for index in range(self._NUMBER_OF_FILES):
+      path = os.path.join(
+          'test-1.0', 'src{0:d}'.format(index % 4), 'file{0:d}'.format(index))
+      with open(path, 'rb') as file_object:
+        self.assertEqual(file_object.read(), '{0:d}'.format(index).encode(
+            'utf-8'))
+
+    self.assertFalse(os.path.exists('other'))
+
+  def testCreateFromTar(self):
+    """Tests the _CreateFromTar function."""
+    source_helper_object = self._CreateSourcePackageHelper()
+
+    current_working_directory = os.getcwd()
+
+    try:
+      with test_lib.TempDirectory() as temporary_directory:
+        os.chdir(temporary_directory)
+
+        with tarfile.open('test-1.0.tar.gz', 'w:gz') as archive:
+          for index in range(self._NUMBER_OF_FILES):
+            data = '{0:d}'.format(index).encode('utf-8')
+            tar_info = tarfile.TarInfo('test-1.0/src{0:d}/file{1:d}'.format(
+                index % 4, index))
+            tar_info.size = len(data)
+            archive.addfile(tar_info, io.BytesIO(data))
+
+          tar_info = tarfile.TarInfo('other/file')
+          archive.addfile(tar_info, io.BytesIO(b''))
+
+        directory_name = source_helper_object._CreateFromTar(
+            'test-1.0.tar.gz')
+        self._CheckSourceDirectory(directory_name)
+
+    finally:
+      os.chdir(current_working_directory)
+
+  def testCreateFromZip(self):
+    """Tests the _CreateFromZip function."""
+    source_helper_object = self._CreateSourcePackageHelper()
+
+    current_working_directory = os.getcwd()
+
+    try:
+      with test_lib.TempDirectory() as temporary_directory:
+        os.chdir(temporary_directory)
+
+        with zipfile.ZipFile('test-1.0.zip', 'w') as archive:
+          archive.writestr('test-1.0/', b'')
+          for index in range(self._NUMBER_OF_FILES):
+            archive.writestr(
+                'test-1.0/src{0:d}/file{1:d}'.format(index % 4, index),
+                '{0:d}'.format(index).encode('utf-8'))
+
+          archive.writestr('other/file', b'')
+
+        directory_name = source_helper_object._CreateFromZip('test-1.0.zip')
+        self._CheckSourceDirectory(directory_name)
+
+    finally:
+      os.chdir(current_working_directory)
+
+  def testCreateFromZipWithUnsafeNames(self):
+    """Tests the _CreateFromZip function with unsafe member names."""
+    source_helper_object = self._CreateSourcePackageHelper()
+
+    current_working_directory = os.getcwd()
+
+    try:
+      with test_lib.TempDirectory() as temporary_directory:
+        extraction_directory = os.path.join(temporary_directory, 'extract')
+        os.mkdir(extraction_directory)
+        os.chdir(extraction_directory)
+
+        with zipfile.ZipFile('test-1.0.zip', 'w') as archive:
+          archive.writestr('test-1.0/file', b'data')
+          archive.writestr('test-1.0/../../escaped_dir/file.txt', b'data')
+          archive.writestr('test-1.0/../escaped_file.txt', b'data')
+          archive.writestr('C:/escaped_drive/file.txt', b'data')
+
+        directory_name = source_helper_object._CreateFromZip('test-1.0.zip')
+        self.assertEqual(directory_name, 'test-1.0')
+        self.assertTrue(os.path.isfile(os.path.join('test-1.0', 'file')))
+
+        self.assertFalse(os.path.exists(
+            os.path.join(temporary_directory, 'escaped_dir')))
+        self.assertFalse(os.path.exists('escaped_dir'))
+        self.assertFalse(os.path.exists('escaped_file.txt'))
+        self.assertFalse(os.path.exists('C:'))
+
+    finally:
+      os.chdir(current_working_directory)
 
 
 if __name__ == '__main__':
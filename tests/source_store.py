@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the content-addressed store of source packages."""
+
+from __future__ import unicode_literals
+
+import os
+import stat
+import unittest
+
+from l2tdevtools import source_store
+
+from tests import test_lib
+
+
+class SourceStoreTest(test_lib.BaseTestCase):
+  """Tests for the source store."""
+
+  # pylint: disable=protected-access
+
+  _PROJECT_NAME = 'dfvfs'
+
+  def _CreateSourcePackage(self, directory, project_version):
+    """Creates a source package for testing.
+
+    Args:
+      directory (str): path of the directory to create the source package in.
+      project_version (str): version of the project.
+
+    Returns:
+      str: path of the source package.
+    """
+    path = os.path.join(directory, '{0:s}-{1:s}.tar.gz'.format(
+        self._PROJECT_NAME, project_version))
+    with open(path, 'wb') as file_object:
+      file_object.write(project_version.encode('utf-8'))
+
+    return path
+
+  def testAddFileAndGetFile(self):
+    """Tests the AddFile and GetFile functions."""
+    with test_lib.TempDirectory() as temporary_directory:
+      store_path = os.path.join(temporary_directory, 'store')
+      test_store = source_store.SourceStore(store_path)
+
+      path = test_store.GetFile(self._PROJECT_NAME, '20180831')
+      self.assertIsNone(path)
+
+      source_path = self._CreateSourcePackage(temporary_directory, '20180831')
+      stored_path = test_store.AddFile(
+          self._PROJECT_NAME, '20180831', source_path)
+      self.assertIsNotNone(stored_path)
+      self.assertTrue(stored_path.startswith(store_path))
+
+      path = test_store.GetFile(self._PROJECT_NAME, '20180831')
+      self.assertEqual(path, stored_path)
+
+      self.assertFalse(os.stat(stored_path).st_mode & stat.S_IWUSR)
+      self.assertTrue(os.stat(source_path).st_mode & stat.S_IWUSR)
+
+  def testGetFileVerified(self):
+    """Tests that GetFile only verifies an unchanged source package once."""
+    with test_lib.TempDirectory() as temporary_directory:
+      test_store = source_store.SourceStore(
+          os.path.join(temporary_directory, 'store'))
+
+      source_path = self._CreateSourcePackage(temporary_directory, '20180831')
+      stored_path = test_store.AddFile(
+          self._PROJECT_NAME, '20180831', source_path)
+
+      calculated_paths = []
+      calculate_sha256 = test_store._CalculateSHA256
+
+      def _CalculateSHA256(path):
+        calculated_paths.append(path)
+        return calculate_sha256(path)
+
+      test_store._CalculateSHA256 = _CalculateSHA256
+
+      path = test_store.GetFile(self._PROJECT_NAME, '20180831')
+      self.assertEqual(path, stored_path)
+      self.assertEqual(calculated_paths, [])
+
+      os.utime(stored_path, (0, 0))
+
+      path = test_store.GetFile(self._PROJECT_NAME, '20180831')
+      self.assertEqual(path, stored_path)
+      self.assertEqual(calculated_paths, [stored_path])
+
+      path = test_store.GetFile(self._PROJECT_NAME, '20180831')
+      self.assertEqual(path, stored_path)
+      self.assertEqual(calculated_paths, [stored_path])
+
+  def testGetFileCorrupt(self):
+    """Tests the GetFile function with a corrupt source package."""
+    with test_lib.TempDirectory() as temporary_directory:
+      test_store = source_store.SourceStore(
+          os.path.join(temporary_directory, 'store'))
+
+      source_path = self._CreateSourcePackage(temporary_directory, '20180831')
+      stored_path = test_store.AddFile(
+          self._PROJECT_NAME, '20180831', source_path)
+
+      os.chmod(stored_path, stat.S_IRUSR | stat.S_IWUSR)
+      with open(stored_path, 'wb') as file_object:
+        file_object.write(b'corrupt')
+
+      path = test_store.GetFile(self._PROJECT_NAME, '20180831')
+      self.assertIsNone(path)
+      self.assertFalse(os.path.exists(stored_path))
+
+  def testLinkFile(self):
+    """Tests the LinkFile function."""
+    with test_lib.TempDirectory() as temporary_directory:
+      test_store = source_store.SourceStore(
+          os.path.join(temporary_directory, 'store'))
+
+      source_path = self._CreateSourcePackage(temporary_directory, '20180831')
+      test_store.AddFile(self._PROJECT_NAME, '20180831', source_path)
+
+      build_directory = os.path.join(temporary_directory, 'build')
+      os.mkdir(build_directory)
+
+      path = test_store.LinkFile(
+          self._PROJECT_NAME, '20180831', directory=build_directory)
+      self.assertEqual(path, os.path.join(
+          build_directory, 'dfvfs-20180831.tar.gz'))
+
+      with open(path, 'rb') as file_object:
+        self.assertEqual(file_object.read(), b'20180831')
+
+      path = test_store.LinkFile(
+          self._PROJECT_NAME, '20180901', directory=build_directory)
+      self.assertIsNone(path)
+
+  def testCollectGarbage(self):
+    """Tests the CollectGarbage function."""
+    with test_lib.TempDirectory() as temporary_directory:
+      store_path = os.path.join(temporary_directory, 'store')
+      test_store = source_store.SourceStore(store_path)
+
+      for modification_time, project_version in enumerate([
+          '20180829', '20180830', '20180831']):
+        source_path = self._CreateSourcePackage(
+            temporary_directory, project_version)
+        test_store.AddFile(self._PROJECT_NAME, project_version, source_path)
+
+        version_path = os.path.join(
+            store_path, self._PROJECT_NAME, project_version)
+        os.utime(version_path, (modification_time, modification_time))
+
+      number_of_removed_versions = test_store.CollectGarbage(
+          maximum_number_of_versions=2)
+      self.assertEqual(number_of_removed_versions, 1)
+
+      self.assertIsNone(test_store.GetFile(self._PROJECT_NAME, '20180829'))
+      self.assertIsNotNone(test_store.GetFile(self._PROJECT_NAME, '20180830'))
+      self.assertIsNotNone(test_store.GetFile(self._PROJECT_NAME, '20180831'))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the templates shared by the generators."""
+
+from __future__ import unicode_literals
+
+import io
+import os
+import unittest
+
+from l2tdevtools import templates
+
+from tests import test_lib
+
+
+class TemplateTest(test_lib.BaseTestCase):
+  """Tests for the template."""
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    template = templates.Template(
+        'control', 'Source: {source_name}\nX: {{literal}} {values[0]}\n')
+    self.assertEqual(
+        template.placeholders, frozenset(['source_name', 'values']))
+
+    template = templates.Template(
+        'setup.py', 'name=$name ${version} $$escaped\n',
+        style=templates.Template.STYLE_STRING)
+    self.assertEqual(template.placeholders, frozenset(['name', 'version']))
+
+    with self.assertRaises(ValueError):
+      templates.Template('control', 'Source: {source_name\n')
+
+    with self.assertRaises(ValueError):
+      templates.Template('control', 'Source: {}\n')
+
+    with self.assertRaises(ValueError):
+      templates.Template(
+          'setup.py', 'name=$1\n', style=templates.Template.STYLE_STRING)
+
+    with self.assertRaises(ValueError):
+      templates.Template('control', 'Source\n', style='bogus')
+
+  def testRender(self):
+    """Tests the Render function."""
+    template = templates.Template('control', 'Source: {source_name} {{x}}\n')
+
+    data = template.Render({'source_name': 'dfvfs', 'unused': 'value'})
+    self.assertEqual(data, 'Source: dfvfs {x}\n')
+
+    with self.assertRaises(KeyError):
+      template.Render({})
+
+    template = templates.Template(
+        'setup.py', 'name=$name $$x\n', style=templates.Template.STYLE_STRING)
+
+    data = template.Render({'name': 'dfvfs'})
+    self.assertEqual(data, 'name=dfvfs $x\n')
+
+    with self.assertRaises(KeyError):
+      template.Render(None)
+
+
+class TemplateRegistryTest(test_lib.BaseTestCase):
+  """Tests for the template registry."""
+
+  def testGetTemplate(self):
+    """Tests the GetTemplate function."""
+    with test_lib.TempDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'control')
+      with io.open(path, 'wb') as file_object:
+        file_object.write('Source: {source_name} é\n'.encode('utf-8'))
+
+      try:
+        template = templates.TemplateRegistry.GetTemplate(path)
+        self.assertEqual(template.placeholders, frozenset(['source_name']))
+        self.assertEqual(template.template_data, 'Source: {source_name} é\n')
+
+        os.remove(path)
+
+        # The template is not read again.
+        cached_template = templates.TemplateRegistry.GetTemplate(path)
+        self.assertIs(cached_template, template)
+
+        cached_template = templates.TemplateRegistry.GetTemplate(
+            path, style=templates.Template.STYLE_FORMAT)
+        self.assertIs(cached_template, template)
+
+        with self.assertRaises(IOError):
+          templates.TemplateRegistry.GetTemplate(
+              path, style=templates.Template.STYLE_STRING)
+
+      finally:
+        templates.TemplateRegistry.ClearTemplates()
+
+
+class TemplatesFunctionsTest(test_lib.BaseTestCase):
+  """Tests for the template functions."""
+
+  def testWriteFileIfChanged(self):
+    """Tests the WriteFileIfChanged function."""
+    with test_lib.TempDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'rules')
+
+      result = templates.WriteFileIfChanged(path, b'data\n')
+      self.assertTrue(result)
+
+      os.utime(path, (0, 0))
+
+      result = templates.WriteFileIfChanged(path, b'data\n')
+      self.assertFalse(result)
+      self.assertEqual(os.stat(path).st_mtime, 0)
+
+      result = templates.WriteFileIfChanged(path, b'date\n')
+      self.assertTrue(result)
+      self.assertNotEqual(os.stat(path).st_mtime, 0)
+
+      with io.open(path, 'rb') as file_object:
+        self.assertEqual(file_object.read(), b'date\n')
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the parallel test runner."""
+
+from __future__ import unicode_literals
+
+import io
+import os
+import signal
+import unittest
+
+try:
+  from StringIO import StringIO
+except ImportError:
+  from io import StringIO  # pylint: disable=ungrouped-imports
+
+from l2tdevtools import test_runner
+
+from tests import test_lib
+
+
+class ParallelTestRunnerTest(test_lib.BaseTestCase):
+  """Tests for the parallel test runner."""
+
+  # pylint: disable=protected-access
+
+  _TEST_MODULE = '\n'.join([
+      'import unittest',
+      '',
+      '',
+      'class {0:s}Test(unittest.TestCase):',
+      '',
+      '  def testPass(self):',
+      '    self.assertTrue(True)',
+      '',
+      '  def testFail(self):',
+      '    self.assertTrue({1!s})',
+      ''])
+
+  _KILL_TEST_MODULE = '\n'.join([
+      'import os',
+      'import signal',
+      'import unittest',
+      '',
+      '',
+      'class KillTest(unittest.TestCase):',
+      '',
+      '  def testKill(self):',
+      '    os.kill(os.getpid(), signal.SIGKILL)',
+      ''])
+
+  def _CreateTestModules(self, directory):
+    """Creates test modules for testing.
+
+    Args:
+      directory (str): path of the directory to create the test modules in.
+    """
+    for module_name, class_name, fail_result in (
+        ('parallel_runner_first', 'First', True),
+        ('parallel_runner_second', 'Second', False),
+        ('parallel_runner_third', 'Third', True)):
+      path = os.path.join(directory, '{0:s}.py'.format(module_name))
+      with io.open(path, 'w', encoding='utf-8') as file_object:
+        file_object.write(self._TEST_MODULE.format(class_name, fail_result))
+
+  def testRun(self):
+    """Tests the Run function."""
+    with test_lib.TempDirectory() as temporary_directory:
+      self._CreateTestModules(temporary_directory)
+
+      for number_of_jobs in (1, 2):
+        output_writer = StringIO()
+        parallel_test_runner = test_runner.ParallelTestRunner(
+            number_of_jobs=number_of_jobs, number_of_slowest_tests=2,
+            output_writer=output_writer)
+
+        result = parallel_test_runner.Run(
+            start_directory=temporary_directory, pattern='parallel_runner_*.py')
+        self.assertFalse(result)
+
+        output = output_writer.getvalue()
+        self.assertIn('Ran 6 tests from 3 modules', output)
+        self.assertIn('FAILED (failures=1)', output)
+        self.assertIn('SecondTest', output)
+        self.assertIn('Slowest tests:', output)
+
+        slowest_tests = output.split('Slowest tests:\n')[1].split('\n\n')[0]
+        self.assertEqual(len(slowest_tests.split('\n')), 2)
+
+  def testRunWithSystemExit(self):
+    """Tests the Run function with a test module that exits on import."""
+    with test_lib.TempDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'exit_runner_test.py')
+      with io.open(path, 'w', encoding='utf-8') as file_object:
+        file_object.write('import sys\n\nsys.exit(1)\n')
+
+      output_writer = StringIO()
+      parallel_test_runner = test_runner.ParallelTestRunner(
+          output_writer=output_writer)
+
+      result = parallel_test_runner.Run(
+          start_directory=temporary_directory, pattern='exit_runner_*.py')
+      self.assertFalse(result)
+
+      output = output_writer.getvalue()
+      self.assertIn('Unable to run tests of: exit_runner_test', output)
+
+  def testRunTestModuleWithKeyboardInterrupt(self):
+    """Tests the _RunTestModule function with a keyboard interrupt."""
+    with test_lib.TempDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'interrupt_runner_test.py')
+      with io.open(path, 'w', encoding='utf-8') as file_object:
+        file_object.write('raise KeyboardInterrupt()\n')
+
+      with self.assertRaises(KeyboardInterrupt):
+        test_runner._RunTestModule(
+            temporary_directory, 'interrupt_runner_test', 1)
+
+  @unittest.skipUnless(hasattr(signal, 'SIGKILL'), 'requires SIGKILL')
+  def testRunWithTerminatedWorker(self):
+    """Tests the Run function with a worker process that is terminated."""
+    with test_lib.TempDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'kill_runner_pass.py')
+      with io.open(path, 'w', encoding='utf-8') as file_object:
+        file_object.write(self._TEST_MODULE.format('Pass', True))
+
+      path = os.path.join(temporary_directory, 'kill_runner_kill.py')
+      with io.open(path, 'w', encoding='utf-8') as file_object:
+        file_object.write(self._KILL_TEST_MODULE)
+
+      output_writer = StringIO()
+      parallel_test_runner = test_runner.ParallelTestRunner(
+          number_of_jobs=2, output_writer=output_writer)
+
+      result = parallel_test_runner.Run(
+          start_directory=temporary_directory, pattern='kill_runner_*.py')
+      self.assertFalse(result)
+
+      output = output_writer.getvalue()
+      self.assertIn('Unable to run tests of: kill_runner_kill', output)
+      self.assertIn('Ran 2 tests from 2 modules', output)
+      self.assertIn('FAILED (errors=1)', output)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the tracing of the phases of builds."""
+
+from __future__ import unicode_literals
+
+import io
+import json
+import os
+import unittest
+
+from l2tdevtools import tracing
+
+from tests import test_lib
+
+
+class TracerTest(test_lib.BaseTestCase):
+  """Tests for the tracer."""
+
+  def testStartSpan(self):
+    """Tests the StartSpan function."""
+    tracer = tracing.Tracer()
+
+    with tracer.StartSpan('project', project='dfvfs', target='dpkg'):
+      with tracer.StartSpan('extract', distribution=None):
+        pass
+
+    spans = tracer.GetSpans()
+    self.assertEqual(len(spans), 2)
+
+    span = spans[0]
+    self.assertEqual(span.name, 'extract')
+    self.assertEqual(span.attributes, {'project': 'dfvfs', 'target': 'dpkg'})
+    self.assertIsNotNone(span.cpu_time)
+    self.assertIsNotNone(span.start_time)
+    self.assertIsNotNone(span.wall_time)
+    self.assertEqual(span.process_identifier, os.getpid())
+
+    span = spans[1]
+    self.assertEqual(span.name, 'project')
+    self.assertGreaterEqual(span.wall_time, spans[0].wall_time)
+
+  def testGetSpansFromTraceFile(self):
+    """Tests the GetSpans function with a trace file."""
+    with test_lib.TempDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'trace.jsonl')
+      tracer = tracing.Tracer(path)
+
+      with tracer.StartSpan('project', project='dfvfs'):
+        with tracer.StartSpan('build'):
+          pass
+
+      other_tracer = tracing.Tracer(path)
+      with other_tracer.StartSpan('project', project='plaso'):
+        pass
+
+      with io.open(path, 'r', encoding='utf-8') as file_object:
+        lines = file_object.readlines()
+
+      self.assertEqual(len(lines), 3)
+
+      spans = tracer.GetSpans()
+      self.assertEqual(len(spans), 3)
+      self.assertEqual(
+          [span.name for span in spans], ['project', 'build', 'project'])
+      self.assertEqual(spans[1].attributes, {'project': 'dfvfs'})
+
+
+class TracingFunctionsTest(test_lib.BaseTestCase):
+  """Tests for the tracing functions."""
+
+  def testStartSpan(self):
+    """Tests the StartSpan function."""
+    with tracing.StartSpan('build') as span:
+      self.assertIsNone(span)
+
+    tracer = tracing.Tracer()
+    tracing.SetTracer(tracer)
+
+    try:
+      with tracing.StartSpan('build') as span:
+        self.assertIsNotNone(span)
+
+    finally:
+      tracing.SetTracer(None)
+
+    self.assertEqual(len(tracer.GetSpans()), 1)
+
+  def testWriteChromeTrace(self):
+    """Tests the WriteChromeTrace function."""
+    tracer = tracing.Tracer()
+    with tracer.StartSpan('project', project='dfvfs', target='dpkg'):
+      pass
+
+    with test_lib.TempDirectory() as temporary_directory:
+      path = os.path.join(temporary_directory, 'trace.json')
+      result = tracing.WriteChromeTrace(tracer.GetSpans(), path)
+      self.assertTrue(result)
+
+      with io.open(path, 'r', encoding='utf-8') as file_object:
+        trace = json.load(file_object)
+
+    trace_events = trace['traceEvents']
+    self.assertEqual(len(trace_events), 1)
+
+    trace_event = trace_events[0]
+    self.assertEqual(trace_event['name'], 'project')
+    self.assertEqual(trace_event['cat'], 'dpkg')
+    self.assertEqual(trace_event['ph'], 'X')
+    self.assertEqual(trace_event['pid'], os.getpid())
+    self.assertEqual(trace_event['args']['project'], 'dfvfs')
+
+
+if __name__ == '__main__':
+  unittest.main()
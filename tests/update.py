@@ -13,6 +13,51 @@ from tools import update
 from tests import test_lib
 
 
+class TestDownloadHelper(object):
+  """Download helper for testing."""
+
+  _PACKAGE_DOWNLOAD_URLS = [
+      'https://github.com/log2timeline/l2tbinaries/raw/master/win32/'
+      '{0:s}-20180510.1.win32.msi'.format(name)
+      for name in ('dfvfs', 'missing')]
+
+  def DownloadFile(self, download_url):
+    """Downloads a file from the URL and returns the filename.
+
+    Args:
+      download_url (str): URL where to download the file.
+
+    Returns:
+      str: filename if successful or None if not available.
+    """
+    _, _, filename = download_url.rpartition('/')
+    if filename.startswith('missing'):
+      return None
+
+    with open(filename, 'wb') as file_object:
+      file_object.write(b'data')
+
+    return filename
+
+  # pylint: disable=unused-argument
+  def GetPackageDownloadURLs(
+      self, preferred_machine_type=None, preferred_operating_system=None,
+      use_api=False):
+    """Retrieves the package download URLs for a given system configuration.
+
+    Args:
+      preferred_machine_type (Optional[str]): preferred machine type, where
+          None, which will auto-detect the current machine type.
+      preferred_operating_system (Optional[str]): preferred operating system,
+          where None, which will auto-detect the current operating system.
+      use_api (Optional[bool]): True if the GitHub API should be used.
+
+    Returns:
+      list[str]: download URLs of the packages.
+    """
+    return self._PACKAGE_DOWNLOAD_URLS
+
+
 @unittest.skipIf(
     os.environ.get('TRAVIS_OS_NAME') == 'osx',
     'TLS 1.2 not supported by macOS on Travis')
@@ -88,6 +133,60 @@ class DependencyUpdaterTest(test_lib.BaseTestCase):
           package_versions.get(self._PROJECT_NAME, None),
           [self._PROJECT_VERSION, '1'])
 
+  def testGetPackageFilenamesAndVersionsWithFailedDownload(self):
+    """Tests the GetPackageFilenamesAndVersions function with a failure."""
+    current_working_directory = os.getcwd()
+
+    try:
+      with test_lib.TempDirectory() as temporary_directory:
+        dependency_updater = update.DependencyUpdater(
+            download_directory=os.path.join(temporary_directory, 'build'),
+            preferred_machine_type='x86', preferred_operating_system='Windows')
+        dependency_updater._download_helper = TestDownloadHelper()
+
+        package_filenames, package_versions = (
+            dependency_updater._GetPackageFilenamesAndVersions([]))
+
+    finally:
+      os.chdir(current_working_directory)
+
+    self.assertEqual(package_filenames, {
+        self._PROJECT_NAME: 'dfvfs-20180510.1.win32.msi'})
+    self.assertEqual(package_versions, {
+        self._PROJECT_NAME: [self._PROJECT_VERSION, '1']})
+
+  def testDownloadPackages(self):
+    """Tests the _DownloadPackages function."""
+    dependency_updater = update.DependencyUpdater(download_jobs=2)
+    dependency_updater._download_helper = TestDownloadHelper()
+
+    download_urls = [
+        'https://github.com/log2timeline/l2tbinaries/raw/master/win32/'
+        '{0:s}.win32.msi'.format(name) for name in ('dfvfs', 'plaso', 'six')]
+
+    current_working_directory = os.getcwd()
+
+    try:
+      with test_lib.TempDirectory() as temporary_directory:
+        os.chdir(temporary_directory)
+
+        result = dependency_updater._DownloadPackages(download_urls)
+        self.assertTrue(result)
+
+        filenames = sorted(os.listdir(temporary_directory))
+        self.assertEqual(filenames, [
+            'dfvfs.win32.msi', 'plaso.win32.msi', 'six.win32.msi'])
+
+        download_urls.append(
+            'https://github.com/log2timeline/l2tbinaries/raw/master/win32/'
+            'missing.win32.msi')
+
+        result = dependency_updater._DownloadPackages(download_urls)
+        self.assertFalse(result)
+
+    finally:
+      os.chdir(current_working_directory)
+
 
 if __name__ == '__main__':
   unittest.main()
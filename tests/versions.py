@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the functions to handle package versions."""
+
+from __future__ import unicode_literals
+
+import unittest
+
+from l2tdevtools import projects
+from l2tdevtools import versions
+
+from tests import test_lib
+
+
+class VersionsTest(test_lib.BaseTestCase):
+  """Tests for the functions to handle package versions."""
+
+  def testCompareVersions(self):
+    """Tests the CompareVersions function."""
+    result = versions.CompareVersions(['1', '10'], ['1', '9'])
+    self.assertEqual(result, 1)
+
+    result = versions.CompareVersions(['1', '0'], ['1', '0', '1'])
+    self.assertEqual(result, -1)
+
+    result = versions.CompareVersions(['20180101'], ['20180101'])
+    self.assertEqual(result, 0)
+
+  def testFilterVersions(self):
+    """Tests the FilterVersions function."""
+    version_strings = ['1.0', '1.2', '1.10', '2.0', '2.1']
+
+    version_definition = projects.ProjectVersionDefinition('>=1.2,<2.1')
+    filtered_versions = versions.FilterVersions(
+        version_strings, version_definition)
+    self.assertEqual(filtered_versions, ['1.2', '1.10', '2.0'])
+
+    version_definition = projects.ProjectVersionDefinition('>1.2,<=2.1')
+    filtered_versions = versions.FilterVersions(
+        version_strings, version_definition)
+    self.assertEqual(filtered_versions, ['1.10', '2.0', '2.1'])
+
+    filtered_versions = versions.FilterVersions(version_strings, None)
+    self.assertEqual(filtered_versions, version_strings)
+
+  def testGetLatestVersion(self):
+    """Tests the GetLatestVersion function."""
+    latest_version = versions.GetLatestVersion(['1.9', '1.10', '1.2'])
+    self.assertEqual(latest_version, '1.10')
+
+    version_definition = projects.ProjectVersionDefinition('<1.10')
+    latest_version = versions.GetLatestVersion(
+        ['1.9', '1.10', '1.2'], version_definition=version_definition)
+    self.assertEqual(latest_version, '1.9')
+
+    latest_version = versions.GetLatestVersion([])
+    self.assertIsNone(latest_version)
+
+  def testGetVersionKey(self):
+    """Tests the GetVersionKey function."""
+    version_key = versions.GetVersionKey('1.2.3')
+    self.assertEqual(hash(version_key), hash(versions.GetVersionKey('1.2.3')))
+
+    self.assertEqual(
+        versions.GetVersionKey('1.0rc1'), versions.GetVersionKey('1.0.rc1'))
+
+    self.assertLess(
+        versions.GetVersionKey('1.9'), versions.GetVersionKey('1.10'))
+    self.assertLess(
+        versions.GetVersionKey('1.0'), versions.GetVersionKey('1.0.0'))
+    self.assertLess(
+        versions.GetVersionKey('1.0.0-rc1'), versions.GetVersionKey('1.0.0'))
+    self.assertLess(
+        versions.GetVersionKey('2.0'), versions.GetVersionKey('1!1.0'))
+    self.assertLess(
+        versions.GetVersionKey('2.0'), versions.GetVersionKey('1:1.0'))
+
+  def testIsPreRelease(self):
+    """Tests the IsPreRelease function."""
+    self.assertFalse(versions.IsPreRelease('1.0'))
+    self.assertFalse(versions.IsPreRelease('1.0.post1'))
+    self.assertFalse(versions.IsPreRelease('20180831'))
+    self.assertTrue(versions.IsPreRelease('2.0rc1'))
+    self.assertTrue(versions.IsPreRelease('2.0b2'))
+    self.assertTrue(versions.IsPreRelease('2.0a1'))
+    self.assertTrue(versions.IsPreRelease('2.0.dev3'))
+
+  def testIsVersionInRange(self):
+    """Tests the IsVersionInRange function."""
+    result = versions.IsVersionInRange('1.2')
+    self.assertTrue(result)
+
+    result = versions.IsVersionInRange(
+        '1.2', earliest_version=['>=', '1', '2'])
+    self.assertTrue(result)
+
+    result = versions.IsVersionInRange('1.2', earliest_version=['>', '1', '2'])
+    self.assertFalse(result)
+
+    result = versions.IsVersionInRange('1.2', latest_version=['<', '1', '10'])
+    self.assertTrue(result)
+
+    result = versions.IsVersionInRange(
+        '1.2', earliest_version=['==', '1', '2'])
+    self.assertTrue(result)
+
+  def testSortVersions(self):
+    """Tests the SortVersions function."""
+    version_strings = [
+        '1.1', '1.0.1', '1.0.post1', '1.0', '1.0rc1', '1.0b1', '1.0a1',
+        '1.0.dev1', '1!0.1']
+
+    sorted_versions = versions.SortVersions(version_strings)
+    self.assertEqual(sorted_versions, [
+        '1.0.dev1', '1.0a1', '1.0b1', '1.0rc1', '1.0', '1.0.post1', '1.0.1',
+        '1.1', '1!0.1'])
+
+    sorted_versions = versions.SortVersions(version_strings, reverse=True)
+    self.assertEqual(sorted_versions[0], '1!0.1')
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script to benchmark the comparison of package versions.
+
+The benchmark determines the latest version per package and sorts the
+versions per package of a synthetic repository, such as done for the COPR,
+GitHub and Launchpad repositories by manage.py, with the pairwise comparison
+of version parts that was used before the version keys and with the version
+keys.
+"""
+
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import functools
+import random
+import sys
+import time
+
+from l2tdevtools import versions
+
+
+def _LegacyCompareVersions(first_version_list, second_version_list):
+  """Compares two lists containing version parts as done previously.
+
+  Args:
+    first_version_list (list[str]): first version parts.
+    second_version_list (list[str]): second version parts.
+
+  Returns:
+    int: 1 if the first is larger than the second, -1 if the first is smaller
+        than the second, or 0 if the first and second are equal.
+  """
+  first_version_list_length = len(first_version_list)
+  second_version_list_length = len(second_version_list)
+
+  for index in range(0, first_version_list_length):
+    if index >= second_version_list_length:
+      return 1
+
+    try:
+      first_version_part = int(first_version_list[index], 10)
+      second_version_part = int(second_version_list[index], 10)
+    except ValueError:
+      first_version_part = first_version_list[index]
+      second_version_part = second_version_list[index]
+
+    if first_version_part > second_version_part:
+      return 1
+    elif first_version_part < second_version_part:
+      return -1
+
+  if first_version_list_length < second_version_list_length:
+    return -1
+
+  return 0
+
+
+def _GetVersionsPerPackage(entries):
+  """Groups the versions of the entries per package.
+
+  Args:
+    entries (list[tuple[str, str]]): package names and versions.
+
+  Returns:
+    dict[str, list[str]]: versions per package name.
+  """
+  versions_per_package = {}
+  for package_name, package_version in entries:
+    versions_per_package.setdefault(package_name, []).append(package_version)
+
+  return versions_per_package
+
+
+def CreateRepositoryEntries(number_of_entries, number_of_packages):
+  """Creates the entries of a synthetic repository.
+
+  Args:
+    number_of_entries (int): number of entries.
+    number_of_packages (int): number of distinct packages.
+
+  Returns:
+    list[tuple[str, str]]: package names and versions.
+  """
+  random_generator = random.Random(0)
+
+  entries = []
+  for _ in range(number_of_entries):
+    package_name = 'package{0:d}'.format(
+        random_generator.randint(0, number_of_packages - 1))
+
+    if random_generator.random() < 0.5:
+      # Date based versions, such as used by libyal.
+      package_version = '2018{0:02d}{1:02d}'.format(
+          random_generator.randint(1, 12), random_generator.randint(1, 28))
+    else:
+      package_version = '{0:d}.{1:d}.{2:d}'.format(
+          random_generator.randint(0, 3), random_generator.randint(0, 20),
+          random_generator.randint(0, 20))
+
+    entries.append((package_name, package_version))
+
+  return entries
+
+
+def GetLatestVersionsWithKeys(entries):
+  """Determines the latest version per package with the version keys.
+
+  Args:
+    entries (list[tuple[str, str]]): package names and versions.
+
+  Returns:
+    dict[str, str]: latest version per package name.
+  """
+  return {
+      package_name: versions.GetLatestVersion(package_versions)
+      for package_name, package_versions in _GetVersionsPerPackage(
+          entries).items()}
+
+
+def GetLatestVersionsWithLegacyComparison(entries):
+  """Determines the latest version per package with pairwise comparisons.
+
+  Args:
+    entries (list[tuple[str, str]]): package names and versions.
+
+  Returns:
+    dict[str, str]: latest version per package name.
+  """
+  packages = {}
+  for package_name, package_version in entries:
+    if package_name in packages:
+      compare_result = _LegacyCompareVersions(
+          package_version.split('.'), packages[package_name].split('.'))
+      if compare_result < 0:
+        continue
+
+    packages[package_name] = package_version
+
+  return packages
+
+
+def SortVersionsWithKeys(entries):
+  """Sorts the versions per package with the version keys.
+
+  Args:
+    entries (list[tuple[str, str]]): package names and versions.
+
+  Returns:
+    dict[str, list[str]]: sorted versions per package name.
+  """
+  return {
+      package_name: versions.SortVersions(package_versions)
+      for package_name, package_versions in _GetVersionsPerPackage(
+          entries).items()}
+
+
+def SortVersionsWithLegacyComparison(entries):
+  """Sorts the versions per package with pairwise comparisons.
+
+  Args:
+    entries (list[tuple[str, str]]): package names and versions.
+
+  Returns:
+    dict[str, list[str]]: sorted versions per package name.
+  """
+  sort_key = functools.cmp_to_key(
+      lambda first, second: _LegacyCompareVersions(
+          first.split('.'), second.split('.')))
+
+  return {
+      package_name: sorted(package_versions, key=sort_key)
+      for package_name, package_versions in _GetVersionsPerPackage(
+          entries).items()}
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Benchmarks the comparison of package versions.'))
+
+  argument_parser.add_argument(
+      '--entries', dest='number_of_entries', type=int, action='store',
+      metavar='NUMBER', default=20000, help=(
+          'number of entries in the synthetic repository.'))
+
+  argument_parser.add_argument(
+      '--packages', dest='number_of_packages', type=int, action='store',
+      metavar='NUMBER', default=200, help=(
+          'number of distinct packages in the synthetic repository.'))
+
+  argument_parser.add_argument(
+      '--runs', dest='number_of_runs', type=int, action='store',
+      metavar='NUMBER', default=5, help='number of runs per benchmark.')
+
+  options = argument_parser.parse_args()
+
+  if (options.number_of_entries < 1 or options.number_of_packages < 1 or
+      options.number_of_runs < 1):
+    print('Number of entries, packages and runs must be 1 or more.')
+    print('')
+    argument_parser.print_help()
+    print('')
+    return False
+
+  entries = CreateRepositoryEntries(
+      options.number_of_entries, options.number_of_packages)
+
+  benchmarks = [
+      ('latest: pairwise comparison', GetLatestVersionsWithLegacyComparison,
+       False),
+      ('latest: version keys (cold)', GetLatestVersionsWithKeys, True),
+      ('latest: version keys (warm)', GetLatestVersionsWithKeys, False),
+      ('sort: pairwise comparison', SortVersionsWithLegacyComparison, False),
+      ('sort: version keys (cold)', SortVersionsWithKeys, True),
+      ('sort: version keys (warm)', SortVersionsWithKeys, False)]
+
+  print('Benchmarking {0:d} packages in {1:d} entries, best of {2:d} '
+        'runs:'.format(
+            options.number_of_packages, options.number_of_entries,
+            options.number_of_runs))
+
+  for description, benchmark_function, clear_cache in benchmarks:
+    durations = []
+    for _ in range(options.number_of_runs):
+      if clear_cache:
+        versions.ClearVersionKeyCache()
+
+      start_time = time.time()
+      benchmark_function(entries)
+      durations.append(time.time() - start_time)
+
+    print('{0:s}\t{1:.1f} ms'.format(
+        description.ljust(30), min(durations) * 1000.0))
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -6,17 +6,35 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import argparse
+import functools
 import io
+import json
 import logging
 import os
+import shutil
 import subprocess
 import sys
+import tempfile
+import time
 
+from multiprocessing import pool as multiprocessing_pool
+
+from l2tdevtools import artifact_catalog as artifact_catalog_lib
+from l2tdevtools import build_environment as build_environment_lib
 from l2tdevtools import build_helper
+from l2tdevtools import build_manifest
+from l2tdevtools import build_scheduler
 from l2tdevtools import download_helper
+from l2tdevtools import git_mirror
+from l2tdevtools import http_client
+from l2tdevtools import page_cache as page_cache_lib
 from l2tdevtools import presets
 from l2tdevtools import projects
 from l2tdevtools import source_helper
+from l2tdevtools import source_store as source_store_lib
+from l2tdevtools import tracing
+from l2tdevtools.download_helpers import interface
+from l2tdevtools.download_helpers import pypi
 
 
 # Since os.path.abspath() uses the current working directory (cwd)
@@ -27,6 +45,60 @@ __file__ = os.path.abspath(__file__)
 
 # TODO: look into merging functionality with update script.
 
+class ProjectBuildPlan(object):
+  """Build plan of a project.
+
+  Attributes:
+    artifacts (list[str]): paths of the files the build is expected to
+        produce, relative to the build directory.
+    build_required (bool): True if a build is required.
+    build_target (str): build target.
+    distributions (list[str]): names of the distributions that require
+        a build.
+    download_url (str): download URL of the source package or None if not
+        available.
+    error (str): description of why the plan could not be determined or None.
+    name (str): name of the project.
+    reason (str): reason a build is required or None.
+    version (str): latest version of the project or None if not available.
+  """
+
+  def __init__(self, name, build_target):
+    """Initializes a build plan of a project.
+
+    Args:
+      name (str): name of the project.
+      build_target (str): build target.
+    """
+    super(ProjectBuildPlan, self).__init__()
+    self.artifacts = []
+    self.build_required = False
+    self.build_target = build_target
+    self.distributions = []
+    self.download_url = None
+    self.error = None
+    self.name = name
+    self.reason = None
+    self.version = None
+
+  def CopyToDict(self):
+    """Copies the build plan to a dictionary.
+
+    Returns:
+      dict[str, object]: build plan, which can be serialized as JSON.
+    """
+    return {
+        'artifacts': list(self.artifacts),
+        'build_required': self.build_required,
+        'build_target': self.build_target,
+        'distributions': list(self.distributions),
+        'download_url': self.download_url,
+        'error': self.error,
+        'name': self.name,
+        'reason': self.reason,
+        'version': self.version}
+
+
 class ProjectBuilder(object):
   """Class that helps in building projects."""
 
@@ -34,15 +106,24 @@ class ProjectBuilder(object):
   _DPKG_SOURCE_DISTRIBUTIONS = frozenset([
       'trusty', 'xenial', 'bionic'])
 
-  def __init__(self, build_target):
+  def __init__(self, build_target, build_environment=None, explain=False):
     """Initializes the project builder.
 
     Args:
       build_target (str): build target.
+      build_environment (Optional[BuildEnvironment]): environment of
+          the compiler and make commands or None to use the environment of
+          the process.
+      explain (Optional[bool]): True if the reason why a project is built
+          or skipped should be printed.
     """
     super(ProjectBuilder, self).__init__()
+    self._build_environment = build_environment
     self._build_target = build_target
+    self._explain = explain
     self._l2tdevtools_path = os.path.dirname(os.path.dirname(__file__))
+    self._fingerprinter = build_manifest.BuildFingerprinter(
+        self._l2tdevtools_path)
 
   def _BuildProject(self, download_helper_object, project_definition):
     """Builds a project.
@@ -70,7 +151,10 @@ class ProjectBuilder(object):
       download_url = 'http://{0:s}'.format(download_url[8:])
 
     if self._build_target == 'download':
-      source_filename = source_helper_object.Download()
+      with artifact_catalog_lib.RecordArtifacts(
+          project_name, self._build_target,
+          project_version=source_helper_object.GetProjectVersion()):
+        source_filename = source_helper_object.Download()
 
       # If available run the script post-download.sh after download.
       if os.path.exists('post-download.sh'):
@@ -89,6 +173,8 @@ class ProjectBuilder(object):
           project_definition.name))
       return False
 
+    build_helper_object.build_environment = self._build_environment
+
     build_dependencies = build_helper_object.CheckBuildDependencies()
     if build_dependencies:
       logging.warning(
@@ -97,27 +183,94 @@ class ProjectBuilder(object):
       return False
 
     if self._build_target == 'dpkg-source':
-      distributions = self._DPKG_SOURCE_DISTRIBUTIONS
+      result = self._BuildProjectForDistributions(
+          project_definition, build_helper_object, source_helper_object,
+          sorted(self._DPKG_SOURCE_DISTRIBUTIONS))
     else:
-      distributions = [None]
+      result = self._BuildProjectForDistribution(
+          project_definition, build_helper_object, source_helper_object, None)
 
-    for distribution in distributions:
-      if not self._BuildProjectForDistribution(
-          build_helper_object, source_helper_object, distribution):
-        return False
+    if not result:
+      return False
 
-    if os.path.exists(build_helper_object.LOG_FILENAME):
+    if os.path.exists(build_helper_object.log_filename):
       logging.info('Removing: {0:s}'.format(
-          build_helper_object.LOG_FILENAME))
-      os.remove(build_helper_object.LOG_FILENAME)
+          build_helper_object.log_filename))
+      os.remove(build_helper_object.log_filename)
 
     return True
 
+  def _CreateDownloadHelper(self, project_definition):
+    """Creates a download helper.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+
+    Returns:
+      DownloadHelper: download helper or None if the download URL of
+          the project is not supported.
+    """
+    return download_helper.DownloadHelperFactory.NewDownloadHelper(
+        project_definition.download_url)
+
+  def _CheckFingerprint(
+      self, project_definition, build_helper_object, source_helper_object,
+      distribution, build_required):
+    """Checks if the inputs of a build changed since the last build.
+
+    If the build output exists but the build manifest does not contain
+    a fingerprint of the build, the build output is assumed to be up to date
+    and its fingerprint is added to the build manifest.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+      build_helper_object (BuildHelper): build helper.
+      source_helper_object (SourceHelper): source helper.
+      distribution (str): name of the distribution.
+      build_required (bool): True if the build output is missing.
+
+    Returns:
+      tuple[BuildFingerprint, str]: fingerprint of the build or None if not
+          available and the reason a rebuild is required or None if
+          the inputs did not change.
+    """
+    source_filename = source_helper_object.Download()
+    if not source_filename:
+      return None, None
+
+    with tracing.StartSpan('fingerprint'):
+      fingerprint = self._fingerprinter.GetFingerprint(
+          project_definition, build_helper_object, source_filename,
+          self._build_target)
+
+    if build_required:
+      return fingerprint, None
+
+    build_manifest_object = build_manifest.BuildManifest()
+    previous_fingerprint = build_manifest_object.GetFingerprint(
+        source_helper_object.project_name, self._build_target,
+        distribution=distribution)
+
+    if not previous_fingerprint:
+      build_manifest_object.SetFingerprint(
+          source_helper_object.project_name, self._build_target,
+          fingerprint, distribution=distribution)
+      return fingerprint, None
+
+    changed_inputs = fingerprint.GetChangedInputs(previous_fingerprint)
+    if not changed_inputs:
+      return fingerprint, None
+
+    return fingerprint, 'the inputs changed: {0:s}'.format(
+        ', '.join(changed_inputs))
+
   def _BuildProjectForDistribution(
-      self, build_helper_object, source_helper_object, distribution):
+      self, project_definition, build_helper_object, source_helper_object,
+      distribution):
     """Builds a project for a specific distribution.
 
     Args:
+      project_definition (ProjectDefinition): project definition.
       build_helper_object (BuildHelper): build helper.
       source_helper_object (SourceHelper): source helper.
       distribution (str): name of the distribution.
@@ -128,34 +281,168 @@ class ProjectBuilder(object):
     if distribution:
       build_helper_object.distribution = distribution
 
+    build_required, fingerprint = self._CheckBuildRequired(
+        project_definition, build_helper_object, source_helper_object,
+        distribution)
+
+    with tracing.StartSpan('clean'):
+      build_helper_object.Clean(source_helper_object)
+
+    if not build_required:
+      return True
+
+    with artifact_catalog_lib.RecordArtifacts(
+        source_helper_object.project_name, self._build_target,
+        project_version=source_helper_object.GetProjectVersion(),
+        distribution=distribution,
+        architecture=getattr(build_helper_object, 'architecture', None)):
+      result = build_helper_object.Build(source_helper_object)
+
+    if not result:
+      self._LogBuildFailure(build_helper_object, source_helper_object)
+      return False
+
+    if fingerprint:
+      build_manifest_object = build_manifest.BuildManifest()
+      build_manifest_object.SetFingerprint(
+          source_helper_object.project_name, self._build_target,
+          fingerprint, distribution=distribution)
+
+    return True
+
+  def _BuildProjectForDistributions(
+      self, project_definition, build_helper_object, source_helper_object,
+      distributions):
+    """Builds a project for multiple distributions.
+
+    The build helper builds all the distributions that require a build from
+    a single extraction of the source package and a single generation of
+    the packaging files.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+      build_helper_object (BuildHelper): build helper, which must support
+          BuildDistributions.
+      source_helper_object (SourceHelper): source helper.
+      distributions (list[str]): names of the distributions.
+
+    Returns:
+      bool: True if the builds are successful or False on error.
+    """
+    fingerprints = {}
+    distributions_to_build = []
+    for distribution in distributions:
+      build_helper_object.distribution = distribution
+
+      build_required, fingerprint = self._CheckBuildRequired(
+          project_definition, build_helper_object, source_helper_object,
+          distribution)
+
+      with tracing.StartSpan('clean', distribution=distribution):
+        build_helper_object.Clean(source_helper_object)
+
+      if build_required:
+        distributions_to_build.append(distribution)
+        fingerprints[distribution] = fingerprint
+
+    if not distributions_to_build:
+      return True
+
+    # The distribution is part of the names of the files of the builds.
+    with artifact_catalog_lib.RecordArtifacts(
+        source_helper_object.project_name, self._build_target,
+        project_version=source_helper_object.GetProjectVersion(),
+        architecture=getattr(build_helper_object, 'architecture', None),
+        distributions=distributions_to_build):
+      built_distributions = build_helper_object.BuildDistributions(
+          source_helper_object, distributions_to_build)
+
+    build_manifest_object = build_manifest.BuildManifest()
+    for distribution in built_distributions:
+      fingerprint = fingerprints[distribution]
+      if fingerprint:
+        build_manifest_object.SetFingerprint(
+            source_helper_object.project_name, self._build_target,
+            fingerprint, distribution=distribution)
+
+    if len(built_distributions) != len(distributions_to_build):
+      self._LogBuildFailure(build_helper_object, source_helper_object)
+      return False
+
+    return True
+
+  def _CheckBuildRequired(
+      self, project_definition, build_helper_object, source_helper_object,
+      distribution):
+    """Checks if a build is required.
+
+    If the inputs of the build changed the existing build output is removed.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+      build_helper_object (BuildHelper): build helper.
+      source_helper_object (SourceHelper): source helper.
+      distribution (str): name of the distribution.
+
+    Returns:
+      tuple[bool, BuildFingerprint]: True if a build is required and
+          the fingerprint of the build or None if not available.
+    """
     build_required = build_helper_object.CheckBuildRequired(
         source_helper_object)
 
-    build_helper_object.Clean(source_helper_object)
+    fingerprint, reason = self._CheckFingerprint(
+        project_definition, build_helper_object, source_helper_object,
+        distribution, build_required)
+    if reason:
+      build_required = True
 
-    if not build_required or build_helper_object.Build(source_helper_object):
-      return True
+      # Several build helpers do not build if the build output exists.
+      self._RemoveBuildOutput(build_helper_object, source_helper_object)
+
+    if self._explain:
+      project_name = source_helper_object.project_name
+      if distribution:
+        project_name = '{0:s} ({1:s})'.format(project_name, distribution)
+
+      if build_required:
+        print('Building: {0:s} because {1:s}.'.format(
+            project_name, reason or 'the build output is missing'))
+      else:
+        print('Skipping: {0:s} because it is up to date.'.format(
+            project_name))
+
+    return build_required, fingerprint
 
-    if not os.path.exists(build_helper_object.LOG_FILENAME):
+  def _LogBuildFailure(self, build_helper_object, source_helper_object):
+    """Logs that the build of a project failed.
+
+    Args:
+      build_helper_object (BuildHelper): build helper.
+      source_helper_object (SourceHelper): source helper.
+    """
+    if not os.path.exists(build_helper_object.log_filename):
       logging.warning('Build of: {0:s} failed.'.format(
           source_helper_object.project_name))
     else:
-      log_filename = '{0:s}_{1:s}'.format(
-          source_helper_object.project_name,
-          build_helper_object.LOG_FILENAME)
-
-      # Remove older logfiles if they exists otherwise the rename
-      # fails on Windows.
-      if os.path.exists(log_filename):
-        os.remove(log_filename)
-
-      os.rename(build_helper_object.LOG_FILENAME, log_filename)
+      log_file_path = os.path.abspath(build_helper_object.log_filename)
       logging.warning((
           'Build of: {0:s} failed, for more information check '
           '{1:s}').format(
-              source_helper_object.project_name, log_filename))
+              source_helper_object.project_name, log_file_path))
 
-    return False
+  def _RemoveBuildOutput(self, build_helper_object, source_helper_object):
+    """Removes the output of a previous build.
+
+    Args:
+      build_helper_object (BuildHelper): build helper.
+      source_helper_object (SourceHelper): source helper.
+    """
+    for filename in build_helper_object.GetOutputFilenames(
+        source_helper_object):
+      if os.path.exists(filename):
+        logging.info('Removing: {0:s}'.format(filename))
+        artifact_catalog_lib.RemoveFile(filename)
 
   def Build(self, project_definition):
     """Builds a project.
@@ -169,15 +456,469 @@ class ProjectBuilder(object):
     Raises:
       ValueError: if the project type is unsupported.
     """
-    download_helper_object = (
-        download_helper.DownloadHelperFactory.NewDownloadHelper(
-            project_definition.download_url))
-
+    download_helper_object = self._CreateDownloadHelper(project_definition)
     if not download_helper_object:
       raise ValueError('Unsupported download URL: {0:s}.'.format(
           project_definition.download_url))
 
-    return self._BuildProject(download_helper_object, project_definition)
+    compiler_cache_statistics = None
+    if self._build_environment:
+      compiler_cache_statistics = (
+          self._build_environment.GetCompilerCacheStatistics())
+
+    http_client_object = http_client.GetHTTPClient()
+    http_statistics = http_client_object.GetStatistics()
+
+    with tracing.StartSpan(
+        'project', project=project_definition.name,
+        target=self._build_target) as span:
+      result = self._BuildProject(download_helper_object, project_definition)
+
+      if span:
+        # The statistics are stored in the project span so that the statistics
+        # of the worker processes can be combined in the build summary.
+        project_http_statistics = {}
+        for host, host_statistics in (
+            http_client_object.GetStatistics().items()):
+          previous_statistics = http_statistics.get(host, None)
+          if previous_statistics:
+            host_statistics = host_statistics.GetDifference(
+                previous_statistics)
+
+          if host_statistics.number_of_requests:
+            project_http_statistics[host] = host_statistics.CopyToDict()
+
+        span.attributes['http_statistics'] = project_http_statistics
+
+      if span and compiler_cache_statistics:
+        current_statistics = (
+            self._build_environment.GetCompilerCacheStatistics())
+
+        # The statistics are stored in the project span so that they are
+        # shown in the build summary. Note that the statistics of projects
+        # that are built concurrently include each others compilations.
+        if current_statistics:
+          compiler_cache_statistics = current_statistics.GetDifference(
+              compiler_cache_statistics)
+          span.attributes['compiler_cache_hits'] = (
+              compiler_cache_statistics.hits)
+          span.attributes['compiler_cache_misses'] = (
+              compiler_cache_statistics.misses)
+
+    return result
+
+  def Plan(self, project_definition, build_directory):
+    """Determines the build plan of a project without building it.
+
+    The latest version of the project is resolved and the files the build is
+    expected to produce are compared with the files in the build directory.
+    The source package is not downloaded, hence changes of the other inputs
+    of the build, which are detected by fingerprinting the source package,
+    are not part of the plan.
+
+    Args:
+      project_definition (ProjectDefinition): project definition.
+      build_directory (str): path of the directory in which the project is
+          built.
+
+    Returns:
+      ProjectBuildPlan: build plan.
+    """
+    plan = ProjectBuildPlan(project_definition.name, self._build_target)
+
+    download_helper_object = self._CreateDownloadHelper(project_definition)
+    if not download_helper_object:
+      plan.error = 'unsupported download URL: {0:s}'.format(
+          project_definition.download_url)
+      return plan
+
+    source_helper_object = source_helper.SourcePackageHelper(
+        project_definition.name, project_definition, download_helper_object)
+
+    plan.version = source_helper_object.GetProjectVersion()
+    if not plan.version:
+      plan.error = 'unable to determine the latest version'
+      return plan
+
+    plan.download_url = download_helper_object.GetDownloadURL(
+        project_definition.name, plan.version)
+
+    if self._build_target == 'download':
+      # The download helper does not download source packages that were
+      # already downloaded.
+      plan.build_required = True
+      plan.reason = 'the source package is always checked'
+      return plan
+
+    build_helper_object = build_helper.BuildHelperFactory.NewBuildHelper(
+        project_definition, self._build_target, self._l2tdevtools_path)
+    if not build_helper_object:
+      plan.error = 'unable to determine how to build'
+      return plan
+
+    if self._build_target == 'dpkg-source':
+      distributions = sorted(self._DPKG_SOURCE_DISTRIBUTIONS)
+    else:
+      distributions = [None]
+
+    for distribution in distributions:
+      if distribution:
+        build_helper_object.distribution = distribution
+
+      output_filenames = build_helper_object.GetOutputFilenames(
+          source_helper_object)
+      plan.artifacts.extend(output_filenames)
+
+      # The build helpers check the files in the current working directory,
+      # which cannot be changed per thread.
+      missing_filenames = [
+          filename for filename in output_filenames
+          if not os.path.exists(os.path.join(build_directory, filename))]
+
+      if not output_filenames or missing_filenames:
+        plan.build_required = True
+        if distribution:
+          plan.distributions.append(distribution)
+
+    if plan.build_required:
+      plan.reason = 'the build output is missing'
+
+    return plan
+
+
+# Scripts in the build directory that are run by the build helpers from
+# the current working directory.
+_HOOK_SCRIPTS = frozenset([
+    'post-download.sh', 'post-dpkg.sh', 'post-dpkg-source.sh',
+    'prep-dpkg.sh', 'prep-dpkg-source.sh'])
+
+
+def _BuildProjectInWorkingDirectory(
+    project_builder, build_directory, project_definition):
+  """Builds a project in its own working directory.
+
+  This function is used by the build scheduler to build projects in worker
+  processes. Every project is built in a sub directory of the build directory
+  so that concurrent builds do not interfere with each other.
+
+  Args:
+    project_builder (ProjectBuilder): project builder.
+    build_directory (str): absolute path of the build directory.
+    project_definition (ProjectDefinition): project definition.
+
+  Returns:
+    bool: True if the build is successful or False on error.
+  """
+  working_directory = os.path.join(build_directory, project_definition.name)
+  if not os.path.exists(working_directory):
+    os.mkdir(working_directory)
+
+  for script_name in _HOOK_SCRIPTS:
+    script_path = os.path.join(build_directory, script_name)
+    if os.path.exists(script_path):
+      shutil.copy(script_path, working_directory)
+
+  logging.info('Processing: {0:s} in: {1:s}'.format(
+      project_definition.name, working_directory))
+
+  current_working_directory = os.getcwd()
+  os.chdir(working_directory)
+
+  try:
+    return project_builder.Build(project_definition)
+
+  finally:
+    os.chdir(current_working_directory)
+
+
+def _InitializeWorker(
+    trace_path, artifact_catalog_path=None, git_mirror_cache_path=None,
+    http_timeout=None, page_cache_path=None, page_cache_offline=False,
+    page_cache_time_to_live=page_cache_lib.PageCache.DEFAULT_TIME_TO_LIVE,
+    source_store_path=None):
+  """Initializes a build worker process.
+
+  Args:
+    trace_path (str): path of the JSON lines trace file.
+    artifact_catalog_path (Optional[str]): path of the artifact catalog
+        database file or None if no artifact catalog is used.
+    git_mirror_cache_path (Optional[str]): path of the directory that
+        contains the git mirror cache or None if no git mirror cache is used.
+    http_timeout (Optional[float]): number of seconds after which a HTTP
+        request times out or None to use the default.
+    page_cache_path (Optional[str]): path of the directory that contains
+        the page cache or None if no page cache is used.
+    page_cache_offline (Optional[bool]): True if the page cache should use
+        stale entries instead of downloading or revalidating page content.
+    page_cache_time_to_live (Optional[int]): maximum age of a page cache
+        entry in seconds before it needs to be revalidated.
+    source_store_path (Optional[str]): path of the directory that contains
+        the source store or None if no source store is used.
+  """
+  logging.basicConfig(
+      level=logging.INFO, format='[%(levelname)s] %(message)s')
+
+  if http_timeout:
+    http_client.SetHTTPClient(http_client.HTTPClient(timeout=http_timeout))
+
+  tracing.SetTracer(tracing.Tracer(trace_path))
+
+  if artifact_catalog_path:
+    artifact_catalog_lib.SetArtifactCatalog(
+        artifact_catalog_lib.ArtifactCatalog(artifact_catalog_path))
+
+  if git_mirror_cache_path:
+    source_helper.GitRepositorySourceHelper.SetGitMirrorCache(
+        git_mirror.GitMirrorCache(git_mirror_cache_path))
+
+  if page_cache_path:
+    interface.DownloadHelper.SetPageCache(page_cache_lib.PageCache(
+        page_cache_path, offline=page_cache_offline,
+        time_to_live=page_cache_time_to_live))
+
+  if source_store_path:
+    source_helper.SourcePackageHelper.SetSourceStore(
+        source_store_lib.SourceStore(source_store_path))
+
+
+# The phases of a build that are shown in the build summary.
+_SUMMARY_PHASES = (
+    'download', 'extract', 'generate', 'prepare', 'build', 'finalize')
+
+
+def _PrintBuildSummary(spans):
+  """Prints a summary of the time spent per project and phase.
+
+  Args:
+    spans (list[Span]): spans recorded during the builds.
+  """
+  phase_times = {}
+  project_spans = []
+  for span in spans:
+    key = (
+        span.attributes.get('project', None),
+        span.attributes.get('target', None))
+
+    if span.name == 'project':
+      project_spans.append(span)
+    elif span.name in _SUMMARY_PHASES:
+      phase_times.setdefault(key, {})
+      phase_times[key].setdefault(span.name, 0.0)
+      phase_times[key][span.name] += span.wall_time or 0.0
+
+  if not project_spans:
+    return
+
+  header = '{0:<24s} {1:<12s} {2:>9s} {3:>9s} {4:>14s}'.format(
+      'Project', 'Target', 'Wall (s)', 'CPU (s)', 'Peak RSS (MiB)')
+  for phase in _SUMMARY_PHASES:
+    header = '{0:s} {1:>9s}'.format(header, phase)
+  header = '{0:s} {1:>9s}'.format(header, 'ccache')
+
+  print('')
+  print('Build summary:')
+  print(header)
+
+  for span in sorted(
+      project_spans, key=lambda span: span.wall_time or 0.0, reverse=True):
+    project_name = span.attributes.get('project', None) or ''
+    build_target = span.attributes.get('target', None) or ''
+
+    peak_rss = '-'
+    if span.peak_rss is not None:
+      peak_rss = '{0:.1f}'.format(span.peak_rss / (1024.0 * 1024.0))
+
+    row = '{0:<24s} {1:<12s} {2:>9.1f} {3:>9.1f} {4:>14s}'.format(
+        project_name, build_target, span.wall_time or 0.0,
+        span.cpu_time or 0.0, peak_rss)
+
+    times = phase_times.get((project_name, build_target), {})
+    for phase in _SUMMARY_PHASES:
+      if phase in times:
+        row = '{0:s} {1:>9.1f}'.format(row, times[phase])
+      else:
+        row = '{0:s} {1:>9s}'.format(row, '-')
+
+    compiler_cache_statistics = build_environment_lib.CompilerCacheStatistics(
+        hits=span.attributes.get('compiler_cache_hits', 0),
+        misses=span.attributes.get('compiler_cache_misses', 0))
+
+    hit_rate = compiler_cache_statistics.GetHitRate()
+    if hit_rate is None:
+      row = '{0:s} {1:>9s}'.format(row, '-')
+    else:
+      row = '{0:s} {1:>8.1f}%'.format(row, hit_rate * 100.0)
+
+    print(row)
+
+  print('')
+  print((
+      'Peak RSS is the peak resident set size of the build process, and its '
+      'child\nprocesses, up to the end of the project build, which can '
+      'include earlier\nprojects built by the same process.'))
+
+
+def _PrintHTTPStatistics(spans):
+  """Prints the statistics of the HTTP requests per host.
+
+  Args:
+    spans (list[Span]): spans recorded during the builds.
+  """
+  http_statistics = {}
+  for span in spans:
+    if span.name != 'project':
+      continue
+
+    project_http_statistics = span.attributes.get('http_statistics', None)
+    for host, statistics_dict in (project_http_statistics or {}).items():
+      host_statistics = http_statistics.setdefault(
+          host, http_client.HTTPHostStatistics())
+      host_statistics.latency += statistics_dict['latency']
+      host_statistics.number_of_connections += (
+          statistics_dict['number_of_connections'])
+      host_statistics.number_of_errors += statistics_dict['number_of_errors']
+      host_statistics.number_of_requests += (
+          statistics_dict['number_of_requests'])
+      host_statistics.number_of_retries += statistics_dict['number_of_retries']
+
+  if not http_statistics:
+    return
+
+  print('')
+  print('HTTP requests:')
+  print(http_client.FormatStatistics(http_statistics))
+
+
+def _PlanProjectInWorkingDirectory(
+    project_builder, build_directory, use_project_directories,
+    project_definition):
+  """Determines the build plan of a project in its working directory.
+
+  Args:
+    project_builder (ProjectBuilder): project builder.
+    build_directory (str): path of the build directory.
+    use_project_directories (bool): True if every project is built in its
+        own sub directory of the build directory.
+    project_definition (ProjectDefinition): project definition.
+
+  Returns:
+    ProjectBuildPlan: build plan.
+  """
+  working_directory = build_directory
+  if use_project_directories:
+    working_directory = os.path.join(build_directory, project_definition.name)
+
+  return project_builder.Plan(project_definition, working_directory)
+
+
+def _PlanBuilds(
+    project_builder, build_directory, project_definitions,
+    use_project_directories=False, number_of_threads=16):
+  """Determines the build plans of projects concurrently.
+
+  Args:
+    project_builder (ProjectBuilder): project builder.
+    build_directory (str): path of the build directory.
+    project_definitions (list[ProjectDefinition]): definitions of
+        the projects.
+    use_project_directories (Optional[bool]): True if every project is built
+        in its own sub directory of the build directory.
+    number_of_threads (Optional[int]): maximum number of projects to plan
+        concurrently.
+
+  Returns:
+    list[ProjectBuildPlan]: build plans in build order.
+  """
+  if not project_definitions:
+    return []
+
+  pypi.PyPIDownloadHelper.PrefetchSourcePackages(
+      [project_definition.download_url
+       for project_definition in project_definitions],
+      number_of_threads=number_of_threads)
+
+  thread_pool = multiprocessing_pool.ThreadPool(
+      processes=min(number_of_threads, len(project_definitions)))
+
+  try:
+    plans = thread_pool.map(
+        functools.partial(
+            _PlanProjectInWorkingDirectory, project_builder, build_directory,
+            use_project_directories),
+        project_definitions)
+
+  finally:
+    thread_pool.close()
+    thread_pool.join()
+
+  plans_per_name = {plan.name: plan for plan in plans}
+
+  dependency_graph = build_scheduler.ProjectDependencyGraph(
+      project_definitions)
+  return [plans_per_name[name] for name in dependency_graph.GetBuildOrder()]
+
+
+def _PrintBuildPlan(plans):
+  """Prints the build plans of projects as a table.
+
+  Args:
+    plans (list[ProjectBuildPlan]): build plans.
+  """
+  print('{0:<24s} {1:<20s} {2:<6s} {3:s}'.format(
+      'Project', 'Version', 'Build', 'Artifacts'))
+
+  for plan in plans:
+    if plan.error:
+      build = 'error'
+      details = plan.error
+    else:
+      build = 'yes' if plan.build_required else 'no'
+      details = ', '.join(plan.artifacts) or '-'
+
+    print('{0:<24s} {1:<20s} {2:<6s} {3:s}'.format(
+        plan.name, plan.version or '-', build, details))
+
+  number_of_builds = len([plan for plan in plans if plan.build_required])
+  number_of_errors = len([plan for plan in plans if plan.error])
+
+  print('')
+  print('{0:d} of {1:d} projects require a build, {2:d} errors.'.format(
+      number_of_builds, len(plans), number_of_errors))
+
+
+def _WriteBuildPlan(
+    path, build_target, plans, disabled_projects, undefined_projects):
+  """Writes the build plans of projects to a JSON file.
+
+  Args:
+    path (str): path of the JSON file.
+    build_target (str): build target.
+    plans (list[ProjectBuildPlan]): build plans.
+    disabled_projects (list[str]): names of the projects that are disabled
+        for the build target.
+    undefined_projects (list[str]): names of the projects that are not
+        defined.
+
+  Returns:
+    bool: True if the file was written or False on error.
+  """
+  data = json.dumps({
+      'build_target': build_target,
+      'disabled_projects': disabled_projects,
+      'projects': [plan.CopyToDict() for plan in plans],
+      'undefined_projects': undefined_projects}, indent=2, sort_keys=True)
+
+  try:
+    with io.open(path, 'w', encoding='utf-8') as file_object:
+      file_object.write('{0:s}\n'.format(data))
+
+  except IOError as exception:
+    logging.warning(
+        'Unable to write build plan file: {0:s} with error: {1!s}'.format(
+            path, exception))
+    return False
+
+  return True
 
 
 def Main():
@@ -197,17 +938,121 @@ def Main():
       'build_target', choices=sorted(build_targets), action='store',
       metavar='BUILD_TARGET', default=None, help='The build target.')
 
+  argument_parser.add_argument(
+      '--artifact-catalog', '--artifact_catalog', action='store',
+      metavar='PATH', dest='artifact_catalog', type=str, default=None,
+      help=(
+          'path of the SQLite database file in which the files in the build '
+          'directory are cataloged, including the project, version, build '
+          'target, distribution, architecture and digest of the files '
+          'produced by the builds. The catalog is used to find the files of '
+          'previous versions instead of scanning the build directory for '
+          'every project. The default is not to use a catalog.'))
+
   argument_parser.add_argument(
       '--build-directory', '--build_directory', action='store',
       metavar='DIRECTORY', dest='build_directory', type=str,
       default='build', help='The location of the build directory.')
 
+  argument_parser.add_argument(
+      '--cache-directory', '--cache_directory', action='store',
+      metavar='DIRECTORY', dest='cache_directory', type=str, default=None,
+      help=(
+          'The location of the directory in which downloaded pages are '
+          'cached between runs. The default is not to cache pages.'))
+
+  argument_parser.add_argument(
+      '--cache-ttl', '--cache_ttl', action='store', metavar='SECONDS',
+      dest='cache_ttl', type=int, default=3600, help=(
+          'The number of seconds a cached page is used before it is '
+          'revalidated. The default is 3600.'))
+
+  argument_parser.add_argument(
+      '--chrome-trace-file', '--chrome_trace_file', action='store',
+      metavar='PATH', dest='chrome_trace_file', type=str, default=None,
+      help=(
+          'path of the file to write the timing of the phases of the builds '
+          'to in Chrome trace event format, which can be loaded in '
+          'chrome://tracing.'))
+
+  argument_parser.add_argument(
+      '--compiler-cache', '--compiler_cache', action='store',
+      metavar='DIRECTORY', dest='compiler_cache', type=str, default=None,
+      help=(
+          'path of the ccache directory. If set the compiler commands of '
+          'configure and make based builds use ccache, so that unchanged '
+          'sources are not compiled again, and the cache hit rate is shown '
+          'in the build summary. Requires ccache. Projects with the '
+          'no_compiler_cache build option do not use the cache.'))
+
   argument_parser.add_argument(
       '-c', '--config', dest='config_path', action='store',
       metavar='CONFIG_PATH', default=None, help=(
           'path of the directory containing the build configuration '
           'files e.g. projects.ini.'))
 
+  argument_parser.add_argument(
+      '--explain', dest='explain', action='store_true', default=False,
+      help=(
+          'print why every project is built or skipped. A project is built '
+          'if its build output is missing or if one of the inputs of the '
+          'build, such as the source package, project definition, templates '
+          'or patches, changed since the last build.'))
+
+  argument_parser.add_argument(
+      '--git-mirror-cache', '--git_mirror_cache', action='store',
+      metavar='DIRECTORY', dest='git_mirror_cache', type=str, default=None,
+      help=(
+          'The location of the directory in which bare mirrors of the git '
+          'repositories of projects are stored, so that only the changes '
+          'are fetched when a repository is cloned again. The default is '
+          'not to use a git mirror cache.'))
+
+  argument_parser.add_argument(
+      '--http-timeout', '--http_timeout', action='store', metavar='SECONDS',
+      dest='http_timeout', type=float,
+      default=http_client.HTTPClient.DEFAULT_TIMEOUT, help=(
+          'number of seconds after which a HTTP request, such as that of '
+          'a download, times out. The default is {0:.0f} seconds.').format(
+              http_client.HTTPClient.DEFAULT_TIMEOUT))
+
+  argument_parser.add_argument(
+      '-j', '--jobs', dest='jobs', action='store', metavar='NUMBER',
+      type=int, default=1, help=(
+          'number of projects to build concurrently. The default is to build '
+          'the projects one at a time. Projects are built after the projects '
+          'they depend on and are skipped if one of these fails to build. '
+          'When building concurrently every project is built in its own sub '
+          'directory of the build directory.'))
+
+  argument_parser.add_argument(
+      '--make-jobs', '--make_jobs', dest='make_jobs', action='store',
+      metavar='NUMBER', type=int, default=None, help=(
+          'number of jobs make runs concurrently when building a project, '
+          'including make invoked by dpkg-buildpackage and rpmbuild. The '
+          'default is to use the number of jobs of the build tools. '
+          'Projects with the no_parallel_make build option are built with '
+          'one job.'))
+
+  argument_parser.add_argument(
+      '--offline', dest='offline', action='store_true', default=False, help=(
+          'use the cached pages, also if they are out of date, instead of '
+          'downloading pages. Requires --cache-directory.'))
+
+  argument_parser.add_argument(
+      '--plan', dest='plan', action='store_true', default=False, help=(
+          'print the build plan instead of building: the latest version of '
+          'every project, if a build is required and the files the build is '
+          'expected to produce. The versions are resolved concurrently and '
+          'no source packages are downloaded, hence a project is planned to '
+          'be built only if its build output is missing.'))
+
+  argument_parser.add_argument(
+      '--plan-file', '--plan_file', action='store', metavar='PATH',
+      dest='plan_file', type=str, default=None, help=(
+          'path of the file to write the build plan to as JSON. Implies '
+          '--plan.'))
+
   argument_parser.add_argument(
       '--preset', dest='preset', action='store',
       metavar='PRESET_NAME', default=None, help=(
@@ -222,6 +1067,28 @@ def Main():
           'default is to build all project defined in the projects.ini '
           'configuration file.'))
 
+  argument_parser.add_argument(
+      '--source-store', '--source_store', action='store',
+      metavar='DIRECTORY', dest='source_store', type=str, default=None,
+      help=(
+          'The location of the directory in which downloaded source packages '
+          'are stored, so that they can be shared between build directories '
+          'and build targets. The default is not to use a source store.'))
+
+  argument_parser.add_argument(
+      '--source-store-versions', '--source_store_versions', action='store',
+      metavar='NUMBER', dest='source_store_versions', type=int, default=2,
+      help=(
+          'The number of most recently used versions per project to retain '
+          'in the source store. The default is 2.'))
+
+  argument_parser.add_argument(
+      '--trace-file', '--trace_file', action='store', metavar='PATH',
+      dest='trace_file', type=str, default=None, help=(
+          'path of the file to append the timing of the phases of the builds '
+          'to as JSON lines. Every line contains a span with the wall time, '
+          'CPU time and peak resident set size of a phase.'))
+
   options = argument_parser.parse_args()
 
   if not options.build_target:
@@ -264,7 +1131,71 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-  project_builder = ProjectBuilder(options.build_target)
+  if options.offline and not options.cache_directory:
+    print('Offline mode requires a cache directory.')
+    print('')
+    return False
+
+  page_cache_path = None
+  if options.cache_directory:
+    page_cache_path = os.path.abspath(options.cache_directory)
+    page_cache = page_cache_lib.PageCache(
+        page_cache_path, offline=options.offline,
+        time_to_live=options.cache_ttl)
+    interface.DownloadHelper.SetPageCache(page_cache)
+
+  source_store = None
+  source_store_path = None
+  if options.source_store:
+    source_store_path = os.path.abspath(options.source_store)
+    source_store = source_store_lib.SourceStore(source_store_path)
+    source_helper.SourcePackageHelper.SetSourceStore(source_store)
+
+  git_mirror_cache_path = None
+  if options.git_mirror_cache:
+    git_mirror_cache_path = os.path.abspath(options.git_mirror_cache)
+    source_helper.GitRepositorySourceHelper.SetGitMirrorCache(
+        git_mirror.GitMirrorCache(git_mirror_cache_path))
+
+  if options.make_jobs is not None and options.make_jobs < 1:
+    print('Unsupported number of make jobs: {0:d}.'.format(options.make_jobs))
+    print('')
+    return False
+
+  if options.source_store_versions < 1:
+    print('Unsupported number of source store versions: {0:d}.'.format(
+        options.source_store_versions))
+    print('')
+    return False
+
+  if options.http_timeout <= 0:
+    print('Unsupported HTTP timeout: {0:.1f} seconds.'.format(
+        options.http_timeout))
+    print('')
+    return False
+
+  http_client.SetHTTPClient(
+      http_client.HTTPClient(timeout=options.http_timeout))
+
+  build_environment = None
+  if options.compiler_cache or options.make_jobs:
+    compiler_cache_directory = None
+    if options.compiler_cache:
+      compiler_cache_directory = os.path.abspath(options.compiler_cache)
+
+    build_environment = build_environment_lib.BuildEnvironment(
+        compiler_cache_directory=compiler_cache_directory,
+        number_of_make_jobs=options.make_jobs)
+
+    if (compiler_cache_directory and
+        not build_environment.IsCompilerCacheAvailable()):
+      print('Compiler cache requires ccache.')
+      print('')
+      return False
+
+  project_builder = ProjectBuilder(
+      options.build_target, build_environment=build_environment,
+      explain=options.explain)
 
   project_names = []
   if options.preset:
@@ -285,55 +1216,138 @@ def Main():
 
   builds = []
   disabled_packages = []
-  with io.open(projects_file, 'r', encoding='utf-8') as file_object:
-    project_definition_reader = projects.ProjectDefinitionReader()
-    for project_definition in project_definition_reader.Read(file_object):
-      if project_definition.name not in project_names:
-        continue
-
-      is_disabled = False
-      if (options.build_target in project_definition.disabled or
-          'all' in project_definition.disabled):
-        if options.preset:
-          is_disabled = True
-        else:
-          # If a project is manually specified ignore the disabled status.
-          logging.info('Ignoring disabled status for: {0:s}'.format(
-              project_definition.name))
-
-      if is_disabled:
-        disabled_packages.append(project_definition.name)
+  project_definition_index = projects.ProjectDefinitionIndex(projects_file)
+  for project_definition in project_definition_index.GetProjectDefinitions(
+      names=project_names):
+    is_disabled = False
+    if (options.build_target in project_definition.disabled or
+        'all' in project_definition.disabled):
+      if options.preset:
+        is_disabled = True
       else:
-        builds.append(project_definition)
+        # If a project is manually specified ignore the disabled status.
+        logging.info('Ignoring disabled status for: {0:s}'.format(
+            project_definition.name))
 
-  if not os.path.exists(options.build_directory):
-    os.mkdir(options.build_directory)
+    if is_disabled:
+      disabled_packages.append(project_definition.name)
+    else:
+      builds.append(project_definition)
 
-  current_working_directory = os.getcwd()
-  os.chdir(options.build_directory)
+  if options.jobs < 1:
+    print('Unsupported number of jobs: {0:d}.'.format(options.jobs))
+    print('')
+    return False
 
   undefined_packages = list(project_names)
   for disabled_package in disabled_packages:
     undefined_packages.remove(disabled_package)
 
-  failed_builds = []
   for project_definition in builds:
-    if project_names and project_definition.name not in project_names:
-      continue
+    if project_definition.name in undefined_packages:
+      undefined_packages.remove(project_definition.name)
+
+  if options.plan or options.plan_file:
+    plans = _PlanBuilds(
+        project_builder, os.path.abspath(options.build_directory), builds,
+        use_project_directories=options.jobs > 1)
+
+    _PrintBuildPlan(plans)
 
     if undefined_packages:
-      project_index = undefined_packages.index(project_definition.name)
-      del undefined_packages[project_index]
+      print('')
+      print('Undefined packages:')
+      for undefined_package in undefined_packages:
+        print('\t{0:s}'.format(undefined_package))
+
+    if options.plan_file and not _WriteBuildPlan(
+        options.plan_file, options.build_target, plans, disabled_packages,
+        undefined_packages):
+      return False
 
-    logging.info('Processing: {0:s}'.format(project_definition.name))
+    return not [plan for plan in plans if plan.error]
+
+  if not os.path.exists(options.build_directory):
+    os.mkdir(options.build_directory)
+
+  # Resolve the versions of the projects hosted on PyPI concurrently.
+  pypi.PyPIDownloadHelper.PrefetchSourcePackages([
+      project_definition.download_url for project_definition in builds])
+
+  if options.trace_file:
+    trace_path = os.path.abspath(options.trace_file)
+  else:
+    file_descriptor, trace_path = tempfile.mkstemp(suffix='.jsonl')
+    os.close(file_descriptor)
 
-    # TODO: add support for dokan, bzip2
-    # TODO: setup sqlite in build directory.
-    if not project_builder.Build(project_definition):
-      print('Failed building: {0:s}'.format(project_definition.name))
-      failed_builds.append(project_definition.name)
+  tracer = tracing.Tracer(trace_path)
+  tracing.SetTracer(tracer)
 
-  os.chdir(current_working_directory)
+  artifact_catalog_path = None
+  if options.artifact_catalog:
+    artifact_catalog_path = os.path.abspath(options.artifact_catalog)
+    artifact_catalog_lib.SetArtifactCatalog(
+        artifact_catalog_lib.ArtifactCatalog(artifact_catalog_path))
+
+  start_time = time.time()
+
+  current_working_directory = os.getcwd()
+
+  # TODO: add support for dokan, bzip2
+  # TODO: setup sqlite in build directory.
+  if options.jobs == 1:
+    build_function = project_builder.Build
+
+    os.chdir(options.build_directory)
+
+  else:
+    build_function = functools.partial(
+        _BuildProjectInWorkingDirectory, project_builder,
+        os.path.abspath(options.build_directory))
+
+  scheduler = build_scheduler.BuildScheduler(
+      build_function, number_of_jobs=options.jobs,
+      initializer=functools.partial(
+          _InitializeWorker, trace_path,
+          artifact_catalog_path=artifact_catalog_path,
+          git_mirror_cache_path=git_mirror_cache_path,
+          http_timeout=options.http_timeout, page_cache_path=page_cache_path,
+          page_cache_offline=options.offline,
+          page_cache_time_to_live=options.cache_ttl,
+          source_store_path=source_store_path))
+
+  compiler_cache_statistics = None
+  if build_environment:
+    compiler_cache_statistics = build_environment.GetCompilerCacheStatistics()
+
+  try:
+    failed_builds = scheduler.Build(builds)
+  finally:
+    os.chdir(current_working_directory)
+
+  if compiler_cache_statistics:
+    current_statistics = build_environment.GetCompilerCacheStatistics()
+    if current_statistics:
+      compiler_cache_statistics = current_statistics.GetDifference(
+          compiler_cache_statistics)
+    else:
+      compiler_cache_statistics = None
+
+  # The trace file can contain spans of previous runs.
+  spans = [
+      span for span in tracer.GetSpans() if span.start_time >= start_time]
+  if not options.trace_file:
+    os.remove(trace_path)
+
+  if options.chrome_trace_file:
+    tracing.WriteChromeTrace(spans, options.chrome_trace_file)
+
+  if source_store:
+    source_store.CollectGarbage(
+        maximum_number_of_versions=options.source_store_versions)
+
+  for failed_build in failed_builds:
+    print('Failed building: {0:s}'.format(failed_build))
 
   if undefined_packages:
     print('')
@@ -347,7 +1361,24 @@ def Main():
     for failed_build in failed_builds:
       print('\t{0:s}'.format(failed_build))
 
-  return not failed_builds
+  if scheduler.skipped_builds:
+    print('')
+    print('Skipped building, due to failed dependencies:')
+    for skipped_build in scheduler.skipped_builds:
+      print('\t{0:s}'.format(skipped_build))
+
+  _PrintBuildSummary(spans)
+  _PrintHTTPStatistics(spans)
+
+  if compiler_cache_statistics:
+    hit_rate = compiler_cache_statistics.GetHitRate() or 0.0
+    print('')
+    print((
+        'Compiler cache: {0:d} hits, {1:d} misses, {2:.1f}% hit rate.').format(
+            compiler_cache_statistics.hits, compiler_cache_statistics.misses,
+            hit_rate * 100.0))
+
+  return not failed_builds and not scheduler.skipped_builds
 
 
 if __name__ == '__main__':
@@ -56,12 +56,10 @@ def Main():
     print('')
     return False
 
-  project_definition_match = None
-  with open(options.config_file) as file_object:
-    project_definition_reader = projects.ProjectDefinitionReader()
-    for project_definition in project_definition_reader.Read(file_object):
-      if options.project_name == project_definition.name:
-        project_definition_match = project_definition
+  project_definition_index = projects.ProjectDefinitionIndex(
+      options.config_file)
+  project_definition_match = project_definition_index.GetProjectDefinition(
+      options.project_name)
 
   if not project_definition_match:
     print('No such package name: {0:s}.'.format(options.project_name))
@@ -6,9 +6,8 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import argparse
+import contextlib
 import csv
-import gzip
-import io
 import json
 import logging
 import os
@@ -17,13 +16,96 @@ import re
 import sys
 import zlib
 
+from multiprocessing import pool as multiprocessing_pool
 from xml.etree import ElementTree
 
+from l2tdevtools import artifact_catalog as artifact_catalog_lib
+from l2tdevtools import github_api
+from l2tdevtools import http_client
+from l2tdevtools import page_cache as page_cache_lib
 from l2tdevtools import versions
 from l2tdevtools.download_helpers import interface
+from l2tdevtools.lib import errors
+from l2tdevtools.lib import repository_metadata
 
 
-class COPRProjectManager(object):
+class PackagesFetcher(object):
+  """Fetches the packages of repositories concurrently.
+
+  The fetch tasks, such as retrieving the packages of a repository or the
+  version of a package on PyPI, are mostly waiting for network responses,
+  hence they are run by a bounded number of threads.
+  """
+
+  def __init__(self, number_of_jobs=8):
+    """Initializes a packages fetcher.
+
+    Args:
+      number_of_jobs (Optional[int]): maximum number of fetch tasks that are
+          run concurrently.
+    """
+    super(PackagesFetcher, self).__init__()
+    self._number_of_jobs = max(number_of_jobs or 1, 1)
+
+  def _RunTask(self, task):
+    """Runs a fetch task.
+
+    Args:
+      task (tuple[object, function, tuple]): key, function and arguments of
+          the fetch task.
+
+    Returns:
+      tuple[object, object]: key and result of the fetch task.
+    """
+    key, function, arguments = task
+    return key, function(*arguments)
+
+  def Fetch(self, tasks):
+    """Runs fetch tasks concurrently.
+
+    Args:
+      tasks (list[tuple[object, function, tuple]]): key, function and
+          arguments of the fetch tasks, where the key identifies the result
+          of the fetch task.
+
+    Returns:
+      dict[object, object]: results of the fetch tasks per key.
+    """
+    if not tasks:
+      return {}
+
+    number_of_jobs = min(self._number_of_jobs, len(tasks))
+    if number_of_jobs == 1:
+      return dict(self._RunTask(task) for task in tasks)
+
+    pool = multiprocessing_pool.ThreadPool(processes=number_of_jobs)
+    try:
+      results = dict(pool.imap_unordered(self._RunTask, tasks))
+      pool.close()
+
+    finally:
+      pool.terminate()
+      pool.join()
+
+    return results
+
+
+class RepositoryManager(object):
+  """Defines a repository manager."""
+
+  def _CreateDownloadHelper(self):
+    """Creates a download helper.
+
+    A download helper is created per fetch, since a download helper keeps
+    the last page it downloaded and cannot be shared by concurrent fetches.
+
+    Returns:
+      DownloadHelper: download helper.
+    """
+    return interface.DownloadHelper('')
+
+
+class COPRProjectManager(RepositoryManager):
   """Defines a COPR project manager."""
 
   _COPR_BASE_URL = 'https://copr.fedorainfracloud.org{0:s}'
@@ -47,7 +129,6 @@ class COPRProjectManager(object):
       name (str): name of the group.
     """
     super(COPRProjectManager, self).__init__()
-    self._download_helper = interface.DownloadHelper('')
     self._name = name
 
   def GetPackages(self, project):
@@ -70,8 +151,10 @@ class COPRProjectManager(object):
         'project': project}
     copr_repo_url = self._COPR_REPO_URL.format(**kwargs)
 
+    download_helper = self._CreateDownloadHelper()
+
     download_url = '/'.join([copr_repo_url, 'repodata', 'repomd.xml'])
-    page_content = self._download_helper.DownloadPageContent(download_url)
+    page_content = download_helper.DownloadPageContent(download_url)
     if not page_content:
       logging.error('Unable to retrieve repomd.xml.')
       return None
@@ -88,56 +171,40 @@ class COPRProjectManager(object):
       return None
 
     download_url = '/'.join([copr_repo_url, href_value_tuple[1]])
-    page_content = self._download_helper.DownloadPageContent(
-        download_url, encoding=None)
-    if not page_content:
-      _, _, download_url = download_url.rpartition('/')
+    file_object = download_helper.OpenPage(download_url)
+    if not file_object:
       logging.error('Unable to retrieve primary.xml.gz.')
       return None
 
-    with gzip.GzipFile(fileobj=io.BytesIO(page_content)) as file_object:
-      page_content = file_object.read()
-
-    primary_xml = ElementTree.fromstring(page_content)
-    # Note explicitly checking xml.Element against None because of deprecation
-    # warning.
-    if primary_xml is None:
-      logging.error('Packages missing from primary.xml.')
-      return None
-
     packages = {}
-    for project_xml in primary_xml:
-      arch_xml = project_xml.find('{http://linux.duke.edu/metadata/common}arch')
-      if arch_xml is None or arch_xml.text != 'src':
-        continue
+    try:
+      # The packages are parsed while primary.xml.gz is being downloaded and
+      # decompressed.
+      with contextlib.closing(file_object):
+        primary_xml_stream = repository_metadata.OpenGzipDecompressedStream(
+            file_object)
 
-      package_name_xml = project_xml.find(
-          '{http://linux.duke.edu/metadata/common}name')
-      package_version_xml = project_xml.find(
-          '{http://linux.duke.edu/metadata/common}version')
-      if package_name_xml is None or package_version_xml is None:
-        continue
+        for package_name, architecture, package_version in (
+            repository_metadata.ReadRPMPrimaryPackages(primary_xml_stream)):
+          if architecture != 'src' or not package_name or not package_version:
+            continue
 
-      package_name = package_name_xml.text
-      package_version = package_version_xml.attrib['ver']
+          if package_name in packages and (
+              versions.GetVersionKey(package_version) <
+              versions.GetVersionKey(packages[package_name])):
+            continue
 
-      if not package_name or not package_version:
-        continue
+          packages[package_name] = package_version
 
-      if package_name in packages:
-        package_version_tuple = package_version.split('.')
-        version_tuple = packages[package_name].split('.')
-        compare_result = versions.CompareVersions(
-            package_version_tuple, version_tuple)
-        if compare_result < 0:
-          continue
-
-      packages[package_name] = package_version
+    except (IOError, SyntaxError, zlib.error) as exception:
+      logging.error(
+          'Unable to read primary.xml.gz with error: {0!s}'.format(exception))
+      return None
 
     return packages
 
 
-class GithubRepoManager(object):
+class GithubRepoManager(RepositoryManager):
   """Defines a GitHub repository manager."""
 
   _GITHUB_REPO_API_URL = (
@@ -149,7 +216,6 @@ class GithubRepoManager(object):
   def __init__(self):
     """Initializes a GitHub repository manager."""
     super(GithubRepoManager, self).__init__()
-    self._download_helper = interface.DownloadHelper('')
 
   def _GetDownloadURL(self, sub_directory, track, use_api=False):
     """Retrieves the download URL.
@@ -201,13 +267,19 @@ class GithubRepoManager(object):
       logging.info('Missing download URL.')
       return None
 
-    page_content = self._download_helper.DownloadPageContent(download_url)
-    if not page_content:
-      return None
-
     filenames = []
     if use_api:
-      # The page content consist of JSON data that contains a list of dicts.
+      github_api_client = github_api.GitHubAPIClient()
+      try:
+        directory_entries = github_api_client.GetJSON(download_url)
+      except errors.ConnectivityError as exception:
+        logging.warning('{0!s}'.format(exception))
+        return None
+
+      if not directory_entries:
+        return None
+
+      # The JSON data contains a list of dicts.
       # Each dict consists of:
       # {
       #   "name":"PyYAML-3.11.win-amd64-py2.7.msi",
@@ -226,12 +298,17 @@ class GithubRepoManager(object):
       #   }
       # }
 
-      for directory_entry in json.loads(page_content):
+      for directory_entry in directory_entries:
         filename = directory_entry.get('name', None)
         if filename:
           filenames.append(filename)
 
     else:
+      download_helper = self._CreateDownloadHelper()
+      page_content = download_helper.DownloadPageContent(download_url)
+      if not page_content:
+        return None
+
       # The format of the download URL is:
       # <a class="js-navigation-open" title="{title}" id="{id}" href="{path}"
       expression_string = (
@@ -266,7 +343,7 @@ class GithubRepoManager(object):
     return packages
 
 
-class LaunchpadPPAManager(object):
+class LaunchpadPPAManager(RepositoryManager):
   """Defines a Launchpad PPA manager."""
 
   _LAUNCHPAD_URL = (
@@ -282,7 +359,6 @@ class LaunchpadPPAManager(object):
     """
     super(LaunchpadPPAManager, self).__init__()
     self._distribution = distribution
-    self._download_helper = interface.DownloadHelper('')
     self._name = name
 
   def CopyPackages(self):
@@ -308,33 +384,41 @@ class LaunchpadPPAManager(object):
         'track': track}
     download_url = self._LAUNCHPAD_URL.format(**kwargs)
 
-    ppa_sources = self._download_helper.DownloadPageContent(
-        download_url, encoding=None)
-    if not ppa_sources:
+    download_helper = self._CreateDownloadHelper()
+    file_object = download_helper.OpenPage(download_url)
+    if not file_object:
       logging.error('Unable to retrieve PPA sources list.')
       return None
 
-    ppa_sources = zlib.decompress(ppa_sources, 16 + zlib.MAX_WBITS)
-
+    packages = {}
     try:
-      ppa_sources = ppa_sources.decode('utf-8')
+      # The stanzas are parsed while Sources.gz is being downloaded and
+      # decompressed.
+      with contextlib.closing(file_object):
+        sources_stream = repository_metadata.OpenGzipDecompressedStream(
+            file_object)
+
+        for stanza in repository_metadata.ReadDeb822Stanzas(sources_stream):
+          package = stanza.get('Package', None)
+          version = stanza.get('Version', None)
+          if not package or not version:
+            continue
+
+          version, _, _ = version.rpartition('-')
+          packages[package] = version
+
+    except (IOError, zlib.error) as exception:
+      logging.error(
+          'Unable to read PPA sources list with error: {0!s}'.format(
+              exception))
+      return None
+
     except UnicodeDecodeError as exception:
       logging.error(
           'Unable to decode PPA sources list with error: {0!s}'.format(
               exception))
       return None
 
-    packages = {}
-    for line in ppa_sources.split('\n'):
-      if line.startswith('Package: '):
-        _, _, package = line.rpartition('Package: ')
-
-      elif line.startswith('Version: '):
-        _, _, version = line.rpartition('Version: ')
-        version, _, _ = version.rpartition('-')
-
-        packages[package] = version
-
     return packages
 
 
@@ -345,10 +429,10 @@ class OpenSuseBuildServiceManager(object):
   # Fedora_22/src/
 
 
-class PyPIManager(object):
+class PyPIManager(RepositoryManager):
   """Defines a PyPI manager object."""
 
-  _PYPI_URL = 'https://pypi.python.org/pypi/{package_name:s}'
+  _PYPI_URL = 'https://pypi.org/pypi/{package_name:s}/json'
 
   # TODO: move to projects.ini configuration.
   _PYPI_PACKAGE_NAMES = {
@@ -407,11 +491,6 @@ class PyPIManager(object):
       'wrapt': 'wrapt',
       'XlsxWriter': 'XlsxWriter'}
 
-  def __init__(self):
-    """Initializes a PyPI manager object."""
-    super(PyPIManager, self).__init__()
-    self._download_helper = interface.DownloadHelper('')
-
   def CopyPackages(self):
     """Copies packages."""
     # TODO: implement:
@@ -419,56 +498,101 @@ class PyPIManager(object):
     #              /+copy-packages
     return
 
-  def GetPackages(self):
-    """Retrieves a list of packages.
+  def GetFetchTasks(self):
+    """Retrieves the tasks to fetch the versions of the packages.
 
     Returns:
-      dict[str, str]: package names and versions as values or None if
-          the packages cannot be determined.
+      list[tuple[object, function, tuple]]: key, function and arguments of
+          the fetch tasks, where the key is a tuple of "pypi" and the name of
+          the package.
+    """
+    return [
+        (('pypi', package_name), self.GetPackageVersion, (package_name, ))
+        for package_name in sorted(self._PYPI_PACKAGE_NAMES.keys())]
+
+  def GetPackagesFromFetchResults(self, results):
+    """Retrieves the packages from the results of the fetch tasks.
+
+    Args:
+      results (dict[object, object]): results of the fetch tasks per key.
+
+    Returns:
+      dict[str, str]: package names and versions as values.
     """
     packages = {}
-    for package_name in iter(self._PYPI_PACKAGE_NAMES.keys()):
-      kwargs = {'package_name': package_name}
-      download_url = self._PYPI_URL.format(**kwargs)
+    for key, version in results.items():
+      if isinstance(key, tuple) and key[0] == 'pypi' and version:
+        package_name = self._PYPI_PACKAGE_NAMES[key[1]]
+        packages[package_name] = version
 
-      page_content = self._download_helper.DownloadPageContent(download_url)
-      if not page_content:
-        logging.error('Unable to retrieve PyPI package: {0:s} page.'.format(
-            package_name))
-        continue
+    return packages
 
-      try:
-        page_content = page_content.decode('utf-8')
-      except UnicodeDecodeError as exception:
-        logging.error((
-            'Unable to decode PyPI package: {0:s} page with error: '
-            '{1:s}').format(package_name, exception))
-        continue
+  def GetPackageVersion(self, package_name):
+    """Retrieves the version of a package.
 
-      expression_string = (
-          '<title>{0:s} ([^ ]*) : Python Package Index</title>'.format(
+    Args:
+      package_name (str): name of the package on PyPI.
+
+    Returns:
+      str: version of the package or None if the version cannot be
+          determined.
+    """
+    kwargs = {'package_name': package_name}
+    download_url = self._PYPI_URL.format(**kwargs)
+
+    download_helper = self._CreateDownloadHelper()
+    page_content = download_helper.DownloadPageContent(download_url)
+    if not page_content:
+      logging.error('Unable to retrieve PyPI package: {0:s} page.'.format(
+          package_name))
+      return None
+
+    try:
+      json_dict = json.loads(page_content)
+    except ValueError as exception:
+      logging.error((
+          'Unable to parse PyPI package: {0:s} page with error: '
+          '{1!s}').format(package_name, exception))
+      return None
+
+    version = (json_dict.get('info', None) or {}).get('version', None)
+    if not version:
+      logging.warning(
+          'Unable to determine PyPI package: {0:s} information.'.format(
               package_name))
-      matches = re.findall(expression_string, page_content)
-      if not matches or len(matches) != 1:
-        logging.warning(
-            'Unable to determine PyPI package: {0:s} information.'.format(
-                package_name))
-        continue
+      return None
 
-      package_name = self._PYPI_PACKAGE_NAMES[package_name]
-      packages[package_name] = matches
+    return version
 
-    return packages
+  def GetPackages(self, packages_fetcher):
+    """Retrieves a list of packages.
+
+    Args:
+      packages_fetcher (PackagesFetcher): packages fetcher used to retrieve
+          the versions of the packages concurrently.
+
+    Returns:
+      dict[str, str]: package names and versions as values or None if
+          the packages cannot be determined.
+    """
+    results = packages_fetcher.Fetch(self.GetFetchTasks())
+    return self.GetPackagesFromFetchResults(results)
 
 
 class PackagesManager(object):
   """Manages packages across various repositories."""
 
-  def __init__(self, distribution='trusty'):
+  # The channels, which are the repositories that are compared with
+  # a reference directory by CompareDirectoryWithChannels.
+  CHANNELS = ('copr', 'launchpad', 'l2tbinaries', 'pypi')
+
+  def __init__(self, distribution='trusty', number_of_jobs=8):
     """Initializes a packages manager.
 
     Args:
       distribution (Optional[str]): name of the distribution.
+      number_of_jobs (Optional[int]): maximum number of repository listings
+          and package pages that are fetched concurrently.
     """
     super(PackagesManager, self).__init__()
     self._copr_project_manager = COPRProjectManager('gift')
@@ -476,6 +600,7 @@ class PackagesManager(object):
     self._github_repo_manager = GithubRepoManager()
     self._launchpad_ppa_manager = LaunchpadPPAManager(
         'gift', distribution=distribution)
+    self._packages_fetcher = PackagesFetcher(number_of_jobs=number_of_jobs)
     self._pypi_manager = PyPIManager()
 
   def _ComparePackages(self, reference_packages, packages):
@@ -504,25 +629,104 @@ class PackagesManager(object):
 
     return new_packages, new_versions
 
-  def CompareDirectoryWithCOPRProject(self, reference_directory, project):
-    """Compares a directory containing source rpm packages with a COPR project.
+  def _GetDPKGSourcePackages(self, reference_directory):
+    """Retrieves the dpkg source packages in a directory.
 
     Args:
       reference_directory (str): path of the reference directory that contains
           dpkg source packages.
-      project (str): name of the COPR project.
 
     Returns:
-      tuple: containing:
+      dict[str, str]: package names and versions.
+    """
+    reference_packages = {}
+    for directory_entry in artifact_catalog_lib.ListDirectory(
+        reference_directory):
+      # The directory contains various files and we are only interested
+      # in the source dpkg packages that use the naming convention:
+      # package_version-#ppa1~distribution_source.changes
+      name_suffix = 'ppa1~{0:s}_source.changes'.format(self._distribution)
+      if not directory_entry.endswith(name_suffix):
+        continue
 
-        dict[str, str]: new package names and versions. New packages are those
-            that are present in the reference directory but not in the project.
-        dict[str, str]: newer existing package names and versions. Newer
-            existing packages are those that have a newer version in the
-            reference directory.
+      name, _, _ = directory_entry.rpartition('-')
+      name, _, version = name.rpartition('_')
+
+      reference_packages[name] = version
+
+    return reference_packages
+
+  def _GetMSIOrDMGPackages(self, reference_directory, sub_directory):
+    """Retrieves the msi or dmg packages in a directory.
+
+    Args:
+      reference_directory (str): path of the reference directory that contains
+          msi or dmg packages.
+      sub_directory (str): name of the machine type sub directory.
+
+    Returns:
+      dict[str, str]: package names and versions.
     """
     reference_packages = {}
-    for directory_entry in os.listdir(reference_directory):
+    for directory_entry in artifact_catalog_lib.ListDirectory(
+        reference_directory):
+      if directory_entry.endswith('.dmg'):
+        directory_entry, _, _ = directory_entry.rpartition('.dmg')
+
+      elif directory_entry.endswith('.msi'):
+        if sub_directory == 'win32':
+          directory_entry, _, _ = directory_entry.rpartition('.win32')
+        elif sub_directory == 'win64':
+          directory_entry, _, _ = directory_entry.rpartition('.win-amd64')
+
+      else:
+        continue
+
+      name, _, version = directory_entry.rpartition('-')
+      reference_packages[name] = version
+
+    return reference_packages
+
+  def _GetSourcePackages(self, reference_directory):
+    """Retrieves the .tar.gz source packages in a directory.
+
+    Args:
+      reference_directory (str): path of the reference directory that contains
+          .tar.gz source packages.
+
+    Returns:
+      dict[str, str]: package names and versions.
+    """
+    reference_packages = {}
+    for directory_entry in artifact_catalog_lib.ListDirectory(
+        reference_directory):
+      if not directory_entry.endswith('.tar.gz'):
+        continue
+
+      directory_entry, _, _ = directory_entry.rpartition('.tar.gz')
+      name, _, version = directory_entry.rpartition('-')
+
+      if (name.endswith('-alpha') or name.endswith('-beta') or
+          name.endswith('-experimental')):
+        name, _, _ = name.rpartition('-')
+
+      reference_packages[name] = version
+
+    return reference_packages
+
+  def _GetSourceRPMPackages(self, reference_directory):
+    """Retrieves the source rpm packages in a directory.
+
+    Args:
+      reference_directory (str): path of the reference directory that contains
+          source rpm packages.
+
+    Returns:
+      dict[str, str]: package names and versions.
+    """
+    reference_packages = {}
+    for directory_entry in artifact_catalog_lib.ListDirectory(
+        reference_directory):
       # The directory contains various files and we are only interested
       # in the source RPM packages that use the naming convention:
       # package-version-#.src.rpm
@@ -534,6 +738,75 @@ class PackagesManager(object):
 
       reference_packages[name] = version
 
+    return reference_packages
+
+  def CompareDirectoryWithChannels(
+      self, reference_directory, track, sub_directory=None):
+    """Compares a directory with all the repositories of a track.
+
+    The package listings of the COPR project, the Launchpad PPA track, the
+    l2tbinaries track and the package pages on PyPI are fetched concurrently.
+
+    Args:
+      reference_directory (str): path of the reference directory that contains
+          the packages.
+      track (str): name of the track.
+      sub_directory (Optional[str]): name of the machine type sub directory,
+          where None will not compare the l2tbinaries track.
+
+    Returns:
+      dict[str, tuple[dict[str, str], dict[str, str]]]: new package names and
+          versions and newer existing package names and versions per channel.
+    """
+    tasks = [
+        ('copr', self._copr_project_manager.GetPackages, (track, )),
+        ('launchpad', self._launchpad_ppa_manager.GetPackages, (track, ))]
+
+    if sub_directory:
+      tasks.append((
+          'l2tbinaries', self._github_repo_manager.GetPackages,
+          (sub_directory, track)))
+
+    tasks.extend(self._pypi_manager.GetFetchTasks())
+
+    results = self._packages_fetcher.Fetch(tasks)
+
+    channels = {
+        'copr': self._ComparePackages(
+            self._GetSourceRPMPackages(reference_directory),
+            results['copr']),
+        'launchpad': self._ComparePackages(
+            self._GetDPKGSourcePackages(reference_directory),
+            results['launchpad']),
+        'pypi': self._ComparePackages(
+            self._GetSourcePackages(reference_directory),
+            self._pypi_manager.GetPackagesFromFetchResults(results))}
+
+    if sub_directory:
+      channels['l2tbinaries'] = self._ComparePackages(
+          self._GetMSIOrDMGPackages(reference_directory, sub_directory),
+          results['l2tbinaries'])
+
+    return channels
+
+  def CompareDirectoryWithCOPRProject(self, reference_directory, project):
+    """Compares a directory containing source rpm packages with a COPR project.
+
+    Args:
+      reference_directory (str): path of the reference directory that contains
+          dpkg source packages.
+      project (str): name of the COPR project.
+
+    Returns:
+      tuple: containing:
+
+        dict[str, str]: new package names and versions. New packages are those
+            that are present in the reference directory but not in the project.
+        dict[str, str]: newer existing package names and versions. Newer
+            existing packages are those that have a newer version in the
+            reference directory.
+    """
+    reference_packages = self._GetSourceRPMPackages(reference_directory)
     packages = self._copr_project_manager.GetPackages(project)
     return self._ComparePackages(reference_packages, packages)
 
@@ -555,7 +828,8 @@ class PackagesManager(object):
             reference directory.
     """
     reference_packages = {}
-    for directory_entry in os.listdir(reference_directory):
+    for directory_entry in artifact_catalog_lib.ListDirectory(
+        reference_directory):
       # The directory contains various files and we are only interested
       # in the source packages that use the naming convention:
       # package-version-#.tar.gz
@@ -608,23 +882,8 @@ class PackagesManager(object):
             existing packages are those that have a newer version in the
             reference directory.
     """
-    reference_packages = {}
-    for directory_entry in os.listdir(reference_directory):
-      if directory_entry.endswith('.dmg'):
-        directory_entry, _, _ = directory_entry.rpartition('.dmg')
-
-      elif directory_entry.endswith('.msi'):
-        if sub_directory == 'win32':
-          directory_entry, _, _ = directory_entry.rpartition('.win32')
-        elif sub_directory == 'win64':
-          directory_entry, _, _ = directory_entry.rpartition('.win-amd64')
-
-      else:
-        continue
-
-      name, _, version = directory_entry.rpartition('-')
-      reference_packages[name] = version
-
+    reference_packages = self._GetMSIOrDMGPackages(
+        reference_directory, sub_directory)
     packages = self._github_repo_manager.GetPackages(sub_directory, track)
     return self._ComparePackages(reference_packages, packages)
 
@@ -646,20 +905,7 @@ class PackagesManager(object):
             existing packages are those that have a newer version in the
             reference directory.
     """
-    reference_packages = {}
-    for directory_entry in os.listdir(reference_directory):
-      # The directory contains various files and we are only interested
-      # in the source dpkg packages that use the naming convention:
-      # package_version-#ppa1~distribution_source.changes
-      name_suffix = 'ppa1~{0:s}_source.changes'.format(self._distribution)
-      if not directory_entry.endswith(name_suffix):
-        continue
-
-      name, _, _ = directory_entry.rpartition('-')
-      name, _, version = name.rpartition('_')
-
-      reference_packages[name] = version
-
+    reference_packages = self._GetDPKGSourcePackages(reference_directory)
     packages = self._launchpad_ppa_manager.GetPackages(track)
     return self._ComparePackages(reference_packages, packages)
 
@@ -679,11 +925,12 @@ class PackagesManager(object):
             existing packages are those that have a newer version in the
             reference project.
     """
-    reference_packages = self._copr_project_manager.GetPackages(
-        reference_project)
-    packages = self._copr_project_manager.GetPackages(project)
+    results = self._packages_fetcher.Fetch([
+        ('reference', self._copr_project_manager.GetPackages,
+         (reference_project, )),
+        ('packages', self._copr_project_manager.GetPackages, (project, ))])
 
-    return self._ComparePackages(reference_packages, packages)
+    return self._ComparePackages(results['reference'], results['packages'])
 
   def CompareGithubRepos(self, sub_directory, reference_track, track):
     """Compares two GitHub repos PPA tracks.
@@ -702,11 +949,13 @@ class PackagesManager(object):
             existing packages are those that have a newer version in the
             reference track.
     """
-    reference_packages = self._github_repo_manager.GetPackages(
-        sub_directory, reference_track)
-    packages = self._github_repo_manager.GetPackages(sub_directory, track)
+    results = self._packages_fetcher.Fetch([
+        ('reference', self._github_repo_manager.GetPackages,
+         (sub_directory, reference_track)),
+        ('packages', self._github_repo_manager.GetPackages,
+         (sub_directory, track))])
 
-    return self._ComparePackages(reference_packages, packages)
+    return self._ComparePackages(results['reference'], results['packages'])
 
   def CompareLaunchpadPPATracks(self, reference_track, track):
     """Compares two Launchpad PPA tracks.
@@ -724,11 +973,12 @@ class PackagesManager(object):
             existing packages are those that have a newer version in the
             reference track.
     """
-    reference_packages = self._launchpad_ppa_manager.GetPackages(
-        reference_track)
-    packages = self._launchpad_ppa_manager.GetPackages(track)
+    results = self._packages_fetcher.Fetch([
+        ('reference', self._launchpad_ppa_manager.GetPackages,
+         (reference_track, )),
+        ('packages', self._launchpad_ppa_manager.GetPackages, (track, ))])
 
-    return self._ComparePackages(reference_packages, packages)
+    return self._ComparePackages(results['reference'], results['packages'])
 
   def CompareDirectoryWithPyPI(self, reference_directory):
     """Compares a directory containing .tar.gz packages with PyPI.
@@ -746,21 +996,8 @@ class PackagesManager(object):
             existing packages are those that have a newer version in the
             reference directory.
     """
-    reference_packages = {}
-    for directory_entry in os.listdir(reference_directory):
-      if not directory_entry.endswith('.tar.gz'):
-        continue
-
-      directory_entry, _, _ = directory_entry.rpartition('.tar.gz')
-      name, _, version = directory_entry.rpartition('-')
-
-      if (name.endswith('-alpha') or name.endswith('-beta') or
-          name.endswith('-experimental')):
-        name, _, _ = name.rpartition('-')
-
-      reference_packages[name] = version
-
-    packages = self._pypi_manager.GetPackages()
+    reference_packages = self._GetSourcePackages(reference_directory)
+    packages = self._pypi_manager.GetPackages(self._packages_fetcher)
     return self._ComparePackages(reference_packages, packages)
 
   def GetMachineTypeSubDirectory(
@@ -841,8 +1078,8 @@ def Main():
     bool: True if successful or False if not.
   """
   actions = frozenset([
-      'copr-diff-dev', 'copr-diff-stable', 'copr-diff-testing', 'csv-diff',
-      'l2tbinaries-diff-dev', 'l2tbinaries-diff-stable',
+      'all-diff', 'copr-diff-dev', 'copr-diff-stable', 'copr-diff-testing',
+      'csv-diff', 'l2tbinaries-diff-dev', 'l2tbinaries-diff-stable',
       'l2tbinaries-diff-testing', 'launchpad-diff-dev', 'launchpad-diff-stable',
       'launchpad-diff-testing', 'pypi-diff'])
 
@@ -853,11 +1090,33 @@ def Main():
       'action', choices=sorted(actions), action='store',
       metavar='ACTION', default=None, help='The action.')
 
+  argument_parser.add_argument(
+      '--artifact-catalog', '--artifact_catalog', action='store',
+      metavar='PATH', dest='artifact_catalog', type=str, default=None,
+      help=(
+          'path of the SQLite database file in which the files in the build '
+          'directory are cataloged by the build script. The catalog is used '
+          'to list the build directory. The default is not to use a '
+          'catalog.'))
+
   argument_parser.add_argument(
       '--build-directory', '--build_directory', action='store',
       metavar='DIRECTORY', dest='build_directory', type=str,
       default='build', help='The location of the build directory.')
 
+  argument_parser.add_argument(
+      '--cache-directory', '--cache_directory', action='store',
+      metavar='DIRECTORY', dest='cache_directory', type=str, default=None,
+      help=(
+          'The location of the directory in which downloaded pages are '
+          'cached between runs. The default is not to cache pages.'))
+
+  argument_parser.add_argument(
+      '--cache-ttl', '--cache_ttl', action='store', metavar='SECONDS',
+      dest='cache_ttl', type=int, default=3600, help=(
+          'The number of seconds a cached page is used before it is '
+          'revalidated. The default is 3600.'))
+
   argument_parser.add_argument(
       '--csv-file', '--csv_file', action='store', metavar='FILE',
       dest='csv_file', type=str, default='', help=(
@@ -867,6 +1126,20 @@ def Main():
       '--distribution', action='store', metavar='NAME', dest='distribution',
       type=str, default='trusty', help='The name of the distribution.')
 
+  argument_parser.add_argument(
+      '--http-timeout', '--http_timeout', action='store', metavar='SECONDS',
+      dest='http_timeout', type=float,
+      default=http_client.HTTPClient.DEFAULT_TIMEOUT, help=(
+          'number of seconds after which a HTTP request times out. The '
+          'default is {0:.0f} seconds.').format(
+              http_client.HTTPClient.DEFAULT_TIMEOUT))
+
+  argument_parser.add_argument(
+      '-j', '--jobs', action='store', metavar='JOBS', dest='jobs', type=int,
+      default=8, help=(
+          'number of repository listings and package pages to fetch '
+          'concurrently. The default is 8.'))
+
   argument_parser.add_argument(
       '--machine-type', '--machine_type', action='store', metavar='TYPE',
       dest='machine_type', type=str, default=None, help=(
@@ -875,6 +1148,17 @@ def Main():
           'unless want to force the installation of one machine type e.g. '
           '\'x86\' onto another \'amd64\'.'))
 
+  argument_parser.add_argument(
+      '--offline', dest='offline', action='store_true', default=False, help=(
+          'use the cached pages, also if they are out of date, instead of '
+          'downloading pages. Requires --cache-directory.'))
+
+  argument_parser.add_argument(
+      '-v', '--verbose', dest='verbose', action='store_true', default=False,
+      help=(
+          'have more verbose output, such as the statistics of the HTTP '
+          'requests per host.'))
+
   options = argument_parser.parse_args()
 
   if not options.action:
@@ -884,15 +1168,64 @@ def Main():
     print('')
     return False
 
+  if options.offline and not options.cache_directory:
+    print('Offline mode requires a cache directory.')
+    print('')
+    return False
+
+  if options.http_timeout <= 0:
+    print('Unsupported HTTP timeout: {0:.1f} seconds.'.format(
+        options.http_timeout))
+    print('')
+    return False
+
+  http_client_object = http_client.HTTPClient(timeout=options.http_timeout)
+  http_client.SetHTTPClient(http_client_object)
+
+  if options.cache_directory:
+    page_cache = page_cache_lib.PageCache(
+        os.path.abspath(options.cache_directory), offline=options.offline,
+        time_to_live=options.cache_ttl)
+    interface.DownloadHelper.SetPageCache(page_cache)
+    github_api.GitHubAPIClient.SetETagStore(page_cache)
+
+  if options.artifact_catalog:
+    artifact_catalog = artifact_catalog_lib.ArtifactCatalog(
+        os.path.abspath(options.artifact_catalog))
+    artifact_catalog_lib.SetArtifactCatalog(artifact_catalog)
+
   # TODO: add action to upload files to PPA.
   # TODO: add action to copy files between PPA tracks.
   # TODO: add pypi support.
 
-  packages_manager = PackagesManager(distribution=options.distribution)
+  packages_manager = PackagesManager(
+      distribution=options.distribution, number_of_jobs=options.jobs)
 
   action_tuple = options.action.split('-')
 
-  if action_tuple[0] == 'copr' and action_tuple[1] == 'diff':
+  diffs = []
+  if action_tuple[0] == 'all' and action_tuple[1] == 'diff':
+    reference_directory = options.build_directory
+
+    # The machine type sub directory is None if the l2tbinaries do not support
+    # the current machine type, in which case l2tbinaries is not compared.
+    sub_directory = packages_manager.GetMachineTypeSubDirectory(
+        preferred_machine_type=options.machine_type)
+
+    channels = packages_manager.CompareDirectoryWithChannels(
+        reference_directory, 'testing', sub_directory=sub_directory)
+
+    for channel in packages_manager.CHANNELS:
+      if channel not in channels:
+        continue
+
+      diff_header = 'Difference between: {0:s} and {1:s} testing'.format(
+          reference_directory, channel)
+
+      new_packages, new_versions = channels[channel]
+      diffs.append((diff_header, new_packages, new_versions))
+
+  elif action_tuple[0] == 'copr' and action_tuple[1] == 'diff':
     track = action_tuple[2]
 
     if track == 'testing':
@@ -930,6 +1263,8 @@ def Main():
         'Difference between: {0:s} and CSV'.format(reference_directory))
 
   elif action_tuple[0] == 'l2tbinaries' and action_tuple[1] == 'diff':
+    track = action_tuple[2]
+
     sub_directory = packages_manager.GetMachineTypeSubDirectory(
         preferred_machine_type=options.machine_type)
 
@@ -996,17 +1331,27 @@ def Main():
         'Difference between: {0:s} and release'.format(reference_directory))
 
   if action_tuple[1] == 'diff':
-    print(diff_header)
-    print('')
-
-    print('New packages:')
-    for package in sorted(new_packages.keys()):
-      print('  {0:s}'.format(package))
-    print('')
-
-    print('New versions:')
-    for package in sorted(new_versions.keys()):
-      print('  {0:s}'.format(package))
+    if action_tuple[0] != 'all':
+      diffs.append((diff_header, new_packages, new_versions))
+
+    for diff_header, new_packages, new_versions in diffs:
+      print(diff_header)
+      print('')
+
+      print('New packages:')
+      for package in sorted(new_packages.keys()):
+        print('  {0:s}'.format(package))
+      print('')
+
+      print('New versions:')
+      for package in sorted(new_versions.keys()):
+        print('  {0:s}'.format(package))
+      print('')
+
+  http_statistics = http_client_object.GetStatistics()
+  if options.verbose and http_statistics:
+    print('HTTP requests:')
+    print(http_client.FormatStatistics(http_statistics))
     print('')
 
   return True
@@ -18,18 +18,12 @@ try:
 except ImportError:
   import configparser  # pylint: disable=import-error
 
-# pylint: disable=import-error,no-name-in-module
-if sys.version_info[0] < 3:
-  # Keep urllib2 here since we this code should be able to be used
-  # by a default Python set up.
-  import urllib2 as urllib_error
-  from urllib2 import urlopen
-else:
-  import urllib.error as urllib_error
-  from urllib.request import urlopen
-
-# pylint: disable=wrong-import-position
+from l2tdevtools import github_api
+from l2tdevtools import http_client
+from l2tdevtools import page_cache as page_cache_lib
 from l2tdevtools import py2to3
+from l2tdevtools.lib import errors
+from l2tdevtools.lib import netrcfile
 
 
 class StatsDefinitionReader(object):
@@ -140,28 +134,40 @@ class DownloadHelper(object):
       download_url (str): URL where to download the page content.
 
     Returns:
-      tuple[bytes, TODO]: page content and response headers if successful or
-          None otherwise.
+      tuple[bytes, httplib.HTTPMessage]: page content and response headers
+          if successful or None otherwise.
     """
     if not download_url:
       return None, None
 
     try:
-      url_object = urlopen(download_url)
-    except urllib_error.URLError as exception:
+      response = http_client.GetHTTPClient().Request(download_url)
+      if response.code != 200:
+        response.close()
+        return None, None
+
+      return response.read(), response.headers
+
+    except (IOError, errors.ConnectivityError) as exception:
       logging.warning(
           'Unable to download URL: {0:s} with error: {1!s}'.format(
               download_url, exception))
       return None, None
 
-    if url_object.code != 200:
-      return None, None
 
-    return url_object.read(), url_object.info()
+class GithubContributionsHelper(object):
+  """Class that defines a GitHub contributions helper."""
 
+  def __init__(self, access_token=None):
+    """Initializes a GitHub contributions helper.
 
-class GithubContributionsHelper(DownloadHelper):
-  """Class that defines a GitHub contributions helper."""
+    Args:
+      access_token (Optional[str]): GitHub access token, where None
+          represents unauthenticated requests, which have a lower rate limit.
+    """
+    super(GithubContributionsHelper, self).__init__()
+    self._github_api_client = github_api.GitHubAPIClient(
+        access_token=access_token)
 
   def _ListContributionsForProject(
       self, organization, project_name, output_writer):
@@ -172,18 +178,20 @@ class GithubContributionsHelper(DownloadHelper):
       project_name (str): name of the project.
       output_writer (OutputWriter): output writer.
     """
-    download_url = (
-        'https://api.github.com/repos/{0:s}/{1:s}/stats/contributors').format(
-            organization, project_name)
+    path = 'repos/{0:s}/{1:s}/stats/contributors'.format(
+        organization, project_name)
 
-    contributors_data, response = self._DownloadPageContent(download_url)
-    if not contributors_data:
+    try:
+      contributors_json = self._github_api_client.GetJSON(path)
+    except errors.ConnectivityError as exception:
+      logging.warning(
+          'Unable to retrieve contributions of: {0:s} with error: {1!s}'.format(
+              project_name, exception))
       return
 
-    # TODO: check if response is not None
-    _ = response
+    if not contributors_json:
+      return
 
-    contributors_json = json.loads(contributors_data)
     self._WriteContributions(project_name, contributors_json, output_writer)
 
   def _ListPullRequestsForProject(
@@ -195,18 +203,17 @@ class GithubContributionsHelper(DownloadHelper):
       project_name (str): name of the project.
       output_writer (OutputWriter): output writer.
     """
-    download_url = (
-        'https://api.github.com/repos/{0:s}/{1:s}/pulls?state=all').format(
-            organization, project_name)
+    path = 'repos/{0:s}/{1:s}/pulls?state=all'.format(
+        organization, project_name)
 
-    pulls_data, response = self._DownloadPageContent(download_url)
-    if not pulls_data:
+    try:
+      pulls_json = self._github_api_client.GetPagedJSON(path)
+    except errors.ConnectivityError as exception:
+      logging.warning(
+          'Unable to retrieve pull requests of: {0:s} with error: {1!s}'.format(
+              project_name, exception))
       return
 
-    # TODO: check if response is not None
-    _ = response
-
-    pulls_json = json.loads(pulls_data)
     self._WritePullRequests(project_name, pulls_json, output_writer)
 
   def _WriteContributions(self, project_name, contributors_json, output_writer):
@@ -617,6 +624,14 @@ def Main():
           'path of the directory containing the statistics configuration '
           'files e.g. stats.ini.'))
 
+  argument_parser.add_argument(
+      '--cache-directory', '--cache_directory', action='store',
+      metavar='DIRECTORY', dest='cache_directory', type=str, default=None,
+      help=(
+          'path of the directory in which the responses of the GitHub API '
+          'are cached, which allows to send conditional requests that do not '
+          'count against the rate limit.'))
+
   argument_parser.add_argument(
       '-f', '--format', dest='output_format', action='store',
       metavar='FORMAT', choices=['csv', 'tilde'], default='csv',
@@ -682,7 +697,16 @@ def Main():
       projects_per_organization = (
           stats_definition_reader.ReadProjectsPerOrganization(file_object))
 
-    contributions_helper = GithubContributionsHelper()
+    if options.cache_directory:
+      page_cache = page_cache_lib.PageCache(
+          os.path.abspath(options.cache_directory))
+      github_api.GitHubAPIClient.SetETagStore(page_cache)
+
+    netrc_file = netrcfile.NetRCFile()
+    github_access_token = netrc_file.GetGitHubAccessToken()
+
+    contributions_helper = GithubContributionsHelper(
+        access_token=github_access_token)
     contributions_helper.ListContributions(
         projects_per_organization, output_writer)
 
@@ -8,18 +8,24 @@ from __future__ import unicode_literals
 import argparse
 import glob
 import io
-import json
 import logging
 import os
 import platform
 import re
 import subprocess
 import sys
+import time
 
+from multiprocessing import pool as multiprocessing_pool
+
+from l2tdevtools import github_api
+from l2tdevtools import http_client
+from l2tdevtools import page_cache as page_cache_lib
 from l2tdevtools import presets
 from l2tdevtools import projects
 from l2tdevtools import versions
 from l2tdevtools.download_helpers import interface
+from l2tdevtools.lib import errors
 
 
 if platform.system() == 'Windows':
@@ -124,9 +130,8 @@ class GithubRepoDownloadHelper(interface.DownloadHelper):
       return None
 
     if use_api:
-      # TODO: add support for branch.
-      download_url = '{0:s}/contents/{1:s}'.format(
-          self._GITHUB_REPO_API_URL, sub_directory)
+      download_url = '{0:s}/contents/{1:s}?ref={2:s}'.format(
+          self._GITHUB_REPO_API_URL, sub_directory, self._branch)
 
     else:
       download_url = '{0:s}/tree/{1:s}/{2:s}'.format(
@@ -158,15 +163,21 @@ class GithubRepoDownloadHelper(interface.DownloadHelper):
       logging.info('Missing download URL.')
       return None
 
-    page_content = self.DownloadPageContent(download_url)
-    if not page_content:
-      return None
-
     # TODO: skip SHA256SUMS
 
     download_urls = []
     if use_api:
-      # The page content consist of JSON data that contains a list of dicts.
+      github_api_client = github_api.GitHubAPIClient()
+      try:
+        directory_entries = github_api_client.GetJSON(download_url)
+      except errors.ConnectivityError as exception:
+        logging.warning('{0!s}'.format(exception))
+        return None
+
+      if not directory_entries:
+        return None
+
+      # The JSON data contains a list of dicts.
       # Each dict consists of:
       # {
       #   "name":"PyYAML-3.11.win-amd64-py2.7.msi",
@@ -185,7 +196,7 @@ class GithubRepoDownloadHelper(interface.DownloadHelper):
       #   }
       # }
 
-      for directory_entry in json.loads(page_content):
+      for directory_entry in directory_entries:
         download_url = directory_entry.get('download_url', None)
         if download_url:
           download_urls.append(download_url)
@@ -197,6 +208,10 @@ class GithubRepoDownloadHelper(interface.DownloadHelper):
       if not sub_directory:
         return None
 
+      page_content = self.DownloadPageContent(download_url)
+      if not page_content:
+        return None
+
       # The format of the download URL is:
       # <a class="js-navigation-open" title="{title}" id="{id}" href="{path}"
       expression_string = (
@@ -247,7 +262,7 @@ class DependencyUpdater(object):
       'net.sourceforge.projects.']
 
   def __init__(
-      self, download_directory='build', download_only=False,
+      self, download_directory='build', download_jobs=4, download_only=False,
       download_track='stable', exclude_packages=False, force_install=False,
       msi_targetdir=None, preferred_machine_type=None,
       preferred_operating_system=None, verbose_output=False):
@@ -255,6 +270,8 @@ class DependencyUpdater(object):
 
     Args:
       download_directory (Optional[str]): path of the download directory.
+      download_jobs (Optional[int]): maximum number of packages that are
+          downloaded concurrently.
       download_only (Optional[bool]): True if the dependency packages should
           only be downloaded.
       download_track (Optional[str]): track to download from.
@@ -274,6 +291,7 @@ class DependencyUpdater(object):
 
     super(DependencyUpdater, self).__init__()
     self._download_directory = download_directory
+    self._download_jobs = max(download_jobs or 1, 1)
     self._download_helper = GithubRepoDownloadHelper(
         self._DOWNLOAD_URL, branch=branch)
     self._download_only = download_only
@@ -293,6 +311,71 @@ class DependencyUpdater(object):
     else:
       self._preferred_machine_type = None
 
+  def _DownloadPackage(self, download_url):
+    """Downloads a package into the current working directory.
+
+    Args:
+      download_url (str): URL where to download the package.
+
+    Returns:
+      tuple[str, str]: download URL and filename of the package or None
+          if the package could not be downloaded.
+    """
+    return download_url, self._download_helper.DownloadFile(download_url)
+
+  def _DownloadPackages(self, download_urls):
+    """Downloads packages concurrently into the current working directory.
+
+    Args:
+      download_urls (list[str]): URLs where to download the packages.
+
+    Returns:
+      bool: True if all packages were downloaded.
+    """
+    if not download_urls:
+      return True
+
+    number_of_jobs = min(self._download_jobs, len(download_urls))
+    logging.info('Downloading: {0:d} packages using: {1:d} jobs'.format(
+        len(download_urls), number_of_jobs))
+
+    start_time = time.time()
+
+    pool = multiprocessing_pool.ThreadPool(processes=number_of_jobs)
+    try:
+      results = pool.imap_unordered(self._DownloadPackage, download_urls)
+
+      failed_downloads = []
+      number_of_bytes = 0
+      for index, (download_url, filename) in enumerate(results):
+        if not filename:
+          failed_downloads.append(download_url)
+          status = 'failed'
+        else:
+          number_of_bytes += os.path.getsize(filename)
+          status = 'done'
+
+        logging.info('[{0:d}/{1:d}] {2:s}: {3:s}'.format(
+            index + 1, len(download_urls), status, download_url))
+
+      pool.close()
+
+    finally:
+      pool.terminate()
+      pool.join()
+
+    duration = max(time.time() - start_time, 0.001)
+    logging.info((
+        'Downloaded: {0:d} of {1:d} packages, {2:d} bytes in {3:.1f} seconds '
+        '({4:.1f} KiB/s)').format(
+            len(download_urls) - len(failed_downloads), len(download_urls),
+            number_of_bytes, duration, number_of_bytes / duration / 1024))
+
+    for download_url in failed_downloads:
+      logging.warning('Unable to download: {0:s}'.format(download_url))
+
+    return not failed_downloads
+
   def _GetPackageFilenamesAndVersions(self, package_names):
     """Determines the package filenames and versions.
 
@@ -312,10 +395,15 @@ class DependencyUpdater(object):
     python_version_indicator = '-py{0:d}.{1:d}'.format(
         sys.version_info[0], sys.version_info[1])
 
-    # The API is rate limited, so we scrape the web page instead.
     package_urls = self._download_helper.GetPackageDownloadURLs(
         preferred_machine_type=self._preferred_machine_type,
-        preferred_operating_system=self.operating_system)
+        preferred_operating_system=self.operating_system, use_api=True)
+    if not package_urls:
+      # Fall back to scraping the web page when the API is not available,
+      # for example when the rate limit is exceeded.
+      package_urls = self._download_helper.GetPackageDownloadURLs(
+          preferred_machine_type=self._preferred_machine_type,
+          preferred_operating_system=self.operating_system)
     if not package_urls:
       logging.error('Unable to determine package download URLs.')
       return None, None
@@ -325,7 +413,9 @@ class DependencyUpdater(object):
 
     os.chdir(self._download_directory)
 
+    package_download_urls = {}
     package_filenames = {}
+    package_globs = {}
     package_versions = {}
     for package_url in package_urls:
       _, _, package_filename = package_url.rpartition('/')
@@ -380,21 +470,36 @@ class DependencyUpdater(object):
       if compare_result > 0:
         package_filenames[name] = package_filename
         package_versions[name] = version
+        package_download_urls[name] = package_url
+        package_globs[name] = '{0:s}*{1:s}'.format(
+            package_prefix, package_suffix)
 
-      if not os.path.exists(package_filename):
-        filenames = glob.glob('{0:s}*{1:s}'.format(
-            package_prefix, package_suffix))
-        for filename in filenames:
-          if os.path.isdir(filename):
-            continue
+    selected_filenames = set(package_filenames.values())
+
+    download_urls = []
+    for name, package_filename in sorted(package_filenames.items()):
+      if os.path.exists(package_filename):
+        continue
+
+      for filename in glob.glob(package_globs[name]):
+        if os.path.isdir(filename) or filename in selected_filenames:
+          continue
+
+        logging.info('Removing: {0:s}'.format(filename))
+        os.remove(filename)
 
-          logging.info('Removing: {0:s}'.format(filename))
-          os.remove(filename)
+      download_urls.append(package_download_urls[name])
 
-        logging.info('Downloading: {0:s}'.format(package_filename))
-        self._download_helper.DownloadFile(package_url)
+    try:
+      if not self._DownloadPackages(download_urls):
+        # Ignore the packages that could not be downloaded.
+        for name, package_filename in list(package_filenames.items()):
+          if not os.path.exists(package_filename):
+            del package_filenames[name]
+            del package_versions[name]
 
-    os.chdir('..')
+    finally:
+      os.chdir('..')
 
     return package_filenames, package_versions
 
@@ -780,6 +885,19 @@ def Main():
   argument_parser = argparse.ArgumentParser(description=(
       'Installs the latest versions of project dependencies.'))
 
+  argument_parser.add_argument(
+      '--cache-directory', '--cache_directory', action='store',
+      metavar='DIRECTORY', dest='cache_directory', type=str, default=None,
+      help=(
+          'The location of the directory in which downloaded pages are '
+          'cached between runs. The default is not to cache pages.'))
+
+  argument_parser.add_argument(
+      '--cache-ttl', '--cache_ttl', action='store', metavar='SECONDS',
+      dest='cache_ttl', type=int, default=3600, help=(
+          'The number of seconds a cached page is used before it is '
+          'revalidated. The default is 3600.'))
+
   argument_parser.add_argument(
       '-c', '--config', dest='config_path', action='store',
       metavar='CONFIG_PATH', default=None, help=(
@@ -809,6 +927,19 @@ def Main():
           'of installed dependencies. The default behavior is to only'
           'install a dependency if not or an older version is installed.'))
 
+  argument_parser.add_argument(
+      '--http-timeout', '--http_timeout', action='store', metavar='SECONDS',
+      dest='http_timeout', type=float,
+      default=http_client.HTTPClient.DEFAULT_TIMEOUT, help=(
+          'number of seconds after which a HTTP request, such as that of '
+          'a download, times out. The default is {0:.0f} seconds.').format(
+              http_client.HTTPClient.DEFAULT_TIMEOUT))
+
+  argument_parser.add_argument(
+      '-j', '--jobs', dest='jobs', action='store', metavar='NUMBER',
+      type=int, default=4, help=(
+          'number of packages to download concurrently. The default is 4.'))
+
   argument_parser.add_argument(
       '--machine-type', '--machine_type', action='store', metavar='TYPE',
       dest='machine_type', type=str, default=None, help=(
@@ -824,6 +955,11 @@ def Main():
           'is not recommended unless want to force the installation of the '
           'MSIs into different directory than the system default.'))
 
+  argument_parser.add_argument(
+      '--offline', dest='offline', action='store_true', default=False, help=(
+          'use the cached pages, also if they are out of date, instead of '
+          'downloading pages. Requires --cache-directory.'))
+
   argument_parser.add_argument(
       '--preset', dest='preset', action='store',
       metavar='PRESET_NAME', default=None, help=(
@@ -838,7 +974,9 @@ def Main():
 
   argument_parser.add_argument(
       '-v', '--verbose', dest='verbose', action='store_true', default=False,
-      help='have more verbose output.')
+      help=(
+          'have more verbose output, such as the statistics of the HTTP '
+          'requests per host.'))
 
   argument_parser.add_argument(
       'project_names', nargs='*', action='store', metavar='NAME',
@@ -850,6 +988,17 @@ def Main():
 
   options = argument_parser.parse_args()
 
+  if options.jobs < 1:
+    print('Unsupported number of jobs: {0:d}.'.format(options.jobs))
+    print('')
+    return False
+
+  if options.http_timeout <= 0:
+    print('Unsupported HTTP timeout: {0:.1f} seconds.'.format(
+        options.http_timeout))
+    print('')
+    return False
+
   config_path = options.config_path
   if not config_path:
     config_path = os.path.dirname(__file__)
@@ -871,6 +1020,21 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
+  if options.offline and not options.cache_directory:
+    print('Offline mode requires a cache directory.')
+    print('')
+    return False
+
+  if options.cache_directory:
+    page_cache = page_cache_lib.PageCache(
+        os.path.abspath(options.cache_directory), offline=options.offline,
+        time_to_live=options.cache_ttl)
+    interface.DownloadHelper.SetPageCache(page_cache)
+    github_api.GitHubAPIClient.SetETagStore(page_cache)
+
+  http_client_object = http_client.HTTPClient(timeout=options.http_timeout)
+  http_client.SetHTTPClient(http_client_object)
+
   project_names = []
   if options.preset:
     with io.open(presets_file, 'r', encoding='utf-8') as file_object:
@@ -890,6 +1054,7 @@ def Main():
 
   dependency_updater = DependencyUpdater(
       download_directory=options.download_directory,
+      download_jobs=options.jobs,
       download_only=options.download_only,
       download_track=options.track,
       exclude_packages=options.exclude_packages,
@@ -898,15 +1063,12 @@ def Main():
       preferred_machine_type=options.machine_type,
       verbose_output=options.verbose)
 
-  project_definitions = {}
-  with io.open(projects_file, 'r', encoding='utf-8') as file_object:
-    project_definition_reader = projects.ProjectDefinitionReader()
-    for project_definition in project_definition_reader.Read(file_object):
-      project_definitions[project_definition.name] = project_definition
+  project_definition_index = projects.ProjectDefinitionIndex(projects_file)
 
   package_names = []
   for project_name in project_names:
-    project_definition = project_definitions.get(project_name, None)
+    project_definition = project_definition_index.GetProjectDefinition(
+        project_name)
     if not project_definition:
       logging.error('Missing definition for project: {0:s}'.format(
           project_name))
@@ -919,7 +1081,15 @@ def Main():
 
     package_names.append(package_name)
 
-  return dependency_updater.UpdatePackages(package_names)
+  result = dependency_updater.UpdatePackages(package_names)
+
+  http_statistics = http_client_object.GetStatistics()
+  if options.verbose and http_statistics:
+    print('')
+    print('HTTP requests:')
+    print(http_client.FormatStatistics(http_statistics))
+
+  return result
 
 
 if __name__ == '__main__':